@@ -242,6 +242,9 @@ CMD_HOSTS = "cat /etc/hosts"
 CMD_GET_NETMASK = "ifconfig | grep \"{}\" | awk '{{print $4}}'"
 CMD_DMESGS = "dmesg > {}"
 CMD_JOURNALCTL = "journalctl > {}"
+CMD_STAT_INODE_SIZE = "stat -c '%i %s' {}"
+CMD_READ_FROM_OFFSET = "tail -c +{} {} | head -c {}"
+CMD_JOURNALCTL_AFTER_CURSOR = "journalctl --no-pager -o short-iso --show-cursor {} {}"
 # Provisioner commands
 CMD_LSBLK = "lsblk -S | grep disk | wc -l"
 CMD_LSBLK_SIZE = "lsblk -r |grep disk| awk '{print $4}'"
@@ -546,6 +549,8 @@ GET_REQUEST_USAGE = "consul kv get -recurse csm/config/CSM_SERVICE | grep reques
 GET_MAX_USERS = "consul kv get -recurse csm/config/CSM_USERS"
 # Kubectl command prefix
 KUBECTL_CMD = "kubectl {} {} -n {} {}"
+# tar and gzip paths to stdout, files vanishing while reading are not fatal
+K8S_TAR_STREAM_CMD = "tar -czf - --ignore-failed-read {}"
 KUBECTL_GET_DEPLOYMENT = "kubectl get deployment"
 KUBECTL_GET_POD_CONTAINERS = "kubectl get pods {} -o jsonpath='{{.spec.containers[*].name}}'"
 KUBECTL_GET_POD_IPS = 'kubectl get pods --no-headers -o ' \
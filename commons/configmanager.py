@@ -19,30 +19,81 @@
 #
 """Module for handling the yaml config and DB config and combine them"""
 
+import copy
+import hashlib
 import logging
+import os
+import pickle
 from urllib.parse import quote_plus
 import yaml
 from pymongo import MongoClient
 from commons.utils import config_utils
 from commons import pswdmanager
 from commons.params import SETUPS_FPATH, DB_HOSTNAME, DB_NAME, SYS_INFO_COLLECTION, SETUP_DEFAULTS
+from commons.params import CONFIG_CACHE_DIR
 
 LOG = logging.getLogger(__name__)
 
+# fpath: (content digest, decrypted config), decrypted data is never written to disk.
+_YAML_CACHE = {}
+# fpath: ((mtime, size), setups)
+_SETUPS_CACHE = {}
+# target: setup details read from DB when missing in setups json
+_DB_SETUPS_CACHE = {}
+# (pid, MongoClient), a client must not be shared across fork.
+_MONGO_CLIENT = (None, None)
+
+
+def _load_compiled_yaml(digest: str, content: bytes):
+    """Load parsed yaml from binary cache or parse and store it."""
+    cache_file = os.path.join(CONFIG_CACHE_DIR, digest + ".pickle")
+    try:
+        with open(cache_file, "rb") as fin:
+            return pickle.load(fin)  # nosec (B301) cache is private to user
+    except (OSError, EOFError, pickle.UnpicklingError):
+        pass
+    data = yaml.safe_load(content)
+    try:
+        os.makedirs(CONFIG_CACHE_DIR, mode=0o700, exist_ok=True)
+        tmp_file = f"{cache_file}.{os.getpid()}"
+        with open(tmp_file, "wb") as fout:
+            pickle.dump(data, fout, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_file, cache_file)
+    except OSError as error:
+        LOG.debug("Could not write config cache %s: %s", cache_file, error)
+    return data
+
 
 def get_config_yaml(fpath: str) -> dict:
     """Reads the config and decrypts the passwords
 
+    Parsed yaml is cached on disk keyed by file content hash and the decrypted
+    config is cached in memory, so repeated reads return a copy without parsing.
     :param fpath: configuration file path
     :return [type]: dictionary containing config data
     """
-    with open(fpath) as fin:
+    with open(fpath, "rb") as fin:
         LOG.debug("Reading details from file : %s", fpath)
-        data = yaml.safe_load(fin)
+        content = fin.read()
+    digest = hashlib.sha256(content).hexdigest()
+    cached = _YAML_CACHE.get(fpath)
+    if cached is None or cached[0] != digest:
+        data = _load_compiled_yaml(digest, content)
         data['end'] = 'end'
         LOG.debug("Decrypting password from file : %s", fpath)
         pswdmanager.decrypt_all_passwd(data)
-    return data
+        cached = _YAML_CACHE[fpath] = (digest, data)
+    return copy.deepcopy(cached[1])
+
+
+def get_setups(fpath: str = SETUPS_FPATH) -> dict:
+    """Read setups json, content is re-read only when the file changes."""
+    stat = os.stat(fpath)
+    version = (stat.st_mtime_ns, stat.st_size)
+    cached = _SETUPS_CACHE.get(fpath)
+    if cached is None or cached[0] != version:
+        cached = _SETUPS_CACHE[fpath] = (version, config_utils.read_content_json(fpath, mode='rb'))
+    return cached[1]
 
 
 def get_config_db(setup_query: dict, drop_id: bool = True):
@@ -68,15 +119,19 @@ def get_config_db(setup_query: dict, drop_id: bool = True):
 
 
 def _get_collection_obj():
+    global _MONGO_CLIENT  # pylint: disable=global-statement
     LOG.debug("Database hostname: %s", DB_HOSTNAME)
     LOG.debug("Database name: %s", DB_NAME)
     LOG.debug("Collection name: %s", SYS_INFO_COLLECTION)
-    db_creds = pswdmanager.get_secrets(secret_ids=['DB_USER', 'DB_PASSWORD'])
-    mongodburi = "mongodb://{0}:{1}@{2}"
-    uri = mongodburi.format(
-        quote_plus(db_creds['DB_USER']), quote_plus(db_creds['DB_PASSWORD']), DB_HOSTNAME)
-    LOG.debug("URI : %s", uri)
-    client = MongoClient(uri)
+    pid, client = _MONGO_CLIENT
+    if client is None or pid != os.getpid():
+        db_creds = pswdmanager.get_secrets(secret_ids=['DB_USER', 'DB_PASSWORD'])
+        mongodburi = "mongodb://{0}:{1}@{2}"
+        uri = mongodburi.format(
+            quote_plus(db_creds['DB_USER']), quote_plus(db_creds['DB_PASSWORD']), DB_HOSTNAME)
+        LOG.debug("URI : %s", uri)
+        client = MongoClient(uri)
+        _MONGO_CLIENT = (os.getpid(), client)
     setup_db = client[DB_NAME]
     collection_obj = setup_db[SYS_INFO_COLLECTION]
     LOG.debug("Collection obj for DB interaction %s", collection_obj)
@@ -121,11 +176,13 @@ def get_config_wrapper(**kwargs):
         flag = True
         try:
             LOG.debug("Reading config from setups.json for setup: %s", target)
-            setup_details = config_utils.read_content_json(SETUPS_FPATH, mode='rb')[target]
+            setup_details = copy.deepcopy(get_setups()[target])
         except (KeyError, FileNotFoundError):
-            setup_query = {"setupname": kwargs['target']}
-            LOG.debug("Reading config from DB for setup: %s", target)
-            setup_details = get_config_db(setup_query=setup_query)[target]
+            if target not in _DB_SETUPS_CACHE:
+                setup_query = {"setupname": kwargs['target']}
+                LOG.debug("Reading config from DB for setup: %s", target)
+                _DB_SETUPS_CACHE[target] = get_config_db(setup_query=setup_query)[target]
+            setup_details = copy.deepcopy(_DB_SETUPS_CACHE[target])
         if "target_key" in kwargs:
             setup_details = setup_details[kwargs["target_key"]]
         data.update(setup_details)
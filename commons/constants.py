@@ -512,3 +512,5 @@ PROFILE_FILE_PATH = "scripts/io_stability/profiling.yaml"
 COLLECTION_SCRIPT_PATH = "scripts/io_stability/collect-k8s-stats.sh"
 PROFILE_FILE = "profiling.yaml"
 COLLECTION_FILE = "collect-k8s-stats.sh"
+# time series stat collection agent
+STATS_AGENT_PATH = "scripts/io_stability/stats_agent.py"
@@ -19,21 +19,37 @@
 #
 """
 Extended log rotation class for cortx log files
+
+Logging can be made non-blocking for IO threads: handlers are moved behind a queue
+and run by a listener thread, rotated logs are compressed by a background worker,
+hot path call sites can be rate limited and records can be written as JSON lines.
 """
 import os
 import inspect
 import gzip
+import json
+import queue
 import shutil
 import datetime
 import logging
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from logging import handlers
 from commons import params
 
 LOG_FILE = 'cortx-test.log'
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+_COMPRESSOR = ThreadPoolExecutor(max_workers=1, thread_name_prefix="log-compress")
+_LISTENERS = {}
 
 
-def init_loghandler(log, level=logging.DEBUG) -> None:
-    """Initialize logging with stream and file handlers."""
+def init_loghandler(log, level=logging.DEBUG, queued=False) -> None:
+    """
+    Initialize logging with stream and file handlers.
+    :param queued: run handlers in a listener thread, see start_queue_logging.
+    """
     log.setLevel(level)
     make_log_dir(params.LOG_DIR_NAME)
     fh = logging.FileHandler(os.path.join(os.getcwd(),
@@ -44,24 +60,66 @@ def init_loghandler(log, level=logging.DEBUG) -> None:
     fh.setLevel(logging.DEBUG)
     ch = logging.StreamHandler()
     ch.setLevel(logging.DEBUG)
-    formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    formatter = logging.Formatter(LOG_FORMAT)
     fh.setFormatter(formatter)
     ch.setFormatter(formatter)
-    log.addHandler(fh)
-    log.addHandler(ch)
+    if queued:
+        start_queue_logging(log, [fh, ch])
+    else:
+        log.addHandler(fh)
+        log.addHandler(ch)
 
 
-def set_log_handlers(log, name, mode='w', level=logging.DEBUG):
-    """Set stream and file handlers."""
+def set_log_handlers(log, name, mode='w', level=logging.DEBUG, queued=False,
+                     multiprocess=False):
+    """
+    Set stream and file handlers.
+    :param queued: run handlers in a listener thread, see start_queue_logging.
+    :param multiprocess: queue records of forked child processes too, see start_queue_logging.
+    """
     fh = logging.FileHandler(name, mode=mode)
     fh.setLevel(level)
     ch = logging.StreamHandler()
     ch.setLevel(level)
-    formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    formatter = logging.Formatter(LOG_FORMAT)
     fh.setFormatter(formatter)
     ch.setFormatter(formatter)
-    log.addHandler(fh)
-    log.addHandler(ch)
+    if queued:
+        start_queue_logging(log, [fh, ch], multiprocess=multiprocess)
+    else:
+        log.addHandler(fh)
+        log.addHandler(ch)
+
+
+def start_queue_logging(log, log_handlers, multiprocess=False) -> handlers.QueueListener:
+    """
+    Attach log_handlers to log through a queue. Logging threads only enqueue records,
+    formatting and writing happen in a listener thread.
+    :param log: logger e.g. root logger.
+    :param log_handlers: handlers run by listener.
+    :param multiprocess: use a multiprocessing queue, records of processes forked after
+        the call reach the listener of this process, which child processes do not inherit.
+    :return: started listener, stopped by stop_queue_logging.
+    """
+    record_queue = multiprocessing.Queue() if multiprocess else queue.SimpleQueue()
+    queue_handler = handlers.QueueHandler(record_queue)
+    listener = handlers.QueueListener(record_queue, *log_handlers, respect_handler_level=True)
+    log.addHandler(queue_handler)
+    listener.start()
+    _LISTENERS[queue_handler] = listener
+    return listener
+
+
+def stop_queue_logging(log) -> None:
+    """Flush queued records of log, stop its listeners and close their handlers."""
+    for handler in list(log.handlers):
+        listener = _LISTENERS.pop(handler, None)
+        if listener is None:
+            continue
+        log.removeHandler(handler)
+        listener.stop()
+        for log_handler in listener.handlers:
+            log_handler.close()
 
 
 def make_log_dir(dirpath) -> None:
@@ -78,17 +136,38 @@ def get_frame():
 class CortxRotatingFileHandler(handlers.RotatingFileHandler):
     """
     Handler overriding the existing RotatingFileHandler for switching cortx-test log files
-    when the current file reaches a certain size.
+    when the current file reaches a certain size. Rotated file is renamed in the logging
+    thread and compressed by a background worker.
     """
 
-    def __init__(self, filename="cortx-test.log", maxBytes=10485760, backupCount=5):
+    def __init__(self, filename="cortx-test.log", maxBytes=10485760, backupCount=5,
+                 compresslevel=6, background=True):
         """
         Initialization for cortx rotating file handler
+        :param compresslevel: gzip level of rotated logs.
+        :param background: compress in background worker instead of logging thread.
         """
         self.baseFilename = filename
         super().__init__(filename=self.baseFilename, maxBytes=maxBytes, backupCount=backupCount)
         self.namer = self.log_namer
         self.rotator = self.log_rotator
+        self.compresslevel = compresslevel
+        self.background = background
+        self._pending = None
+
+    def doRollover(self):
+        """Wait for compression of previous rollover, backups are renamed on rollover."""
+        if self._pending is not None:
+            self._pending.result()
+            self._pending = None
+        super().doRollover()
+
+    def close(self):
+        """Wait for pending compression and close file."""
+        if self._pending is not None:
+            self._pending.result()
+            self._pending = None
+        super().close()
 
     def log_namer(self, name):
         """
@@ -104,7 +183,90 @@ class CortxRotatingFileHandler(handlers.RotatingFileHandler):
         :param source: current log file path
         :param dest: destination path for rotated file
         """
+        if not self.background:
+            self.compress(source, dest, self.compresslevel)
+            return
+        # rename is cheap, stream is reopened on base file name right after
+        pending = dest + ".pending"
+        os.replace(source, pending)
+        self._pending = _COMPRESSOR.submit(self.compress, pending, dest, self.compresslevel)
+
+    @staticmethod
+    def compress(source, dest, compresslevel=9):
+        """Gzip source into dest and remove source."""
         with open(source, "rb") as sf:
-            with gzip.open(dest, "wb", 9) as df:
+            with gzip.open(dest + ".tmp", "wb", compresslevel) as df:
                 shutil.copyfileobj(sf, df)
+        os.replace(dest + ".tmp", dest)
         os.remove(source)
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    Token bucket per call site (file and line), records above rate are dropped. Next
+    passing record of a call site carries number of dropped records as 'suppressed'.
+    Records of WARNING and above are never dropped.
+    """
+
+    def __init__(self, rate=10.0, burst=20, sample=1):
+        """
+        :param rate: records per second per call site.
+        :param burst: records allowed at once per call site.
+        :param sample: pass only every n-th record of a call site before rate limiting.
+        """
+        super().__init__()
+        self.rate = rate
+        self.burst = burst
+        self.sample = sample
+        self._sites = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record):
+        if record.levelno >= logging.WARNING:
+            return True
+        site = (record.pathname, record.lineno)
+        now = time.monotonic()
+        with self._lock:
+            tokens, last, count, dropped = self._sites.get(site, (self.burst, now, 0, 0))
+            tokens = min(self.burst, tokens + (now - last) * self.rate)
+            count += 1
+            passed = count % self.sample == 0 and tokens >= 1
+            if passed:
+                tokens -= 1
+                record.suppressed = dropped
+                dropped = 0
+            else:
+                dropped += 1
+            self._sites[site] = (tokens, now, count, dropped)
+        return passed
+
+
+def limit_logger(name, rate=10.0, burst=20, sample=1) -> RateLimitFilter:
+    """
+    Rate limit records logged by a module logger e.g. limit_logger("libs.di.uploader").
+    :return: attached filter.
+    """
+    log_filter = RateLimitFilter(rate, burst, sample)
+    logging.getLogger(name).addFilter(log_filter)
+    return log_filter
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """Compact JSON object per record, one per line."""
+
+    def format(self, record):
+        entry = {"t": round(record.created, 6), "l": record.levelname, "n": record.name,
+                 "th": record.threadName, "f": f"{record.filename}:{record.lineno}",
+                 "m": record.getMessage()}
+        if getattr(record, "suppressed", 0):
+            entry["s"] = record.suppressed
+        if record.exc_info:
+            entry["x"] = self.formatException(record.exc_info)
+        return json.dumps(entry, separators=(",", ":"))
+
+
+def json_lines_handler(path, max_bytes=104857600, backup_count=5) -> logging.Handler:
+    """Rotating JSON lines sink with background compression."""
+    handler = CortxRotatingFileHandler(path, maxBytes=max_bytes, backupCount=backup_count)
+    handler.setFormatter(JsonLinesFormatter())
+    return handler
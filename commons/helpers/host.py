@@ -20,11 +20,9 @@
 
 import logging
 import os
-import posixpath
 import re
 import shutil
 import socket
-import stat
 import time
 from typing import Any
 from typing import List
@@ -37,6 +35,11 @@ import pysftp
 from paramiko.ssh_exception import SSHException
 
 from commons import commands, const
+from commons.helpers.sftp_transfer import SftpTransfer
+from commons.utils.instrument_utils import measure
+from commons.utils.retry_utils import Backoff
+from commons.utils.retry_utils import RetryPolicy
+from commons.utils.retry_utils import get_breaker
 
 LOGGER = logging.getLogger(__name__)
 
@@ -64,17 +67,18 @@ class AbsHost:
         ref: http://docs.paramiko.org/en/stable/api/client.html#paramiko.client.SSHClient.connect
         :param shell: In case required shell invocation.
         :param timeout: timeout in seconds.
-        :param retry: retry to connect.
+        :param retry: reconnect attempts after a timeout, 0 fails on first timeout.
         :param kwargs: Optional keyword arguments for SSHClient.connect func call.
         """
         try:
             self.host_obj = paramiko.SSHClient()
             self.host_obj.set_missing_host_key_policy(paramiko.AutoAddPolicy())
             LOGGER.debug("Connecting to host: %s", str(self.hostname))
-            count = 0
-            retry_count = 3
-            while count < retry_count:
-                try:
+            policy = RetryPolicy(attempts=3, backoff=Backoff(base=2, cap=30),
+                                 retry_on=(SSHException,), name="ssh",
+                                 breaker=get_breaker(f"ssh:{self.hostname}"))
+            for attempt in policy.attempts():
+                with attempt, measure("ssh.connect"):
                     self.host_obj.connect(hostname=self.hostname,
                                           username=self.username,
                                           password=self.password,
@@ -82,13 +86,6 @@ class AbsHost:
                                           allow_agent=False,
                                           look_for_keys=False,
                                           **kwargs)
-                    break
-                except SSHException as error:
-                    LOGGER.exception("Exception in connecting %s", error)
-                    count = count + 1
-                    if count == retry_count:
-                        raise error
-                    LOGGER.debug("Retrying to connect the host")
 
             if shell:
                 self.shell_obj = self.host_obj.invoke_shell()
@@ -96,8 +93,7 @@ class AbsHost:
         except socket.timeout as timeout_exception:
             LOGGER.error("Could not establish connection because of timeout: %s",
                          timeout_exception)
-            reconnected = self.reconnect(retry=retry, shell=shell, timeout=timeout, **kwargs)
-            if not reconnected:
+            if retry <= 0 or not self.reconnect(retry, shell=shell, timeout=timeout, **kwargs):
                 raise TimeoutError(f'Connection timed out on {self.hostname}') from None
         except Exception as error:
             LOGGER.error(
@@ -155,14 +151,16 @@ class AbsHost:
         :param retry_count: host retry count.
         :return: bool
         """
-        while retry_count:
-            try:
-                self.connect(**kwargs)
-                return True
-            except Exception as error:
-                LOGGER.debug("Attempting to reconnect: %s", str(error))
-                retry_count -= 1
-                time.sleep(wait_time)
+        if retry_count <= 0:
+            return False
+        policy = RetryPolicy(attempts=retry_count, backoff=Backoff(base=wait_time, cap=120),
+                             name="ssh_reconnect")
+        try:
+            # attempts are counted here, nested connect must not reconnect again
+            policy.call(self.connect, retry=0, **kwargs)
+            return True
+        except Exception as error:
+            LOGGER.debug("Attempting to reconnect failed: %s", str(error))
         return False
 
 
@@ -202,6 +200,14 @@ class Host(AbsHost):
             kwargs.pop('exc')
         LOGGER.debug("Executing %s", cmd)
         self.connect(**kwargs)  # fn will raise an exception
+        with measure("ssh.exec"):
+            return self._exec_cmd(cmd, inputs, read_lines, read_nbytes, timer, timeout,
+                                  check_recv_ready, exc)
+
+    # pylint: disable=too-many-arguments
+    def _exec_cmd(self, cmd, inputs, read_lines, read_nbytes, timer, timeout, check_recv_ready,
+                  exc):
+        """Run command on connected host, see execute_cmd."""
         stdin, stdout, stderr = self.host_obj.exec_command(cmd, timeout=timeout)  # nosec
         # above is non blocking call and timeout is set for SSL handshake and command
         if check_recv_ready:
@@ -338,19 +344,38 @@ class Host(AbsHost):
             remote.write(content)
         self.disconnect()
 
-    def copy_file_to_remote(self, local_path: str, remote_path: str) -> tuple:
+    def sftp_transfer(self, **kwargs) -> SftpTransfer:
+        """
+        Parallel SFTP transfer engine connected to host, close it after use.
+        :keyword channels: number of concurrent SFTP channels.
+        :keyword chunk_size: files larger than chunk size are copied in parallel ranges.
+        :keyword compress: enable SSH compression.
+        :keyword client: connected SSH client used for copies up to fanout_size bytes.
+        """
+        return SftpTransfer(self.hostname, self.username, self.password, **kwargs)
+
+    def connected_client(self) -> paramiko.SSHClient:
+        """SSH client of host, connected if there is no active connection."""
+        transport = self.host_obj.get_transport() if self.host_obj else None
+        if transport is None or not transport.is_active():
+            self.connect()
+        return self.host_obj
+
+    def copy_file_to_remote(self, local_path: str, remote_path: str, **kwargs) -> tuple:
         """
-        Copy local file to remote path.
+        Copy local file or directory tree to remote path.
 
+        Small copies run on the existing SSH connection, large files are copied in
+        parallel chunks over own connections and interrupted copies resume.
         :param str local_path: local file path.
         :param str remote_path: remote file path.
+        :keyword: sftp_transfer options e.g. channels, compress, fanout_size.
+        :return: True/False, bytes copied or error.
         """
         try:
-            self.connect_pysftp()
-            LOGGER.debug("sftp connected")
-            resp = self.pysftp_obj.put(local_path, remote_path)
+            with self.sftp_transfer(client=self.connected_client(), **kwargs) as sftp:
+                resp = sftp.put(local_path, remote_path)
             LOGGER.debug("file copied to : %s", str(remote_path))
-            self.disconnect()
 
             return self.path_exists(remote_path), resp
         except Exception as error:
@@ -359,20 +384,21 @@ class Host(AbsHost):
                 self.copy_file_to_remote.__name__, error)
             return False, error
 
-    def copy_file_to_local(self, remote_path: str, local_path: str) -> tuple:
+    def copy_file_to_local(self, remote_path: str, local_path: str, **kwargs) -> tuple:
         """
-        Copy remote file path to local file path.
+        Copy remote file or directory tree to local path.
 
+        Small copies run on the existing SSH connection, large files are copied in
+        parallel chunks over own connections and interrupted copies resume.
         :param str local_path: local file path.
         :param str remote_path: remote local path.
-        :return: True/False, response.
+        :keyword: sftp_transfer options e.g. channels, compress, fanout_size.
+        :return: True/False, bytes copied or error.
         """
         try:
-            self.connect_pysftp()
-            LOGGER.debug("sftp connected")
-            resp = self.pysftp_obj.get(remote_path, local_path)
+            with self.sftp_transfer(client=self.connected_client(), **kwargs) as sftp:
+                resp = sftp.get(remote_path, local_path)
             LOGGER.debug("file copied to : %s", str(local_path))
-            self.disconnect()
 
             return os.path.exists(local_path), resp
         except Exception as error:
@@ -538,22 +564,13 @@ class Host(AbsHost):
         Delete remote directory.
 
         Function deletes all the remote server files and directory
-        recursively of the specified path.
+        recursively of the specified path, files are removed concurrently.
         :param str dpath: Remote directory to be deleted
-        :param int level: Level or depth of remote directory
-        :return: None
+        :param int level: Unused, kept for compatibility
+        :return: True if directory is deleted
         """
-        self.connect_pysftp()
-        LOGGER.debug("sftp connected")
-        for fpath in self.pysftp_obj.listdir_attr(dpath):
-            rpath = posixpath.join(dpath, fpath.filename)
-            if stat.S_ISDIR(fpath.st_mode):
-                self.delete_dir_sftp(rpath, level=(level + 1))
-            else:
-                rpath = posixpath.join(dpath, fpath.filename)
-                self.pysftp_obj.remove(rpath)
-        self.pysftp_obj.rmdir(dpath)
-        self.disconnect()
+        with self.sftp_transfer() as sftp:
+            sftp.remove(dpath)
 
         return not self.path_exists(dpath)
 
@@ -0,0 +1,268 @@
+#!/usr/bin/python
+#
+# Copyright (c) 2022 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+#
+"""Incremental tailer of node logs.
+
+Remote log files are tracked by inode and byte offset, journal and kernel log by
+journal cursor. Every poll fetches only data added since the previous poll, appends
+it to a local copy per source and indexes lines matching the configured error
+patterns. Offsets and cursors are persisted so a later tailer continues where the
+previous one stopped. A test window is a pair of local offsets, so logs of a test
+are cut from the local copies without downloading anything again.
+
+File ranges are read over SFTP and journalctl output is read while the command
+runs, so large backlogs e.g. of from_start never wait on a full SSH channel.
+"""
+
+import json
+import logging
+import os
+import re
+from typing import Dict
+from typing import Iterator
+from typing import List
+
+from commons import commands
+from commons.utils import config_utils
+
+LOGGER = logging.getLogger(__name__)
+
+SERVERLOGS_CFG = "config/serverlogs_helper.yaml"
+JOURNAL = "journal"
+KERNEL = "kernel"
+MAX_FETCH = 16 * 1024 * 1024
+READ_BLOCK = 1024 * 1024
+CURSOR_PREFIX = b"-- cursor: "
+
+
+class LogTailer:
+    """Fetch new data of node logs since last poll and index error lines."""
+
+    # pylint: disable=too-many-arguments
+    def __init__(self, node_obj, local_dir: str, files: List[str] = None,
+                 patterns: List[str] = None, journal: bool = True, from_start: bool = False):
+        """
+        :param node_obj: Host or LogicalNode object of node.
+        :param local_dir: directory of local log copies, index and tail state.
+        :param files: remote log files, tail_files of serverlogs_helper.yaml if None.
+        :param patterns: error regex patterns, error_patterns of serverlogs_helper.yaml
+            if None.
+        :param journal: tail journal and kernel log.
+        :param from_start: fetch existing data of sources not seen before, else start
+            from current end.
+        """
+        if files is None or patterns is None:
+            cfg = config_utils.read_yaml(SERVERLOGS_CFG)[1]
+            files = cfg.get("tail_files", []) if files is None else files
+            patterns = cfg.get("error_patterns", []) if patterns is None else patterns
+        self.node = node_obj
+        self.local_dir = local_dir
+        self.sources = ([JOURNAL, KERNEL] if journal else []) + list(files)
+        self.patterns = [re.compile(pattern.encode()) for pattern in patterns]
+        self._any = re.compile(b"|".join(b"(?:" + pattern.encode() + b")"
+                                         for pattern in patterns)) if patterns else None
+        self.from_start = from_start
+        os.makedirs(local_dir, exist_ok=True)
+        self.state_path = os.path.join(local_dir, f"{node_obj.hostname}_tail_state.json")
+        self.index_path = os.path.join(local_dir, f"{node_obj.hostname}_error_index.jsonl")
+        try:
+            with open(self.state_path, encoding="utf-8") as state:
+                self.state = json.load(state)
+        except (OSError, ValueError):
+            self.state = {"files": {}, "cursors": {}}
+
+    def local_path(self, source: str) -> str:
+        """Local copy of source."""
+        name = source.strip("/").replace("/", "_")
+        if not name.endswith(".log"):
+            name += ".log"
+        return os.path.join(self.local_dir, f"{self.node.hostname}_{name}")
+
+    def _save_state(self) -> None:
+        tmp_path = self.state_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as state:
+            json.dump(self.state, state)
+        os.replace(tmp_path, self.state_path)
+
+    def _fetch_file(self, path: str, sftp) -> Iterator[bytes]:
+        """Yield complete lines added to remote file since previous poll."""
+        try:
+            inode, size = self.node.execute_cmd(
+                cmd=commands.CMD_STAT_INODE_SIZE.format(path)).split()
+        except IOError as error:
+            LOGGER.debug("Skipping %s on %s: %s", path, self.node.hostname, error)
+            return
+        inode, size = int(inode), int(size)
+        seen = self.state["files"].get(path)
+        if seen is None:
+            offset = 0 if self.from_start else size
+        elif seen["inode"] != inode or size < seen["offset"]:
+            LOGGER.info("%s on %s rotated or truncated", path, self.node.hostname)
+            offset = 0
+        else:
+            offset = seen["offset"]
+        if offset < size:
+            with sftp.open(path, "rb") as remote:
+                while offset < size:
+                    end = min(offset + MAX_FETCH, size)
+                    # readv keeps read requests of the whole range in flight
+                    data = b"".join(remote.readv(
+                        [(pos, min(READ_BLOCK, end - pos)) for pos in range(offset, end,
+                                                                             READ_BLOCK)]))
+                    if not data:
+                        break
+                    # partial last line is fetched again next time
+                    cut = data.rfind(b"\n") + 1
+                    if not cut:
+                        if len(data) < MAX_FETCH:
+                            break
+                        cut = len(data)
+                    yield data[:cut]
+                    offset += cut
+                    if cut < len(data) and end == size:
+                        break
+        self.state["files"][path] = {"inode": inode, "offset": offset}
+
+    def _fetch_journal(self, source: str) -> Iterator[bytes]:
+        """Yield journal entries after saved cursor, read while journalctl runs."""
+        cursor = self.state["cursors"].get(source)
+        if cursor:
+            option = f"--after-cursor='{cursor}'"
+        else:
+            option = "" if self.from_start else "-n 0"
+        kernel = "-k" if source == KERNEL else ""
+        _, stdout, stderr = self.node.connected_client().exec_command(
+            commands.CMD_JOURNALCTL_AFTER_CURSOR.format(kernel, option))  # nosec
+        new_cursor = None
+        pending = b""
+        while True:
+            data = stdout.read(READ_BLOCK)
+            lines = (pending + data).splitlines(keepends=True)
+            pending = lines.pop() if data and lines and not lines[-1].endswith(b"\n") else b""
+            entries = []
+            for line in lines:
+                if line.startswith(CURSOR_PREFIX):
+                    new_cursor = line[len(CURSOR_PREFIX):].strip().decode()
+                elif not line.startswith(b"-- "):
+                    entries.append(line)
+            if entries:
+                yield b"".join(entries)
+            if not data:
+                break
+        exit_status = stdout.channel.recv_exit_status()
+        if exit_status:
+            LOGGER.debug("journalctl on %s exited with %s: %s", self.node.hostname,
+                         exit_status, stderr.read().decode(errors="replace").strip())
+        if new_cursor:
+            self.state["cursors"][source] = new_cursor
+        elif not cursor:
+            # journal printed no entry, take cursor of last entry as starting point
+            last = self.node.execute_cmd(
+                cmd=commands.CMD_JOURNALCTL_AFTER_CURSOR.format(kernel, "-n 1")).splitlines()
+            if last and last[-1].startswith(CURSOR_PREFIX):
+                self.state["cursors"][source] = last[-1][len(CURSOR_PREFIX):].strip().decode()
+
+    def _index(self, source: str, data: bytes, start: int) -> List[dict]:
+        hits = []
+        if self._any is None or not self._any.search(data):
+            return hits
+        offset = start
+        for line in data.splitlines(keepends=True):
+            if self._any.search(line):
+                hits.append({"node": self.node.hostname, "source": source, "offset": offset,
+                             "patterns": [pattern.pattern.decode() for pattern in self.patterns
+                                          if pattern.search(line)],
+                             "line": line.decode(errors="replace").rstrip()})
+            offset += len(line)
+        return hits
+
+    def poll(self) -> Dict[str, int]:
+        """
+        Fetch and index data added to all sources since previous poll.
+        :return: source: number of new bytes.
+        """
+        new = {}
+        hits = []
+        sftp = None
+        try:
+            for source in self.sources:
+                if source in (JOURNAL, KERNEL):
+                    chunks = self._fetch_journal(source)
+                else:
+                    sftp = sftp or self.node.connected_client().open_sftp()
+                    chunks = self._fetch_file(source, sftp)
+                new[source] = 0
+                with open(self.local_path(source), "ab") as local:
+                    for data in chunks:
+                        start = local.tell()
+                        local.write(data)
+                        new[source] += len(data)
+                        hits.extend(self._index(source, data, start))
+        finally:
+            if sftp is not None:
+                sftp.close()
+        if hits:
+            with open(self.index_path, "a", encoding="utf-8") as index:
+                for hit in hits:
+                    index.write(json.dumps(hit) + "\n")
+            LOGGER.warning("%s error lines found in logs of %s", len(hits), self.node.hostname)
+        self._save_state()
+        return new
+
+    def sizes(self) -> Dict[str, int]:
+        """Current end of every local copy."""
+        return {source: os.path.getsize(self.local_path(source))
+                if os.path.exists(self.local_path(source)) else 0
+                for source in self.sources}
+
+    def mark(self) -> Dict[str, int]:
+        """Poll and return end of every local copy, start or end of a test window."""
+        self.poll()
+        return self.sizes()
+
+    def hits(self, start: Dict[str, int] = None, end: Dict[str, int] = None) -> List[dict]:
+        """Indexed error lines within window, all when window is not given."""
+        if not os.path.exists(self.index_path):
+            return []
+        with open(self.index_path, encoding="utf-8") as index:
+            entries = [json.loads(line) for line in index]
+        return [hit for hit in entries
+                if (start is None or hit["offset"] >= start.get(hit["source"], 0))
+                and (end is None or hit["offset"] < end.get(hit["source"], 0))]
+
+    def extract(self, start: Dict[str, int], end: Dict[str, int], dest_dir: str,
+                prefix: str) -> List[str]:
+        """
+        Write logs of window e.g. a test into dest_dir.
+        :param start: mark taken at start of window.
+        :param end: mark taken at end of window.
+        :param prefix: file name prefix e.g. test id.
+        :return: written file paths.
+        """
+        os.makedirs(dest_dir, exist_ok=True)
+        paths = []
+        for source, end_offset in end.items():
+            start_offset = start.get(source, 0)
+            if end_offset <= start_offset:
+                continue
+            path = os.path.join(dest_dir, f"{prefix}_{os.path.basename(self.local_path(source))}")
+            with open(self.local_path(source), "rb") as local, open(path, "wb") as out:
+                local.seek(start_offset)
+                out.write(local.read(end_offset - start_offset))
+            paths.append(path)
+        return paths
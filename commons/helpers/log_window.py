@@ -0,0 +1,216 @@
+#!/usr/bin/python
+#
+# Copyright (c) 2022 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+#
+"""Time window extraction of time ordered log files.
+
+Start and end offsets of a window are found by binary search over byte offsets,
+every probe reads one block at the probed offset and parses the timestamp of the
+first complete line in it. Files are read locally or remotely through an SFTP
+client, only the probed blocks and the byte range of the window are transferred.
+Syslog timestamps carry no year, it is taken from a reference time so windows
+spanning month and year boundaries compare correctly.
+"""
+
+import logging
+import os
+import re
+from datetime import datetime
+from typing import Callable
+from typing import Optional
+from typing import Tuple
+from typing import Union
+
+LOGGER = logging.getLogger(__name__)
+
+PROBE_SIZE = 64 * 1024
+MAX_SCAN = 4 * 1024 * 1024
+COPY_CHUNK = 1024 * 1024
+
+_ISO = re.compile(rb"(\d{4})-(\d\d)-(\d\d)[T ](\d\d):(\d\d):(\d\d)(?:[.,](\d{1,6}))?")
+_SYSLOG = re.compile(rb"([A-Z][a-z]{2}) +(\d{1,2}) (\d\d):(\d\d):(\d\d)")
+_MONTHS = {name: index for index, name in enumerate(
+    (b"Jan", b"Feb", b"Mar", b"Apr", b"May", b"Jun", b"Jul", b"Aug", b"Sep", b"Oct", b"Nov",
+     b"Dec"), start=1)}
+# timestamp is searched within line prefix only, messages may quote other timestamps
+_PREFIX = 64
+
+
+def parse_log_time(line: Union[bytes, str], ref: datetime = None) -> Optional[datetime]:
+    """
+    Timestamp at start of a log line.
+    Supports ISO "2022-12-12 16:06:01.123" / "2022-12-12T16:06:01" and syslog
+    "Dec 12 16:06:01" formats.
+    :param ref: reference time for year of syslog timestamps, now if None. Months after
+        month of ref are taken from previous year.
+    :return: datetime, None if line has no timestamp.
+    """
+    if isinstance(line, str):
+        line = line.encode()
+    prefix = line[:_PREFIX]
+    match = _ISO.search(prefix)
+    if match:
+        fraction = match.group(7) or b"0"
+        return datetime(*[int(val) for val in match.groups()[:6]],
+                        int(fraction.ljust(6, b"0")))
+    match = _SYSLOG.search(prefix)
+    if match and match.group(1) in _MONTHS:
+        ref = ref or datetime.now()
+        month = _MONTHS[match.group(1)]
+        year = ref.year - 1 if month > ref.month else ref.year
+        try:
+            return datetime(year, month, *[int(val) for val in match.groups()[1:]])
+        except ValueError:
+            return None
+    return None
+
+
+class _LocalFile:
+    """Range reads of a local file."""
+
+    def __init__(self, path: str):
+        self._file = open(path, "rb")  # pylint: disable=consider-using-with
+        self.size = os.fstat(self._file.fileno()).st_size
+
+    def read(self, offset: int, length: int) -> bytes:
+        """Read length bytes at offset."""
+        self._file.seek(offset)
+        return self._file.read(length)
+
+    def iter_range(self, start: int, end: int):
+        """Yield chunks of byte range."""
+        self._file.seek(start)
+        while start < end:
+            data = self._file.read(min(COPY_CHUNK, end - start))
+            if not data:
+                break
+            start += len(data)
+            yield data
+
+    def close(self) -> None:
+        """Close file."""
+        self._file.close()
+
+
+class _RemoteFile(_LocalFile):
+    """Range reads of a remote file through paramiko SFTP client."""
+
+    # pylint: disable=super-init-not-called
+    def __init__(self, sftp, path: str):
+        self._file = sftp.open(path, "rb")
+        self.size = self._file.stat().st_size
+
+    def iter_range(self, start: int, end: int):
+        """Yield chunks of byte range, chunk requests are pipelined."""
+        chunks = [(offset, min(COPY_CHUNK, end - offset))
+                  for offset in range(start, end, COPY_CHUNK)]
+        yield from self._file.readv(chunks)
+
+
+def _first_stamp(reader, pos: int, ref: datetime) -> Tuple[Optional[int], Optional[datetime]]:
+    """Offset and timestamp of first timestamped line starting at or after pos."""
+    base = end = max(pos - 1, 0)
+    buf = b""
+    # byte before pos tells whether pos is a line start
+    line_start = 0 if pos == 0 else None
+    while True:
+        if line_start is None:
+            newline = buf.find(b"\n")
+            if newline >= 0:
+                line_start = newline + 1
+                continue
+        else:
+            newline = buf.find(b"\n", line_start)
+            if newline >= 0 or end >= reader.size:
+                line = buf[line_start:newline if newline >= 0 else len(buf)]
+                stamp = parse_log_time(line, ref) if line else None
+                if stamp is not None:
+                    return base + line_start, stamp
+                if newline < 0:
+                    return None, None
+                line_start = newline + 1
+                continue
+            base += line_start
+            buf = buf[line_start:]
+            line_start = 0
+        if end >= reader.size or end - pos > MAX_SCAN:
+            return None, None
+        data = reader.read(end, PROBE_SIZE)
+        if not data:
+            return None, None
+        buf += data
+        end += len(data)
+
+
+def find_offset(reader, before: Callable[[datetime], bool], ref: datetime = None) -> int:
+    """
+    Offset of first timestamped line for which before(timestamp) is False, file size
+    if there is none. Timestamps of file are expected in ascending order.
+    """
+    low, high = 0, reader.size
+    probes = 0
+    while low < high:
+        mid = (low + high) // 2
+        start, stamp = _first_stamp(reader, mid, ref)
+        probes += 1
+        if start is not None and before(stamp):
+            low = start + 1
+        else:
+            high = mid
+    start, _ = _first_stamp(reader, low, ref)
+    LOGGER.debug("Offset %s found in %s probes", start, probes)
+    return reader.size if start is None else start
+
+
+def _to_time(value: Union[str, datetime], ref: datetime) -> datetime:
+    if isinstance(value, datetime):
+        return value
+    stamp = parse_log_time(value, ref)
+    if stamp is None:
+        raise ValueError(f"Unsupported timestamp {value}")
+    return stamp
+
+
+# pylint: disable=too-many-arguments
+def extract_log_window(path: str, start_time: Union[str, datetime],
+                       end_time: Union[str, datetime], dest_path: str, sftp=None,
+                       ref: datetime = None) -> Tuple[int, int]:
+    """
+    Write lines of log file logged from start_time to end_time, both inclusive, into
+    dest_path.
+    :param path: log file path, remote path when sftp is given.
+    :param start_time: datetime or log timestamp e.g. "Dec 12 16:06:01".
+    :param end_time: datetime or log timestamp.
+    :param dest_path: local file path of extracted window.
+    :param sftp: paramiko SFTP client of node having the log file.
+    :param ref: reference time for year of syslog timestamps, now if None.
+    :return: start and end byte offsets of window in log file.
+    """
+    ref = ref or datetime.now()
+    start_time, end_time = _to_time(start_time, ref), _to_time(end_time, ref)
+    reader = _RemoteFile(sftp, path) if sftp is not None else _LocalFile(path)
+    try:
+        start = find_offset(reader, lambda stamp: stamp < start_time, ref)
+        end = find_offset(reader, lambda stamp: stamp <= end_time, ref)
+        end = max(start, end)
+        with open(dest_path, "wb") as dest:
+            for data in reader.iter_range(start, end):
+                dest.write(data)
+    finally:
+        reader.close()
+    LOGGER.info("Extracted bytes %s-%s of %s into %s", start, end, path, dest_path)
+    return start, end
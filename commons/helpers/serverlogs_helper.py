@@ -21,6 +21,7 @@
 
 from datetime import datetime
 from commons.helpers import host
+from commons.helpers.log_window import extract_log_window
 from commons.utils import config_utils
 
 fileconf_yaml = config_utils.read_yaml("config/serverlogs_helper.yaml")
@@ -42,32 +43,14 @@ def get_node_details(node_name):
     node_obj.passwd = fileconf['node_password']
     return node_obj
 
-def split_file_for_timestamp(st_time, end_time, filename, filepath, test_id):
+def split_file_for_timestamp(st_time, end_time, filename, filepath, test_id, sftp=None):
     # split file for give time stamps and create new file with test_id
-    # appended to it
+    # appended to it, window is located by binary search so only its bytes are read
+    # timestamp format ('%b %#d %H:%M:%S') -> "Dec 12 16:06:01" or ISO format
     path = "{}/{}".format(filepath, filename)
-    logfile = open(path, 'r')
-
     newname = "{}_{}".format(test_id, filename)
     newpath = "{}/{}".format(fileconf['log_destination'], newname)
-    newfile = open(newpath, 'w')
-
-    # timestamp format ('%b %#d %H:%M:%S') -> "Dec 12 16:06:01"
-    st_t = st_time.split()
-    en_t = end_time.split()
-    start_time = "{} {} {}".format(st_t[0], st_t[1], st_t[2])
-    end_time = "{} {} {}".format(en_t[0], en_t[1], en_t[2])
-
-    for line in logfile:
-        ls = line.split(' ')
-        # PLEASE CHECK TIMESTAMP IN LOG FILES FIRST, For every file it might be
-        # different
-        timestamp = "{} {} {}".format(ls[0], ls[1], ls[2])
-        if timestamp >= start_time and timestamp <= end_time:
-            newfile.write(line)
-
-    newfile.close()  # close it if done writing into it
-    logfile.close()
+    extract_log_window(path, st_time, end_time, newpath, sftp=sftp)
 
     return newpath
 
@@ -79,19 +62,14 @@ def process_and_copy_file(
         localpath,
         test_id,
         sftp):
-    # Copy file from node to test client
-    nodepath = "{}/{}".format(file_path, file_name)
-    dest_path = "{}/{}".format(fileconf['log_destination'], file_name)
-    # @TODO - check sftp.get(), this call might be wrong
-    sftp.get(remotepath=nodepath, localpath=dest_path)
-
-    # 1. Fetch give file from node and Split file for given time stamp
+    # 1. Fetch time window of given file from node, only window bytes are transferred
     newfilepath = split_file_for_timestamp(
         st_time,
         end_time,
         file_name,
-        fileconf['log_destination'],
-        test_id)
+        file_path,
+        test_id,
+        sftp=sftp)
 
     # 2. Copy file from node to remote server <<< @TODO need new connection
     # here !! MISSING !!!
@@ -0,0 +1,406 @@
+#!/usr/bin/python
+#
+# Copyright (c) 2022 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+#
+"""Parallel SFTP transfer of files and directory trees.
+
+Every worker thread owns an SSH connection with its own SFTP channel. Files are
+split into chunks which are copied concurrently with pipelined requests. Data is
+written into a ``.part`` file, completed chunks and their sha256 are journaled so
+an interrupted transfer resumes with the chunks not yet copied. The part file is
+renamed once all chunks are done.
+
+Given a connected SSH client, copies up to fanout_size bytes run on SFTP channels
+of its transport and only larger copies open connections of their own.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import posixpath
+import stat
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
+from typing import Tuple
+
+import paramiko
+
+LOGGER = logging.getLogger(__name__)
+
+DEFAULT_CHANNELS = 8
+CHUNK_SIZE = 64 * 1024 * 1024
+FANOUT_SIZE = CHUNK_SIZE
+BLOCK_SIZE = 1024 * 1024
+PART_SUFFIX = ".part"
+JOURNAL_DIR = os.path.join(tempfile.gettempdir(), "sftp_transfer")
+
+
+class _FileJob:
+    """Chunks of one file, journal of completed chunks and pending count."""
+
+    # pylint: disable=too-many-arguments
+    def __init__(self, src: str, dst: str, size: int, mtime: int, chunk_size: int,
+                 journal_path: str):
+        self.src = src
+        self.dst = dst
+        self.size = size
+        self.mtime = mtime
+        self.chunk_size = chunk_size
+        self.journal_path = journal_path
+        self.done = {}
+        self.pending = 0
+        self.lock = threading.Lock()
+
+    def chunks(self) -> List[Tuple[int, int]]:
+        """Offset and length of every chunk, one empty chunk for empty file."""
+        return [(offset, min(self.chunk_size, self.size - offset))
+                for offset in range(0, self.size, self.chunk_size)] or [(0, 0)]
+
+    def load_journal(self) -> dict:
+        """Completed chunks of an earlier attempt of the same source version."""
+        try:
+            with open(self.journal_path, encoding="utf-8") as journal:
+                data = json.load(journal)
+        except (OSError, ValueError):
+            return {}
+        if (data.get("src"), data.get("size"), data.get("mtime"), data.get("chunk_size")) != \
+                (self.src, self.size, self.mtime, self.chunk_size):
+            return {}
+        return {int(offset): digest for offset, digest in data["done"].items()}
+
+    def save_journal(self) -> None:
+        """Atomically write completed chunks, called with lock held."""
+        tmp_path = self.journal_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as journal:
+            json.dump({"src": self.src, "size": self.size, "mtime": self.mtime,
+                       "chunk_size": self.chunk_size, "done": self.done}, journal)
+        os.replace(tmp_path, self.journal_path)
+
+    def chunk_done(self, offset: int, digest: str) -> bool:
+        """Record chunk, return True when it was the last pending one."""
+        with self.lock:
+            self.done[offset] = digest
+            self.save_journal()
+            self.pending -= 1
+            return self.pending == 0
+
+
+class SftpTransfer:
+    """
+    Copy files and directory trees over N concurrent SFTP channels.
+    Usage:
+        with SftpTransfer(hostname, username, password, channels=8) as sftp:
+            sftp.get("/var/log/cortx", "/tmp/logs/cortx")
+    """
+
+    # pylint: disable=too-many-arguments
+    def __init__(self, hostname: str, username: str, password: str,
+                 channels: int = DEFAULT_CHANNELS, chunk_size: int = CHUNK_SIZE,
+                 compress: bool = False, port: int = 22, client: paramiko.SSHClient = None,
+                 fanout_size: int = FANOUT_SIZE):
+        """
+        :param channels: number of concurrent SSH connections.
+        :param chunk_size: files larger than chunk size are copied in parallel ranges.
+        :param compress: enable SSH zlib compression, useful for text logs on slow links.
+        :param client: connected SSH client of host, not closed by close.
+        :param fanout_size: copies up to this many bytes use channels of client connection.
+        """
+        self.hostname = hostname
+        self.username = username
+        self.password = password
+        self.port = port
+        self.channels = max(channels, 1)
+        self.chunk_size = chunk_size
+        self.compress = compress
+        self.client = client
+        self.fanout_size = fanout_size
+        self._fanout = client is None
+        self._local = threading.local()
+        self._clients = []
+        self._clients_lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=self.channels,
+                                        thread_name_prefix=f"sftp-{hostname}")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self) -> None:
+        """Stop workers and close all connections and channels opened by transfer."""
+        self._pool.shutdown(wait=True)
+        with self._clients_lock:
+            for client in self._clients:
+                client.close()
+            self._clients.clear()
+
+    def sftp(self) -> paramiko.SFTPClient:
+        """SFTP channel of calling thread, connected on first use."""
+        sftp = getattr(self._local, "sftp", None)
+        shared = getattr(self._local, "shared", False)
+        if sftp is not None and self._fanout and shared:
+            sftp = None
+        if sftp is None or sftp.get_channel().closed:
+            if not self._fanout:
+                sftp = self._local.sftp = self.client.open_sftp()
+                self._local.shared = True
+                with self._clients_lock:
+                    self._clients.append(sftp)
+                return sftp
+            client = paramiko.SSHClient()
+            client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+            client.connect(hostname=self.hostname, port=self.port, username=self.username,
+                           password=self.password, allow_agent=False, look_for_keys=False,
+                           compress=self.compress, timeout=400)
+            with self._clients_lock:
+                self._clients.append(client)
+            sftp = self._local.sftp = client.open_sftp()
+            self._local.shared = False
+        return sftp
+
+    def _plan_fanout(self, jobs: List[_FileJob]) -> None:
+        """Open connections of own only for copies larger than fanout size."""
+        self._fanout = self.client is None or sum(job.size for job in jobs) > self.fanout_size
+
+    def _journal_path(self, direction: str, src: str, dst: str) -> str:
+        key = hashlib.sha1(f"{direction}:{self.hostname}:{src}:{dst}".encode()).hexdigest()
+        os.makedirs(JOURNAL_DIR, exist_ok=True)
+        return os.path.join(JOURNAL_DIR, key + ".json")
+
+    def _run(self, jobs: List[_FileJob], copy_chunk, verify_chunk, finish) -> int:
+        """Copy chunks of all jobs on the pool, skipping verified journaled chunks."""
+        futures = []
+        for job in jobs:
+            journaled = job.load_journal()
+            todo = []
+            for offset, length in job.chunks():
+                digest = journaled.get(offset)
+                if digest is not None and verify_chunk(job, offset, length) == digest:
+                    job.done[offset] = digest
+                else:
+                    todo.append((offset, length))
+            if not todo:
+                finish(job)
+                continue
+            if journaled:
+                LOGGER.info("Resuming %s, %s of %s chunks left", job.src, len(todo),
+                            len(job.chunks()))
+            job.pending = len(todo)
+            for offset, length in todo:
+                futures.append(self._pool.submit(self._copy, job, offset, length,
+                                                 copy_chunk, finish))
+        for future in futures:
+            future.result()
+        return sum(job.size for job in jobs)
+
+    @staticmethod
+    def _copy(job: _FileJob, offset: int, length: int, copy_chunk, finish) -> None:
+        digest = copy_chunk(job, offset, length)
+        if job.chunk_done(offset, digest):
+            finish(job)
+
+    @staticmethod
+    def _local_digest(path: str, offset: int, length: int) -> str:
+        sha = hashlib.sha256()
+        try:
+            with open(path, "rb") as local:
+                local.seek(offset)
+                while length > 0:
+                    data = local.read(min(BLOCK_SIZE, length))
+                    if not data:
+                        return ""
+                    sha.update(data)
+                    length -= len(data)
+        except OSError:
+            return ""
+        return sha.hexdigest()
+
+    # Remote to local
+
+    def _get_chunk(self, job: _FileJob, offset: int, length: int) -> str:
+        sha = hashlib.sha256()
+        blocks = [(pos, min(BLOCK_SIZE, offset + length - pos))
+                  for pos in range(offset, offset + length, BLOCK_SIZE)]
+        if not blocks:
+            return sha.hexdigest()
+        with self.sftp().open(job.src, "rb") as remote:
+            fd = os.open(job.dst + PART_SUFFIX, os.O_WRONLY)
+            try:
+                # readv keeps many read requests in flight
+                for (pos, _), data in zip(blocks, remote.readv(blocks)):
+                    os.pwrite(fd, data, pos)
+                    sha.update(data)
+            finally:
+                os.close(fd)
+        return sha.hexdigest()
+
+    def _verify_local_part(self, job: _FileJob, offset: int, length: int) -> str:
+        return self._local_digest(job.dst + PART_SUFFIX, offset, length)
+
+    @staticmethod
+    def _finish_get(job: _FileJob) -> None:
+        os.replace(job.dst + PART_SUFFIX, job.dst)
+        os.utime(job.dst, (job.mtime, job.mtime))
+        try:
+            os.remove(job.journal_path)
+        except OSError:
+            pass
+
+    def _remote_walk(self, remote_dir: str, local_dir: str) -> List[Tuple[str, str, object]]:
+        files = []
+        os.makedirs(local_dir, exist_ok=True)
+        for attr in self.sftp().listdir_attr(remote_dir):
+            rpath = posixpath.join(remote_dir, attr.filename)
+            lpath = os.path.join(local_dir, attr.filename)
+            if stat.S_ISDIR(attr.st_mode):
+                files.extend(self._remote_walk(rpath, lpath))
+            elif stat.S_ISREG(attr.st_mode):
+                files.append((rpath, lpath, attr))
+        return files
+
+    def get(self, remote_path: str, local_path: str) -> int:
+        """
+        Copy remote file or directory tree to local path.
+        :return: bytes in copied files.
+        """
+        start = time.time()
+        attr = self.sftp().stat(remote_path)
+        if stat.S_ISDIR(attr.st_mode):
+            files = self._remote_walk(remote_path, local_path)
+        else:
+            files = [(remote_path, local_path, attr)]
+        jobs = []
+        for rpath, lpath, f_attr in files:
+            job = _FileJob(rpath, lpath, f_attr.st_size, f_attr.st_mtime, self.chunk_size,
+                           self._journal_path("get", rpath, lpath))
+            part = lpath + PART_SUFFIX
+            if not os.path.exists(part) or os.path.getsize(part) != job.size:
+                with open(part, "wb") as local:
+                    local.truncate(job.size)
+            jobs.append(job)
+        self._plan_fanout(jobs)
+        size = self._run(jobs, self._get_chunk, self._verify_local_part, self._finish_get)
+        LOGGER.info("Copied %s files, %.1f MB from %s:%s in %.1fs", len(jobs), size / 2 ** 20,
+                    self.hostname, remote_path, time.time() - start)
+        return size
+
+    # Local to remote
+
+    def _put_chunk(self, job: _FileJob, offset: int, length: int) -> str:
+        sha = hashlib.sha256()
+        with open(job.src, "rb") as local, self.sftp().open(job.dst + PART_SUFFIX, "r+b") as remote:
+            # do not wait for write acks of every block
+            remote.set_pipelined(True)
+            local.seek(offset)
+            remote.seek(offset)
+            while length > 0:
+                data = local.read(min(BLOCK_SIZE, length))
+                remote.write(data)
+                sha.update(data)
+                length -= len(data)
+        return sha.hexdigest()
+
+    def _verify_remote_part(self, job: _FileJob, offset: int, length: int) -> str:
+        sha = hashlib.sha256()
+        try:
+            with self.sftp().open(job.dst + PART_SUFFIX, "rb") as remote:
+                remote.seek(offset)
+                data = remote.read(length)
+        except IOError:
+            return ""
+        if len(data) != length:
+            return ""
+        sha.update(data)
+        # journaled chunk must also still match local source
+        if sha.hexdigest() != self._local_digest(job.src, offset, length):
+            return ""
+        return sha.hexdigest()
+
+    def _finish_put(self, job: _FileJob) -> None:
+        sftp = self.sftp()
+        sftp.posix_rename(job.dst + PART_SUFFIX, job.dst)
+        sftp.utime(job.dst, (job.mtime, job.mtime))
+        try:
+            os.remove(job.journal_path)
+        except OSError:
+            pass
+
+    def _mkdir_remote(self, remote_dir: str) -> None:
+        sftp = self.sftp()
+        try:
+            sftp.stat(remote_dir)
+        except IOError:
+            self._mkdir_remote(posixpath.dirname(remote_dir))
+            sftp.mkdir(remote_dir)
+
+    def put(self, local_path: str, remote_path: str) -> int:
+        """
+        Copy local file or directory tree to remote path.
+        :return: bytes in copied files.
+        """
+        start = time.time()
+        files = []
+        if os.path.isdir(local_path):
+            for root, _, names in os.walk(local_path):
+                rel = os.path.relpath(root, local_path)
+                rdir = remote_path if rel == "." else posixpath.join(
+                    remote_path, *rel.split(os.sep))
+                self._mkdir_remote(rdir)
+                files.extend((os.path.join(root, name), posixpath.join(rdir, name))
+                             for name in names)
+        else:
+            files.append((local_path, remote_path))
+        sftp = self.sftp()
+        jobs = []
+        for lpath, rpath in files:
+            l_stat = os.stat(lpath)
+            job = _FileJob(lpath, rpath, l_stat.st_size, int(l_stat.st_mtime), self.chunk_size,
+                           self._journal_path("put", lpath, rpath))
+            try:
+                resumable = bool(job.load_journal()) and sftp.stat(rpath + PART_SUFFIX)
+            except IOError:
+                resumable = False
+            if not resumable:
+                sftp.open(rpath + PART_SUFFIX, "wb").close()
+            jobs.append(job)
+        self._plan_fanout(jobs)
+        size = self._run(jobs, self._put_chunk, self._verify_remote_part, self._finish_put)
+        LOGGER.info("Copied %s files, %.1f MB to %s:%s in %.1fs", len(jobs), size / 2 ** 20,
+                    self.hostname, remote_path, time.time() - start)
+        return size
+
+    def remove(self, remote_path: str) -> None:
+        """Remove remote file or directory tree, files are removed concurrently."""
+        sftp = self.sftp()
+        if not stat.S_ISDIR(sftp.stat(remote_path).st_mode):
+            sftp.remove(remote_path)
+            return
+        dirs, files = [remote_path], []
+        for directory in dirs:  # dirs grows while walking, breadth first
+            for attr in sftp.listdir_attr(directory):
+                path = posixpath.join(directory, attr.filename)
+                (dirs if stat.S_ISDIR(attr.st_mode) else files).append(path)
+        for future in [self._pool.submit(lambda path: self.sftp().remove(path), path)
+                       for path in files]:
+            future.result()
+        for directory in reversed(dirs):
+            sftp.rmdir(directory)
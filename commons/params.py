@@ -31,6 +31,8 @@ LATEST_LOG_FOLDER = 'latest'
 LOG_DIR = os.path.join(SCRIPT_HOME, LOG_DIR_NAME)
 TEST_DATA_FOLDER = os.path.join(LOG_DIR, 'TestData')
 VAR_LOG_SYS = '/var/log/'
+# Parsed yaml configs keyed by file content hash, passwords stay encrypted in cache.
+CONFIG_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "cortx-test", "config")
 
 COMMON_CONFIG = os.path.join(CONFIG_DIR, 'common_config.yaml')
 S3_CONFIG = os.path.join(CONFIG_DIR, 's3', 's3_config.yaml')
@@ -23,6 +23,7 @@ Performing the encryption and decryption
 import os
 import json
 import base64
+from functools import lru_cache
 from Crypto.Cipher import AES
 from Crypto.Hash import SHA256
 from Crypto import Random as CryptoRandom
@@ -49,8 +50,13 @@ def decrypt(enc_secret: str) -> str:
     Decrypt encrypted word using AES-CBC mode decryption
     """
     key = get_secrets(secret_ids=['KEY'])['KEY']
-    key = key.encode("utf8")
-    digest_key = SHA256.new(key).digest()
+    return _decrypt(enc_secret, key)
+
+
+@lru_cache(maxsize=1024)
+def _decrypt(enc_secret: str, key: str) -> str:
+    """Decrypt with given key, results are memoized per key."""
+    digest_key = SHA256.new(key.encode("utf8")).digest()
     enc_secret = enc_secret.encode("utf8")
     enc_secret = base64.b64decode(enc_secret)
     init_vec = enc_secret[:AES.block_size]
@@ -19,6 +19,7 @@
 #
 """ Report Server client to update test results to Mongo DB."""
 
+import functools
 import json
 import logging
 from http import HTTPStatus
@@ -36,22 +37,16 @@ DB_USERNAME, DB_PASSWORD = runner.get_db_credential()
 LOGGER = logging.getLogger(__name__)
 
 
-def create_timings_db_entry(payload):
+@functools.lru_cache(maxsize=None)
+def get_test_plan_fields(test_plan_id):
     """
-    Create a timings DB entry for given parameter.
-    {
-        "buildNo": "515",
-        "logs": "",
-        "testID": "",
-        "testPlanID": "",
-        "testExecutionID": "",
-        "testStartTime": "2021-03-01T06:17:45+00:00",
-        "nodeRebootTime": 45.5,
-    }
+    Build type and label of test plan, Jira is queried once per test plan.
+    :param test_plan_id: test plan ticket e.g. TEST-1234.
+    :return: tuple of build type and test plan label.
     """
     jira_id, jira_pwd = runner.get_jira_credential()
     jira_obj = jira_utils.JiraTask(jira_id, jira_pwd)
-    tp_details = jira_obj.get_issue_details(payload["testPlanID"])
+    tp_details = jira_obj.get_issue_details(test_plan_id)
 
     build_type = "stable"
     try:
@@ -66,6 +61,23 @@ def create_timings_db_entry(payload):
         test_plan_label = tp_details.fields.labels[0]
     else:
         test_plan_label = "regular"
+    return build_type, test_plan_label
+
+
+def create_timings_db_entry(payload):
+    """
+    Create a timings DB entry for given parameter.
+    {
+        "buildNo": "515",
+        "logs": "",
+        "testID": "",
+        "testPlanID": "",
+        "testExecutionID": "",
+        "testStartTime": "2021-03-01T06:17:45+00:00",
+        "nodeRebootTime": 45.5,
+    }
+    """
+    build_type, test_plan_label = get_test_plan_fields(payload["testPlanID"])
     headers = {
         'Content-Type': 'application/json'
     }
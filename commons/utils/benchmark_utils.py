@@ -0,0 +1,398 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2022 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+
+"""
+Benchmark results parsing into one metrics schema.
+
+Outputs of s3bench, hsbench, cosbench and locust are parsed into BenchmarkRecord objects so
+results of different runs and tools can be compared and checked against a stored baseline.
+"""
+
+import csv
+import json
+import logging
+import re
+from dataclasses import asdict, dataclass, field
+
+from commons.utils.histogram_utils import LatencyHistogram
+
+LOGGER = logging.getLogger(__name__)
+
+OPERATIONS = {"write": "PUT", "put": "PUT", "read": "GET", "get": "GET", "del": "DELETE",
+              "delete": "DELETE", "head": "HEAD", "list": "LIST"}
+# Metrics where a lower value is a regression, rest of the metrics are latencies.
+THROUGHPUT_METRICS = ("ops_per_sec", "mbps")
+DEFAULT_THRESHOLDS = {"ops_per_sec": 10, "mbps": 10, "p99": 20}
+MB = 1024 * 1024
+
+
+@dataclass
+class BenchmarkRecord:
+    """
+    Result of one operation type of a benchmark run, latencies are in milliseconds.
+
+    histogram is the LatencyHistogram.to_dict of latencies in microseconds when the tool
+    provides per request latencies, approximate lists latency metrics which are estimates.
+    """
+
+    tool: str
+    operation: str
+    object_size: int = 0
+    clients: int = 0
+    ops_per_sec: float = 0.0
+    mbps: float = 0.0
+    latency: dict = field(default_factory=dict)
+    count: int = 0
+    errors: int = 0
+    histogram: dict = None
+    approximate: list = field(default_factory=list)
+
+    @property
+    def key(self) -> tuple:
+        """Identity of record used to match records across runs."""
+        return self.tool, self.operation, self.object_size, self.clients
+
+    def metric(self, name: str) -> float:
+        """Throughput metric or latency percentile e.g. mbps, p99."""
+        if name in THROUGHPUT_METRICS:
+            return getattr(self, name)
+        return self.latency.get(name)
+
+    def to_dict(self) -> dict:
+        """Dictionary representation of record."""
+        return asdict(self)
+
+
+def normalize_operation(operation: str) -> str:
+    """Map tool specific operation name e.g. Write, DEL, put_object to PUT, DELETE."""
+    name = operation.strip().lower()
+    for prefix, normalized in OPERATIONS.items():
+        if name == prefix or name.startswith(prefix + "_") or name.startswith(prefix + " "):
+            return normalized
+    return operation.strip().upper()
+
+
+def _number(value, default=0.0) -> float:
+    try:
+        return float(str(value).strip().split()[0])
+    except (ValueError, IndexError):
+        return default
+
+
+def _lines(source):
+    """Iterate lines of a file path or of an iterable of strings."""
+    if isinstance(source, str):
+        with open(source, "r", encoding="utf-8", errors="replace") as log_fd:
+            yield from log_fd
+    else:
+        for chunk in source:
+            yield from chunk.splitlines()
+
+
+S3BENCH_SECTION = re.compile(
+    r"^(?:Results Summary for (\w+) Operation|Operation:\s*(\w+))", re.IGNORECASE)
+S3BENCH_PERCENTILE = re.compile(
+    r"^(?:\w+ times|Duration)\s+(\d+(?:\.\d+)?)(?:th|st|nd|rd)?\s*(?:%ile|-ile)\s*:\s*(\S+)",
+    re.IGNORECASE)
+S3BENCH_MIN_MAX = re.compile(r"^(?:\w+ times|Duration)\s+(Max|Min|Avg)\s*:\s*(\S+)",
+                             re.IGNORECASE)
+
+
+def parse_s3bench_log(source, object_size: int = None, clients: int = None):
+    """
+    Stream parse s3bench log, supports plain and reportFormat output of s3bench.
+    :param source: log file path or list of s3bench responses.
+    :param object_size: object size in bytes if not found in log.
+    :param clients: number of clients if not found in log.
+    :return: generator of BenchmarkRecord, one per operation section.
+    """
+    params = {"object_size": object_size or 0, "clients": clients or 0}
+    record = None
+    duration = 0.0
+    for line in _lines(source):
+        line = line.strip()
+        section = S3BENCH_SECTION.match(line)
+        if section:
+            if record:
+                yield _finish_s3bench(record, duration)
+            record = BenchmarkRecord(tool="s3bench",
+                                     operation=normalize_operation(section.group(1) or
+                                                                   section.group(2)),
+                                     object_size=params["object_size"],
+                                     clients=params["clients"])
+            duration = 0.0
+            continue
+        key, _, value = line.partition(":")
+        key = key.strip().lower()
+        if key.startswith("objectsize") and not object_size:
+            params["object_size"] = int(_number(value) * MB)
+        elif key.startswith("numclients") and not clients:
+            params["clients"] = int(_number(value))
+        elif key.startswith("numsamples") and record is None:
+            params["samples"] = int(_number(value))
+        if record is None or not value:
+            continue
+        percentile = S3BENCH_PERCENTILE.match(line)
+        min_max = S3BENCH_MIN_MAX.match(line)
+        if percentile:
+            record.latency[f"p{percentile.group(1)}"] = _number(percentile.group(2)) * 1000
+        elif min_max:
+            record.latency[min_max.group(1).lower()] = _number(min_max.group(2)) * 1000
+        elif key.startswith("total throughput"):
+            record.mbps = _number(value)
+        elif key.startswith("rps"):
+            record.ops_per_sec = _number(value)
+        elif key.startswith("total duration"):
+            duration = _number(value)
+        elif key in ("number of errors", "errors count"):
+            record.errors = int(_number(value))
+        elif key.startswith("total requests count"):
+            record.count = int(_number(value))
+    if record:
+        yield _finish_s3bench(record, duration)
+    LOGGER.debug("Parsed s3bench parameters %s", params)
+
+
+def _finish_s3bench(record: BenchmarkRecord, duration: float) -> BenchmarkRecord:
+    if not record.count and record.mbps and record.object_size and duration:
+        record.count = int(round(record.mbps * MB * duration / record.object_size))
+    if not record.ops_per_sec and record.count and duration:
+        record.ops_per_sec = record.count / duration
+    return record
+
+
+def parse_hsbench_json(source, object_size: int = 0, clients: int = 0):
+    """
+    Parse hsbench JSON output, only TOTAL intervals are considered.
+    :param source: hsbench JSON file path.
+    :param object_size: object size in bytes used for run.
+    :param clients: number of hsbench threads.
+    :return: generator of BenchmarkRecord.
+    """
+    with open(source, "r", encoding="utf-8") as json_fd:
+        intervals = json.load(json_fd)
+    for interval in intervals:
+        if interval.get("IntervalName") != "TOTAL":
+            continue
+        yield BenchmarkRecord(
+            tool="hsbench", operation=normalize_operation(interval["Mode"]),
+            object_size=object_size, clients=clients, ops_per_sec=_number(interval["Iops"]),
+            mbps=_number(interval["Mbps"]), count=int(_number(interval["Ops"])),
+            latency={"min": _number(interval["MinLat"]), "avg": _number(interval["AvgLat"]),
+                     "max": _number(interval["MaxLat"])})
+
+
+COSBENCH_PERCENTILE = re.compile(r"^(\d+(?:\.\d+)?)%-(?:ResTime|RT)$", re.IGNORECASE)
+
+
+def parse_cosbench_csv(source, object_size: int = 0, clients: int = 0):
+    """
+    Parse cosbench workload or stage summary CSV.
+    :param source: cosbench CSV file path.
+    :param object_size: object size in bytes used for run.
+    :param clients: number of cosbench workers.
+    :return: generator of BenchmarkRecord.
+    """
+    with open(source, "r", encoding="utf-8", newline="") as csv_fd:
+        for row in csv.DictReader(csv_fd):
+            if not row.get("Op-Type"):
+                continue
+            ratio = _number(str(row.get("Succ-Ratio", "100")).rstrip("%"), 100.0)
+            count = int(_number(row.get("Op-Count")))
+            latency = {"avg": _number(row.get("Avg-ResTime"))}
+            for column, value in row.items():
+                percentile = COSBENCH_PERCENTILE.match(column or "")
+                if percentile:
+                    latency[f"p{percentile.group(1)}"] = _number(value)
+            yield BenchmarkRecord(
+                tool="cosbench", operation=normalize_operation(row["Op-Type"]),
+                object_size=object_size, clients=clients,
+                ops_per_sec=_number(row.get("Throughput")),
+                mbps=_number(row.get("Bandwidth")) / MB, latency=latency, count=count,
+                errors=int(round(count * (100 - ratio) / 100)))
+
+
+def parse_locust_csv(source, object_size: int = 0, clients: int = 0):
+    """
+    Parse locust <prefix>_stats.csv written with --csv option.
+    :param source: locust stats CSV file path.
+    :param object_size: average object size in bytes used for run.
+    :param clients: number of locust users.
+    :return: generator of BenchmarkRecord, one per request type and name.
+    """
+    with open(source, "r", encoding="utf-8", newline="") as csv_fd:
+        for row in csv.DictReader(csv_fd):
+            if row.get("Name") == "Aggregated" or not row.get("Type"):
+                continue
+            ops_per_sec = _number(row.get("Requests/s"))
+            latency = {"avg": _number(row.get("Average Response Time")),
+                       "min": _number(row.get("Min Response Time")),
+                       "max": _number(row.get("Max Response Time"))}
+            for column in ("50%", "90%", "95%", "99%"):
+                if row.get(column) not in (None, "", "N/A"):
+                    latency[f"p{column.rstrip('%')}"] = _number(row[column])
+            # Object operations are named after request type, rest e.g. create_bucket as is.
+            if row["Name"].endswith("_object"):
+                operation = normalize_operation(row["Type"])
+            else:
+                operation = row["Name"].upper()
+            yield BenchmarkRecord(
+                tool="locust", operation=operation,
+                object_size=object_size, clients=clients, ops_per_sec=ops_per_sec,
+                mbps=ops_per_sec * object_size / MB, latency=latency,
+                count=int(_number(row.get("Request Count"))),
+                errors=int(_number(row.get("Failure Count"))))
+
+
+PARSERS = {"s3bench": parse_s3bench_log, "hsbench": parse_hsbench_json,
+           "cosbench": parse_cosbench_csv, "locust": parse_locust_csv}
+
+
+def parse_results(tool: str, source, **kwargs) -> list:
+    """
+    Parse benchmark output of given tool.
+    :param tool: one of s3bench, hsbench, cosbench, locust.
+    :param source: output file path of the tool.
+    :keyword object_size: object size in bytes.
+    :keyword clients: number of clients.
+    :return: list of BenchmarkRecord.
+    """
+    if tool.lower() not in PARSERS:
+        raise ValueError(f"Unsupported benchmark tool {tool}, supported {list(PARSERS)}")
+    return list(PARSERS[tool.lower()](source, **kwargs))
+
+
+def aggregate_records(records: list, tool: str = None) -> list:
+    """
+    Merge records of parallel instances of a benchmark into one record per operation.
+
+    Throughput and counts are summed. When every merged record has a latency histogram the
+    histograms are merged and latencies are computed from the merged histogram. Otherwise min
+    and max are combined, avg is count weighted and percentiles are count weighted averages
+    of the instance percentiles, which is not a percentile of the combined run, so these are
+    listed in approximate of the merged record.
+    :param records: BenchmarkRecord list of concurrently running instances.
+    :param tool: tool name of aggregated records, defaults to tool of the records.
+    :return: list of BenchmarkRecord, one per operation and object size.
+    """
+    merged = {}
+    for record in records:
+        key = (record.operation, record.object_size)
+        if key not in merged:
+            merged[key] = (BenchmarkRecord(tool=tool or record.tool, operation=record.operation,
+                                           object_size=record.object_size), {}, [])
+        total, weighted, parts = merged[key]
+        weight = record.count or 1
+        parts.append(record)
+        total.clients += record.clients
+        total.ops_per_sec += record.ops_per_sec
+        total.mbps += record.mbps
+        total.count += record.count
+        total.errors += record.errors
+        for name, value in record.latency.items():
+            if name == "min":
+                total.latency[name] = min(total.latency.get(name, value), value)
+            elif name == "max":
+                total.latency[name] = max(total.latency.get(name, value), value)
+            else:
+                weighted.setdefault(name, [0.0, 0])
+                weighted[name][0] += value * weight
+                weighted[name][1] += weight
+    aggregated = []
+    for total, weighted, parts in merged.values():
+        if all(part.histogram for part in parts):
+            hist = LatencyHistogram.from_dict(parts[0].histogram)
+            for part in parts[1:]:
+                hist.merge(LatencyHistogram.from_dict(part.histogram))
+            total.histogram = hist.to_dict()
+            total.latency = {"min": hist.min / 1000, "max": hist.max / 1000,
+                             "avg": hist.total / hist.count / 1000 if hist.count else 0}
+            for name in weighted:
+                if name.startswith("p"):
+                    total.latency[name] = hist.percentile(float(name[1:])) / 1000
+            aggregated.append(total)
+            continue
+        for name, (value, weight) in weighted.items():
+            total.latency[name] = value / weight
+        total.approximate = sorted(
+            {name for part in parts for name in part.approximate} |
+            ({name for name in weighted if name.startswith("p")} if len(parts) > 1 else set()))
+        aggregated.append(total)
+    return aggregated
+
+
+def save_baseline(records: list, path: str) -> None:
+    """Store records as JSON baseline."""
+    with open(path, "w", encoding="utf-8") as json_fd:
+        json.dump([record.to_dict() for record in records], json_fd, indent=2)
+
+
+def load_baseline(path: str) -> list:
+    """Load records stored with save_baseline."""
+    with open(path, "r", encoding="utf-8") as json_fd:
+        return [BenchmarkRecord(**record) for record in json.load(json_fd)]
+
+
+def compare_runs(baseline: list, current: list, thresholds: dict = None) -> list:
+    """
+    Compare records of current run with baseline records having same key.
+    :param baseline: baseline BenchmarkRecord list.
+    :param current: current BenchmarkRecord list.
+    :param thresholds: metric to allowed degradation in percent,
+        e.g. {"mbps": 10, "p99": 20} flags 10% lower MB/s or 20% higher p99 latency.
+    :return: list of comparison dict with per metric change in percent and regressions.
+    """
+    thresholds = thresholds or DEFAULT_THRESHOLDS
+    base_map = {record.key: record for record in baseline}
+    comparison = []
+    for record in current:
+        base = base_map.get(record.key)
+        if not base:
+            LOGGER.warning("No baseline for %s", record.key)
+            continue
+        result = {"key": record.key, "change": {}, "regressions": [],
+                  "approximate": sorted(set(base.approximate) | set(record.approximate))}
+        for metric, limit in thresholds.items():
+            old, new = base.metric(metric), record.metric(metric)
+            if not old or new is None:
+                continue
+            change = (new - old) * 100.0 / old
+            result["change"][metric] = round(change, 2)
+            degradation = -change if metric in THROUGHPUT_METRICS else change
+            if degradation > limit:
+                result["regressions"].append(metric)
+        comparison.append(result)
+    return comparison
+
+
+def check_regression(records: list, baseline_path: str, thresholds: dict = None) -> tuple:
+    """
+    Check records against stored baseline.
+    :param records: BenchmarkRecord list of current run.
+    :param baseline_path: path of baseline stored with save_baseline.
+    :param thresholds: see compare_runs.
+    :return: (True, comparison) if no regression else (False, regressed comparisons).
+    """
+    comparison = compare_runs(load_baseline(baseline_path), records, thresholds)
+    regressed = [result for result in comparison if result["regressions"]]
+    for result in regressed:
+        LOGGER.error("Regression in %s: %s", result["key"], result["change"])
+    if regressed:
+        return False, regressed
+    return True, comparison
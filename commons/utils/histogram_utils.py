@@ -0,0 +1,137 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2022 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+
+"""Log-linear latency histogram with bounded relative error."""
+
+import threading
+
+
+class LatencyHistogram:
+    """
+    HDR style histogram of non negative integer values e.g. latencies in microseconds.
+
+    Values below 2**precision_bits are counted exactly, larger values fall in buckets whose
+    width is at most 1/2**(precision_bits - 1) of the value, so percentiles keep a bounded
+    relative error while memory only grows with the number of distinct buckets in use.
+    """
+
+    def __init__(self, precision_bits: int = 7):
+        self.precision_bits = precision_bits
+        self._half = 1 << (precision_bits - 1)
+        self._lock = threading.Lock()
+        self.counts = {}
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = None
+
+    def _index(self, value: int) -> int:
+        """Bucket index of value."""
+        shift = value.bit_length() - self.precision_bits
+        if shift <= 0:
+            return value
+        return shift * self._half + (value >> shift)
+
+    def _value(self, index: int) -> int:
+        """Mid point value of bucket index."""
+        if index < 2 * self._half:
+            return index
+        shift = index // self._half - 1
+        lower = (index - shift * self._half) << shift
+        return lower + ((1 << shift) - 1) // 2
+
+    def record(self, value, count: int = 1) -> None:
+        """
+        Record value in histogram.
+        :param value: non negative value, fractions are truncated.
+        :param count: number of occurrences of value.
+        """
+        value = max(int(value), 0)
+        index = self._index(value)
+        with self._lock:
+            self.counts[index] = self.counts.get(index, 0) + count
+            self.count += count
+            self.total += value * count
+            self.min = value if self.min is None else min(self.min, value)
+            self.max = value if self.max is None else max(self.max, value)
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        """Add counts of other histogram with same precision into this one."""
+        if other.precision_bits != self.precision_bits:
+            raise ValueError("Histograms with different precision can not be merged")
+        with self._lock:
+            for index, count in other.counts.items():
+                self.counts[index] = self.counts.get(index, 0) + count
+            self.count += other.count
+            self.total += other.total
+            if other.count:
+                self.min = other.min if self.min is None else min(self.min, other.min)
+                self.max = other.max if self.max is None else max(self.max, other.max)
+
+    def percentile(self, percent: float) -> int:
+        """
+        Value at given percentile.
+        :param percent: percentile between 0 and 100.
+        :return: value or 0 for empty histogram.
+        """
+        with self._lock:
+            if not self.count:
+                return 0
+            rank = max(1, int(round(self.count * percent / 100.0)))
+            seen = 0
+            for index in sorted(self.counts):
+                seen += self.counts[index]
+                if seen >= rank:
+                    return min(max(self._value(index), self.min), self.max)
+            return self.max
+
+    def summary(self, percentiles=(50, 95, 99)) -> dict:
+        """Dictionary with count, min, max, mean and requested percentiles."""
+        summary = {"count": self.count, "min": self.min or 0, "max": self.max or 0,
+                   "mean": self.total / self.count if self.count else 0}
+        for percent in percentiles:
+            summary[f"p{percent:g}"] = self.percentile(percent)
+        return summary
+
+    def reset(self) -> None:
+        """Clear all recorded values."""
+        with self._lock:
+            self.counts = {}
+            self.count = 0
+            self.total = 0
+            self.min = None
+            self.max = None
+
+    def to_dict(self) -> dict:
+        """Serializable representation which can be restored with from_dict."""
+        with self._lock:
+            return {"precision_bits": self.precision_bits, "count": self.count,
+                    "total": self.total, "min": self.min, "max": self.max,
+                    "counts": {str(index): count for index, count in self.counts.items()}}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "LatencyHistogram":
+        """Restore histogram from to_dict output."""
+        hist = cls(precision_bits=data["precision_bits"])
+        hist.counts = {int(index): count for index, count in data["counts"].items()}
+        hist.count = data["count"]
+        hist.total = data["total"]
+        hist.min = data["min"]
+        hist.max = data["max"]
+        return hist
@@ -0,0 +1,218 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2022 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+
+"""Latency instrumentation of framework hot paths.
+
+   Operations are timed with measure() or instrumented() and recorded in microsecond
+   LatencyHistograms per operation name, once for the running test and once for the
+   session:
+       with measure("ssh.exec") as span:
+           out = run()
+           span.nbytes = len(out)
+
+       @instrumented("csm.login")
+       def login(): ...
+   Nested operations are recorded under their own names, only outermost operations of a
+   thread add to instrumented time, so test duration minus instrumented time is the time
+   spent in the framework and test code itself.
+"""
+
+import functools
+import logging
+import threading
+import time
+from typing import Callable
+
+from commons.utils.histogram_utils import LatencyHistogram
+
+LOGGER = logging.getLogger(__name__)
+
+ENABLED = True
+_LOCAL = threading.local()
+
+
+class OpStats:
+    """Latency histogram in microseconds, bytes and errors of one operation."""
+
+    __slots__ = ("hist", "nbytes", "errors")
+
+    def __init__(self):
+        self.hist = LatencyHistogram()
+        self.nbytes = 0
+        self.errors = 0
+
+
+class Recorder:
+    """Operation statistics of a test or session."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.ops = {}
+        self.outer_ns = 0
+        self.started = time.time()
+
+    def record(self, op: str, elapsed_ns: int, nbytes: int = 0, error: bool = False,
+               outer: bool = True) -> None:
+        """Record one operation taking elapsed_ns nanoseconds."""
+        with self._lock:
+            stats = self.ops.get(op)
+            if stats is None:
+                stats = self.ops[op] = OpStats()
+            stats.nbytes += nbytes
+            stats.errors += error
+            if outer:
+                self.outer_ns += elapsed_ns
+        stats.hist.record(elapsed_ns // 1000)
+
+    def reset(self) -> None:
+        """Clear all operations."""
+        with self._lock:
+            self.ops = {}
+            self.outer_ns = 0
+            self.started = time.time()
+
+    def summary(self, duration: float = None) -> dict:
+        """
+        Latency summary of recorded operations.
+        :param duration: wall time in seconds the operations belong to, adds share of
+            duration spent in each operation.
+        :return: duration_s, instrumented_s and per operation count, errors, bytes,
+            total_s, mean, p50, p95, p99 and max in milliseconds.
+        """
+        with self._lock:
+            ops = dict(self.ops)
+            outer_ns = self.outer_ns
+        report = {"duration_s": duration, "instrumented_s": round(outer_ns / 1e9, 3),
+                  "ops": {}}
+        for op in sorted(ops):
+            stats = ops[op]
+            hist = stats.hist.summary()
+            total = stats.hist.total / 1e6
+            report["ops"][op] = {
+                "count": hist["count"], "errors": stats.errors, "bytes": stats.nbytes,
+                "total_s": round(total, 3), "mean_ms": round(hist["mean"] / 1000, 3),
+                "p50_ms": hist["p50"] / 1000, "p95_ms": hist["p95"] / 1000,
+                "p99_ms": hist["p99"] / 1000, "max_ms": hist["max"] / 1000}
+            if duration:
+                report["ops"][op]["share"] = round(total / duration, 3)
+        return report
+
+
+TEST = Recorder()
+SESSION = Recorder()
+
+
+def record(op: str, elapsed_ns: int, nbytes: int = 0, error: bool = False,
+           outer: bool = True) -> None:
+    """Record operation in test and session recorders."""
+    TEST.record(op, elapsed_ns, nbytes, error, outer)
+    SESSION.record(op, elapsed_ns, nbytes, error, outer)
+
+
+class Span:
+    """Timing context of one operation, nbytes and error may be set inside the context."""
+
+    __slots__ = ("op", "nbytes", "error", "start", "outer")
+
+    def __init__(self, op: str, nbytes: int = 0):
+        self.op = op
+        self.nbytes = nbytes
+        self.error = False
+        self.start = None
+        self.outer = True
+
+    def __enter__(self):
+        depth = getattr(_LOCAL, "depth", 0)
+        self.outer = depth == 0
+        _LOCAL.depth = depth + 1
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        elapsed = time.perf_counter_ns() - self.start
+        _LOCAL.depth -= 1
+        record(self.op, elapsed, self.nbytes, self.error or exc_type is not None, self.outer)
+        return False
+
+
+class _NoSpan:
+    """Span used while instrumentation is disabled."""
+
+    op = None
+    nbytes = 0
+    error = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        return False
+
+
+def measure(op: str, nbytes: int = 0):
+    """
+    Context manager timing operation op.
+    :param op: operation name e.g. "s3.PutObject", "ssh.exec".
+    :param nbytes: bytes transferred by operation, can be set on the span later.
+    """
+    return Span(op, nbytes) if ENABLED else _NoSpan()
+
+
+def instrumented(op: str = None) -> Callable:
+    """Decorator timing every call of function, op defaults to qualified function name."""
+    def decorator(func):
+        name = op or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with measure(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def begin_test() -> None:
+    """Start recording of a new test."""
+    TEST.reset()
+
+
+def testcase_summary(duration: float = None, reset: bool = True) -> dict:
+    """Summary of running test, see Recorder.summary."""
+    summary = TEST.summary(duration)
+    if reset:
+        TEST.reset()
+    return summary
+
+
+def session_summary(duration: float = None) -> dict:
+    """Summary of session, see Recorder.summary."""
+    return SESSION.summary(duration)
+
+
+def format_summary(summary: dict) -> str:
+    """Summary as text table, slowest operations first."""
+    lines = [f"{'operation':<32}{'count':>8}{'errors':>8}{'p50 ms':>10}{'p95 ms':>10}"
+             f"{'p99 ms':>10}{'total s':>10}{'share':>8}{'bytes':>14}"]
+    for op, stats in sorted(summary["ops"].items(), key=lambda op: -op[1]["total_s"]):
+        share = f"{stats['share']:.1%}" if "share" in stats else "-"
+        lines.append(f"{op:<32}{stats['count']:>8}{stats['errors']:>8}{stats['p50_ms']:>10.1f}"
+                     f"{stats['p95_ms']:>10.1f}{stats['p99_ms']:>10.1f}{stats['total_s']:>10.2f}"
+                     f"{share:>8}{stats['bytes']:>14}")
+    lines.append(f"instrumented {summary['instrumented_s']}s of {summary['duration_s']}s")
+    return "\n".join(lines)
@@ -32,6 +32,11 @@ from jira import JIRAError
 from jira import Issue
 from http import HTTPStatus
 
+from commons.utils.retry_utils import Backoff
+from commons.utils.retry_utils import CircuitOpenError
+from commons.utils.retry_utils import RetryPolicy
+from commons.utils.retry_utils import get_breaker
+
 LOGGER = logging.getLogger(__name__)
 
 
@@ -65,33 +70,32 @@ class JiraTask:
         test_list = []
         te_tag = ""
         options = {'server': self.jira_url}
-        retries_cnt = 5
-        incremental_timeout_sec = 60
-        req_success = False
-        retry_attempt = 0
         id_list = []
         test_tuple = ()
-        while (not req_success) and retries_cnt:
-            try:
-                auth_jira = JIRA(options, basic_auth=self.auth)
-                te = auth_jira.issue(test_exe_id)
-                if te:
-                    te_tags = te.fields.customfield_21006
-                    if te_tags:
-                        te_tag = te_tags[0]
-                        te_tag = te_tag.lower()
-                    req_success = True
-            except (JIRAError, requests.exceptions.RequestException) as fault:
-                if fault.status_code == HTTPStatus.UNAUTHORIZED:
-                    raise EnvironmentError("Unauthorized JIRA credentials") from fault
-                print('Error occurred in getting te tag')
-                LOGGER.error('Error occurred %s in getting te_tag from %s', fault, test_exe_id)
-                retries_cnt = retries_cnt - 1
-                retry_attempt = retry_attempt + 1
-                if retries_cnt == 0:
-                    raise EnvironmentError(
-                        "Unable to access JIRA. Please check above errors.") from fault
-                time.sleep(incremental_timeout_sec * retry_attempt)
+        policy = RetryPolicy(
+            attempts=5, backoff=Backoff(base=60, cap=300),
+            retry_on=(JIRAError, requests.exceptions.RequestException),
+            giveup=lambda fault: getattr(fault, "status_code", None) == HTTPStatus.UNAUTHORIZED,
+            breaker=get_breaker("jira"), name="jira")
+        try:
+            for attempt in policy.attempts():
+                with attempt:
+                    auth_jira = JIRA(options, basic_auth=self.auth)
+                    te = auth_jira.issue(test_exe_id)
+                    if te:
+                        te_tags = te.fields.customfield_21006
+                        if te_tags:
+                            te_tag = te_tags[0]
+                            te_tag = te_tag.lower()
+                if attempt.error is not None:
+                    LOGGER.error('Error occurred %s in getting te_tag from %s', attempt.error,
+                                 test_exe_id)
+        except (JIRAError, requests.exceptions.RequestException, CircuitOpenError) as fault:
+            if getattr(fault, "status_code", None) == HTTPStatus.UNAUTHORIZED:
+                raise EnvironmentError("Unauthorized JIRA credentials") from fault
+            LOGGER.error('Error occurred %s in getting te_tag from %s', fault, test_exe_id)
+            raise EnvironmentError(
+                "Unable to access JIRA. Please check above errors.") from fault
         if te_tag != "":
             page_not_zero = 1
             page_cnt = 1
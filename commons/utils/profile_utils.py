@@ -0,0 +1,155 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2022 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+
+"""Sampling profiler of all Python threads of the process.
+
+   A daemon thread wakes up every interval, takes the current frame of every other
+   thread and counts the stack. Nothing is hooked into function calls, so overhead
+   only depends on the interval and stack depth, about 1% at the default 10ms.
+   Results are written as collapsed stacks ("thread;module:func;... count") accepted
+   by flamegraph.pl and speedscope, and as a time breakdown per module. Time of frames
+   blocked in socket, ssl, select or thread waits is time spent waiting on the cluster
+   or on other threads, everything else is client side work.
+"""
+
+import logging
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Tuple
+
+LOGGER = logging.getLogger(__name__)
+
+# leaf modules of frames blocked on I/O or other threads
+WAIT_MODULES = ("socket", "ssl", "select", "selectors", "threading", "queue",
+                "concurrent.futures._base", "subprocess", "multiprocessing.connection")
+
+
+class SamplingProfiler:
+    """
+    Usage:
+        profiler = SamplingProfiler()
+        profiler.start()
+        ... run test ...
+        profiler.stop()
+        profiler.write("log/latest/TEST-1234_profile")
+    """
+
+    def __init__(self, interval: float = 0.01, max_depth: int = 128):
+        """
+        :param interval: seconds between samples.
+        :param max_depth: innermost frames kept of deep stacks.
+        """
+        self.interval = interval
+        self.max_depth = max_depth
+        self.stacks = Counter()
+        self.samples = 0
+        self.started = None
+        self.elapsed = 0.0
+        self._labels = {}
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _label(self, frame) -> str:
+        code = frame.f_code
+        label = self._labels.get(code)
+        if label is None:
+            module = frame.f_globals.get("__name__", "?")
+            label = self._labels[code] = f"{module}:{code.co_name}"
+        return label
+
+    def sample(self) -> None:
+        """Count current stack of every thread except sampling thread."""
+        own = threading.get_ident()
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        for ident, frame in sys._current_frames().items():  # pylint: disable=protected-access
+            if ident == own:
+                continue
+            stack = []
+            while frame is not None and len(stack) < self.max_depth:
+                stack.append(self._label(frame))
+                frame = frame.f_back
+            stack.append(names.get(ident, str(ident)))
+            self.stacks[tuple(reversed(stack))] += 1
+        self.samples += 1
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.sample()
+
+    def start(self) -> None:
+        """Start sampling in a daemon thread."""
+        self._stop.clear()
+        self.started = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler",
+                                        daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop sampling."""
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+        self.elapsed += time.perf_counter() - self.started
+
+    def breakdown(self) -> list:
+        """
+        Samples per module sorted by self samples.
+        :return: list of (module, self samples, inclusive samples, waiting) tuples, waiting
+            tells whether samples of module are blocked on I/O or other threads.
+        """
+        own, total = Counter(), Counter()
+        for stack, count in self.stacks.items():
+            modules = [label.rsplit(":", 1)[0] for label in stack[1:]]
+            if not modules:
+                continue
+            own[modules[-1]] += count
+            for module in set(modules):
+                total[module] += count
+        return [(module, own[module], total[module], module in WAIT_MODULES)
+                for module in sorted(total, key=lambda mod: (-own[mod], -total[mod]))]
+
+    def write(self, prefix: str) -> Tuple[str, str]:
+        """
+        Write collapsed stacks and module breakdown.
+        :param prefix: path prefix of files, suffixed with _stacks.txt and _modules.txt.
+        :return: paths of stacks and breakdown files.
+        """
+        stacks_file, modules_file = f"{prefix}_stacks.txt", f"{prefix}_modules.txt"
+        with open(stacks_file, "w", encoding="utf-8") as fp:
+            for stack, count in self.stacks.most_common():
+                fp.write(f"{';'.join(stack)} {count}\n")
+        thread_samples = sum(self.stacks.values()) or 1
+        breakdown = self.breakdown()
+        waiting = sum(own for _, own, _, wait in breakdown if wait)
+        with open(modules_file, "w", encoding="utf-8") as fp:
+            fp.write(f"# {self.samples} samples of all threads in {self.elapsed:.1f}s, "
+                     f"interval {self.interval * 1000:g}ms\n")
+            fp.write(f"# waiting on I/O or threads {waiting / thread_samples:.1%}, "
+                     f"client work {1 - waiting / thread_samples:.1%}\n")
+            fp.write(f"{'self %':>8}{'total %':>9}{'self s':>9}  module\n")
+            for module, own, total, wait in breakdown:
+                fp.write(f"{own / thread_samples:>8.1%}{total / thread_samples:>9.1%}"
+                         f"{own * self.interval:>9.2f}  {module}{' (wait)' if wait else ''}\n")
+        LOGGER.info("Profile of %s samples written to %s and %s", self.samples, stacks_file,
+                    modules_file)
+        return stacks_file, modules_file
@@ -0,0 +1,298 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2022 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+
+"""Retries with jittered exponential backoff, deadlines and circuit breakers.
+
+   Usage as decorator:
+       @retry(attempts=5, retry_on=(ConnectionError,), name="csm")
+       def call(): ...
+   or as context managers:
+       for attempt in RetryPolicy(attempts=3, name="ssh").attempts():
+           with attempt:
+               client.connect()
+   Retries, time spent backing off and breaker rejections are recorded per name and
+   reported by retry_metrics().
+"""
+
+import functools
+import logging
+import random
+import threading
+import time
+from typing import Callable
+from typing import Tuple
+from typing import Type
+
+from commons.utils.histogram_utils import LatencyHistogram
+
+LOGGER = logging.getLogger(__name__)
+
+_METRICS = {}
+_METRICS_LOCK = threading.Lock()
+_BREAKERS = {}
+
+
+class CircuitOpenError(ConnectionError):
+    """Call rejected because circuit of endpoint is open."""
+
+
+def _metrics(name: str) -> dict:
+    with _METRICS_LOCK:
+        if name not in _METRICS:
+            _METRICS[name] = {"calls": 0, "retries": 0, "failures": 0, "rejected": 0,
+                              "backoff": LatencyHistogram()}
+        return _METRICS[name]
+
+
+def record_retries(name: str, retries: int = 0, backoff: float = 0.0) -> None:
+    """Record retries and seconds backed off by a client with its own retry loop."""
+    metrics = _metrics(name)
+    with _METRICS_LOCK:
+        metrics["calls"] += 1
+        metrics["retries"] += retries
+    if backoff:
+        metrics["backoff"].record(backoff * 1000)
+
+
+def retry_metrics(reset: bool = False) -> dict:
+    """
+    Retry metrics per name.
+    :param reset: clear metrics after reading.
+    :return: name: calls, retries, failures, rejected and backoff_ms summary.
+    """
+    with _METRICS_LOCK:
+        report = {name: {"calls": metrics["calls"], "retries": metrics["retries"],
+                         "failures": metrics["failures"], "rejected": metrics["rejected"],
+                         "backoff_ms": metrics["backoff"].summary()}
+                  for name, metrics in _METRICS.items()}
+        if reset:
+            _METRICS.clear()
+    return report
+
+
+class Backoff:
+    """Exponential backoff with full jitter: delay n is uniform in [0, min(cap, base*factor**n)]."""
+
+    def __init__(self, base: float = 1.0, cap: float = 60.0, factor: float = 2.0,
+                 jitter: bool = True):
+        self.base = base
+        self.cap = cap
+        self.factor = factor
+        self.jitter = jitter
+
+    def delay(self, attempt: int) -> float:
+        """Delay in seconds before retry number attempt, starting from 0."""
+        ceiling = min(self.cap, self.base * self.factor ** attempt)
+        return random.uniform(0, ceiling) if self.jitter else ceiling  # nosec
+
+
+class Deadline:
+    """Time budget of an operation including its retries."""
+
+    def __init__(self, seconds: float = None):
+        self.end = time.monotonic() + seconds if seconds is not None else None
+
+    def remaining(self) -> float:
+        """Seconds left, infinite without budget."""
+        return float("inf") if self.end is None else max(self.end - time.monotonic(), 0.0)
+
+    @property
+    def expired(self) -> bool:
+        """Budget is used up."""
+        return self.remaining() <= 0
+
+
+class CircuitBreaker:
+    """
+    Per endpoint breaker. After failure_threshold consecutive failures calls are
+    rejected for reset_timeout seconds, then one trial call is let through and its
+    outcome closes or reopens the circuit.
+    """
+
+    def __init__(self, name: str, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self._trial = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        """closed, open or half_open."""
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return "half_open"
+        return "open"
+
+    def allow(self) -> bool:
+        """Whether a call may go ahead now."""
+        with self._lock:
+            state = self.state
+            if state == "closed":
+                return True
+            if state == "half_open" and not self._trial:
+                self._trial = True
+                return True
+            return False
+
+    def success(self) -> None:
+        """Record successful call, closes circuit."""
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._trial = False
+
+    def failure(self) -> None:
+        """Record failed call, opens circuit at threshold or after failed trial."""
+        with self._lock:
+            self.failures += 1
+            if self._trial or self.failures >= self.failure_threshold:
+                if self.opened_at is None or self._trial:
+                    LOGGER.warning("Circuit of %s opened after %s failures", self.name,
+                                   self.failures)
+                self.opened_at = time.monotonic()
+            self._trial = False
+
+    def __enter__(self):
+        if not self.allow():
+            metrics = _metrics(self.name)
+            with _METRICS_LOCK:
+                metrics["rejected"] += 1
+            raise CircuitOpenError(f"Circuit of {self.name} is open")
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        if exc_type is None:
+            self.success()
+        elif not issubclass(exc_type, CircuitOpenError):
+            self.failure()
+        return False
+
+
+def get_breaker(name: str, **kwargs) -> CircuitBreaker:
+    """Shared breaker of endpoint name e.g. "ssh:node1", created on first use."""
+    with _METRICS_LOCK:
+        if name not in _BREAKERS:
+            _BREAKERS[name] = CircuitBreaker(name, **kwargs)
+        return _BREAKERS[name]
+
+
+class _Attempt:
+    """Context of one attempt, swallows retryable errors of all but last attempt."""
+
+    def __init__(self, policy: "RetryPolicy", number: int, last: bool):
+        self.policy = policy
+        self.number = number
+        self.last = last
+        self.error = None
+
+    def __enter__(self):
+        if self.policy.breaker is not None:
+            self.policy.breaker.__enter__()
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        if self.policy.breaker is not None:
+            self.policy.breaker.__exit__(exc_type, exc, traceback)
+        if exc_type is None:
+            return False
+        if self.last or not self.policy.retryable(exc):
+            metrics = _metrics(self.policy.name)
+            with _METRICS_LOCK:
+                metrics["failures"] += 1
+            return False
+        self.error = exc
+        return True
+
+
+class RetryPolicy:
+    """Retry policy usable as decorator, callable wrapper or attempt iterator."""
+
+    # pylint: disable=too-many-arguments
+    def __init__(self, attempts: int = 3, backoff: Backoff = None, deadline: float = None,
+                 retry_on: Tuple[Type[BaseException], ...] = (Exception,),
+                 giveup: Callable[[BaseException], bool] = None, breaker: CircuitBreaker = None,
+                 name: str = "default"):
+        """
+        :param attempts: attempts including first call.
+        :param backoff: delays between attempts, Backoff() if None.
+        :param deadline: seconds budget of all attempts and delays.
+        :param retry_on: exception types retried.
+        :param giveup: predicate of exceptions not to retry although matching retry_on.
+        :param breaker: circuit breaker guarding every attempt.
+        :param name: metrics name.
+        """
+        self.max_attempts = attempts
+        self.backoff = backoff or Backoff()
+        self.deadline = deadline
+        self.retry_on = retry_on
+        self.giveup = giveup
+        self.breaker = breaker
+        self.name = name
+
+    def retryable(self, error: BaseException) -> bool:
+        """Whether error is retried."""
+        if isinstance(error, CircuitOpenError) or not isinstance(error, self.retry_on):
+            return False
+        return not (self.giveup and self.giveup(error))
+
+    def attempts(self):
+        """Yield attempt contexts, sleeping between them, until one completes."""
+        deadline = Deadline(self.deadline)
+        metrics = _metrics(self.name)
+        with _METRICS_LOCK:
+            metrics["calls"] += 1
+        for number in range(self.max_attempts):
+            if number:
+                delay = min(self.backoff.delay(number - 1), deadline.remaining())
+                with _METRICS_LOCK:
+                    metrics["retries"] += 1
+                metrics["backoff"].record(delay * 1000)
+                LOGGER.debug("%s: retry %s in %.2fs after %s", self.name, number, delay,
+                             attempt.error)
+                time.sleep(delay)
+            last = number == self.max_attempts - 1 or deadline.expired
+            attempt = _Attempt(self, number, last)
+            try:
+                yield attempt
+            except GeneratorExit:
+                return
+            if attempt.error is None:
+                return
+
+    def call(self, func: Callable, *args, **kwargs):
+        """Call func with retries, last error is raised."""
+        for attempt in self.attempts():
+            with attempt:
+                return func(*args, **kwargs)
+        return None
+
+    def __call__(self, func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            return self.call(func, *args, **kwargs)
+        return wrapper
+
+
+def retry(**kwargs) -> RetryPolicy:
+    """Decorator retrying function with RetryPolicy(**kwargs)."""
+    return RetryPolicy(**kwargs)
@@ -0,0 +1,218 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2022 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+#
+
+"""Time series resource usage of cluster nodes, pods and processes.
+
+   scripts/io_stability/stats_agent.py is piped to python3 on every node over SSH
+   and streams binary samples back on the same channel. Samples are decoded into
+   per node columns, timestamps are shifted to client clock so they line up with
+   test phase markers set on the client. Columns are saved as compressed numpy
+   archives, one per node.
+"""
+
+import logging
+import os
+import threading
+import time
+from array import array
+
+import numpy as np
+
+from commons.constants import PID_WATCH_LIST
+from commons.constants import STATS_AGENT_PATH
+from commons.helpers.pods_helper import LogicalNode
+from scripts.io_stability import stats_agent
+
+LOGGER = logging.getLogger(__name__)
+
+COLUMNS = ("cpu", "mem", "read", "write", "rx", "tx")
+
+
+class NodeSeries:
+    """Columns of samples of one node."""
+
+    def __init__(self, hostname: str):
+        self.hostname = hostname
+        self.keys = []
+        self.time = array("d")
+        self.key = array("I")
+        self.columns = {"cpu": array("f"), "mem": array("Q"), "read": array("f"),
+                        "write": array("f"), "rx": array("f"), "tx": array("f")}
+        self.clock_offset = 0.0
+
+    def add_key(self, key_id: int, name: str) -> None:
+        """Register key name of key id."""
+        self.keys.extend([""] * (key_id + 1 - len(self.keys)))
+        self.keys[key_id] = name
+
+    def add_sample(self, payload: bytes) -> None:
+        """Append records of a sample frame."""
+        timestamp, count = stats_agent.SAMPLE.unpack_from(payload)
+        timestamp += self.clock_offset
+        for record in stats_agent.RECORD.iter_unpack(
+                payload[stats_agent.SAMPLE.size:
+                        stats_agent.SAMPLE.size + count * stats_agent.RECORD.size]):
+            self.time.append(timestamp)
+            self.key.append(record[0])
+            for column, value in zip(COLUMNS, record[1:]):
+                self.columns[column].append(value)
+
+    def read(self, stream) -> None:
+        """Decode frames from stream till it ends."""
+        header = stats_agent.FRAME
+        while True:
+            head = _read_exact(stream, header.size)
+            if not head:
+                break
+            kind, length = header.unpack(head)
+            payload = _read_exact(stream, length)
+            if len(payload) < length:
+                break
+            if kind == b"S":
+                self.add_sample(payload)
+            elif kind == b"K":
+                key_id, = stats_agent.KEY.unpack_from(payload)
+                self.add_key(key_id, payload[stats_agent.KEY.size:].decode())
+            elif kind == b"H":
+                self.clock_offset = time.time() - stats_agent.HELLO.unpack(payload)[0]
+
+
+def _read_exact(stream, size: int) -> bytes:
+    data = b""
+    while len(data) < size:
+        chunk = stream.read(size - len(data))
+        if not chunk:
+            break
+        data += chunk
+    return data
+
+
+class ClusterStatsCollector:
+    """
+    Sample cpu, memory, disk and network of nodes, pods and watched processes.
+    Usage:
+        collector = ClusterStatsCollector(CMN_CFG, interval=0.5)
+        collector.start()
+        collector.mark("write")
+        ...
+        collector.mark("read")
+        ...
+        collector.stop()
+        collector.save(log_dir)
+    """
+
+    def __init__(self, cmn_cfg, interval: float = 1.0, procs: list = None,
+                 node_type: str = "worker"):
+        """
+        :param cmn_cfg: Common config
+        :param interval: seconds between samples
+        :param procs: process names sampled per pid, PID_WATCH_LIST if None
+        :param node_type: type of nodes running the agent
+        """
+        self.interval = interval
+        self.procs = "|".join(procs if procs is not None else PID_WATCH_LIST)
+        self.node_list = [LogicalNode(hostname=node["hostname"], username=node["username"],
+                                      password=node["password"])
+                          for node in cmn_cfg["nodes"]
+                          if node["node_type"].lower() == node_type]
+        self.series = {}
+        self.markers = []
+        self._threads = []
+
+    def _stream(self, node: LogicalNode) -> None:
+        series = self.series[node.hostname]
+        try:
+            node.connect()
+            stdin, stdout, _ = node.host_obj.exec_command(  # nosec
+                f"python3 - --interval {self.interval} --procs '{self.procs}'")
+            with open(STATS_AGENT_PATH, "rb") as agent:
+                stdin.write(agent.read())
+            stdin.channel.shutdown_write()
+            series.read(stdout)
+        except Exception as error:  # pylint: disable=broad-except
+            LOGGER.error("Stats collection on %s stopped: %s", node.hostname, error)
+        LOGGER.info("Collected %s samples from %s", len(series.time), node.hostname)
+
+    def start(self) -> None:
+        """Start agent on every node."""
+        for node in self.node_list:
+            self.series[node.hostname] = NodeSeries(node.hostname)
+            thread = threading.Thread(target=self._stream, args=(node,), daemon=True,
+                                      name=f"stats-{node.hostname}")
+            thread.start()
+            self._threads.append(thread)
+        self.mark("start")
+
+    def mark(self, phase: str) -> None:
+        """Start a test phase e.g. write, read, degraded, at current time."""
+        LOGGER.info("Stats phase %s", phase)
+        self.markers.append((time.time(), phase))
+
+    def stop(self) -> None:
+        """Stop agents, closing the SSH connection ends the agent."""
+        self.mark("stop")
+        for node in self.node_list:
+            node.disconnect()
+        for thread in self._threads:
+            thread.join(timeout=30)
+        self._threads = []
+
+    def to_arrays(self, hostname: str) -> dict:
+        """
+        Columns of node as numpy arrays with phase index of every sample.
+        :return: dict of time, key, phase, cpu, mem, read, write, rx, tx columns and
+            keys, marker_time, marker_phase lookup arrays.
+        """
+        series = self.series[hostname]
+        marker_time = np.array([marker[0] for marker in self.markers], dtype="f8")
+        sample_time = np.frombuffer(series.time, dtype="f8")
+        arrays = {"time": sample_time, "key": np.frombuffer(series.key, dtype="u4"),
+                  "phase": np.searchsorted(marker_time, sample_time, side="right") - 1,
+                  "keys": np.array(series.keys, dtype=str), "marker_time": marker_time,
+                  "marker_phase": np.array([marker[1] for marker in self.markers], dtype=str)}
+        for column, values in series.columns.items():
+            arrays[column] = np.frombuffer(values, dtype=values.typecode)
+        return arrays
+
+    def save(self, dir_path: str) -> list:
+        """
+        Save columns of every node as <hostname>_stats.npz in dir_path.
+        :return: saved file paths
+        """
+        os.makedirs(dir_path, exist_ok=True)
+        paths = []
+        for hostname in self.series:
+            path = os.path.join(dir_path, f"{hostname}_stats.npz")
+            np.savez_compressed(path, **self.to_arrays(hostname))
+            paths.append(path)
+        return paths
+
+    def phase_summary(self, hostname: str, key: str, column: str = "cpu") -> dict:
+        """Mean and max of a column of key per phase e.g. ("pod:cortx-data-1", "cpu")."""
+        arrays = self.to_arrays(hostname)
+        if key not in self.series[hostname].keys:
+            return {}
+        mask = arrays["key"] == self.series[hostname].keys.index(key)
+        summary = {}
+        for index, phase in enumerate(arrays["marker_phase"]):
+            values = arrays[column][mask & (arrays["phase"] == index)]
+            if values.size:
+                summary[str(phase)] = {"mean": float(values.mean()), "max": float(values.max())}
+        return summary
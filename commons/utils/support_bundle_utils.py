@@ -21,9 +21,15 @@
 Module to maintain support bundle utils
 """
 
+import fnmatch
+import gzip
+import json
 import os
 import logging
+import tarfile
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from commons.helpers.node_helper import Node
 from commons.helpers.pods_helper import LogicalNode
 from commons import commands as cm_cmd
@@ -33,6 +39,9 @@ from config import CMN_CFG
 
 # Global Constants
 LOGGER = logging.getLogger(__name__)
+SB_STREAM_CHUNK = 1024 * 1024
+SB_INDEX_FILE = "sb_index.jsonl"
+SB_STDERR_KEEP = 64 * 1024
 
 
 # pylint: disable=too-many-arguments
@@ -420,3 +429,162 @@ def file_with_prefix_exists_on_path(path: str, file_prefix: str):
         if file_prefix in str(file):
             return True
     return False
+
+
+class _TeeReader:
+    """File like reader which writes every byte read from source into sink."""
+
+    def __init__(self, source, sink):
+        self.source = source
+        self.sink = sink
+
+    def read(self, size=-1):
+        """Read from source and copy to sink."""
+        data = self.source.read(size)
+        self.sink.write(data)
+        return data
+
+
+def _drain(stream, tail: bytearray, keep: int = SB_STDERR_KEEP) -> None:
+    """Read stream till EOF keeping its last keep bytes in tail."""
+    while True:
+        data = stream.read(SB_STREAM_CHUNK)
+        if not data:
+            return
+        tail.extend(data)
+        del tail[:-keep]
+
+
+def stream_pod_logs(node_obj, pod: str, local_dir_path: str, paths: tuple,
+                    container: str = None) -> list:
+    """
+    Tar and gzip paths inside pod and stream the archive over the SSH channel of node
+    directly into local <pod>.tar.gz, nothing is staged on node.
+    Archive members are indexed while streaming.
+    :param node_obj: LogicalNode object of master node.
+    :param pod: pod name.
+    :param local_dir_path: local dir path on client.
+    :param paths: paths inside pod.
+    :param container: container name, default container of pod if None.
+    :return: index entries with file, pod, archive, offset and size of member data
+        in uncompressed tar stream.
+    """
+    archive = f"{pod}.tar.gz"
+    suffix = f"-c {container} " if container else ""
+    cmd = cm_cmd.KUBECTL_CMD.format(
+        "exec", pod, cm_const.NAMESPACE,
+        f"{suffix}-- {cm_cmd.K8S_TAR_STREAM_CMD.format(' '.join(paths))}")
+    entries = []
+    node_obj.connect()
+    try:
+        _, stdout, stderr = node_obj.host_obj.exec_command(cmd)  # nosec
+        # tar warnings must not fill the stderr window and stall the stdout stream
+        err_tail = bytearray()
+        drain = threading.Thread(target=_drain, args=(stderr, err_tail),
+                                 name=f"sb-stderr-{pod}", daemon=True)
+        drain.start()
+        with open(os.path.join(local_dir_path, archive), "wb") as sink:
+            tee = _TeeReader(stdout, sink)
+            with tarfile.open(fileobj=tee, mode="r|gz") as tar:
+                for member in tar:
+                    if member.isfile():
+                        entries.append({"file": member.name, "pod": pod, "archive": archive,
+                                        "offset": member.offset_data, "size": member.size,
+                                        "mtime": member.mtime})
+            # copy trailing padding of archive
+            while tee.read(SB_STREAM_CHUNK):
+                pass
+        exit_status = stdout.channel.recv_exit_status()
+        drain.join()
+        if exit_status:
+            LOGGER.warning("Streaming logs of %s exited with %s: %s", pod, exit_status,
+                           err_tail.decode(errors="replace").strip())
+    finally:
+        node_obj.disconnect()
+    LOGGER.info("Streamed %s files of %s pod into %s", len(entries), pod, archive)
+    return entries
+
+
+def stream_support_bundle_k8s(local_dir_path: str,
+                              paths: tuple = (cm_const.SB_EXTRACTED_PATH,),
+                              pod_prefixes: tuple = tuple(
+                                  cm_const.SB_POD_PREFIX_AND_COMPONENT_LIST),
+                              max_workers: int = 8):
+    """
+    Stream logs of all cortx pods in parallel into per pod archives on client
+    and write a searchable index of archive members.
+    :param local_dir_path: local dir path on client
+    :param paths: paths inside pods to be collected
+    :param pod_prefixes: prefixes of pods to be collected
+    :param max_workers: number of pods streamed concurrently
+    :return: True if all pods are collected, index file path or error message
+    """
+    host = username = password = None
+    for node in CMN_CFG["nodes"]:
+        if node["node_type"] == "master":
+            host, username, password = node["hostname"], node["username"], node["password"]
+    if host is None:
+        LOGGER.error("No master node in setup config, support bundle cannot be streamed")
+        return False, "No master node found in CMN_CFG nodes"
+    m_node_obj = LogicalNode(hostname=host, username=username, password=password)
+    pod_list = [pod for prefix in pod_prefixes
+                for pod in m_node_obj.get_all_pods(pod_prefix=prefix)]
+    m_node_obj.disconnect()
+    if not os.path.exists(local_dir_path):
+        os.makedirs(local_dir_path)
+
+    def _stream(pod):
+        # every pod gets its own SSH connection
+        node_obj = LogicalNode(hostname=host, username=username, password=password)
+        try:
+            return stream_pod_logs(node_obj, pod, local_dir_path, paths)
+        except Exception as error:  # pylint: disable=broad-except
+            LOGGER.error("Streaming logs of %s pod failed: %s", pod, error)
+            return None
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        results = list(executor.map(_stream, pod_list))
+    index_path = os.path.join(local_dir_path, SB_INDEX_FILE)
+    with open(index_path, "w", encoding="utf-8") as index:
+        for entries in results:
+            for entry in entries or []:
+                index.write(json.dumps(entry) + "\n")
+    flg = bool(pod_list) and all(entries is not None for entries in results)
+    LOGGER.info("Logs of %s pods streamed to %s, index %s", len(pod_list), local_dir_path,
+                index_path)
+    return flg, index_path
+
+
+def search_sb_index(index_path: str, pattern: str, pod: str = None) -> list:
+    """
+    Search streamed support bundle index.
+    :param index_path: index file written by stream_support_bundle_k8s
+    :param pattern: shell style pattern matched against member path e.g. "*motr*/trace/*"
+    :param pod: only entries of pod
+    :return: matching index entries
+    """
+    with open(index_path, encoding="utf-8") as index:
+        entries = [json.loads(line) for line in index]
+    return [entry for entry in entries if fnmatch.fnmatch(entry["file"], pattern)
+            and (pod is None or entry["pod"] == pod)]
+
+
+def extract_sb_file(index_path: str, entry: dict, local_path: str) -> str:
+    """
+    Extract single file of index entry from its pod archive without unpacking others.
+    :param index_path: index file written by stream_support_bundle_k8s
+    :param entry: index entry e.g. from search_sb_index
+    :param local_path: path of extracted file
+    :return: local_path
+    """
+    archive = os.path.join(os.path.dirname(index_path), entry["archive"])
+    with gzip.open(archive, "rb") as tar_stream, open(local_path, "wb") as out:
+        tar_stream.seek(entry["offset"])
+        remaining = entry["size"]
+        while remaining:
+            data = tar_stream.read(min(SB_STREAM_CHUNK, remaining))
+            if not data:
+                raise EOFError(f"{archive} truncated at {entry['file']}")
+            out.write(data)
+            remaining -= len(data)
+    return local_path
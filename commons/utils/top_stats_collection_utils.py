@@ -20,7 +20,6 @@
 """Methods to collect top command stats from server"""
 
 import logging
-import os.path
 from multiprocessing import Process
 
 from commons.commands import CMD_PGREP_TOP
@@ -116,14 +115,10 @@ class TopStatsCollection:
         """
         function to copy files from dir and remove dir from remote
         """
-        ls_dir = self.master_node_list[0].list_dir(remote_path=dir_path)
-        LOGGER.debug("ls of remote dir %s", ls_dir)
-        for file in ls_dir:
-            resp = self.master_node_list[0].copy_file_to_local(os.path.join(dir_path, file),
-                                                               os.path.join(local_path, file))
-            if not resp:
-                LOGGER.info("copy of file %s failed", file)
-                return resp
+        resp = self.master_node_list[0].copy_file_to_local(dir_path, local_path)
+        if not resp[0]:
+            LOGGER.info("copy of dir %s failed: %s", dir_path, resp[1])
+            return resp[0]
         LOGGER.debug("removing dir from path of remote %s", dir_path)
         resp = self.master_node_list[0].delete_dir_sftp(dpath=dir_path)
         return resp
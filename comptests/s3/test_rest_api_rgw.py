@@ -45,6 +45,11 @@ class TestRestApiRgw:
         cls.created_users = []
         cls.tenant = 'Group1'
 
+    @classmethod
+    def teardown_class(cls):
+        """Close connections of RGW admin client."""
+        cls.obj.close_sync()
+
     def teardown_method(self):
         """
         Teardown for deleting resources like users,object and bucket created as part of testcases
@@ -54,18 +59,15 @@ class TestRestApiRgw:
         delete_failed = []
         delete_success = []
         self.log.debug("created_users list : %s",self.created_users)
-        for usr in self.created_users:
-            self.log.info("Sending request to delete user %s", usr)
-            try:
-                loop = asyncio.get_event_loop()
-                status = loop.run_until_complete(self.obj.delete_user(usr))
-                if status[0] != HTTPStatus.OK:
-                    delete_failed.append(usr)
-                else:
-                    delete_success.append(usr)
-            # pylint: disable=broad-except
-            except BaseException as err:
-                self.log.warning("Ignoring %s while deleting user: %s", err, usr)
+        self.log.info("Sending request to delete users %s", self.created_users)
+        statuses = self.obj.delete_users_sync(self.created_users)
+        for usr, status in zip(self.created_users, statuses):
+            if isinstance(status, BaseException):
+                self.log.warning("Ignoring %s while deleting user: %s", status, usr)
+            elif status[0] != HTTPStatus.OK:
+                delete_failed.append(usr)
+            else:
+                delete_success.append(usr)
         for usr in delete_success:
             self.created_users.remove(usr)
         self.log.info("User delete success list %s", delete_success)
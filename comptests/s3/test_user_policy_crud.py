@@ -45,6 +45,11 @@ class TestRgwPolicyCrud:
         cls.created_users = []
         cls.tenant = 'Group1'
 
+    @classmethod
+    def teardown_class(cls):
+        """Close connections of RGW admin client."""
+        cls.obj.close_sync()
+
     def teardown_method(self):
         """
         Teardown for deleting resources like users,object and bucket created as part of testcases
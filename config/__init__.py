@@ -138,9 +138,6 @@ CMN_CFG = configmanager.get_config_wrapper(fpath=COMMON_CONFIG, target=target)
 if S3_ENGINE_RGW == CMN_CFG["s3_engine"]:
     S3_CFG["region"] = "default"
 CMN_CFG.update(S3_CFG)
-JMETER_CFG = configmanager.get_config_wrapper(
-    fpath=CSM_CONFIG, config_key="JMeterConfig", target=target, target_key="csm")
-
 if PROD_FAMILY_LC == CMN_CFG["product_family"]:
     CSM_REST_CFG = configmanager.get_config_wrapper(
         fpath=CSM_CONFIG, config_key="Restcall_LC", target=target, target_key="csm")
@@ -154,19 +151,34 @@ if CSM_CHECKS:
     CSM_CFG["Restcall"]["msg_check"] = "enable"
 RAS_VAL = configmanager.get_config_wrapper(
     fpath=RAS_CONFIG_PATH, target=target, target_key="csm")
-CMN_DESTRUCTIVE_CFG = configmanager.get_config_wrapper(fpath=COMMON_DESTRUCTIVE_CONFIG_PATH)
-RAS_TEST_CFG = configmanager.get_config_wrapper(fpath=SSPL_TEST_CONFIG_PATH)
-PROV_CFG = configmanager.get_config_wrapper(fpath=PROV_TEST_CONFIG_PATH)
-HA_CFG = configmanager.get_config_wrapper(fpath=HA_TEST_CONFIG_PATH)
-PROV_TEST_CFG = configmanager.get_config_wrapper(fpath=PROV_CONFIG_PATH)
-DTM_CFG = configmanager.get_config_wrapper(fpath=DTM_CFG_PATH)
-DTM_TEST_CFG = configmanager.get_config_wrapper(fpath=DTM_TEST_CFG_PATH)
-DEPLOY_CFG = configmanager.get_config_wrapper(fpath=DEPLOY_TEST_CONFIG_PATH)
-
-DI_CFG = configmanager.get_config_wrapper(fpath=DI_CONFIG_PATH)
 DATA_PATH_CFG = configmanager.get_config_wrapper(fpath=DATA_PATH_CONFIG_PATH, target=target)
-DURABILITY_CFG = configmanager.get_config_wrapper(fpath=DURABILITY_CFG_PATH)
 # Munched configs. These can be used by dot "." operator.
-
-di_cfg = munch.munchify(DI_CFG)
 cmn_cfg = munch.munchify(CMN_CFG)
+
+# Component configs are loaded on first access, see __getattr__.
+_LAZY_CFG = {
+    "JMETER_CFG": lambda: configmanager.get_config_wrapper(
+        fpath=CSM_CONFIG, config_key="JMeterConfig", target=target, target_key="csm"),
+    "CMN_DESTRUCTIVE_CFG": lambda: configmanager.get_config_wrapper(
+        fpath=COMMON_DESTRUCTIVE_CONFIG_PATH),
+    "RAS_TEST_CFG": lambda: configmanager.get_config_wrapper(fpath=SSPL_TEST_CONFIG_PATH),
+    "PROV_CFG": lambda: configmanager.get_config_wrapper(fpath=PROV_TEST_CONFIG_PATH),
+    "HA_CFG": lambda: configmanager.get_config_wrapper(fpath=HA_TEST_CONFIG_PATH),
+    "PROV_TEST_CFG": lambda: configmanager.get_config_wrapper(fpath=PROV_CONFIG_PATH),
+    "DTM_CFG": lambda: configmanager.get_config_wrapper(fpath=DTM_CFG_PATH),
+    "DTM_TEST_CFG": lambda: configmanager.get_config_wrapper(fpath=DTM_TEST_CFG_PATH),
+    "DEPLOY_CFG": lambda: configmanager.get_config_wrapper(fpath=DEPLOY_TEST_CONFIG_PATH),
+    "DI_CFG": lambda: configmanager.get_config_wrapper(fpath=DI_CONFIG_PATH),
+    "DURABILITY_CFG": lambda: configmanager.get_config_wrapper(fpath=DURABILITY_CFG_PATH),
+    "di_cfg": lambda: munch.munchify(__getattr__("DI_CFG")),
+}
+
+
+def __getattr__(name):
+    """Load component config on first access and keep it as module attribute."""
+    try:
+        loader = _LAZY_CFG[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = globals()[name] = loader()
+    return value
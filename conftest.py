@@ -50,6 +50,8 @@ from commons import constants as const
 from commons.helpers.health_helper import Health
 from commons.utils import assert_utils
 from commons.utils import config_utils
+from commons.utils import instrument_utils
+from commons.utils.profile_utils import SamplingProfiler
 from commons.utils import jira_utils
 from commons.utils import system_utils
 from config import CMN_CFG
@@ -59,6 +61,7 @@ from core.runner import get_jira_credential
 from libs.di.di_mgmt_ops import ManagementOPs
 from libs.di.di_run_man import RunDataCheckManager
 from libs.di.fi_adapter import S3FailureInjection
+from libs.s3.s3_account_pool import S3AccountPool
 
 FAILURES_FILE = "failures.txt"
 LOG_DIR = 'log'
@@ -77,6 +80,30 @@ SKIP_DBG_LOGGING = ['boto', 'boto3', 'botocore', 'nose', 'paramiko', 's3transfer
 
 Globals.ALL_RESULT = None
 Globals.CSM_LOGS = None
+Globals.PROFILE_TESTS = set()
+PROFILERS = {}
+LATENCY_ENTRIES = []
+
+
+def reset_session_state():
+    """
+    Reset module state of previous session.
+    A warm pytest worker (core.pytest_worker) runs pytest.main repeatedly in one process
+    and conftest is imported only once, so state of the previous batch is dropped here.
+    """
+    global CACHE, REPORT_CLIENT  # pylint: disable=global-statement
+    CACHE = LRUCache(1024 * 10)
+    REPORT_CLIENT = None
+    PROFILERS.clear()
+    LATENCY_ENTRIES.clear()
+    Globals.records.clear()
+    Globals.ALL_RESULT = None
+    Globals.CSM_LOGS = None
+    Globals.PROFILE_TESTS = set()
+    Globals.JIRA_UPDATE = False
+    Globals.TE_TKT = None
+    instrument_utils.SESSION.reset()
+    instrument_utils.TEST.reset()
 
 
 def _get_items_from_cache():
@@ -247,6 +274,19 @@ def pytest_addoption(parser):
         "--use_ssl", action="store", default=True,
         help="Decide whether to use HTTPS/SSL connection for S3 endpoint."
     )
+    parser.addoption(
+        "--instrument", action="store", default=True,
+        help="Record latency histograms of S3, SSH, CSM REST and DI operations."
+    )
+    parser.addoption(
+        "--profile", action="store", default="",
+        help="Comma separated test IDs e.g. TEST-1234 to run under sampling profiler, "
+             "all to profile every test."
+    )
+    parser.addoption(
+        "--s3_account_pool_size", action="store", default=4, type=int,
+        help="S3 accounts provisioned for s3_account fixture at session start."
+    )
 
 
 def read_test_list_csv() -> List:
@@ -285,8 +325,11 @@ def read_dist_test_list_csv() -> List:
 
 @pytest.hookimpl(trylast=True)
 def pytest_sessionfinish(session, exitstatus):
-    """Remove handlers from all loggers."""
+    """Report session latency summary and remove handlers from all loggers."""
     # todo add html hook file = session.config._htmlfile
+    if instrument_utils.ENABLED:
+        report_session_latency(session)
+        store_latency_entries()
     loggers = [logging.getLogger()] + list(logging.Logger.manager.loggerDict.values())
     for _logger in loggers:
         handlers = getattr(_logger, 'handlers', [])
@@ -418,6 +461,7 @@ def create_report_payload(item, call, final_result, d_u, d_pass):
 @pytest.hookimpl(tryfirst=True)
 def pytest_configure(config):
     """pytest configure hook runs before collection."""
+    reset_session_state()
     if not config.option.nodes:
         config.option.nodes = []  # CMN_CFG.nodes
     if not config.option.local:
@@ -427,6 +471,10 @@ def pytest_configure(config):
             LOGGER.info(f'Jira update pytest switch is set to {Globals.JIRA_UPDATE}')
         else:
             Globals.JIRA_UPDATE = False
+    instrument_utils.ENABLED = ast.literal_eval(str(config.option.instrument))
+    Globals.PROFILE_TESTS = {test.strip() for test in config.option.profile.split(",")
+                             if test.strip()}
+    config.session_start_time = time.time()
     # Handle parallel execution.
     if not hasattr(config, 'workerinput'):
         config.shared_directory = tempfile.mkdtemp()
@@ -629,6 +677,10 @@ def pytest_runtest_makereport(item, call):
         setattr(item, "call_duration", call.duration)
     else:
         setattr(item, "call_duration", call.duration + attr)
+    if report.when == 'teardown' and instrument_utils.ENABLED:
+        report_test_latency(item, report)
+    if report.when == 'teardown' and item.nodeid in PROFILERS:
+        stop_profiler(item.nodeid)
 
     _local = bool(item.config.option.local)
     Globals.LOCAL_RUN = _local
@@ -747,6 +799,98 @@ def pytest_runtest_makereport(item, call):
             f.write(report.nodeid + extra + "\n")
 
 
+def _latency_timings_entry(config, test_id: str, summary: dict, start_time: float) -> None:
+    """Queue latency summary for timings DB, entries are stored at session finish."""
+    if config.option.local or not ast.literal_eval(str(config.option.db_update)):
+        return
+    LATENCY_ENTRIES.append({
+        "buildNo": config.option.build,
+        "logs": "",
+        "testID": test_id,
+        "testPlanID": config.option.tp_ticket,
+        "testExecutionID": config.option.te_tkt,
+        "testStartTime": datetime.datetime.fromtimestamp(start_time).isoformat(),
+        "latencySummary": summary,
+    })
+
+
+def store_latency_entries() -> None:
+    """Store queued latency summaries in timings DB, failures are logged only."""
+    if not LATENCY_ENTRIES:
+        return
+    # timings_client asks for DB credentials at import when they are not configured,
+    # so it is only imported once there is something to store
+    from commons.timings_client import create_timings_db_entry
+    for entry in LATENCY_ENTRIES:
+        try:
+            create_timings_db_entry(entry)
+        except (requests.exceptions.RequestException, Exception) as fault:
+            LOGGER.error("Failed to store latency summary of %s: %s", entry["testID"], fault)
+    LATENCY_ENTRIES.clear()
+
+
+def report_test_latency(item, report) -> None:
+    """Attach latency summary of test to report and timings DB."""
+    duration = getattr(item, "call_duration", None)
+    start = instrument_utils.TEST.started
+    summary = instrument_utils.testcase_summary(duration=duration)
+    if not summary["ops"]:
+        return
+    setattr(item, "latency_summary", summary)
+    report.user_properties.append(("latency_summary", summary))
+    report.sections.append(("Latency summary", instrument_utils.format_summary(summary)))
+    LOGGER.info("Latency summary of %s\n%s", report.nodeid,
+                instrument_utils.format_summary(summary))
+    try:
+        test_id = CACHE.lookup(report.nodeid)
+    except KeyError:
+        return
+    _latency_timings_entry(item.config, test_id, summary, start)
+
+
+def report_session_latency(session) -> None:
+    """Log and store latency summary of session."""
+    start = getattr(session.config, "session_start_time", time.time())
+    summary = instrument_utils.session_summary(duration=round(time.time() - start, 3))
+    if not summary["ops"]:
+        return
+    LOGGER.info("Latency summary of session\n%s", instrument_utils.format_summary(summary))
+    worker = os.environ.get("PYTEST_XDIST_WORKER", "")
+    summary_file = os.path.join(os.getcwd(), LOG_DIR, "latest",
+                                f"latency_summary{'_' + worker if worker else ''}.json")
+    try:
+        with open(summary_file, "w", encoding="utf-8") as fp:
+            json.dump(summary, fp, indent=2)
+    except OSError as fault:
+        LOGGER.error("Failed to write %s: %s", summary_file, fault)
+    _latency_timings_entry(session.config, "session", summary, start)
+
+
+def start_profiler(nodeid: str) -> None:
+    """Start sampling profiler if test is selected with --profile."""
+    try:
+        test_id = CACHE.lookup(nodeid)
+    except KeyError:
+        test_id = None
+    if "all" not in Globals.PROFILE_TESTS and test_id not in Globals.PROFILE_TESTS:
+        return
+    profiler = SamplingProfiler()
+    profiler.start()
+    PROFILERS[nodeid] = (test_id, profiler)
+
+
+def stop_profiler(nodeid: str) -> None:
+    """Stop profiler of test and write its stacks and module breakdown to log/latest."""
+    test_id, profiler = PROFILERS.pop(nodeid)
+    profiler.stop()
+    name = test_id or nodeid.split("::")[-1]
+    prefix = os.path.join(os.getcwd(), LOG_DIR, "latest", f"{name}_profile")
+    try:
+        profiler.write(prefix)
+    except OSError as fault:
+        LOGGER.error("Failed to write profile of %s: %s", name, fault)
+
+
 def upload_supporting_logs(test_id: str, remote_path: str, log: str):
     """
     Upload all supporting (s3bench) log files to nfs share
@@ -758,6 +902,8 @@ def upload_supporting_logs(test_id: str, remote_path: str, log: str):
         support_logs = glob.glob(f"{LOG_DIR}/latest/{test_id}_Gui_Logs/*")
     elif log == 's3bench':
         support_logs = glob.glob(f"{LOG_DIR}/latest/{test_id}_{log}_*")
+    elif log == 'profile':
+        support_logs = glob.glob(f"{LOG_DIR}/latest/{test_id}_profile_*")
     else:
         support_logs = glob.glob(f"{LOG_DIR}/latest/logs-cortx-cloud-*")
     LOGGER.debug("support logs is %s", support_logs)
@@ -854,6 +1000,9 @@ def pytest_runtest_logstart(nodeid, location):
     h_chk = Globals.HEALTH_CHK
     if h_chk and not skip_health_check:
         check_health(target)
+    instrument_utils.begin_test()
+    if Globals.PROFILE_TESTS:
+        start_profiler(nodeid)
 
 
 def check_health(target):
@@ -928,6 +1077,7 @@ def pytest_runtest_logreport(report: "TestReport") -> None:
         upload_supporting_logs(test_id, remote_path, "s3bench")
         upload_supporting_logs(test_id, remote_path, "")
         upload_supporting_logs(test_id, remote_path, "csm_gui")
+        upload_supporting_logs(test_id, remote_path, "profile")
         LOGGER.info("Adding log file path to %s", test_id)
         comment = "Log file path: {}".format(os.path.join(resp[1], name))
         if Globals.JIRA_UPDATE:
@@ -965,6 +1115,27 @@ def generate_random_string():
     return ''.join(random.choice(string.ascii_lowercase) for i in range(5))
 
 
+@pytest.fixture(scope="session")
+def s3_account_pool(request):
+    """Session pool of pre-provisioned S3 accounts, deleted at session end."""
+    pool = S3AccountPool(size=request.config.option.s3_account_pool_size)
+    pool.provision()
+    yield pool
+    pool.close()
+
+
+@pytest.fixture(scope="function")
+def s3_account(request, s3_account_pool):
+    """
+    Lease a clean S3 account from pool, scrubbed and returned to pool after test.
+    Mark test with fresh_s3_account to get a new account deleted after test.
+    """
+    fresh = request.node.get_closest_marker("fresh_s3_account") is not None
+    account = s3_account_pool.lease(fresh=fresh)
+    yield account
+    s3_account_pool.release(account)
+
+
 def get_test_status(request, obj, max_timeout=5000):
     poll = time.time() + max_timeout  # max timeout
     while poll > time.time():
@@ -43,13 +43,17 @@ def dict_to_kafka_msg(obj, ctx):
                     targets=obj['targets'],
                     build=obj['build'],
                     build_type=obj['build_type'],
-                    test_plan=obj['test_plan'])
+                    test_plan=obj['test_plan'],
+                    duration=obj.get('duration'))
 
 
-def get_consumer():
+def get_consumer(topic=TEST_EXEC_TOPIC, group_id=TEST_EXEC_TOPIC, subscribe=True):
     """
       Form a consumer configuration
       Subscribe to a given topic
+      :param topic: topic to subscribe
+      :param group_id: consumer group id
+      :param subscribe: subscribe to topic, caller assigns partitions if False
       :return consumer
     """
     json_deserializer = JSONDeserializer(SCHEMA_STR,
@@ -59,14 +63,15 @@ def get_consumer():
     consumer_conf = {'bootstrap.servers': BOOTSTRAP_SERVERS,
                      'key.deserializer': string_deserializer,
                      'value.deserializer': json_deserializer,
-                     'group.id': TEST_EXEC_TOPIC,
+                     'group.id': group_id,
                      'auto.offset.reset': "earliest",
                      'max.poll.interval.ms': 43200000,
                      'fetch.wait.max.ms': 300000
                      }
 
     consumer = DeserializingConsumer(consumer_conf)
-    consumer.subscribe([TEST_EXEC_TOPIC])
+    if subscribe:
+        consumer.subscribe([topic])
     return consumer
 
 
@@ -94,6 +99,7 @@ class KafkaMsg:
         self.build = kwargs.get('build')
         self.test_plan = kwargs.get('test_plan')
         self.build_type = kwargs.get('build_type')
+        self.duration = kwargs.get('duration')
 
     def get_build_number(self):
         """
@@ -149,6 +155,10 @@ SCHEMA_STR = """
             "parallel": {
                 "description": "Test execution can happen in parallel or not",
                 "type": "boolean"
+            },
+            "duration": {
+                "description": "Estimated execution time in seconds",
+                "type": ["number", "null"]
             }
 
         },
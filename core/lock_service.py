@@ -0,0 +1,342 @@
+# -*- coding: utf-8 -*-
+# !/usr/bin/python
+#
+# Copyright (c) 2022 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+#
+
+"""Lease based target locking with atomic compare and set.
+
+   Lock state lives in the target entry of the systems DB as lock_version,
+   lock_leases and lock_waiters. The legacy is_setup_free, setup_in_useby,
+   in_use_for_parallel and parallel_client_cnt fields are kept in sync for
+   existing readers. Every change reads the entry and writes the new state with
+   a filter on lock_version, so concurrent changes never interleave.
+
+   Leases expire unless renewed by a heartbeat, waiters are served in FIFO order
+   and block until the entry changes instead of searching in a loop.
+"""
+import copy
+import json
+import logging
+import random
+import threading
+import time
+from http import HTTPStatus
+
+import requests
+
+from commons import constants as common_cnst
+from commons import params
+
+LOGGER = logging.getLogger(__name__)
+
+#: Seconds a lease or a queued waiter stays valid without renewal.
+LEASE_TTL = 300
+#: Maximum seconds between polls of the REST store while waiting.
+WAIT_POLL_MAX = 30
+#: Seconds a request to the REST store may take, well below renewal interval of a lease.
+REQUEST_TIMEOUT = 30
+
+
+class LocalLockStore:
+    """
+    In memory stand in of systems DB, used in tests and single host runs.
+    Waiters are notified on every change.
+    """
+
+    def __init__(self, setups=None):
+        self._setups = {}
+        self._cond = threading.Condition()
+        for setup in setups or []:
+            self.add(setup)
+
+    def add(self, setup: dict) -> None:
+        """Add or replace target entry."""
+        with self._cond:
+            self._setups[setup["setupname"]] = copy.deepcopy(setup)
+            self._cond.notify_all()
+
+    def find_one(self, target: str):
+        """Return copy of target entry, None if target is unknown."""
+        with self._cond:
+            return copy.deepcopy(self._setups.get(target))
+
+    def compare_and_set(self, target: str, version, fields: dict):
+        """
+        Set fields of target entry if its lock_version is still version.
+        :return: updated entry, None if entry changed meanwhile.
+        """
+        with self._cond:
+            setup = self._setups.get(target)
+            if setup is None or setup.get("lock_version") != version:
+                return None
+            setup.update(copy.deepcopy(fields))
+            setup["lock_version"] = (version or 0) + 1
+            self._cond.notify_all()
+            return copy.deepcopy(setup)
+
+    def wait_for_change(self, versions: dict, timeout: float) -> None:
+        """Block till lock_version of any target differs from versions or timeout."""
+        with self._cond:
+            self._cond.wait_for(
+                lambda: any(self._setups.get(target, {}).get("lock_version") != version
+                            for target, version in versions.items()), timeout)
+
+
+class RestLockStore:
+    """Systems DB accessed through report server, compare and set uses systemdb/cas."""
+
+    def __init__(self, host: str = params.REPORT_SRV, db_username: str = None,
+                 db_password: str = None):
+        if db_username is None:
+            # runner loads DI libraries and cluster config, LocalLockStore and its
+            # unit tests do not need them
+            from core import runner
+            db_username, db_password = runner.get_db_credential()
+        self.db_username = db_username
+        self.db_password = db_password
+        self.url = host + "systemdb/"
+        self.headers = {'content-type': "application/json"}
+
+    def _request(self, method: str, endpoint: str, payload: dict):
+        payload.update({"db_username": self.db_username, "db_password": self.db_password})
+        try:
+            return requests.request(method, self.url + endpoint, headers=self.headers,
+                                    data=json.dumps(payload), timeout=REQUEST_TIMEOUT)
+        except requests.exceptions.RequestException as fault:
+            LOGGER.exception(str(fault))
+            LOGGER.error("Failed to do %s request on db", method)
+        return None
+
+    def find_one(self, target: str):
+        """Return target entry, None if target is unknown or DB is not reachable."""
+        response = self._request("GET", "search", {"query": {"setupname": target}})
+        if response is not None and response.status_code == HTTPStatus.OK:
+            result = response.json()["result"]
+            return result[0] if result else None
+        return None
+
+    def compare_and_set(self, target: str, version, fields: dict):
+        """
+        Set fields of target entry if its lock_version is still version.
+        :return: updated entry, None if entry changed meanwhile or on error.
+        """
+        response = self._request("PATCH", "cas", {
+            "filter": {"setupname": target, "lock_version": version},
+            "update": {"$set": fields, "$inc": {"lock_version": 1}}})
+        if response is not None and response.status_code == HTTPStatus.OK:
+            return response.json()["result"]
+        if response is not None and response.status_code != HTTPStatus.CONFLICT:
+            LOGGER.error("Compare and set on %s failed with %s, %s", target,
+                         response.status_code, response.text)
+        return None
+
+    def wait_for_change(self, versions: dict, timeout: float) -> None:
+        """Poll with growing interval till lock_version of any target changes or timeout."""
+        deadline = time.time() + timeout
+        delay = 1.0
+        while time.time() < deadline:
+            time.sleep(min(delay * random.uniform(0.5, 1.0), deadline - time.time()))
+            for target, version in versions.items():
+                setup = self.find_one(target)
+                if setup is not None and setup.get("lock_version") != version:
+                    return
+            delay = min(delay * 2, WAIT_POLL_MAX)
+
+
+class LeaseLockService:
+    """
+    Shared and exclusive target locks held as leases.
+    Shared holders are counted atomically, a lock is granted only to the head of
+    the wait queue of a target.
+    """
+
+    def __init__(self, store=None, lease_ttl: float = LEASE_TTL):
+        self.store = store if store is not None else RestLockStore()
+        self.lease_ttl = lease_ttl
+
+    @staticmethod
+    def _holders(setup: dict, now: float) -> list:
+        """Live leases and holders locked by clients without lease."""
+        leases = setup.get("lock_leases") or []
+        leased = {lease["client"] for lease in leases}
+        lock_type = common_cnst.SHARED_LOCK if setup.get("in_use_for_parallel") \
+            else common_cnst.EXCLUSIVE_LOCK
+        legacy = [{"client": client, "type": lock_type, "expiry": float("inf")}
+                  for client in (setup.get("setup_in_useby") or "").split()
+                  if client not in leased]
+        return [lease for lease in leases if lease["expiry"] > now] + legacy
+
+    @staticmethod
+    def _lock_fields(holders: list, leases: list) -> dict:
+        """Legacy lock fields matching holders."""
+        shared = bool(holders) and holders[0]["type"] == common_cnst.SHARED_LOCK
+        return {"lock_leases": leases,
+                "is_setup_free": not holders,
+                "setup_in_useby": " ".join(holder["client"] for holder in holders),
+                "in_use_for_parallel": shared,
+                "parallel_client_cnt": len(holders) if shared else 0}
+
+    def _try_acquire(self, target: str, client: str, lock_type: str):
+        """
+        Take lock if compatible with holders and client is head of wait queue,
+        otherwise queue client.
+        :return: tuple of acquired flag and lock_version to wait on.
+        """
+        while True:
+            setup = self.store.find_one(target)
+            if setup is None:
+                LOGGER.error("target %s is not present in db", target)
+                return False, None
+            now = time.time()
+            version = setup.get("lock_version")
+            holders = [holder for holder in self._holders(setup, now)
+                       if holder["client"] != client]
+            waiters = [waiter for waiter in setup.get("lock_waiters") or []
+                       if waiter["expiry"] > now]
+            position = next((index for index, waiter in enumerate(waiters)
+                             if waiter["client"] == client), len(waiters))
+            compatible = not holders or (lock_type == common_cnst.SHARED_LOCK and all(
+                holder["type"] == common_cnst.SHARED_LOCK for holder in holders))
+            entry = {"client": client, "type": lock_type, "expiry": now + self.lease_ttl}
+            if setup.get("is_setup_healthy", True) and compatible and position == 0:
+                leases = [holder for holder in holders if holder["expiry"] != float("inf")]
+                fields = self._lock_fields(holders + [entry], leases + [entry])
+                fields["lock_waiters"] = [waiter for waiter in waiters
+                                          if waiter["client"] != client]
+                if self.store.compare_and_set(target, version, fields) is not None:
+                    LOGGER.info("%s lock on %s acquired by %s", lock_type, target, client)
+                    return True, None
+                continue
+            # Refresh own queue entry only when it is new or half expired.
+            own = waiters[position] if position < len(waiters) else None
+            if own and own["expiry"] - now > self.lease_ttl / 2 and \
+                    len(waiters) == len(setup.get("lock_waiters") or []):
+                return False, version
+            waiters = [waiter for waiter in waiters if waiter["client"] != client]
+            waiters.insert(position, entry)
+            updated = self.store.compare_and_set(target, version, {"lock_waiters": waiters})
+            if updated is not None:
+                return False, updated.get("lock_version")
+
+    def _update_own(self, target: str, lease_update, waiter_update=None) -> bool:
+        """Apply change to own lease and queue entry of client with compare and set."""
+        while True:
+            setup = self.store.find_one(target)
+            if setup is None:
+                return False
+            now = time.time()
+            holders = self._holders(setup, now)
+            waiters = [waiter for waiter in setup.get("lock_waiters") or []
+                       if waiter["expiry"] > now]
+            new_holders = lease_update(holders, now)
+            if new_holders is None:
+                return False
+            new_waiters = waiter_update(waiters) if waiter_update else waiters
+            leases = [holder for holder in new_holders if holder["expiry"] != float("inf")]
+            fields = self._lock_fields(new_holders, leases)
+            fields["lock_waiters"] = new_waiters
+            if self.store.compare_and_set(target, setup.get("lock_version"), fields) is not None:
+                return True
+
+    def acquire(self, targets: list, client: str, lock_type: str, timeout: float = None) -> str:
+        """
+        Wait for lock on any of targets.
+        :param targets: target names in order of preference.
+        :param client: unique client name.
+        :param lock_type: common_cnst.SHARED_LOCK or common_cnst.EXCLUSIVE_LOCK.
+        :param timeout: seconds to wait, wait forever if None.
+        :return: locked target, empty string on timeout.
+        """
+        deadline = time.time() + timeout if timeout is not None else None
+        while True:
+            versions = {}
+            for target in targets:
+                acquired, version = self._try_acquire(target, client, lock_type)
+                if acquired:
+                    for other in targets:
+                        if other != target:
+                            self.withdraw(other, client)
+                    return target
+                versions[target] = version
+            wait = self.lease_ttl / 3
+            if deadline is not None:
+                wait = min(wait, deadline - time.time())
+                if wait <= 0:
+                    for target in targets:
+                        self.withdraw(target, client)
+                    return ""
+            LOGGER.debug("%s waiting for %s lock on %s", client, lock_type, targets)
+            self.store.wait_for_change(versions, wait)
+
+    def renew(self, target: str, client: str) -> bool:
+        """Extend lease of client, False if client does not hold a lease anymore."""
+
+        def extend(holders, now):
+            if not any(holder["client"] == client for holder in holders):
+                return None
+            for holder in holders:
+                if holder["client"] == client:
+                    holder["expiry"] = now + self.lease_ttl
+            return holders
+
+        return self._update_own(target, extend)
+
+    def release(self, target: str, client: str) -> bool:
+        """Release lease of client, target is free once last holder released."""
+
+        def drop(holders, _):
+            if not any(holder["client"] == client for holder in holders):
+                return None
+            return [holder for holder in holders if holder["client"] != client]
+
+        released = self._update_own(target, drop)
+        if released:
+            LOGGER.info("lock on %s released by %s", target, client)
+        return released
+
+    def withdraw(self, target: str, client: str) -> bool:
+        """Remove client from wait queue of target."""
+        setup = self.store.find_one(target)
+        if not setup or not any(waiter["client"] == client
+                                for waiter in setup.get("lock_waiters") or []):
+            return False
+        return self._update_own(
+            target, lambda holders, _: holders,
+            lambda waiters: [waiter for waiter in waiters if waiter["client"] != client])
+
+
+class LeaseHeartbeat(threading.Thread):
+    """Renew lease of a client in background till stopped or lease is lost."""
+
+    def __init__(self, service: LeaseLockService, target: str, client: str):
+        super().__init__(name=f"lease-{target}", daemon=True)
+        self.service = service
+        self.target = target
+        self.client = client
+        self._stop_event = threading.Event()
+
+    def run(self) -> None:
+        while not self._stop_event.wait(self.service.lease_ttl / 3):
+            if not self.service.renew(self.target, self.client):
+                LOGGER.warning("Lease of %s on %s is lost", self.client, self.target)
+                break
+
+    def stop(self) -> None:
+        """Stop renewing lease."""
+        self._stop_event.set()
+        self.join()
@@ -39,7 +39,7 @@ class Ticket:
     """
 
     def __init__(self, tag, parallel, test_set, te_ticket, targets, build,
-                 build_type, test_plan):
+                 build_type, test_plan, duration=None, partition=-1):
         """
         Constructs the object to be fed into Message bus.
         Args:
@@ -48,6 +48,8 @@ class Ticket:
         test_set (set or string): tests to be executed.
         te_tickets (list): List of test execution tickets
         build (str): build number or string
+        duration (float): estimated execution time in seconds
+        partition (int): Kafka partition to produce to, -1 uses the partitioner
         """
         self.tag = tag
         self.parallel = parallel
@@ -58,6 +60,9 @@ class Ticket:
         self.build = build
         self.build_type = build_type
         self.test_plan = test_plan
+        self.duration = duration
+        # partition is not serialized
+        self.partition = partition
 
     def __str__(self):
         print(' '.join([self.tag, str(self.parallel), str(self.targets), str(self.build),
@@ -83,7 +88,8 @@ def convert_ticket_to_dict(ticket, ctx):
                 build=ticket.build,
                 parallel=ticket.parallel,
                 build_type=ticket.build_type,
-                test_plan=ticket.test_plan)
+                test_plan=ticket.test_plan,
+                duration=ticket.duration)
 
 
 def delivery_report(err, msg):
@@ -107,7 +113,8 @@ def delivery_report(err, msg):
         msg.key(), msg.topic(), msg.partition(), msg.offset()))
 
 
-def produce(producer, topic, uuid=None, value=None, on_delivery=delivery_report):
+def produce(producer, topic, uuid=None, value=None, on_delivery=delivery_report,
+            partition=-1):
     """
     Produce the ticket message i.e. value to topic.
     :param producer:
@@ -115,18 +122,19 @@ def produce(producer, topic, uuid=None, value=None, on_delivery=delivery_report)
     :param uuid:
     :param value:
     :param on_delivery:
+    :param partition: target partition, -1 uses the configured partitioner
     """
     # Serve on_delivery callbacks from previous calls to produce()
     producer.poll(0.0)
     producer.produce(topic=topic, key=uuid, value=value,
-                     on_delivery=on_delivery)
+                     on_delivery=on_delivery, partition=partition)
     print("\nFlushing records...")
 
 
 def server(*args: Any) -> None:
     """
-    Demon thread to read work queue items, process and call produce on them.
-    :param args:
+    Demon thread to read Ticket items of work queue and call produce on them.
+    :param args: topic and work queue, None item stops the server.
     :return:
     """
     topic, work_queue = args
@@ -171,6 +179,10 @@ def server(*args: Any) -> None:
             "parallel": {
                 "description": "Test execution can happen in parallel or not",
                 "type": "boolean"
+            },
+            "duration": {
+                "description": "Estimated execution time in seconds",
+                "type": ["number", "null"]
             }
 
         },
@@ -196,17 +208,11 @@ def server(*args: Any) -> None:
             if work_item is None:
                 work_queue.task_done()  # poisoning will break the loop
                 break
-            test_set = list(work_item.get())
-            te_ticket = work_item.tickets
-            ticket = Ticket(work_item.tag, work_item.parallel,
-                            test_set, str(te_ticket), work_item.targets,
-                            str(work_item.build), work_item.build_type,
-                            work_item.test_plan)
-            LOGGER.info("Ticket picked up for execution is  %s", test_set)
-            print(f"Ticket picked up for execution is {test_set}")
+            ticket = work_item
+            LOGGER.info("Ticket picked up for execution is  %s", ticket.test_set)
+            print(f"Ticket picked up for execution is {ticket.test_set}")
             produce(producer, topic=topic, uuid=str(uuid4()), value=ticket,
-                    on_delivery=delivery_report)
-            work_item.task_done()
+                    on_delivery=delivery_report, partition=ticket.partition)
             work_queue.task_done()
         except ValueError:
             print("Invalid input ticket, discarding record...")
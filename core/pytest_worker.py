@@ -0,0 +1,276 @@
+# -*- coding: utf-8 -*-
+# !/usr/bin/python
+#
+# Copyright (c) 2022 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+#
+
+"""Warm pytest workers for the Kafka test runner.
+
+   A worker is a long lived python process bound to one target. It imports the
+   test libraries and collects the test tree once, mapping test ids (tags marker)
+   to node ids. Test batches arrive over a local unix socket and run in process
+   with pytest.main on the mapped node ids only, results are sent back per node id.
+   A worker exits after max_batches batches or once its RSS exceeds max_rss_mb,
+   the pool then starts a fresh one.
+
+   Run as: python -m core.pytest_worker --address <socket path>
+   with WORKER_AUTHKEY and TARGET set in environment.
+"""
+import argparse
+import logging
+import os
+import resource
+import secrets
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from multiprocessing.connection import Client
+from multiprocessing.connection import Listener
+
+import pytest
+
+LOGGER = logging.getLogger(__name__)
+
+#: Libraries imported before first batch.
+WARM_IMPORTS = ("boto3", "botocore", "paramiko", "requests", "config", "commons.utils.system_utils")
+AUTHKEY_ENV = "WORKER_AUTHKEY"
+
+
+def rss_mb() -> float:
+    """Resident set size of current process in MB."""
+    try:
+        with open("/proc/self/status", encoding="utf-8") as status:
+            for line in status:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+class TestMapPlugin:
+    """Collect test id to node id map of collected items."""
+
+    def __init__(self):
+        self.node_ids = {}
+
+    def pytest_collection_modifyitems(self, items):
+        """Record tags marker of every item."""
+        for item in items:
+            for mark in item.iter_markers(name="tags"):
+                self.node_ids.setdefault(mark.args[0], []).append(item.nodeid)
+
+
+class ResultPlugin:
+    """Collect outcome per node id of a batch."""
+
+    def __init__(self):
+        self.results = {}
+
+    def pytest_runtest_logreport(self, report):
+        """Keep call outcome, or setup/teardown outcome when it failed or skipped."""
+        if report.when == "call" or not report.passed:
+            if self.results.get(report.nodeid) in (None, "passed"):
+                self.results[report.nodeid] = report.outcome
+
+
+class PytestWorker:
+    """Worker process side, serves batches on a unix socket."""
+
+    def __init__(self, address: str, authkey: bytes, max_batches: int, max_rss_mb: float,
+                 collect_args: list = None):
+        self.address = address
+        self.authkey = authkey
+        self.max_batches = max_batches
+        self.max_rss_mb = max_rss_mb
+        self.collect_args = collect_args or []
+        self.node_ids = {}
+        self.batches = 0
+
+    def warm_up(self) -> None:
+        """Import libraries and collect test tree once."""
+        for module in WARM_IMPORTS:
+            try:
+                __import__(module)
+            except Exception as error:  # pylint: disable=broad-except
+                LOGGER.warning("Could not pre-import %s: %s", module, error)
+        mapper = TestMapPlugin()
+        pytest.main(["--collect-only", "-q", "-p", "no:cacheprovider"] + self.collect_args,
+                     plugins=[mapper])
+        self.node_ids = mapper.node_ids
+        LOGGER.info("Worker %s warmed up with %s tests", os.getpid(), len(self.node_ids))
+
+    def run_batch(self, batch: dict) -> dict:
+        """Run pytest with batch args on node ids of batch tests."""
+        node_ids = [node_id for test in batch["tests"] for node_id in self.node_ids.get(test, [])]
+        missing = [test for test in batch["tests"] if test not in self.node_ids]
+        if missing:
+            LOGGER.warning("Tests %s not found in collected tree", missing)
+        results = ResultPlugin()
+        start = time.time()
+        os.environ.update(batch.get("env", {}))
+        exit_code = int(pytest.main(list(batch["args"]) + node_ids, plugins=[results])) \
+            if node_ids else 5  # pytest.ExitCode.NO_TESTS_COLLECTED
+        self.batches += 1
+        return {"exit_code": exit_code, "results": results.results, "missing": missing,
+                "duration": time.time() - start, "recycle": self.should_recycle()}
+
+    def should_recycle(self) -> bool:
+        """Recycle after max batches or above memory threshold."""
+        return self.batches >= self.max_batches or rss_mb() > self.max_rss_mb
+
+    def serve(self) -> None:
+        """Serve batches till recycled or connection closed."""
+        self.warm_up()
+        with Listener(self.address, family="AF_UNIX", authkey=self.authkey) as listener:
+            with listener.accept() as conn:
+                while True:
+                    try:
+                        batch = conn.recv()
+                    except EOFError:
+                        break
+                    reply = self.run_batch(batch)
+                    conn.send(reply)
+                    if reply["recycle"]:
+                        LOGGER.info("Recycling worker after %s batches, rss %.0f MB",
+                                    self.batches, rss_mb())
+                        break
+
+
+class WarmWorker:
+    """Client side handle of a worker process."""
+
+    # pylint: disable=too-many-arguments
+    def __init__(self, target: str, max_batches: int = 20, max_rss_mb: float = 4096,
+                 env: dict = None, collect_args: list = None):
+        self.target = target
+        self.address = os.path.join(tempfile.mkdtemp(prefix="pytest_worker_"), "sock")
+        authkey = secrets.token_bytes(32)
+        self._authkey = authkey
+        worker_env = os.environ.copy()
+        worker_env.update(env or {})
+        worker_env.update({"TARGET": target, AUTHKEY_ENV: authkey.hex()})
+        cmd = [sys.executable, "-m", "core.pytest_worker", "--address", self.address,
+               "--max_batches", str(max_batches), "--max_rss_mb", str(max_rss_mb),
+               "--"] + list(collect_args or [])
+        self.proc = subprocess.Popen(cmd, env=worker_env)
+        self.conn = None
+
+    def connect(self, timeout: float = 1800) -> None:
+        """Wait till worker finished warm up and accepts batches."""
+        deadline = time.time() + timeout
+        while self.conn is None:
+            if self.proc.poll() is not None:
+                raise RuntimeError(f"Worker exited with {self.proc.returncode} during warm up")
+            try:
+                self.conn = Client(self.address, family="AF_UNIX", authkey=self._authkey)
+            except (FileNotFoundError, ConnectionRefusedError) as err:
+                if time.time() > deadline:
+                    raise TimeoutError(
+                        f"Worker for {self.target} not ready in {timeout}s") from err
+                time.sleep(1)
+
+    def run_batch(self, args: list, tests: list, env: dict = None) -> dict:
+        """Send batch and wait for its results."""
+        self.connect()
+        self.conn.send({"args": list(args), "tests": list(tests), "env": env or {}})
+        return self.conn.recv()
+
+    def alive(self) -> bool:
+        """Worker process is running."""
+        return self.proc.poll() is None
+
+    def close(self) -> None:
+        """Stop worker."""
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
+        try:
+            self.proc.wait(timeout=60)
+        except subprocess.TimeoutExpired:
+            self.proc.kill()
+            self.proc.wait()
+        try:
+            os.remove(self.address)
+        except OSError:
+            pass
+        os.rmdir(os.path.dirname(self.address))
+
+
+class WorkerPool:
+    """
+    Warm workers per target. A worker is replaced in background as soon as it
+    asks to be recycled, so the next batch finds a warm worker.
+    """
+
+    def __init__(self, max_batches: int = 20, max_rss_mb: float = 4096, env: dict = None,
+                 collect_args: list = None):
+        self.max_batches = max_batches
+        self.max_rss_mb = max_rss_mb
+        self.env = env or {}
+        self.collect_args = collect_args or []
+        self._workers = {}
+        self._lock = threading.Lock()
+
+    def _spawn(self, target: str) -> WarmWorker:
+        return WarmWorker(target, self.max_batches, self.max_rss_mb, self.env,
+                          self.collect_args + ["--target=" + target])
+
+    def run_batch(self, target: str, args: list, tests: list, env: dict = None) -> dict:
+        """Run tests on warm worker of target."""
+        with self._lock:
+            worker = self._workers.get(target)
+            if worker is None or not worker.alive():
+                worker = self._workers[target] = self._spawn(target)
+        try:
+            reply = worker.run_batch(args, tests, env)
+        except (EOFError, OSError) as error:
+            LOGGER.error("Worker for %s failed: %s", target, error)
+            reply = {"exit_code": -1, "results": {}, "missing": list(tests), "recycle": True}
+        if reply["recycle"]:
+            worker.close()
+            with self._lock:
+                self._workers[target] = self._spawn(target)
+        return reply
+
+    def close(self) -> None:
+        """Stop all workers."""
+        with self._lock:
+            for worker in self._workers.values():
+                worker.close()
+            self._workers.clear()
+
+
+def main():
+    """Worker process entry point."""
+    parser = argparse.ArgumentParser(description="Warm pytest worker")
+    parser.add_argument("--address", required=True, help="unix socket path")
+    parser.add_argument("--max_batches", type=int, default=20)
+    parser.add_argument("--max_rss_mb", type=float, default=4096)
+    parser.add_argument("collect_args", nargs=argparse.REMAINDER,
+                        help="pytest args used for collection")
+    opts = parser.parse_args()
+    collect_args = [arg for arg in opts.collect_args if arg != "--"]
+    authkey = bytes.fromhex(os.environ.pop(AUTHKEY_ENV))
+    PytestWorker(opts.address, authkey, opts.max_batches, opts.max_rss_mb,
+                 collect_args).serve()
+
+
+if __name__ == '__main__':
+    main()
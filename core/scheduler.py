@@ -0,0 +1,387 @@
+# -*- coding: utf-8 -*-
+# !/usr/bin/python
+#
+# Copyright (c) 2022 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+#
+
+"""Duration aware scheduler for distributed test execution.
+
+   Work items (parallel groups and sequential tests) are bin packed onto targets
+   longest processing time first, using historical test execution times from the
+   reports DB. Every distributed execution gets its own topic with one partition
+   per target, so executions no longer share or delete a common topic.
+
+   Runners consume their own partition longest first. A runner whose partition
+   is drained steals the shortest remaining item from the most loaded partition.
+   Ownership of an item is decided by a single partition claims topic, the first
+   claim in log order wins, so an item is executed exactly once.
+
+   A runner which has executed its last item publishes a done marker in the claims
+   topic. The runner finishing when every partition has a done marker deletes the
+   topics of the execution. Topics of executions with a crashed or killed runner are
+   retained and have to be deleted with delete_execution_topics.
+"""
+import heapq
+import json
+import logging
+import time
+from dataclasses import dataclass
+from dataclasses import field
+from http import HTTPStatus
+from typing import Dict
+from typing import Iterable
+from typing import List
+from uuid import uuid4
+
+import requests
+from confluent_kafka import Consumer
+from confluent_kafka import OFFSET_BEGINNING
+from confluent_kafka import Producer
+from confluent_kafka import TopicPartition
+from confluent_kafka.admin import AdminClient
+from confluent_kafka.admin import NewTopic
+
+from commons.params import BOOTSTRAP_SERVERS
+from commons.params import REPORT_SRV
+from commons.params import TEST_EXEC_TOPIC
+from core import kafka_consumer
+
+LOGGER = logging.getLogger(__name__)
+
+AGGREGATE_EP = REPORT_SRV + "reportsdb/aggregate"
+#: Duration in seconds assumed for tests without history.
+DEFAULT_TEST_DURATION = 600
+#: Seconds to wait for test durations before scheduling with default durations.
+DURATIONS_TIMEOUT = 30
+STOP_TICKET = "STOP"
+DONE_KEY = "done"
+
+
+@dataclass
+class WorkItem:
+    """Parallel group or single sequential test scheduled as one Kafka message."""
+
+    tag: str
+    parallel: bool
+    tests: List[str]
+    ticket: str
+    duration: float = 0.0
+
+
+@dataclass
+class Bin:
+    """Work items assigned to one target partition, longest first."""
+
+    partition: int
+    load: float = 0.0
+    items: List[WorkItem] = field(default_factory=list)
+
+
+def execution_topic(execution_id: str) -> str:
+    """Topic holding work items of one distributed execution."""
+    return f"{TEST_EXEC_TOPIC}-{execution_id}"
+
+
+def claims_topic(execution_id: str) -> str:
+    """Single partition topic holding item claims of one distributed execution."""
+    return f"{execution_topic(execution_id)}-claims"
+
+
+def get_test_durations(test_ids: Iterable[str], db_username: str,
+                       db_password: str) -> Dict[str, float]:
+    """
+    Get average execution time of passed runs per test from reports DB.
+    :param test_ids: test ids to look up.
+    :param db_username: reports DB user.
+    :param db_password: reports DB password.
+    :return: dict of test id to duration in seconds, tests without history are omitted.
+    """
+    payload = {
+        "aggregate": [
+            {"$match": {"testID": {"$in": list(test_ids)},
+                        "testResult": {"$in": ["PASS", "Pass"]},
+                        "testExecutionTime": {"$gt": 0}}},
+            {"$group": {"_id": "$testID", "duration": {"$avg": "$testExecutionTime"}}}],
+        "db_username": db_username,
+        "db_password": db_password}
+    headers = {'Content-Type': 'application/json'}
+    # timeout of a hanging report server falls back to default durations as well
+    try:
+        response = requests.request("GET", AGGREGATE_EP, headers=headers,
+                                    data=json.dumps(payload), timeout=DURATIONS_TIMEOUT)
+    except requests.exceptions.RequestException as fault:
+        LOGGER.exception(str(fault))
+        LOGGER.error("Failed to get test durations, scheduling with default durations")
+        return {}
+    if response.status_code != HTTPStatus.OK:
+        LOGGER.error("GET request on %s failed with %s, %s.", AGGREGATE_EP,
+                     response.status_code, response.text)
+        return {}
+    return {entry["_id"]: float(entry["duration"]) for entry in response.json()["result"]}
+
+
+def estimate_durations(work_items: List[WorkItem],
+                       durations: Dict[str, float]) -> List[WorkItem]:
+    """
+    Set estimated duration of work items from test durations.
+    A parallel group is run serially by test runner so its duration is the sum of its tests.
+    :param work_items: work items of drunner execution plan.
+    :param durations: test id: duration in seconds, median is assumed for unknown tests.
+    """
+    known = sorted(durations.values())
+    default = known[len(known) // 2] if known else DEFAULT_TEST_DURATION
+    for item in work_items:
+        item.duration = sum(durations.get(test, default) for test in item.tests)
+    return work_items
+
+
+def plan(work_items: List[WorkItem], bins: int) -> List[Bin]:
+    """
+    Assign work items to bins longest processing time first.
+    Every item goes to the least loaded bin, items of a bin stay longest first.
+    """
+    result = [Bin(partition) for partition in range(max(bins, 1))]
+    heap = [(0.0, b_in.partition) for b_in in result]
+    for item in sorted(work_items, key=lambda w_item: w_item.duration, reverse=True):
+        load, partition = heapq.heappop(heap)
+        b_in = result[partition]
+        b_in.items.append(item)
+        b_in.load = load + item.duration
+        heapq.heappush(heap, (b_in.load, partition))
+    for b_in in result:
+        LOGGER.info("Partition %s: %s items, estimated %.0f seconds", b_in.partition,
+                    len(b_in.items), b_in.load)
+    return result
+
+
+def create_execution_topics(admin_client: AdminClient, execution_id: str,
+                            partitions: int) -> None:
+    """Create work and claims topics of an execution, existing topics are left untouched."""
+    topics = [NewTopic(execution_topic(execution_id), partitions, 1),
+              NewTopic(claims_topic(execution_id), 1, 1)]
+    for topic, future in admin_client.create_topics(topics).items():
+        try:
+            future.result()
+            LOGGER.info("Topic %s created", topic)
+        except Exception as fault:  # pylint: disable=broad-except
+            LOGGER.info("Failed to create topic %s: %s", topic, fault)
+
+
+def delete_execution_topics(admin_client: AdminClient, execution_id: str) -> None:
+    """Delete work and claims topics of a finished execution."""
+    topics = [execution_topic(execution_id), claims_topic(execution_id)]
+    for topic, future in admin_client.delete_topics(topics, operation_timeout=30).items():
+        try:
+            future.result()
+            LOGGER.info("Topic %s deleted", topic)
+        except Exception as fault:  # pylint: disable=broad-except
+            LOGGER.info("Failed to delete topic %s: %s", topic, fault)
+
+
+class ClaimLog:
+    """Claims of work items, first claim of an item in the claims topic owns it."""
+
+    def __init__(self, execution_id: str, runner_id: str, timeout: int = 60):
+        self.topic = claims_topic(execution_id)
+        self.runner_id = runner_id
+        self.timeout = timeout
+        self.owners = {}
+        self.done = set()
+        self._seen = set()
+        self.producer = Producer({"bootstrap.servers": BOOTSTRAP_SERVERS})
+        self.consumer = Consumer({"bootstrap.servers": BOOTSTRAP_SERVERS,
+                                  "group.id": f"{self.topic}-{runner_id}",
+                                  "enable.auto.commit": False})
+        self.consumer.assign([TopicPartition(self.topic, 0, OFFSET_BEGINNING)])
+
+    def _consume(self, timeout: float) -> bool:
+        msg = self.consumer.poll(timeout)
+        if msg is None or msg.error():
+            return False
+        claim = json.loads(msg.value())
+        if claim.get(DONE_KEY):
+            self.done.add(claim["runner"])
+        else:
+            self.owners.setdefault(msg.key().decode(), claim["runner"])
+        self._seen.add(claim["nonce"])
+        return True
+
+    def _publish(self, key: str, **claim) -> None:
+        """Publish claim and wait until it is read back from claims topic."""
+        nonce = str(uuid4())
+        self.producer.produce(self.topic, key=key,
+                              value=json.dumps({"runner": self.runner_id, "nonce": nonce,
+                                                **claim}))
+        self.producer.flush()
+        deadline = time.time() + self.timeout
+        while nonce not in self._seen:
+            if time.time() > deadline:
+                raise TimeoutError(f"Claim of {key} not seen in {self.topic}")
+            self._consume(1.0)
+
+    def refresh(self) -> None:
+        """Read all claims published so far."""
+        while self._consume(0.5):
+            pass
+
+    def claim(self, key: str) -> bool:
+        """
+        Claim work item.
+        :param key: message key of work item.
+        :return: True if this runner owns the item.
+        """
+        self.refresh()
+        if key not in self.owners:
+            self._publish(key)
+        return self.owners[key] == self.runner_id
+
+    def mark_done(self) -> set:
+        """
+        Publish that this runner has executed all its items.
+        :return: runners done so far including this one.
+        """
+        self._publish(f"{DONE_KEY}-{self.runner_id}", done=True)
+        self.refresh()
+        return self.done
+
+    def close(self) -> None:
+        """Close claims consumer."""
+        self.consumer.close()
+
+
+class ScheduledConsumer:
+    """
+    Iterate over work items of one execution for a test runner.
+    Items of partitions assigned to this runner are consumed first, then remaining
+    items of other partitions are stolen. Iteration ends when every partition has
+    its stop marker and every item is claimed.
+    """
+
+    def __init__(self, execution_id: str, runner_id: str, poll_timeout: int = 10,
+                 idle_polls: int = 30):
+        self.execution_id = execution_id
+        self.topic = execution_topic(execution_id)
+        self.poll_timeout = poll_timeout
+        self.idle_polls = idle_polls
+        self.consumer = kafka_consumer.get_consumer(topic=self.topic, group_id=self.topic)
+        self.scanner = kafka_consumer.get_consumer(group_id=f"{self.topic}-{runner_id}",
+                                                   subscribe=False)
+        self.claims = ClaimLog(execution_id, runner_id)
+        self._pending = {}
+        self._stopped = set()
+        self._offsets = {}
+        self.finished = False
+
+    def _scan(self) -> None:
+        """Read new messages of all partitions and drop claimed items."""
+        partitions = self.scanner.list_topics(self.topic).topics[self.topic].partitions
+        assignment = []
+        highs = {}
+        for partition in partitions:
+            _, highs[partition] = self.scanner.get_watermark_offsets(
+                TopicPartition(self.topic, partition))
+            if self._offsets.get(partition, 0) < highs[partition]:
+                assignment.append(TopicPartition(self.topic, partition,
+                                                 self._offsets.get(partition, OFFSET_BEGINNING)))
+            self._pending.setdefault(partition, [])
+        if assignment:
+            self.scanner.assign(assignment)
+            remaining = {t_p.partition for t_p in assignment}
+            while remaining:
+                msg = self.scanner.poll(self.poll_timeout)
+                if msg is None:
+                    break
+                if msg.error():
+                    continue
+                self._offsets[msg.partition()] = msg.offset() + 1
+                if msg.offset() + 1 >= highs[msg.partition()]:
+                    remaining.discard(msg.partition())
+                self._add(msg.partition(), msg.key(), msg.value())
+        self.claims.refresh()
+        for partition, items in self._pending.items():
+            self._pending[partition] = [(key, value) for key, value in items
+                                        if key not in self.claims.owners]
+
+    def _add(self, partition, key, value) -> None:
+        if value is None:
+            return
+        if value.te_ticket == STOP_TICKET:
+            self._stopped.add(partition)
+        else:
+            self._pending[partition].append((key, value))
+
+    def _steal(self):
+        """Claim shortest remaining item of most loaded partition, None if nothing left."""
+        self._scan()
+        while True:
+            candidates = [(sum(value.duration or 0 for _, value in items), partition)
+                          for partition, items in self._pending.items() if items]
+            if not candidates:
+                return None
+            _, partition = max(candidates)
+            key, value = self._pending[partition].pop()
+            if self.claims.claim(key):
+                LOGGER.info("Stole %s from partition %s", value.test_list, partition)
+                return value
+
+    def _finished(self) -> bool:
+        return bool(self._pending) and self._stopped == set(self._pending) and \
+            not any(self._pending.values())
+
+    def __iter__(self):
+        idle = 0
+        while idle < self.idle_polls:
+            msg = self.consumer.poll(self.poll_timeout)
+            if msg is not None and not msg.error() and msg.value() is not None:
+                idle = 0
+                if msg.value().te_ticket == STOP_TICKET:
+                    continue
+                if self.claims.claim(msg.key()):
+                    yield msg.value()
+                continue
+            value = self._steal()
+            if value is not None:
+                idle = 0
+                yield value
+            elif self._finished():
+                self.finished = True
+                return
+            else:
+                idle += 1
+        LOGGER.warning("No work received from %s in %s polls", self.topic, self.idle_polls)
+
+    def finish(self, admin_client: AdminClient = None) -> bool:
+        """
+        Mark this runner done, last runner of the execution deletes its topics.
+        Call after the last yielded item is executed and only if iteration finished.
+        :param admin_client: Kafka admin client used to delete topics.
+        :return: True if topics were deleted.
+        """
+        done = self.claims.mark_done()
+        if len(done) < len(self._pending):
+            LOGGER.info("%s of %s runners of %s done", len(done), len(self._pending),
+                        self.topic)
+            return False
+        admin_client = admin_client or AdminClient({"bootstrap.servers": BOOTSTRAP_SERVERS})
+        delete_execution_topics(admin_client, self.execution_id)
+        return True
+
+    def close(self) -> None:
+        """Close consumers."""
+        self.consumer.close()
+        self.scanner.close()
+        self.claims.close()
@@ -0,0 +1,191 @@
+# -*- coding: utf-8 -*-
+# !/usr/bin/python
+#
+# Copyright (c) 2022 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+#
+
+"""Compact index of the collected test universe used by drunner for planning.
+
+   Every collected test gets an integer id in collection order. Per test only the
+   node id, the interned feature mark and flags are kept, tests of a mark are kept
+   as an array of ids. Selecting the tests of TE tickets marks a bytearray, groups
+   of a mark are then formed by filtering its id array with the selection.
+"""
+import json
+import logging
+import sys
+from array import array
+from typing import Dict
+from typing import Iterator
+from typing import List
+
+from core.scheduler import WorkItem
+
+LOGGER = logging.getLogger(__name__)
+
+SKIP_MARKS = ("dataprovider", "test", "run", "skip", "usefixtures",
+              "filterwarnings", "skipif", "xfail", "parametrize")
+INTERNAL_SKIP_MARKS = ('release_regression', 'sanity')
+BASE_COMPONENTS_MARKS = ('cluster_user_ops', 'cluster_management_ops', 's3_ops',
+                         'ha', 'stress', 'longevity', 'scalability',
+                         'combinational')
+SPECIAL_MARKS = ('parallel',)
+NO_MARK = -1
+_IGNORED_MARKS = frozenset(SKIP_MARKS + SPECIAL_MARKS + INTERNAL_SKIP_MARKS)
+
+
+def iter_json_array(path: str, chunk_size: int = 1 << 16) -> Iterator:
+    """
+    Yield objects of a JSON array of objects without reading the whole file.
+    :param path: JSON file path.
+    :param chunk_size: characters read at a time.
+    """
+    decoder = json.JSONDecoder()
+    with open(path, encoding="utf-8") as json_file:
+        buf = json_file.read(chunk_size).lstrip()
+        if not buf.startswith("["):
+            raise ValueError(f"{path} does not contain a JSON array")
+        pos, eof = 1, False
+        while True:
+            while pos < len(buf) and buf[pos] in " \t\r\n,":
+                pos += 1
+            if pos < len(buf) and buf[pos] == "]":
+                return
+            try:
+                if pos == len(buf):
+                    raise json.JSONDecodeError("Expecting value", buf, pos)
+                obj, pos = decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                chunk = json_file.read(chunk_size)
+                eof = not chunk
+                buf, pos = buf[pos:] + chunk, 0
+                continue
+            yield obj
+
+
+class TestIndex:
+    """Integer indexed test universe with array backed tests per feature mark."""
+
+    def __init__(self):
+        self.test_ids = []  # id: test id
+        self.node_ids = []  # id: node id
+        self.marks = []  # mark index: interned mark
+        self.test_mark = array('i')  # id: mark index or NO_MARK
+        self.parallel = bytearray()  # id: 1 if test can run in parallel
+        self.skipped = bytearray()  # id: 1 if test has skip mark
+        self.members = []  # mark index: array of ids having the mark as feature mark
+        self._ids = {}
+        self._mark_ids = {}
+
+    def __len__(self):
+        return len(self.test_ids)
+
+    def __contains__(self, test_id):
+        return test_id in self._ids
+
+    def _mark_index(self, mark: str) -> int:
+        index = self._mark_ids.get(mark)
+        if index is None:
+            index = self._mark_ids[sys.intern(mark)] = len(self.marks)
+            self.marks.append(sys.intern(mark))
+            self.members.append(array('i'))
+        return index
+
+    def add(self, test_id: str, node_id: str, marks: List[str]) -> None:
+        """
+        Index a collected test. Feature mark is the last mark which is not a skip,
+        special or internal mark, else the first base component mark.
+        A test id collected more than once (parametrized test) is indexed once.
+        """
+        if test_id in self._ids:
+            return
+        test_mark, parent_mark = None, None
+        for mark in marks:
+            if mark in _IGNORED_MARKS:
+                continue
+            if mark in BASE_COMPONENTS_MARKS:
+                parent_mark = parent_mark or mark
+                continue
+            test_mark = mark
+        test_mark = test_mark or parent_mark
+        tid = len(self.test_ids)
+        self._ids[sys.intern(test_id)] = tid
+        self.test_ids.append(sys.intern(test_id))
+        self.node_ids.append(node_id)
+        self.parallel.append('parallel' in marks)
+        self.skipped.append('skip' in marks)
+        if test_mark:
+            mark_index = self._mark_index(test_mark)
+            self.test_mark.append(mark_index)
+            self.members[mark_index].append(tid)
+        else:
+            self.test_mark.append(NO_MARK)
+
+    @classmethod
+    def from_meta_file(cls, path: str) -> "TestIndex":
+        """Index te_meta.json written by pytest collection."""
+        index = cls()
+        for test_meta in iter_json_array(path):
+            if test_meta.get('test_id'):
+                index.add(test_meta['test_id'], test_meta.get('nodeid'),
+                          test_meta.get('marks') or [])
+        LOGGER.info("Indexed %s tests with %s feature marks", len(index), len(index.marks))
+        return index
+
+    def plan(self, te_tests: Dict[str, List[str]]) -> List[WorkItem]:
+        """
+        Group tests of TE tickets into work items. Per feature mark, in order of
+        first selected test, a parallel group is followed by its sequential tests.
+        :param te_tests: TE ticket: test ids of ticket, a test in more than one
+            ticket is run once for the last ticket.
+        :return: work items with test ids in collection order.
+        """
+        tickets = list(te_tests)
+        selected = bytearray(len(self))
+        ticket_of = array('h', [-1]) * len(self)
+        mark_order = {}
+        for ticket_index, ticket in enumerate(tickets):
+            for test in te_tests[ticket]:
+                tid = self._ids.get(test)
+                if tid is None:
+                    LOGGER.error("Unknown Test %s found Continue...", test)
+                    continue
+                if self.skipped[tid]:
+                    continue
+                mark_index = self.test_mark[tid]
+                if mark_index == NO_MARK:
+                    LOGGER.error("Test %s having %s found with no marker."
+                                 " Skipping it in execution.", test, self.node_ids[tid])
+                    continue
+                selected[tid] = 1
+                ticket_of[tid] = ticket_index
+                mark_order.setdefault(mark_index, None)
+        items = []
+        for mark_index in mark_order:
+            chosen = [tid for tid in self.members[mark_index] if selected[tid]]
+            parallel = [tid for tid in chosen if self.parallel[tid]]
+            tag = self.marks[mark_index]
+            if parallel:
+                items.append(WorkItem(tag, True, [self.test_ids[tid] for tid in parallel],
+                                      tickets[ticket_of[parallel[0]]]))
+            for tid in chosen:
+                if not self.parallel[tid]:
+                    items.append(WorkItem(tag, False, [self.test_ids[tid]],
+                                          tickets[ticket_of[tid]]))
+        return items
@@ -39,7 +39,6 @@ import logging
 from typing import List
 from typing import Tuple
 from typing import Any
-from typing import Dict
 from queue import Queue
 from threading import Thread
 from confluent_kafka.admin import AdminClient
@@ -48,9 +47,10 @@ from core import rpcserver
 from core import report_rpc
 from core import runner
 from core import producer
+from core import scheduler
+from core import test_index
 from commons.utils import system_utils
 from commons.utils import jira_utils
-from commons.utils import config_utils
 from commons import worker
 from commons import params
 from commons import cortxlogging
@@ -86,6 +86,9 @@ def parse_args(argv):
                         help="Enable async reporting to Jira and MongoDB")
     parser.add_argument("-c", "--cancel_run", type=bool, default=False,
                         help="Enable Cancel run")
+    parser.add_argument("-e", "--execution_id", type=str, default=None,
+                        help="Schedule tests by duration on a topic of this execution "
+                             "instead of the shared test execution topic")
     return parser.parse_args(args=argv)
 
 
@@ -166,172 +169,61 @@ def run(opts: dict) -> None:
         opts.build, opts.build_type = tp_meta['build'], tp_meta['branch']
 
     log_home = create_log_dir_if_not_exists()
-    # Create a reverse map of test id as key and values as node_id, tags
-    meta_data = dict()  # test universe collected
-    test_map = dict()  # tid: (test_mark, test_meta.get('nodeid'), test_meta.get('marks')
-    rev_tag_map = dict()  # mark: dict(parallel=set(), sequential=set())}
-    skip_marks = ("dataprovider", "test", "run", "skip", "usefixtures",
-                  "filterwarnings", "skipif", "xfail", "parametrize")
-
-    internal_skip_marks = ('release_regression', 'sanity')
-    base_components_marks = ('cluster_user_ops', 'cluster_management_ops', 's3_ops',
-                             'ha', 'stress', 'longevity', 'scalability',
-                             'combinational')
-    skip_test = list()
-    selected_tag_map = dict()
     meta_file = os.path.join(log_home, 'te_meta.json')
     if not os.path.exists(meta_file):
         print("test meta file does not exists... check if pytest_collection ran. Exiting...")
         sys.exit(-1)
-    meta_data = config_utils.read_content_json(meta_file, mode='rb')
-    create_test_map(base_components_marks, meta_data,
-                    rev_tag_map, skip_marks, skip_test,
-                    test_map, internal_skip_marks)
-
-    develop_execution_plan(rev_tag_map, selected_tag_map, skip_test, test_map, tickets)
+    index = test_index.TestIndex.from_meta_file(meta_file)
+    te_tests = dict()
+    for ticket in tickets:
+        test_list, ignore = get_te_tickets_data(ticket)
+        print(f"Ignoring TE tag field {ignore}")
+        te_tests[ticket] = test_list
+    work_items = index.plan(te_tests)
     kafka_admin_conf = {"bootstrap.servers": params.BOOTSTRAP_SERVERS}
     kafka_client = AdminClient(kafka_admin_conf)
-    delete_topic(client=kafka_client, topics=[params.TEST_EXEC_TOPIC])
-    # This topic could be deleted during execution of a distributed execution.
-    # Ensure that only 1 execution is run with multiple targets. This will be enhanced
-    # when we start running multiple distributed executions for multiple targets.
-    create_topic(kafka_client)
+    if opts.execution_id:
+        topic = scheduler.execution_topic(opts.execution_id)
+        selected = {test for item in work_items for test in item.tests}
+        durations = scheduler.get_test_durations(selected, *runner.get_db_credential())
+        bins = scheduler.plan(scheduler.estimate_durations(work_items, durations),
+                              len(targets))
+        scheduler.create_execution_topics(kafka_client, opts.execution_id, len(bins))
+    else:
+        delete_topic(client=kafka_client, topics=[params.TEST_EXEC_TOPIC])
+        # This topic could be deleted during execution of a distributed execution.
+        # Ensure that only 1 execution is run with multiple targets. Use execution id
+        # to run multiple distributed executions for multiple targets.
+        create_topic(kafka_client)
     work_queue = worker.WorkQ(producer.produce, 1024)
-    finish = False  # Use finish to exit loop
     # start kafka producer
     _producer = Thread(target=producer.server,
                        args=(topic, work_queue))  # Use finish in server
     _producer.start()
 
-    # for parallel group create a kafka entry
-    # for each non parallel group item create a kafka entry
-    for tg in selected_tag_map:
-        parallel_set, sequential_set = selected_tag_map[tg]
-        witem = Queue()
-        witem.put(parallel_set)
-        witem.tag = tg
-        witem.parallel = True
-        witem.targets = targets
-        set_t = parallel_set if len(parallel_set) else sequential_set
-        witem.tickets = test_map[next(iter(set_t))][-1]
-        witem.build = opts.build
-        witem.build_type = opts.build_type
-        witem.test_plan = test_plan
-        work_queue.put(witem)
-        for set_item in sequential_set:
-            w_item = Queue()
-            w_item.put([set_item])
-            w_item.tag = tg
-            w_item.parallel = False
-            w_item.targets = targets
-            w_item.tickets = test_map[set_item][-1]
-            w_item.build = opts.build
-            w_item.build_type = opts.build_type
-            w_item.test_plan = test_plan
-            work_queue.put(w_item)
+    if opts.execution_id:
+        # each partition is consumed longest first and ends with a stop marker
+        for b_in in bins:
+            for item in b_in.items:
+                work_queue.put(create_ticket(item, opts, b_in.partition))
+            work_queue.put(create_ticket(
+                scheduler.WorkItem('stop', False, [], scheduler.STOP_TICKET), opts,
+                b_in.partition))
+    else:
+        # for parallel group create a kafka entry
+        # for each non parallel group item create a kafka entry
+        for item in work_items:
+            work_queue.put(create_ticket(item, opts))
     work_queue.put(None)  # poison
     work_queue.join()
     _producer.join()
 
 
-def develop_execution_plan(rev_tag_map, selected_tag_map, skip_test, test_map, tickets):
-    """Develop Test execution plan to be followed by test runners."""
-    for ticket in tickets:
-        # get the te meta and create an execution plan
-        test_list, ignore = get_te_tickets_data(ticket)
-        print(f"Ignoring TE tag field {ignore}")
-        # group test_list into narrow feature groups
-        # with each feature group create parallel and non parallel groups
-        for test in test_list:
-            if test in skip_test:
-                continue
-            if test in test_map:
-                tmark, nid, _tags = test_map.get(test)
-                if not tmark:
-                    LOGGER.error("Test %s having %s found with no marker."
-                                 " Skipping it in execution.", test, nid)
-                    continue
-                test_map.update({test: (tmark, nid, _tags, ticket)})
-            else:
-                LOGGER.error("Unknown Test %s found Continue...", test)
-                continue
-            tdict = rev_tag_map.get(tmark)
-            if not tdict:
-                LOGGER.error("Reverse test map entry %s is empty for %s", tmark,
-                             test)
-                continue
-            p_set, s_set = tdict['parallel'], tdict['sequential']
-
-            if tmark not in selected_tag_map:
-                p_s = set()
-                s_s = set()
-                if test in p_set:
-                    p_s.add(test)
-                else:
-                    s_s.add(test)
-                selected_tag_map.update({tmark: [p_s, s_s]})
-            else:
-                t_l = selected_tag_map.get(tmark)
-                if test in p_set:
-                    t_l[0].add(test)
-                else:
-                    t_l[1].add(test)
-
-
-def create_test_map(base_components_marks: Tuple,
-                    meta_data: Dict,
-                    rev_tag_map: Dict,
-                    skip_marks: Dict,
-                    skip_test: List,
-                    test_map: Dict,
-                    internal_skip_marks: Tuple) -> None:
-    """Create a test metadata dict and tag reverse dict."""
-    special_mark = ('parallel',)
-    for test_meta in meta_data:
-        tid = test_meta.get('test_id')
-        if not tid:
-            continue
-        parent_marks = list()
-        for mark in test_meta.get('marks'):
-            if mark in ('skip',):
-                skip_test.append(tid)
-                break
-        parallel = False
-        for mark in test_meta.get('marks'):
-            if mark in ('parallel',):
-                parallel = True
-                break
-        test_mark = ''
-        for mark in test_meta.get('marks'):
-            if mark in skip_marks + special_mark:
-                continue
-            if mark in internal_skip_marks:
-                continue
-            if mark in base_components_marks:
-                parent_marks.append(mark)
-                continue
-            update_rev_tag_map(mark, parallel, rev_tag_map, tid)
-            test_mark = mark
-        if not test_mark and parent_marks:
-            test_mark = parent_marks[0]  # anyhow use first parent marker now
-
-            # a case when a test is decorated with a base component mark
-            update_rev_tag_map(mark, parallel, rev_tag_map, tid)
-
-        test_map.update({tid: (test_mark, test_meta.get('nodeid'), test_meta.get('marks'))})
-
-
-def update_rev_tag_map(mark, parallel, rev_tag_map, tid):
-    """Update reverse tag map."""
-    if mark not in rev_tag_map:
-        rev_tag_map.update({mark: dict(parallel=set(), sequential=set())})
-        v_dict = rev_tag_map.get(mark)
-        _set = v_dict['parallel'] if parallel else v_dict['sequential']
-        _set.add(tid)
-    else:
-        v_dict = rev_tag_map.get(mark)
-        _set = v_dict['parallel'] if parallel else v_dict['sequential']
-        _set.add(tid)
+def create_ticket(item: scheduler.WorkItem, opts, partition: int = -1) -> producer.Ticket:
+    """Create a work queue Ticket read by producer server."""
+    return producer.Ticket(item.tag, item.parallel, list(item.tests), str(item.ticket),
+                           opts.targets, str(opts.build), opts.build_type, opts.test_plan,
+                           item.duration or None, partition)
 
 
 def create_log_dir_if_not_exists():
@@ -29,6 +29,7 @@ from commons.constants import Rest as const
 from commons.helpers.pods_helper import LogicalNode
 from commons import commands
 from commons import constants
+from libs.csm.rest.csm_rest_capacity_tracker import CapacityTracker
 from libs.csm.rest.csm_rest_test_lib import RestTestLib
 from libs.s3 import s3_misc
 
@@ -306,6 +307,31 @@ class SystemCapacity(RestTestLib):
         assert resp["damaged"] == consul_op["damaged"], "CSM & Consul healthy byte mismatch"
         return hctl_op
 
+    def wait_degraded_capacity(self, master_obj, verify, *args,
+                               timeout: int = const.CAPACITY_UPDATE_TIMEOUT, **kwargs):
+        """
+        Poll degraded byte count till verify passes or timeout.
+        :param master_obj: health object of master node passed to get_degraded_all
+        :param verify: check called as verify(resp, *args, **kwargs) returning
+            (result, message) e.g. verify_bytecount_all
+        :param timeout: seconds to wait for the byte count update
+        :return: result and message of verify on last byte count read
+        """
+        outcome = [(False, "Degraded capacity not read")]
+
+        def check():
+            try:
+                resp = self.get_degraded_all(master_obj)
+            except AssertionError as error:
+                # HCTL, Consul and CSM byte counts are updated one after another
+                outcome[0] = (False, str(error))
+                return False, None
+            outcome[0] = verify(resp, *args, **kwargs)
+            return outcome[0][0], resp
+
+        CapacityTracker().poll(check, timeout=timeout)
+        return outcome[0]
+
     def verify_bytecount_all(self, resp, failure_cnt, kvalue, err_margin,
                              total_written,new_write=0):
         """
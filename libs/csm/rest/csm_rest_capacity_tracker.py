@@ -0,0 +1,235 @@
+# -*- coding: utf-8 -*-
+# !/usr/bin/python
+#
+# Copyright (c) 2022 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+#
+"""Capacity tracker waiting for expected capacity changes of cluster, users and buckets.
+
+   A baseline of all tracked counters is taken first, every poll then reads all
+   counters in one round of concurrent requests and compares observed deltas with
+   expected deltas. Polling interval grows while counters do not move and drops back
+   once they do, the wait returns as soon as all expectations are met.
+"""
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from dataclasses import field
+from http import HTTPStatus
+from typing import Callable
+from typing import Dict
+from typing import Tuple
+
+from commons.constants import Rest as const
+from libs.csm.rest.csm_rest_quota import GetSetQuota
+
+LOGGER = logging.getLogger(__name__)
+
+CLUSTER = ("cluster", "")
+INCREASE = "increase"
+DECREASE = "decrease"
+
+
+def _add(first: int, second: int) -> int:
+    """Sum of deltas, None when neither is set."""
+    if first is None and second is None:
+        return None
+    return (first or 0) + (second or 0)
+
+
+@dataclass
+class Expectation:
+    """Expected change of a counter from baseline."""
+
+    used: int = None  # exact delta of used bytes
+    objects: int = None  # exact delta of object count
+    direction: str = None  # INCREASE or DECREASE of used bytes
+    tolerance: int = 0  # allowed difference of used bytes
+
+    def met(self, delta_used: int, delta_objects: int) -> bool:
+        """Observed deltas satisfy expectation."""
+        if self.used is not None and abs(delta_used - self.used) > self.tolerance:
+            return False
+        if self.objects is not None and delta_objects != self.objects:
+            return False
+        if self.direction == INCREASE and delta_used < -self.tolerance:
+            return False
+        if self.direction == DECREASE and delta_used >= -self.tolerance:
+            return False
+        return True
+
+
+@dataclass
+class CapacityResult:
+    """Outcome of a wait for convergence."""
+
+    converged: bool
+    latency: float
+    polls: int
+    observed: Dict[Tuple[str, str], Tuple[int, int]] = field(default_factory=dict)
+    pending: Dict[Tuple[str, str], Tuple[int, int]] = field(default_factory=dict)
+
+
+class CapacityTracker:
+    """
+    Track used bytes and object count of cluster and of many users or buckets.
+    Usage:
+        tracker = CapacityTracker()
+        tracker.baseline([("user", uid1), ("user", uid2)])
+        ... write data ...
+        tracker.expect(("user", uid1), used=size1, objects=1)
+        tracker.expect(("user", uid2), used=size2, objects=2)
+        result = tracker.wait()
+        assert result.converged, result.pending
+    """
+
+    # pylint: disable=too-many-arguments
+    def __init__(self, quota_obj=None, cluster_reader: Callable[[], int] = None,
+                 min_interval: float = 5, max_interval: float = 120, backoff: float = 2.0,
+                 max_workers: int = 8):
+        """
+        :param quota_obj: GetSetQuota object used to read user and bucket capacity.
+        :param cluster_reader: callable returning used bytes of cluster, CSM bytecount
+            healthy bytes if None.
+        :param min_interval: first and smallest interval between polls in seconds.
+        :param max_interval: largest interval between polls in seconds.
+        :param backoff: interval growth factor while counters are not moving.
+        :param max_workers: concurrent requests of a poll.
+        """
+        self.quota_obj = quota_obj
+        self.cluster_reader = cluster_reader or self._read_bytecount
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.max_workers = max_workers
+        self.base = {}
+        self.expected = {}
+        self._capacity_obj = None
+
+    def _read_bytecount(self) -> int:
+        if self._capacity_obj is None:
+            # csm_rest_capacity imports this module, SystemCapacity is resolved at first read
+            from libs.csm.rest.csm_rest_capacity import SystemCapacity
+            self._capacity_obj = SystemCapacity()
+        return int(self._capacity_obj.verify_get_bytecount()["bytecount"]["healthy"])
+
+    def _read_one(self, key: Tuple[str, str]) -> Tuple[int, int]:
+        if key == CLUSTER:
+            return self.cluster_reader(), 0
+        if self.quota_obj is None:
+            self.quota_obj = GetSetQuota()
+        resource, uid = key
+        resp = self.quota_obj.get_user_capacity_usage(resource, uid)
+        if resp.status_code != HTTPStatus.OK:
+            raise RuntimeError(f"Get capacity of {resource} {uid} failed: {resp.status_code}")
+        details = resp.json()["capacity"]["s3"]["users"][0]
+        return int(details["used"]), int(details["objects"])
+
+    def read(self, keys) -> Dict[Tuple[str, str], Tuple[int, int]]:
+        """Read used bytes and object count of all keys in one round of concurrent requests."""
+        keys = list(keys)
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, max(len(keys), 1))) as pool:
+            return dict(zip(keys, pool.map(self._read_one, keys)))
+
+    def baseline(self, keys=(), cluster: bool = False) -> Dict[Tuple[str, str], Tuple[int, int]]:
+        """
+        Record current counters of keys, clears earlier expectations.
+        :param keys: (resource, uid) tuples e.g. ("user", uid).
+        :param cluster: track cluster used bytes as CLUSTER key as well.
+        """
+        keys = list(keys) + ([CLUSTER] if cluster else [])
+        self.base = self.read(keys)
+        self.expected = {}
+        LOGGER.info("Capacity baseline %s", self.base)
+        return self.base
+
+    def set_baseline(self, key: Tuple[str, str], used: int, objects: int = 0) -> None:
+        """Use known counters e.g. capacity read earlier in test as baseline of key."""
+        self.base[key] = (used, objects)
+        self.expected.pop(key, None)
+
+    def expect(self, key: Tuple[str, str], used: int = None, objects: int = None,
+               direction: str = None, tolerance: int = 0) -> None:
+        """
+        Set expected change of key from baseline, cumulative for repeated calls.
+        :param key: (resource, uid) tuple or CLUSTER.
+        :param used: exact change of used bytes.
+        :param objects: exact change of object count.
+        :param direction: INCREASE or DECREASE of used bytes.
+        :param tolerance: allowed difference of used bytes.
+        """
+        if key not in self.base:
+            raise KeyError(f"{key} has no baseline")
+        prev = self.expected.get(key)
+        if prev is not None:
+            used = _add(prev.used, used)
+            objects = _add(prev.objects, objects)
+            direction = direction or prev.direction
+            tolerance = max(tolerance, prev.tolerance)
+        self.expected[key] = Expectation(used, objects, direction, tolerance)
+
+    def _pending(self, observed) -> Dict[Tuple[str, str], Tuple[int, int]]:
+        pending = {}
+        for key, expectation in self.expected.items():
+            delta = (observed[key][0] - self.base[key][0], observed[key][1] - self.base[key][1])
+            if not expectation.met(*delta):
+                pending[key] = delta
+        return pending
+
+    def poll(self, check: Callable[[], Tuple[bool, object]],
+             timeout: float = const.CAPACITY_UPDATE_TIMEOUT) -> CapacityResult:
+        """
+        Call check till it passes or timeout, with the adaptive interval of wait.
+        :param check: callable returning (passed, observed counters), interval drops back
+            to min_interval whenever observed counters differ from previous poll.
+        :return: CapacityResult with observed counters of last poll.
+        """
+        start = time.time()
+        interval = self.min_interval
+        polls = 0
+        last = None
+        while True:
+            passed, observed = check()
+            polls += 1
+            elapsed = time.time() - start
+            if passed:
+                LOGGER.info("Capacity converged in %.1fs after %s polls", elapsed, polls)
+                return CapacityResult(True, elapsed, polls, observed)
+            if elapsed + interval > timeout:
+                LOGGER.error("Capacity not converged in %.1fs, observed %s", elapsed, observed)
+                return CapacityResult(False, elapsed, polls, observed)
+            # counters still moving, background update is in progress
+            interval = self.min_interval if observed != last else \
+                min(interval * self.backoff, self.max_interval)
+            last = observed
+            LOGGER.info("Capacity pending, next poll in %.0fs", interval)
+            time.sleep(interval)
+
+    def wait(self, timeout: float = const.CAPACITY_UPDATE_TIMEOUT) -> CapacityResult:
+        """
+        Poll expected keys till all expectations are met or timeout.
+        :return: CapacityResult with convergence latency and deltas of unmet keys.
+        """
+        def check():
+            observed = self.read(self.expected)
+            return not self._pending(observed), observed
+
+        result = self.poll(check, timeout)
+        if not result.converged:
+            result.pending = self._pending(result.observed)
+            LOGGER.error("Capacity deltas %s, expected %s", result.pending, self.expected)
+        return result
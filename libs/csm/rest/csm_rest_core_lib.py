@@ -21,12 +21,91 @@
 
 import json
 import logging
+import threading
+import time
+from http import HTTPStatus
+from http.cookiejar import DefaultCookiePolicy
 import requests
 from requests.packages.urllib3.exceptions import InsecureRequestWarning
+from requests.packages.urllib3.exceptions import NewConnectionError
 from commons import constants
 from commons.constants import Rest as const
+from commons.utils.instrument_utils import measure
+from commons.utils.retry_utils import Backoff
+from commons.utils.retry_utils import RetryPolicy
+from commons.utils.retry_utils import get_breaker
 from config import CMN_CFG
 
+
+class TokenCache:
+    """
+        Auth tokens per (user, endpoint) shared by all rest clients of a process
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._tokens = {}  # key: (token, expiry, login callable)
+
+    def get(self, key):
+        """Return cached token of key or None if missing or expired."""
+        with self._lock:
+            entry = self._tokens.get(key)
+            if entry and entry[1] > time.time():
+                return entry[0]
+            self._tokens.pop(key, None)
+        return None
+
+    def put(self, key, token, ttl, login=None):
+        """
+        Cache token of key.
+        :param ttl: seconds after which token is considered expired
+        :param login: callable returning a fresh token, used to renew token on 401
+        """
+        with self._lock:
+            self._tokens[key] = (token, time.time() + ttl, login)
+
+    def invalidate(self, token):
+        """Drop token and return its login callable, None if token was not cached."""
+        with self._lock:
+            for key, (c_token, _, login) in list(self._tokens.items()):
+                if c_token == token:
+                    del self._tokens[key]
+                    return login
+        return None
+
+    def clear(self):
+        """Drop all tokens."""
+        with self._lock:
+            self._tokens.clear()
+
+
+TOKEN_CACHE = TokenCache()
+_SESSIONS = threading.local()
+# verbs safe to send again when the failed request may have reached CSM
+IDEMPOTENT_VERBS = ("get", "put", "delete")
+
+
+def request_not_sent(error):
+    """Whether connection error happened before the request reached the server."""
+    if isinstance(error, requests.exceptions.ConnectTimeout):
+        return True
+    reason = getattr(error.args[0], "reason", None) if error.args else None
+    return isinstance(reason, NewConnectionError)
+
+
+def get_session(base_url):
+    """Keep-alive session per thread and base url, cookies are not persisted."""
+    sessions = getattr(_SESSIONS, "sessions", None)
+    if sessions is None:
+        sessions = _SESSIONS.sessions = {}
+    if base_url not in sessions:
+        session = requests.Session()
+        # Every call authenticates through headers only, as with bare requests calls.
+        session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+        sessions[base_url] = session
+    return sessions[base_url]
+
+
 class RestClient:
     """
         This is the class for rest calls
@@ -40,14 +119,47 @@ class RestClient:
         requests.packages.urllib3.disable_warnings(InsecureRequestWarning)
         self.log = logging.getLogger(__name__)
         self._config = config
-        self._request = {"get": requests.get, "post": requests.post,
-                         "patch": requests.patch, "delete": requests.delete,
-                         "put": requests.put}
         self._base_url = "{}:{}".format(
             self._config["mgmt_vip"], str(self._config["port"]))
         self._json_file_path = self._config[
             "jsonfile"] if 'jsonfile' in self._config else const.JOSN_FILE
         self.secure_connection = self._config["secure"]
+        # connection failures are retried, endpoint is not called while its circuit is open,
+        # post and patch only when the request was not sent, they may not be repeatable
+        breaker = get_breaker(f"csm:{self._base_url}")
+        self._retry = RetryPolicy(
+            attempts=3, backoff=Backoff(base=1, cap=10),
+            retry_on=(requests.exceptions.ConnectionError,),
+            breaker=breaker, name="csm_rest")
+        self._retry_unsent = RetryPolicy(
+            attempts=3, backoff=Backoff(base=1, cap=10),
+            retry_on=(requests.exceptions.ConnectionError,),
+            giveup=lambda error: not request_not_sent(error),
+            breaker=breaker, name="csm_rest")
+
+    @property
+    def _request(self):
+        """Request methods of pooled session of calling thread."""
+        session = get_session(self._base_url)
+        return {"get": session.get, "post": session.post,
+                "patch": session.patch, "delete": session.delete,
+                "put": session.put}
+
+    def _renew_on_unauthorized(self, response, request_type, request_url, headers, **kwargs):
+        """
+        Renew cached token rejected with 401 and retry request once.
+        Tokens not issued through the token cache are left as they are.
+        """
+        if response.status_code != HTTPStatus.UNAUTHORIZED or not headers or \
+                "Authorization" not in headers:
+            return response
+        login = TOKEN_CACHE.invalidate(headers["Authorization"])
+        token = login() if login else None
+        if not token:
+            return response
+        self.log.debug("Cached token was rejected, retrying with renewed token")
+        headers["Authorization"] = token
+        return self._request[request_type](request_url, headers=headers, **kwargs)
 
     # pylint: disable=too-many-arguments
     def rest_call(self, request_type, endpoint=None,
@@ -82,9 +194,15 @@ class RestClient:
             data = json.dumps(data) if isinstance(data, dict) else data
         self.log.debug("Data : %s", data)
         # Request a REST call
-        response_object = self._request[request_type](
-            request_url, headers=headers,
-            data=data, params=params, verify=False, json=json_dict)
+        with measure(f"csm.{request_type}") as span:
+            policy = self._retry if request_type in IDEMPOTENT_VERBS else self._retry_unsent
+            response_object = policy.call(
+                self._request[request_type], request_url, headers=headers,
+                data=data, params=params, verify=False, json=json_dict)
+            response_object = self._renew_on_unauthorized(
+                response_object, request_type, request_url, headers,
+                data=data, params=params, verify=False, json=json_dict)
+            span.error = response_object.status_code >= 500
         self.log.debug("Response Object: %s", response_object)
         try:
             self.log.debug("Response JSON: %s", response_object.json())
@@ -30,6 +30,7 @@ from commons.exceptions import CTException
 from config import CSM_REST_CFG
 from config import CMN_CFG
 from libs.csm.rest.csm_rest_core_lib import RestClient
+from libs.csm.rest.csm_rest_core_lib import TOKEN_CACHE
 
 
 class RestTestLib:
@@ -177,6 +178,26 @@ class RestTestLib:
                 err.CSM_REST_AUTHENTICATION_ERROR, error) from error
         return response
 
+    def token_cache_key(self, login_as):
+        """Token cache key of user, credentials are part of key so that changed
+        credentials are logged in again."""
+        creds = login_as if isinstance(login_as, dict) else self.config.get(login_as, {})
+        return (creds.get("username"), creds.get("password"),
+                self.config["mgmt_vip"], self.config["port"])
+
+    def cache_token(self, login_as, token):
+        """Cache token of user till session timeout, a 401 renews token by login."""
+
+        def login():
+            response = self.rest_login(login_as=login_as)
+            if response.status_code != const.SUCCESS_STATUS:
+                return None
+            self.cache_token(login_as, response.headers['Authorization'])
+            return response.headers['Authorization']
+
+        ttl = 0.9 * self.config.get("session_timeout_second", 3600)
+        TOKEN_CACHE.put(self.token_cache_key(login_as), token, ttl, login)
+
     @staticmethod
     def authenticate_and_login(func):
         """
@@ -192,6 +213,7 @@ class RestTestLib:
             :param kwargs: keyword arguments of the executable function
             :keyword login_as : type of user making the REST call (string)
             :keyword authorized : to verify unauthorized scenarios (boolean)
+            :keyword fresh_login : login again instead of using cached token (boolean)
             :return: function executables
             """
             self.headers = {}  # Initiate headers
@@ -200,11 +222,19 @@ class RestTestLib:
             login_type = kwargs.pop("login_as") if "login_as" in kwargs else "csm_admin_user"
             # Checking the requirements to authorize
             authorized = kwargs.pop("authorized") if "authorized" in kwargs else True
+            # Cached token of user is reused unless a fresh login is requested
+            fresh_login = kwargs.pop("fresh_login", False)
+            token = None if fresh_login else TOKEN_CACHE.get(self.token_cache_key(login_type))
+            if authorized and token:
+                self.log.debug("user %s is using cached token", login_type)
+                self.headers = {'Authorization': token}
+                return func(self, *args, **kwargs)
             # Fetching the login response
             self.log.debug("user will be logged in as %s", login_type)
             response = self.rest_login(login_as=login_type)
             if authorized and response.status_code == const.SUCCESS_STATUS:
                 self.headers = {'Authorization': response.headers['Authorization']}
+                self.cache_token(login_type, response.headers['Authorization'])
             else:
                 self.log.error("Authentication request failed in %s.\nResponse code : %s",
                                RestTestLib.authenticate_and_login.__name__, response.status_code)
@@ -234,6 +264,7 @@ class RestTestLib:
             # Execute prior functions.
             response = func(self, *args, **kwargs)
             # logout session.
+            TOKEN_CACHE.invalidate(self.headers.get("Authorization"))
             resp = self.restapi.rest_call(
                 "post", endpoint=self.config["rest_logout_endpoint"], headers=self.headers)
             if resp.status_code != const.SUCCESS_STATUS:
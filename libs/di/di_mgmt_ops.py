@@ -19,14 +19,20 @@
 
 """Management operations needed during the DI tests."""
 
+import os
 import time
 import random
 import logging
 import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import as_completed
 from http import HTTPStatus
 
 from config import DI_CFG
+from commons import params
 from commons.utils import assert_utils
+from commons.utils import config_utils
 from libs.s3 import cortxcli_test_lib as cctl
 from libs.csm.rest.csm_rest_s3user import RestS3user
 from libs.s3.s3_restapi_test_lib import S3AccountOperationsRestAPI
@@ -39,6 +45,86 @@ LOGGER = logging.getLogger(__name__)
 class ManagementOPs:
     email_suffix = "@seagate.com"
     user_prefix = 'di_user'
+    max_workers = 16
+    retries = 3
+    retry_delay = 2
+    _local = threading.local()
+
+    @classmethod
+    def _thread_obj(cls, name, factory):
+        """Per thread instance of a REST/S3 library object."""
+        obj = getattr(cls._local, name, None)
+        if obj is None:
+            obj = factory()
+            setattr(cls._local, name, obj)
+        return obj
+
+    @classmethod
+    def _retry(cls, func, *args, **kwargs):
+        """Call one REST/S3 operation with retries and growing delay, last error is raised."""
+        for attempt in range(1, cls.retries + 1):
+            try:
+                return func(*args, **kwargs)
+            except Exception as error:  # pylint: disable=broad-except
+                if attempt == cls.retries:
+                    raise
+                LOGGER.warning("%s%s failed (attempt %s): %s", func.__name__, args, attempt,
+                               error)
+                time.sleep(cls.retry_delay * attempt)
+
+    @classmethod
+    def save_manifest(cls, users, path=None):
+        """Write users dict to USER_JSON in log directory, written again as items complete."""
+        path = path or os.path.join(params.LOG_DIR, params.USER_JSON)
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp_path = path + ".tmp"
+        config_utils.create_content_json(tmp_path, users, ensure_ascii=False)
+        os.replace(tmp_path, path)
+        return path
+
+    # pylint: disable=too-many-arguments
+    @classmethod
+    def provision(cls, keys, create, rollback=None, on_done=None, max_workers=None):
+        """
+        Run create(key, record) for all keys with bounded parallelism. create retries each
+        of its operations with _retry and adds what it created to record as it goes, so a
+        key failing half way is rolled back as well. When any key fails,
+        rollback(key, record) is called for every key with a non empty record and
+        AssertionError is raised.
+        :param keys: keys of items to create e.g. user names.
+        :param create: function creating item of a key and returning its details.
+        :param rollback: function deleting the parts of an item listed in its record.
+        :param on_done: called as on_done(key, result) as soon as a key is created.
+        :param max_workers: concurrent create calls, cls.max_workers if None.
+        :return: dict of key: create result in keys order.
+        """
+        keys = list(keys)
+        records = {key: {} for key in keys}
+        results = {}
+        failed = {}
+        with ThreadPoolExecutor(max_workers=max_workers or cls.max_workers) as pool:
+            futures = {pool.submit(create, key, records[key]): key for key in keys}
+            for future in as_completed(futures):
+                key = futures[future]
+                try:
+                    results[key] = future.result()
+                except Exception as error:  # pylint: disable=broad-except
+                    LOGGER.error("Provisioning of %s failed: %s", key, error)
+                    failed[key] = error
+                    continue
+                if on_done:
+                    on_done(key, results[key])
+        if failed:
+            created = {key: record for key, record in records.items() if record}
+            if rollback:
+                LOGGER.info("Rolling back %s created items", len(created))
+                with ThreadPoolExecutor(max_workers=max_workers or cls.max_workers) as pool:
+                    for future in [pool.submit(rollback, key, record)
+                                   for key, record in created.items()]:
+                        if future.exception():
+                            LOGGER.error("Rollback failed: %s", future.exception())
+            assert_utils.assert_true(False, f"Provisioning failed for {failed}")
+        return {key: results[key] for key in keys}
 
     @classmethod
     def create_iam_users(cls, nusers=10):
@@ -67,32 +153,31 @@ class ManagementOPs:
 
         # Create IAM users
         time_stamp = time.strftime("%Y%m%d_%H%M%S")
-        users = {
-            "iam_{}{}_{}".format(
-                cls.user_prefix,
-                i,
-                time_stamp): dict() for i in range(
-                1,
-                nusers + 1)}
         iam_obj = IamTestLib(
             access_key=iam_users['accesskey'],
             secret_key=iam_users['secretkey'])
         iam_user_passwd = DI_CFG["DiUserConfig"]["iam_user"]["password"]
-        for i in range(1, nusers + 1):
-            udict = dict()
-            user = "iam_{}{}_{}".format(cls.user_prefix, i, time_stamp)
-            email = user + cls.email_suffix
-            udict.update({'emailid': email})
-            udict.update({'user_name': user})
-            udict.update({'password': iam_user_passwd})
-            resp = iam_obj.create_user(user)
+
+        def create_user(user, record):
+            resp = cls._retry(iam_obj.create_user, user)
             assert_utils.assert_true(resp[0], resp[1])
-            resp = iam_obj.create_access_key(user)
+            record.update({'emailid': user + cls.email_suffix, 'user_name': user,
+                           'password': iam_user_passwd})
+            resp = cls._retry(iam_obj.create_access_key, user)
             LOGGER.info(resp)
             assert_utils.assert_true(resp[0], resp[1])
-            udict.update({'accesskey': resp[1]["AccessKey"]["AccessKeyId"]})
-            udict.update({'secretkey': resp[1]["AccessKey"]["SecretAccessKey"]})
-            users.update({user: udict})
+            record.update({'accesskey': resp[1]["AccessKey"]["AccessKeyId"],
+                           'secretkey': resp[1]["AccessKey"]["SecretAccessKey"]})
+            return dict(record)
+
+        def delete_user(user, record):
+            if 'accesskey' in record:
+                cls._retry(iam_obj.delete_access_key, user, record['accesskey'])
+            cls._retry(iam_obj.delete_user, user)
+
+        users = cls.provision(
+            ["iam_{}{}_{}".format(cls.user_prefix, i, time_stamp) for i in range(1, nusers + 1)],
+            create_user, rollback=delete_user)
         iam_users.update({'iam_users': users})
         return iam_users
 
@@ -111,34 +196,41 @@ class ManagementOPs:
         if use_cortx_cli:
             s3acc_obj = cctl.CortxCliTestLib()
             s3acc_obj.open_connection()
-        else:
-            s3acc_obj = RestS3user()
         ts = time.strftime("%Y%m%d_%H%M%S")
-        users = {"{}{}_{}".format(cls.user_prefix, i, ts): dict() for i in range(1, nusers + 1)}
         s3_user_passwd = DI_CFG["DiUserConfig"]["s3_account"]["password"]
-        for i in range(1, nusers + 1):
-            udict = dict()
-            user = "{}{}_{}".format(cls.user_prefix, i, ts)
+        users = {}
+
+        def create_user(user, record):
             email = user + cls.email_suffix
-            udict.update({'user_name': user})
-            udict.update({'emailid': email})
-            udict.update({'password': s3_user_passwd})
             if use_cortx_cli:
-                result, acc_details = s3acc_obj.create_account_cortxcli(
-                    user, email, s3_user_passwd)
+                result, acc_details = cls._retry(s3acc_obj.create_account_cortxcli,
+                                                 user, email, s3_user_passwd)
                 assert_utils.assert_true(result, 'S3 account user not created.')
             else:
-                resp = s3acc_obj.create_an_account(
-                    user, s3_user_passwd)
+                resp = cls._retry(cls._thread_obj("s3user", RestS3user).create_an_account,
+                                  user, s3_user_passwd)
                 assert_utils.assert_equal(
                     resp.status_code, 201,
                     'S3 account user not created.')
                 acc_details = json.loads(resp.text)
-
             LOGGER.info("Created s3 account %s", user)
-            udict.update({'accesskey': acc_details["access_key"]})
-            udict.update({'secretkey': acc_details["secret_key"]})
-            users.update({user: udict})
+            record.update({'user_name': user, 'emailid': email, 'password': s3_user_passwd,
+                           'accesskey': acc_details["access_key"],
+                           'secretkey': acc_details["secret_key"]})
+            return dict(record)
+
+        def save_user(user, udict):
+            users[user] = udict
+            cls.save_manifest(users)
+
+        def delete_user(user, _):
+            cls._retry(cls._thread_obj("s3user", RestS3user).delete_s3_account_user, user)
+
+        # cortxcli session is interactive and can not be shared between threads
+        users = cls.provision(
+            ["{}{}_{}".format(cls.user_prefix, i, ts) for i in range(1, nusers + 1)],
+            create_user, rollback=delete_user, on_done=save_user,
+            max_workers=1 if use_cortx_cli else None)
         LOGGER.debug("Users %s created for I/O", users)
         return users
 
@@ -154,15 +246,9 @@ class ManagementOPs:
         """
         users = dict() if not users else users
 
-        # Create S3 account
         if use_cortxcli:
             cli = cctl.CortxCliTestLib()
-
-        buckets = {"user{}".format(i): list() for i in range(1, nbuckets + 1)}
-
-        # create 10 buckets per user
-        for k in users:
-            if use_cortxcli:
+            for k in users:
                 cli.login_cortx_cli(k, users[k]["password"])
                 bkts = [
                     cli.create_bucket_cortx_cli('{}bucket{}'.format(
@@ -170,17 +256,39 @@ class ManagementOPs:
                         1, nbuckets + 1)]
                 bkts_lst = [i.split(" ")[2].split(
                     '\nBucket')[0] for i in bkts if 'created' in i]
-                buckets[k] = bkts_lst
                 cli.logout_cortx_cli()
-            else:
-                access_key = users[k].get("accesskey")
-                secret_key = users[k].get("secretkey")
-                s3_obj = _init_s3_conn(access_key, secret_key, k)
-                bkts_lst = [
-                    s3_obj.create_bucket(Bucket='{}bucket{}'.format(
-                        k.replace('_', '-'), i)).name for i in range(
-                        1, nbuckets + 1)]
-            users[k]["buckets"] = bkts_lst
+                users[k]["buckets"] = bkts_lst
+            return users
+
+        # boto3 clients are thread safe, resources are not
+        clients = {k: _init_s3_conn(users[k].get("accesskey"), users[k].get("secretkey"),
+                                    k).meta.client for k in users}
+        done = {k: 0 for k in users}
+        lock = threading.Lock()
+
+        def create_bucket(key, record):
+            user, bucket = key
+            cls._retry(clients[user].create_bucket, Bucket=bucket)
+            record["bucket"] = bucket
+            return bucket
+
+        def delete_bucket(key, _):
+            user, bucket = key
+            cls._retry(clients[user].delete_bucket, Bucket=bucket)
+
+        def bucket_done(key, _):
+            with lock:
+                done[key[0]] += 1
+                if done[key[0]] == nbuckets:
+                    users[key[0]]["buckets"] = [
+                        '{}bucket{}'.format(key[0].replace('_', '-'), i)
+                        for i in range(1, nbuckets + 1)]
+                    cls.save_manifest(users)
+
+        cls.provision(
+            [(k, '{}bucket{}'.format(k.replace('_', '-'), i))
+             for k in users for i in range(1, nbuckets + 1)],
+            create_bucket, rollback=delete_bucket, on_done=bucket_done)
         return users
 
     @classmethod
@@ -99,7 +99,7 @@ class Uploader(object):
                     except Exception as e:
                         LOGGER.info(f'{each_file_path} in bucket {bucket} Upload caught exception: {e}')
                     else:
-                        LOGGER.info(f'{each_file_path} in bucket {bucket} Upload Done')
+                        LOGGER.info('%s in bucket %s Upload Done', each_file_path, bucket)
                         md5sum = hashlib.md5(open(each_file_path, 'rb').read()).hexdigest()
 
                         obj_name = os.path.basename(each_file_path)
@@ -206,7 +206,7 @@ class DIChecker(object):
                 return
             try:
                 s3.meta.client.download_file(bucket, objectpath, objpth)
-                LOGGER.info(f'downloaded object : {kwargs}')
+                LOGGER.info('downloaded object : %s', kwargs)
             except Exception as e:
                 print(e)
                 LOGGER.error(f'Final object download failed for {kwargs} with exception {e}')
@@ -310,7 +310,7 @@ class DIChecker(object):
             kwargs['secret'] = users.get(ent[0])[1]
             workQ.put(kwargs)
             workers.wenque(workQ)
-            LOGGER.info(f"Enqueued item {ix} for download and checksum compare")
+            LOGGER.info("Enqueued item %s for download and checksum compare", ix)
             # if workQ is not None:
             #    workQ.join()
             # workQ = None
@@ -356,10 +356,13 @@ if __name__ == '__main__':
                         params.LOG_DIR_NAME,
                         'latest',
                         'di-test.log')
-    cortxlogging.set_log_handlers(LOGGER, file)
+    # uploader processes are forked and log through the queue of this process
+    cortxlogging.set_log_handlers(LOGGER, file, queued=True, multiprocess=True)
+    cortxlogging.limit_logger(__name__)
     ops = ManagementOPs()
     users = ops.create_account_users(nusers=2)
     uploader = Uploader()
     uploader.start(users)
     DIChecker.init_s3_conn(users)
     DIChecker.verify_data_integrity(users)
+    cortxlogging.stop_queue_logging(LOGGER)
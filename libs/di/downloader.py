@@ -29,6 +29,7 @@ from pathlib import Path
 from commons import params
 from commons import worker
 from commons.utils import system_utils
+from commons.utils.instrument_utils import measure
 from libs.di import di_base
 from libs.di.di_mgmt_ops import ManagementOPs
 from libs.di import uploader
@@ -68,8 +69,10 @@ class DataIntegrityValidator:
                 LOGGER.error(f"Won't be able to download object {kwargs} without connection")
                 return
             try:
-                s3.meta.client.download_file(bucket, objectpath, objpth)
-                LOGGER.info(f'downloaded object : {kwargs}')
+                with measure("di.download") as span:
+                    s3.meta.client.download_file(bucket, objectpath, objpth)
+                    span.nbytes = os.path.getsize(objpth)
+                LOGGER.info('downloaded object : %s', kwargs)
             except Exception as e:
                 print(e)
                 LOGGER.error(f'Final object download failed for {kwargs} with exception {e}')
@@ -80,7 +83,7 @@ class DataIntegrityValidator:
                 sz = Path(filepath).stat().st_size
                 read_sz = 8192
                 csum = None
-                with open(filepath, 'rb') as fp:
+                with open(filepath, 'rb') as fp, measure("di.checksum", nbytes=sz):
                     file_hash = hashlib.md5()
                     if sz < read_sz:
                         buf = fp.read(sz)
@@ -174,7 +177,7 @@ class DataIntegrityValidator:
             kwargs['secret'] = users.get(ent[0])['secretkey']
             workQ.put(kwargs)
             workers.wenque(workQ)
-            LOGGER.info(f"Enqueued item {ix} for download and checksum compare")
+            LOGGER.info("Enqueued item %s for download and checksum compare", ix)
             # if workQ is not None:
             #    workQ.join()
             # workQ = None
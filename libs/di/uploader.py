@@ -32,6 +32,7 @@ import multiprocessing as mp
 from multiprocessing import Manager, Event
 from boto3.s3.transfer import TransferConfig
 from commons.utils import config_utils
+from commons.utils.instrument_utils import measure
 from commons.worker import Workers
 from commons import params
 from libs.di import di_base
@@ -92,8 +93,7 @@ class Uploader:
                     print("Stop event has been set, remaining objects will be"
                           " skipped.")
                     break
-                LOGGER.info(
-                    f"Enqueued item {ix} for download and checksum compare")
+                LOGGER.info("Enqueued item %s for download and checksum compare", ix)
             LOGGER.info(
                 f"processed items {ix} to upload for user {user}")
         workers.end_workers()
@@ -121,21 +121,23 @@ class Uploader:
         # get random size
         seed = data_generator.DataGenerator.get_random_seed()
         size = random.sample(data_generator.SMALL_BLOCK_SIZES, 1)[0]
-        gen = data_generator.DataGenerator(c_ratio=2)
-        buf, csum = gen.generate(size, seed=seed)
-        file_path = gen.save_buf_to_file(buf, csum, 1024 * 1024, prefix)
+        with measure("di.generate", nbytes=size):
+            gen = data_generator.DataGenerator(c_ratio=2)
+            buf, csum = gen.generate(size, seed=seed)
+            file_path = gen.save_buf_to_file(buf, csum, 1024 * 1024, prefix)
         s3 = s3connections[random.randint(0, pool_len - 1)]
         try:
-            s3.meta.client.upload_file(str(file_path),
-                                       bucket,
-                                       os.path.basename(file_path),
-                                       Config=Uploader.tsfrConfig)
+            with measure("di.upload", nbytes=size):
+                s3.meta.client.upload_file(str(file_path),
+                                           bucket,
+                                           os.path.basename(file_path),
+                                           Config=Uploader.tsfrConfig)
             print(f'uploaded file {file_path} for user {user_name}')
         except Exception as e:
             LOGGER.info(
                 f'{file_path} in bucket {bucket} Upload caught exception: {e}')
         else:
-            LOGGER.info(f'{file_path} in bucket {bucket} Upload Done')
+            LOGGER.info('%s in bucket %s Upload Done', file_path, bucket)
             with open(file_path, 'rb') as fp:
                 md5sum = hashlib.md5(fp.read()).hexdigest()
             obj_name = os.path.basename(file_path)
@@ -35,6 +35,7 @@ from commons.mail_script_utils import Mail
 from commons.utils import system_utils
 from config.s3 import S3_CFG
 from libs.s3 import ACCESS_KEY, SECRET_KEY
+from libs.iostability.workload_engine import WorkloadEngine
 from libs.s3.s3_test_lib import S3TestLib
 from scripts.s3_bench import s3bench
 
@@ -48,6 +49,8 @@ class IOStabilityLib:
                  secret_key=SECRET_KEY):
         self.log = logging.getLogger(__name__)
         self.s3t_obj = S3TestLib(access_key=access_key, secret_key=secret_key)
+        self.access_key = access_key
+        self.secret_key = secret_key
         self.max_retries = max_retries
         self.http_client_timeout = timeout
 
@@ -110,6 +113,47 @@ class IOStabilityLib:
                     self.log.info("Objects deletion completed")
             loop += 1
 
+    # pylint: disable=too-many-arguments
+    def execute_workload_engine(self, distribution, clients, duration_in_days, log_file_prefix,
+                                buckets_created=None, target_ops=None, target_mbps=None,
+                                interval=300):
+        """Execute given workload distribution with in-process workload engine.
+
+        Unlike execute_workload_distribution all object sizes are mixed within one long lived
+        client pool, so there are no gaps between s3bench invocations.
+        :param distribution: Distribution of object size
+        :param clients: No of clients
+        :param duration_in_days: Duration expected of the test run
+        :param log_file_prefix: Prefix for bucket and interval stats file
+        :param buckets_created: Buckets already created to be used for IO operations.
+        :param target_ops: Target PUT operations per second, unthrottled if None.
+        :param target_mbps: Target PUT MB per second, unthrottled if None.
+        :param interval: Interval in seconds for throughput and latency stats.
+        :return: Summary of the run.
+        """
+        if buckets_created:
+            bucket_name = buckets_created[0]
+        else:
+            bucket_name = f"{log_file_prefix}-bucket-{str(int(time.time()))}".lower()
+            self.s3t_obj.create_bucket(bucket_name)
+        stats_file = os.path.join(os.getcwd(), "log", "latest",
+                                  f"{str(log_file_prefix).upper()}-workload-stats.jsonl")
+        engine = WorkloadEngine(distribution, clients=clients, bucket=bucket_name,
+                                target_ops=target_ops, target_mbps=target_mbps,
+                                interval=interval, stats_file=stats_file,
+                                access_key=self.access_key, secret_key=self.secret_key,
+                                endpoint_url=S3_CFG["s3_url"],
+                                verify=self.s3t_obj.s3_cert_path,
+                                max_retries=self.max_retries)
+        self.log.info("Interval stats path %s", stats_file)
+        summary = engine.run(duration=timedelta(days=duration_in_days).total_seconds())
+        if not buckets_created:
+            self.s3t_obj.delete_bucket(bucket_name, force=True)
+        errors = {ops: stat["errors"] for ops, stat in summary["operations"].items()
+                  if stat["errors"]}
+        assert not errors, f"Workload engine observed errors {errors}. Please read {stats_file}"
+        return summary
+
 
 class MailNotification(threading.Thread):
     """
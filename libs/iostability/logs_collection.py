@@ -25,6 +25,7 @@ import os
 from datetime import datetime
 
 from commons.commands import CMD_DMESGS, CMD_JOURNALCTL
+from commons.helpers.log_tailer import LogTailer
 from commons.helpers.pods_helper import LogicalNode
 
 # check and set pytest logging level as Globals.LOG_LEVEL
@@ -50,6 +51,7 @@ class ServerOSLogsCollectLib:
                                    username=node["username"],
                                    password=node["password"])
             self.node_list.append(node_obj)
+        self.tailers = list()
 
     def collect_logs(self, path):
         """
@@ -79,3 +81,45 @@ class ServerOSLogsCollectLib:
             node.remove_remote_file(filename=dmesgs_path)
             node.remove_remote_file(filename=journalctl_path)
         return True
+
+    def collect_logs_incremental(self, path):
+        """
+        function to fetch only dmesgs and journalctl entries added since previous call,
+        error lines are indexed in <node>_error_index.jsonl
+        :param path: local path of log copies, same path must be used between calls
+        :return: list of indexed error lines of fetched data
+        """
+        if not self.tailers or self.tailers[0].local_dir != path:
+            self.tailers = [LogTailer(node, path, from_start=True) for node in self.node_list]
+        hits = list()
+        for tailer in self.tailers:
+            LOGGER.info("Fetching new logs of node %s", tailer.node.hostname)
+            before = tailer.sizes()
+            tailer.poll()
+            hits.extend(tailer.hits(start=before))
+        return hits
+
+    def start_test_window(self, path):
+        """
+        Mark start of a test in logs of all nodes.
+        :param path: local path of log copies
+        :return: marks to be passed to end_test_window
+        """
+        if not self.tailers or self.tailers[0].local_dir != path:
+            self.tailers = [LogTailer(node, path) for node in self.node_list]
+        return [tailer.mark() for tailer in self.tailers]
+
+    def end_test_window(self, start_marks, dest_dir, test_id):
+        """
+        Cut logs of all nodes written since start_test_window into dest_dir.
+        :param start_marks: marks returned by start_test_window
+        :param dest_dir: directory for test logs
+        :param test_id: test id used as file prefix
+        :return: written file paths and error lines indexed within window
+        """
+        paths, hits = list(), list()
+        for tailer, start in zip(self.tailers, start_marks):
+            end = tailer.mark()
+            paths.extend(tailer.extract(start, end, dest_dir, test_id))
+            hits.extend(tailer.hits(start, end))
+        return paths, hits
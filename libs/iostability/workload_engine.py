@@ -0,0 +1,359 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2022 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+
+"""
+In-process closed loop S3 workload engine for IO stability runs.
+
+A single pool of client threads shares one boto3 client and mixes object sizes as per a
+size-percent distribution, optionally throttled to a target rate. Written objects are deleted
+by a background cleaner and per-interval throughput and latency histograms are emitted while
+the workload runs.
+"""
+import io
+import json
+import logging
+import os
+import queue
+import random
+import re
+import threading
+import time
+from datetime import datetime
+
+import boto3
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config
+from botocore.exceptions import BotoCoreError, ClientError
+
+from commons.utils.histogram_utils import LatencyHistogram
+
+LOGGER = logging.getLogger(__name__)
+
+SIZE_UNITS = {"b": 1, "kb": 1024, "mb": 1024 ** 2, "gb": 1024 ** 3, "tb": 1024 ** 4}
+DELETE_BATCH = 1000
+PATTERN_SIZE = 1024 * 1024
+
+
+def parse_size(size) -> int:
+    """
+    Convert s3bench style object size to bytes.
+    :param size: size string e.g. 0Kb, 4Kb, 10Mb, 2Gb or bytes as int.
+    :return: size in bytes.
+    """
+    if isinstance(size, int):
+        return size
+    match = re.fullmatch(r"\s*(\d+(?:\.\d+)?)\s*([kmgt]?b)?\s*", str(size), re.IGNORECASE)
+    if not match:
+        raise ValueError(f"Invalid object size {size}")
+    unit = (match.group(2) or "b").lower()
+    return int(float(match.group(1)) * SIZE_UNITS[unit])
+
+
+class PatternReader(io.RawIOBase):
+    """Seekable file like object of given length which repeats a random pattern."""
+
+    def __init__(self, pattern: bytes, length: int):
+        super().__init__()
+        self.pattern = memoryview(pattern)
+        self.length = length
+        self.offset = 0
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def tell(self):
+        return self.offset
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_CUR:
+            offset += self.offset
+        elif whence == io.SEEK_END:
+            offset += self.length
+        self.offset = min(max(offset, 0), self.length)
+        return self.offset
+
+    def readinto(self, buffer):
+        view = memoryview(buffer).cast("B")
+        size = min(len(view), self.length - self.offset)
+        done = 0
+        while done < size:
+            start = (self.offset + done) % len(self.pattern)
+            chunk = min(size - done, len(self.pattern) - start)
+            view[done:done + chunk] = self.pattern[start:start + chunk]
+            done += chunk
+        self.offset += size
+        return size
+
+
+class RateLimiter:
+    """Token bucket shared by all client threads."""
+
+    def __init__(self, rate: float, burst: float = None):
+        self.rate = rate
+        self.capacity = burst if burst else rate
+        self.tokens = self.capacity
+        self.last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, amount: float = 1, stop: threading.Event = None) -> None:
+        """Block until amount tokens are available or stop is set."""
+        while not (stop and stop.is_set()):
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.last) * self.rate)
+                self.last = now
+                # Requests bigger than bucket capacity go through once the bucket is full.
+                if self.tokens >= min(amount, self.capacity):
+                    self.tokens -= amount
+                    return
+                wait = (min(amount, self.capacity) - self.tokens) / self.rate
+            time.sleep(min(wait, 1))
+
+
+class IntervalStats:
+    """Counters and latency histograms of one reporting interval."""
+
+    def __init__(self):
+        self.start = time.time()
+        self.latency = {}
+        self.bytes = {}
+        self.errors = {}
+        self._lock = threading.Lock()
+
+    def record(self, operation: str, latency: float, nbytes: int, error: bool = False):
+        """Record one operation latency in seconds."""
+        with self._lock:
+            if operation not in self.latency:
+                self.latency[operation] = LatencyHistogram()
+                self.bytes[operation] = 0
+                self.errors[operation] = 0
+            if error:
+                self.errors[operation] += 1
+                return
+            self.bytes[operation] += nbytes
+        self.latency[operation].record(latency * 1000000)
+
+    def report(self, end: float = None) -> dict:
+        """Interval throughput and latency summary in milliseconds."""
+        end = end or time.time()
+        elapsed = max(end - self.start, 1e-6)
+        report = {"start": datetime.fromtimestamp(self.start).isoformat(),
+                  "duration": round(elapsed, 3), "operations": {}}
+        for operation, hist in self.latency.items():
+            summary = hist.summary()
+            report["operations"][operation] = {
+                "ops": hist.count, "errors": self.errors[operation],
+                "ops_per_sec": round(hist.count / elapsed, 3),
+                "mbps": round(self.bytes[operation] / elapsed / 1024 ** 2, 3),
+                "latency_ms": {key: round(summary[key] / 1000, 3)
+                               for key in ("min", "mean", "p50", "p95", "p99", "max")}}
+        return report
+
+
+# pylint: disable=too-many-instance-attributes
+class WorkloadEngine:
+    """
+    Closed loop workload of PUT, GET and background DELETE over a size distribution.
+
+    Target rate can be given as operations per second (target_ops) or MB per second of
+    written data (target_mbps). Without a target every client issues requests back to back.
+    """
+
+    # pylint: disable=too-many-arguments
+    def __init__(self, distribution: dict, clients: int, bucket: str, s3_client=None,
+                 target_ops: float = None, target_mbps: float = None, interval: int = 60,
+                 obj_prefix: str = "object-", read_back: bool = True, stats_file: str = None,
+                 **kwargs):
+        """
+        :param distribution: object size to percent mapping e.g. {"1Kb": 26.79, "1Mb": 18.2}.
+        :param clients: number of parallel client threads.
+        :param bucket: existing bucket used for IO.
+        :param s3_client: boto3 s3 client, created from access_key, secret_key, endpoint_url,
+            verify keyword args with a connection pool of clients size when not given.
+        :param target_ops: target PUT operations per second.
+        :param target_mbps: target PUT MB per second.
+        :param interval: reporting interval in seconds.
+        :param obj_prefix: object name prefix.
+        :param read_back: read every object back before it is queued for deletion.
+        :param stats_file: JSON lines file to which interval reports are appended.
+        """
+        self.sizes = [parse_size(size) for size, percent in distribution.items() if percent]
+        self.weights = [percent for percent in distribution.values() if percent]
+        if not self.sizes:
+            raise ValueError(f"Empty workload distribution {distribution}")
+        self.clients = clients
+        self.bucket = bucket
+        self.obj_prefix = obj_prefix
+        self.read_back = read_back
+        self.interval = interval
+        self.stats_file = stats_file
+        self.on_interval = kwargs.get("on_interval")
+        self.s3_client = s3_client or boto3.client(
+            "s3", aws_access_key_id=kwargs.get("access_key"),
+            aws_secret_access_key=kwargs.get("secret_key"),
+            endpoint_url=kwargs.get("endpoint_url"), verify=kwargs.get("verify", False),
+            region_name=kwargs.get("region", "default"),
+            config=Config(max_pool_connections=clients + 2,
+                          retries={"max_attempts": kwargs.get("max_retries", 6)}))
+        self.transfer_config = TransferConfig(use_threads=False,
+                                              multipart_threshold=64 * 1024 ** 2,
+                                              multipart_chunksize=64 * 1024 ** 2)
+        self.ops_limiter = RateLimiter(target_ops) if target_ops else None
+        self.bytes_limiter = RateLimiter(target_mbps * 1024 ** 2) if target_mbps else None
+        self.pattern = os.urandom(PATTERN_SIZE)
+        self.stop_event = threading.Event()
+        self.clients_done = threading.Event()
+        self.delete_queue = queue.Queue(maxsize=DELETE_BATCH * clients)
+        self.stats = IntervalStats()
+        self.total = IntervalStats()
+        self.reports = []
+        self.undeleted = []
+        self._seq = 0
+        self._seq_lock = threading.Lock()
+
+    def _next_key(self, size: int) -> str:
+        with self._seq_lock:
+            self._seq += 1
+            return f"{self.obj_prefix}{size}-{self._seq}"
+
+    def _record(self, operation: str, latency: float, nbytes: int, error: bool = False):
+        self.stats.record(operation, latency, nbytes, error)
+        self.total.record(operation, latency, nbytes, error)
+
+    def _timed(self, operation: str, nbytes: int, func, *args, **kwargs) -> bool:
+        start = time.perf_counter()
+        try:
+            func(*args, **kwargs)
+        except (BotoCoreError, ClientError) as error:
+            LOGGER.error("%s failed: %s", operation, error)
+            self._record(operation, time.perf_counter() - start, nbytes, error=True)
+            return False
+        self._record(operation, time.perf_counter() - start, nbytes)
+        return True
+
+    def _read(self, key: str) -> None:
+        body = self.s3_client.get_object(Bucket=self.bucket, Key=key)["Body"]
+        for _ in body.iter_chunks(chunk_size=PATTERN_SIZE):
+            pass
+
+    def _client(self, rand: random.Random) -> None:
+        """Client thread loop."""
+        while not self.stop_event.is_set():
+            size = rand.choices(self.sizes, weights=self.weights)[0]
+            if self.ops_limiter:
+                self.ops_limiter.acquire(1, self.stop_event)
+            if self.bytes_limiter:
+                self.bytes_limiter.acquire(size, self.stop_event)
+            if self.stop_event.is_set():
+                break
+            key = self._next_key(size)
+            reader = PatternReader(self.pattern, size)
+            if not self._timed("PUT", size, self.s3_client.upload_fileobj, reader, self.bucket,
+                               key, Config=self.transfer_config):
+                continue
+            if self.read_back:
+                self._timed("GET", size, self._read, key)
+            self.delete_queue.put(key)
+
+    def _delete_objects(self, objects: list) -> None:
+        """Delete objects, keys failed in a partially successful delete raise ClientError."""
+        resp = self.s3_client.delete_objects(Bucket=self.bucket,
+                                             Delete={"Objects": objects, "Quiet": True})
+        errors = resp.get("Errors") or []
+        if errors:
+            self.undeleted.extend(error["Key"] for error in errors)
+            raise ClientError({"Error": {"Code": errors[0].get("Code"),
+                                         "Message": f"{len(errors)} of {len(objects)} objects "
+                                                    f"not deleted: {errors[0].get('Message')}"}},
+                              "DeleteObjects")
+
+    def _delete_batch(self, keys: list) -> None:
+        self._timed("DELETE", 0, self._delete_objects, [{"Key": key} for key in keys])
+
+    def _cleaner(self) -> None:
+        """Delete written objects in batches while workload is running."""
+        batch = []
+        last_flush = time.monotonic()
+        while not (self.clients_done.is_set() and self.delete_queue.empty()):
+            try:
+                batch.append(self.delete_queue.get(timeout=1))
+            except queue.Empty:
+                pass
+            if len(batch) >= DELETE_BATCH or (batch and time.monotonic() - last_flush > 5):
+                self._delete_batch(batch)
+                batch = []
+                last_flush = time.monotonic()
+        if batch:
+            self._delete_batch(batch)
+
+    def _emit(self) -> None:
+        stats, self.stats = self.stats, IntervalStats()
+        report = stats.report()
+        self.reports.append(report)
+        LOGGER.info("Workload interval: %s", json.dumps(report["operations"]))
+        if self.stats_file:
+            with open(self.stats_file, "a", encoding="utf-8") as stats_fd:
+                stats_fd.write(json.dumps(report) + "\n")
+        if self.on_interval:
+            self.on_interval(report)
+
+    def run(self, duration: float) -> dict:
+        """
+        Run workload for given duration.
+        :param duration: duration in seconds.
+        :return: summary of the whole run.
+        """
+        LOGGER.info("Starting workload on %s with %s clients for %s seconds, sizes %s",
+                    self.bucket, self.clients, duration, dict(zip(self.sizes, self.weights)))
+        self.stop_event.clear()
+        self.clients_done.clear()
+        seed = random.SystemRandom().getrandbits(64)
+        threads = [threading.Thread(target=self._client, args=(random.Random(seed + i),),
+                                    name=f"workload-client-{i}", daemon=True)
+                   for i in range(self.clients)]
+        cleaner = threading.Thread(target=self._cleaner, name="workload-cleaner", daemon=True)
+        for thread in threads:
+            thread.start()
+        cleaner.start()
+        end_time = time.monotonic() + duration
+        try:
+            while time.monotonic() < end_time and not self.stop_event.is_set():
+                self.stop_event.wait(min(self.interval, max(end_time - time.monotonic(), 0)))
+                self._emit()
+        finally:
+            self.stop_event.set()
+            for thread in threads:
+                thread.join()
+            self.clients_done.set()
+            cleaner.join()
+            self._emit()
+        summary = self.total.report()
+        summary["undeleted"] = len(self.undeleted)
+        LOGGER.info("Workload summary: %s", json.dumps(summary["operations"]))
+        if self.undeleted:
+            LOGGER.error("%s objects left in %s, e.g. %s", len(self.undeleted), self.bucket,
+                         self.undeleted[:10])
+        return summary
+
+    def stop(self) -> None:
+        """Stop a workload running in another thread."""
+        self.stop_event.set()
@@ -0,0 +1,198 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2022 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+#
+"""Pool of pre-provisioned S3 accounts leased to tests.
+
+   Accounts are created in parallel once per session. A leased account is scrubbed
+   when returned: bucket policies, ACLs, buckets with their objects and IAM users with
+   their access keys are removed, after which the account goes back to the pool. An
+   account which cannot be scrubbed is deleted and replaced on demand.
+"""
+
+import logging
+import os
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from config.s3 import S3_CFG
+from libs.s3 import s3_acl_test_lib
+from libs.s3 import s3_bucket_policy_test_lib
+from libs.s3 import s3_test_lib
+from libs.s3.iam_test_lib import IamTestLib
+from libs.s3.s3_rest_cli_interface_lib import S3AccountOperations
+
+LOGGER = logging.getLogger(__name__)
+
+
+class PooledAccount:
+    """S3 account of the pool with lazily created S3 and IAM library objects."""
+
+    def __init__(self, account_name: str, email_id: str, password: str, details: dict,
+                 fresh: bool = False):
+        self.account_name = account_name
+        self.email_id = email_id
+        self.password = password
+        self.access_key = details["access_key"]
+        self.secret_key = details["secret_key"]
+        self.canonical_id = details.get("canonical_id")
+        self.account_id = details.get("account_id")
+        self.fresh = fresh
+        self._objs = {}
+
+    def _get(self, name: str, cls):
+        if name not in self._objs:
+            self._objs[name] = cls(access_key=self.access_key, secret_key=self.secret_key)
+        return self._objs[name]
+
+    @property
+    def s3_obj(self) -> s3_test_lib.S3TestLib:
+        """S3TestLib object of account."""
+        return self._get("s3", s3_test_lib.S3TestLib)
+
+    @property
+    def acl_obj(self) -> s3_acl_test_lib.S3AclTestLib:
+        """S3AclTestLib object of account."""
+        return self._get("acl", s3_acl_test_lib.S3AclTestLib)
+
+    @property
+    def bkt_policy_obj(self) -> s3_bucket_policy_test_lib.S3BucketPolicyTestLib:
+        """S3BucketPolicyTestLib object of account."""
+        return self._get("policy", s3_bucket_policy_test_lib.S3BucketPolicyTestLib)
+
+    @property
+    def iam_obj(self) -> IamTestLib:
+        """IamTestLib object of account."""
+        return self._get("iam", IamTestLib)
+
+
+class S3AccountPool:
+    """
+    Lease pre-provisioned S3 accounts to tests.
+    Usage:
+        pool = S3AccountPool(size=8)
+        pool.provision()
+        account = pool.lease()
+        account.s3_obj.create_bucket(bucket_name)
+        pool.release(account)
+        pool.close()
+    """
+
+    def __init__(self, size: int = 4, prefix: str = "pool-acc", max_workers: int = 8):
+        """
+        :param size: accounts created by provision.
+        :param prefix: account name prefix.
+        :param max_workers: concurrent account create, scrub and delete operations.
+        """
+        self.size = size
+        worker = os.environ.get("PYTEST_XDIST_WORKER", "")
+        self.prefix = f"{prefix}-{worker}-" if worker else f"{prefix}-"
+        self.max_workers = max_workers
+        self.password = S3_CFG["CliConfig"]["s3_account"]["password"]
+        self.accounts = []
+        self._free = queue.Queue()
+        self._lock = threading.Lock()
+
+    def _create(self, fresh: bool = False) -> PooledAccount:
+        account_name = f"{self.prefix}{time.perf_counter_ns()}"
+        email_id = f"{account_name}{S3_CFG['email_suffix']}"
+        # account operation objects keep a REST session, one per call keeps threads apart
+        resp = S3AccountOperations().create_s3_account(
+            acc_name=account_name, email_id=email_id, passwd=self.password)
+        if not resp[0]:
+            raise RuntimeError(f"Create account {account_name} failed: {resp[1]}")
+        account = PooledAccount(account_name, email_id, self.password, resp[1], fresh)
+        LOGGER.info("Created S3 account %s", account_name)
+        if not fresh:
+            with self._lock:
+                self.accounts.append(account)
+        return account
+
+    def _delete(self, account: PooledAccount) -> bool:
+        resp = S3AccountOperations().delete_s3_account(acc_name=account.account_name)
+        if not resp[0]:
+            LOGGER.error("Delete account %s failed: %s", account.account_name, resp[1])
+        with self._lock:
+            if account in self.accounts:
+                self.accounts.remove(account)
+        return resp[0]
+
+    def provision(self) -> list:
+        """Create pool accounts in parallel."""
+        start = time.time()
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            accounts = list(pool.map(lambda _: self._create(), range(self.size)))
+        for account in accounts:
+            self._free.put(account)
+        LOGGER.info("Provisioned %s S3 accounts in %.1fs", len(accounts), time.time() - start)
+        return accounts
+
+    def lease(self, fresh: bool = False) -> PooledAccount:
+        """
+        Take a clean account from pool, a new one is created when pool is empty.
+        :param fresh: create a new account which is deleted on release.
+        """
+        if fresh:
+            return self._create(fresh=True)
+        try:
+            account = self._free.get_nowait()
+        except queue.Empty:
+            account = self._create()
+        LOGGER.info("Leased S3 account %s", account.account_name)
+        return account
+
+    @staticmethod
+    def scrub(account: PooledAccount) -> bool:
+        """Remove bucket policies, ACLs, buckets with objects and IAM users of account."""
+        try:
+            s3_client = account.s3_obj.s3_client
+            for bucket in account.s3_obj.bucket_list()[1]:
+                try:
+                    s3_client.delete_bucket_policy(Bucket=bucket)
+                    s3_client.put_bucket_acl(Bucket=bucket, ACL="private")
+                except Exception as error:  # pylint: disable=broad-except
+                    LOGGER.debug("Reset of bucket %s: %s", bucket, error)
+                resp = account.s3_obj.delete_bucket(bucket, force=True)
+                if not resp[0]:
+                    return False
+            iam_users = [user["UserName"] for user in account.iam_obj.list_users()[1]]
+            if iam_users:
+                account.iam_obj.delete_users_with_access_key(iam_users)
+        except Exception as error:  # pylint: disable=broad-except
+            LOGGER.error("Scrub of account %s failed: %s", account.account_name, error)
+            return False
+        return True
+
+    def release(self, account: PooledAccount) -> None:
+        """Scrub account and return it to pool, fresh or unscrubbable accounts are deleted."""
+        scrubbed = self.scrub(account)
+        if scrubbed and not account.fresh:
+            self._free.put(account)
+            LOGGER.info("Returned S3 account %s to pool", account.account_name)
+            return
+        self._delete(account)
+
+    def close(self) -> None:
+        """Delete all accounts of pool in parallel."""
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            list(pool.map(self.scrub, list(self.accounts)))
+            list(pool.map(self._delete, list(self.accounts)))
+        while not self._free.empty():
+            self._free.get_nowait()
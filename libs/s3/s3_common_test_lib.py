@@ -38,6 +38,10 @@ from commons.utils import system_utils
 from commons.utils.system_utils import calculate_checksum
 from commons.utils.system_utils import path_exists
 from libs.csm.csm_interface import csm_api_factory
+from libs.csm.rest.csm_rest_capacity_tracker import CLUSTER
+from libs.csm.rest.csm_rest_capacity_tracker import DECREASE
+from libs.csm.rest.csm_rest_capacity_tracker import INCREASE
+from libs.csm.rest.csm_rest_capacity_tracker import CapacityTracker
 from libs.s3 import S3H_OBJ
 from libs.s3 import s3_test_lib
 from libs.s3 import s3_acl_test_lib
@@ -101,41 +105,43 @@ def get_cortx_capacity() -> tuple:
     return total, avail, used
 
 
-def get_cortx_rgw_bytecount() -> tuple:
-    """Get bytecount stats for CORTX RGW."""
+def get_cortx_rgw_bytecount(wait: bool = True) -> tuple:
+    """
+    Get bytecount stats for CORTX RGW.
+
+    :param wait: sleep for capacity update interval before reading, CapacityTracker polls
+        without it.
+    """
     csm_obj = csm_api_factory("rest")
-    LOG.info("Sleep for capacity update interval %s seconds", const.Rest.CAPACITY_UPDATE_TIMEOUT)
-    time.sleep(const.Rest.CAPACITY_UPDATE_TIMEOUT)
+    if wait:
+        LOG.info("Sleep for capacity update interval %s seconds",
+                 const.Rest.CAPACITY_UPDATE_TIMEOUT)
+        time.sleep(const.Rest.CAPACITY_UPDATE_TIMEOUT)
     response = csm_obj.verify_get_bytecount()
     return response['bytecount']
 
 
 def poll_cluster_capacity(check_increase=True, sleep_interval=300, max_retries=5,
                           initial_capacity=0) -> bool:
-    """Poll cluster capacity to check for increase/decrease in capacity used"""
-    retry_count = 0
-    space_reclaimed = False
-    while True:
-        LOG.info("Cluster capacity check (attempt %s)", retry_count+1)
-        if const.S3_ENGINE_RGW == CMN_CFG["s3_engine"]:
-            used_capacity = get_cortx_rgw_bytecount()['healthy']
-        else:
-            used_capacity = get_cortx_capacity()[-1]
-        LOG.info("CORTX capacity: %s", used_capacity)
-        if check_increase and initial_capacity <= used_capacity:
-            space_reclaimed = True
-            break
-        if not check_increase and initial_capacity > used_capacity:
-            space_reclaimed = True
-            break
-        LOG.info("Capacity increase/decrease check failed")
-        retry_count += 1
-        if retry_count < max_retries:
-            LOG.info("Retrying after %s seconds", sleep_interval)
-            time.sleep(sleep_interval)
-        else:
-            break
-    return space_reclaimed
+    """
+    Poll cluster capacity to check for increase/decrease in capacity used.
+
+    Capacity is polled at growing intervals from a few seconds up to sleep_interval and
+    the check returns as soon as used capacity moved in expected direction.
+    """
+    if const.S3_ENGINE_RGW == CMN_CFG["s3_engine"]:
+        def reader():
+            return get_cortx_rgw_bytecount(wait=False)['healthy']
+    else:
+        def reader():
+            return get_cortx_capacity()[-1]
+    tracker = CapacityTracker(cluster_reader=reader, max_interval=sleep_interval)
+    tracker.set_baseline(CLUSTER, initial_capacity)
+    tracker.expect(CLUSTER, direction=INCREASE if check_increase else DECREASE)
+    result = tracker.wait(timeout=sleep_interval * max_retries)
+    LOG.info("CORTX capacity: %s, converged: %s in %.1fs", result.observed[CLUSTER][0],
+             result.converged, result.latency)
+    return result.converged
 
 
 def create_s3_acc(
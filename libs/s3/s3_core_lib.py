@@ -30,11 +30,48 @@ from botocore.config import Config
 from botocore.exceptions import ClientError
 
 from commons.constants import S3_ENGINE_RGW
+from commons.utils import instrument_utils
+from commons.utils.retry_utils import record_retries
 from config import S3_CFG, CMN_CFG
 
 LOGGER = logging.getLogger(__name__)
 
 
+def _start_s3_call(model=None, params=None, context=None, **_kwargs) -> None:
+    """Start timing of S3 call, registered as before-call handler."""
+    if context is None or not instrument_utils.ENABLED:
+        return
+    span = instrument_utils.Span(f"s3.{model.name}")
+    body = params.get("body") if isinstance(params, dict) else None
+    span.nbytes = len(body) if isinstance(body, (bytes, bytearray)) else 0
+    context["latency_span"] = span.__enter__()
+
+
+def _end_s3_call(http_response=None, parsed=None, context=None, exception=None,
+                 **_kwargs) -> None:
+    """
+    Record latency and retries done by botocore for one S3 call, registered as
+    after-call and after-call-error handler. Latency of downloads is time to first byte.
+    """
+    if isinstance(parsed, dict):
+        record_retries("s3", parsed.get("ResponseMetadata", {}).get("RetryAttempts", 0))
+    span = context.pop("latency_span", None) if context is not None else None
+    if span is None:
+        return
+    if http_response is not None:
+        span.error = http_response.status_code >= 400
+        span.nbytes += int(http_response.headers.get("Content-Length", 0) or 0) \
+            if span.op == "s3.GetObject" else 0
+    span.__exit__(type(exception) if exception else None, exception, None)
+
+
+def _register_s3_handlers(client) -> None:
+    """Register latency and retry handlers on boto3 client."""
+    client.meta.events.register("before-call.s3", _start_s3_call)
+    client.meta.events.register("after-call.s3", _end_s3_call)
+    client.meta.events.register("after-call-error.s3", _end_s3_call)
+
+
 class S3Rest:
     """Basic Class for Creating Boto3 REST API Objects."""
 
@@ -56,6 +93,9 @@ class S3Rest:
         :param region: region.
         :param aws_session_token: aws_session_token.
         :param debug: debug mode.
+        :param max_attempts: attempts of a call including retries.
+        :param retry_mode: botocore retry mode, standard uses jittered exponential backoff
+            and stops retrying when most recent calls failed.
         """
         init_s3_connection = kwargs.get("init_s3_connection", True)
         if S3_ENGINE_RGW == CMN_CFG["s3_engine"]:
@@ -65,7 +105,8 @@ class S3Rest:
         aws_session_token = kwargs.get("aws_session_token", None)
         debug = kwargs.get("debug", S3_CFG["debug"])
         max_attempts = kwargs.get("max_attempts", 6)
-        config = Config(retries={'max_attempts': max_attempts})
+        retry_mode = kwargs.get("retry_mode", "standard")
+        config = Config(retries={'max_attempts': max_attempts, 'mode': retry_mode})
         self.use_ssl = kwargs.get("use_ssl", S3_CFG["use_ssl"])
         val_cert = kwargs.get("validate_certs", S3_CFG["validate_certs"])
         self.s3_cert_path = s3_cert_path if val_cert else False
@@ -95,6 +136,8 @@ class S3Rest:
                                               region_name=region,
                                               aws_session_token=aws_session_token,
                                               config=config)
+                for client in (self.s3_client, self.s3_resource.meta.client):
+                    _register_s3_handlers(client)
             else:
                 LOGGER.info("Skipped: create s3 client, resource object with boto3.")
         except ClientError as error:
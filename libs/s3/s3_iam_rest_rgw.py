@@ -27,25 +27,28 @@ from hashlib import sha1
 import hmac
 import ssl
 from urllib.parse import urlencode
-from typing import Any, Dict, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 from time import gmtime, strftime
-from aiohttp import ClientSession, ClientError
+from aiohttp import ClientSession, ClientError, TCPConnector
 
 from config import CMN_CFG
 from commons import params
 from comptests.s3.exceptions.s3_client_exception import HttpClientException
 from comptests.s3.exceptions.s3_client_exception import S3ClientException
 
+
 class HttpClient:
     '''
      Base HTTP client for CORTX utils.
      Enable user to asynchronously send HTTP requests.
+     Requests share one session with a pooled connector, connections and TLS sessions
+     are reused till close().
     '''
     #pylint: disable-msg=too-many-arguments
     def __init__(
         self, host: str = 'localhost', port: int = 30080,
         tls_enabled: bool = False, ca_bundle: str = '',
-        timeout: int = 5
+        timeout: int = 5, max_connections: int = 100
     ) -> None:
         """
         Initialize the client.
@@ -54,6 +57,7 @@ class HttpClient:
         :param tls_enabled: flag to use https.
         :param ca_bundle: path to the root CA certificate.
         :param timeout: connection timeout.
+        :param max_connections: size of connection pool.
         :returns: None.
         """
 
@@ -62,6 +66,49 @@ class HttpClient:
         self._url = f"{'https' if tls_enabled else 'http'}://{host}:{port}"
         self._ssl_ctx = ssl.create_default_context(cafile=ca_bundle) if ca_bundle else False
         self._timeout = timeout
+        self._max_connections = max_connections
+        self._session = None
+        self._session_loop = None
+
+    def _get_session(self) -> ClientSession:
+        """Session of running event loop, created on first use."""
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._session_loop is not loop:
+            # session is bound to the loop it was created in
+            self._close_stale_session()
+            connector = TCPConnector(limit=self._max_connections, ssl=self._ssl_ctx)
+            self._session = ClientSession(connector=connector)
+            self._session_loop = loop
+        return self._session
+
+    def _close_stale_session(self) -> None:
+        """Close session of a previous event loop so its pooled sockets are not leaked."""
+        old, old_loop = self._session, self._session_loop
+        self._session = None
+        if old is None or old.closed:
+            return
+        if old_loop is not None and old_loop.is_running() and not old_loop.is_closed():
+            # loop of session runs in another thread, session is closed there
+            asyncio.run_coroutine_threadsafe(old.close(), old_loop)
+            return
+        # loop of session cannot be run from a running loop, sockets are closed without awaiting
+        old.connector.close()
+        old.detach()
+
+    async def close(self) -> None:
+        """Close pooled connections."""
+        if self._session_loop is not asyncio.get_running_loop():
+            self._close_stale_session()
+        elif self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        await self.close()
+
     @classmethod
     def http_date(cls) -> str:
         """
@@ -95,16 +142,16 @@ class HttpClient:
         if query_params is not None:
             final_url += "?" if "?" not in path else "&"
             final_url += urlencode(query_params)
-        async with ClientSession() as http_session:
-            try:
-                async with http_session.request(method=verb, headers=headers, data=request_params,
-                                                url=final_url, ssl=self._ssl_ctx,
-                                                timeout=self._timeout) as resp:
-                    status = resp.status
-                    body = await resp.text()
-                    return status, body
-            except ClientError as error:
-                raise HttpClientException(str(error)) from None
+        try:
+            async with self._get_session().request(method=verb, headers=headers,
+                                                   data=request_params, url=final_url,
+                                                   ssl=self._ssl_ctx,
+                                                   timeout=self._timeout) as resp:
+                status = resp.status
+                body = await resp.text()
+                return status, body
+        except ClientError as error:
+            raise HttpClientException(str(error)) from None
 
 class S3Client(HttpClient):
     """
@@ -116,7 +163,7 @@ class S3Client(HttpClient):
         self, access_key_id: str, secret_access_key: str,
         host: str = 'localhost', port: int = 8000,
         tls_enabled: bool = False, ca_bundle: str = '',
-        timeout: int = 5
+        timeout: int = 5, max_connections: int = 100
     ) -> None:
         """
         Initialize the client.
@@ -127,12 +174,15 @@ class S3Client(HttpClient):
         :param tls_enabled: flag to use https.
         :param ca_bundle: path to the root CA certificate.
         :param timeout: connection timeout.
+        :param max_connections: size of connection pool.
         :returns: None.
         """
 
-        super().__init__(host, port, tls_enabled, ca_bundle, timeout)
+        super().__init__(host, port, tls_enabled, ca_bundle, timeout, max_connections)
         self._access_key_id = access_key_id
         self._secret_access_key = secret_access_key
+        # keyed hmac state is computed once and copied for every signature
+        self._hmac = hmac.new(secret_access_key.encode("UTF-8"), digestmod=sha1)
 
     def _generate_signature(self, verb: str, headers: Dict[str, str], path: str) -> str:
         """
@@ -149,9 +199,9 @@ class S3Client(HttpClient):
             val = headers.get(key, "")
             string_to_sign += f"{val}\n"
         string_to_sign += path.split('?')[0]
-        string_to_sign_bytes = string_to_sign.encode("UTF-8")
-        secret_access_key_bytes = self._secret_access_key.encode("UTF-8")
-        secret_key_hmac = hmac.new(secret_access_key_bytes, string_to_sign_bytes, sha1).digest()
+        secret_key_hmac = self._hmac.copy()
+        secret_key_hmac.update(string_to_sign.encode("UTF-8"))
+        secret_key_hmac = secret_key_hmac.digest()
         signature_bytes = base64.b64encode(secret_key_hmac).strip()
         signature = f"AWS {self._access_key_id}:{signature_bytes.decode('UTF-8')}"
         return signature
@@ -200,6 +250,31 @@ class RestApiRgw:
     SECRET_KEY = CMN_CFG["rgw_admin"]["secret_key"]
     HOST = CMN_CFG["nodes"][0]["hostname"]
     PORT = CMN_CFG["rgw_admin"]["port"]
+
+    def __init__(self, max_concurrency: int = 64):
+        """
+        :param max_concurrency: requests in flight of bulk operations, also size of
+            connection pool of every client.
+        """
+        self.max_concurrency = max_concurrency
+        self._clients = {}
+        self._loop = None
+
+    def _client(self, access_key: str = None, secret_key: str = None) -> S3Client:
+        """Long lived client of keys, admin keys if not given."""
+        keys = (access_key, secret_key) if access_key and secret_key else \
+            (self.ACCESS_KEY, self.SECRET_KEY)
+        if keys not in self._clients:
+            self._clients[keys] = S3Client(*keys, self.HOST, self.PORT, tls_enabled=False,
+                                           max_connections=self.max_concurrency)
+        return self._clients[keys]
+
+    async def close(self) -> None:
+        """Close connections of all clients."""
+        for client in self._clients.values():
+            await client.close()
+        self._clients = {}
+
     async def create_user(self,user_params) -> Tuple[HTTPStatus, Dict[str, Any]]:
         """
         Illustrate S3Client signed_http_request work.
@@ -207,9 +282,7 @@ class RestApiRgw:
         :returns: HTTP status code and user information as parsed json.
         """
 
-        rgwcli = S3Client(
-           self.ACCESS_KEY , self.SECRET_KEY, self.HOST, self.PORT, tls_enabled=False)
-        status, body = await rgwcli.signed_http_request(
+        status, body = await self._client().signed_http_request(
             'PUT', params.IAM_USER, query_params=user_params)
         user_info = json.loads(body)
         return status, user_info
@@ -220,9 +293,7 @@ class RestApiRgw:
         :returns: HTTP status code and user information as parsed json.
         """
 
-        rgwcli = S3Client(
-            self.ACCESS_KEY , self.SECRET_KEY, self.HOST, self.PORT, tls_enabled=False)
-        status = await rgwcli.signed_http_request(
+        status = await self._client().signed_http_request(
             'DELETE', params.IAM_USER, query_params=user_params)
         return status
 
@@ -233,9 +304,7 @@ class RestApiRgw:
         :returns: HTTP status code and user information as parsed json.
         """
 
-        rgwcli = S3Client(
-            self.ACCESS_KEY , self.SECRET_KEY, self.HOST, self.PORT, tls_enabled=False)
-        status, user_info = await rgwcli.signed_http_request(
+        status, user_info = await self._client().signed_http_request(
             'GET', params.IAM_USER, query_params=user_params)
         return status, user_info
 
@@ -246,9 +315,7 @@ class RestApiRgw:
         :returns: HTTP status code and user information as parsed json.
         """
 
-        rgwcli = S3Client(
-            self.ACCESS_KEY , self.SECRET_KEY, self.HOST, self.PORT, tls_enabled=False)
-        status = await rgwcli.signed_http_request(
+        status = await self._client().signed_http_request(
             'POST', "/", query_params=user_params)
         return status
 
@@ -261,15 +328,8 @@ class RestApiRgw:
         :param secret_key: Secret Key.
         :returns: HTTP status code and user information as parsed json.
         """
-        if access_key and secret_key:
-            rgw_client = S3Client(
-                access_key, secret_key, self.HOST, self.PORT, tls_enabled=False)
-            status = await rgw_client.signed_http_request('POST', "/", query_params=user_params)
-            return status
-
-        rgwcli = S3Client(
-        self.ACCESS_KEY , self.SECRET_KEY, self.HOST, self.PORT, tls_enabled=False)
-        status = await rgwcli.signed_http_request('POST', "/", query_params=user_params)
+        status = await self._client(access_key, secret_key).signed_http_request(
+            'POST', "/", query_params=user_params)
         return status
 
     async def get_user_policy(self,user_params, access_key=None,
@@ -280,13 +340,60 @@ class RestApiRgw:
         :returns: HTTP status code and user information as parsed json.
         """
 
-        if access_key and secret_key:
-            rgw_client = S3Client(
-                access_key, secret_key, self.HOST, self.PORT, tls_enabled=False)
-            status = await rgw_client.signed_http_request('POST', "/", query_params=user_params)
-            return status
-
-        rgwcli = S3Client(
-        self.ACCESS_KEY , self.SECRET_KEY, self.HOST, self.PORT, tls_enabled=False)
-        status = await rgwcli.signed_http_request('POST', "/", query_params=user_params)
+        status = await self._client(access_key, secret_key).signed_http_request(
+            'POST', "/", query_params=user_params)
         return status
+
+    async def _bulk(self, operation, params_list: List[Dict[str, Any]]) -> List[Any]:
+        """
+        Run operation for every params concurrently, at most max_concurrency in flight.
+        :returns: results in params_list order, exception object of a failed request.
+        """
+
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def limited(user_params):
+            async with semaphore:
+                return await operation(user_params)
+
+        return await asyncio.gather(*[limited(user_params) for user_params in params_list],
+                                    return_exceptions=True)
+
+    async def create_users(self, params_list: List[Dict[str, Any]]) -> List[Any]:
+        """Create IAM users concurrently, results as of create_user."""
+        return await self._bulk(self.create_user, params_list)
+
+    async def delete_users(self, params_list: List[Dict[str, Any]]) -> List[Any]:
+        """Delete IAM users concurrently, results as of delete_user."""
+        return await self._bulk(self.delete_user, params_list)
+
+    async def put_user_policies(self, params_list: List[Dict[str, Any]]) -> List[Any]:
+        """Put IAM user policies concurrently, results as of put_user_policy."""
+        return await self._bulk(self.put_user_policy, params_list)
+
+    def run(self, coro) -> Any:
+        """
+        Run coroutine to completion for sync callers, on an event loop of this object
+        which is kept till close_sync so pooled sessions are reused across calls.
+        """
+        if self._loop is None or self._loop.is_closed():
+            self._loop = asyncio.new_event_loop()
+        return self._loop.run_until_complete(coro)
+
+    def create_users_sync(self, params_list: List[Dict[str, Any]]) -> List[Any]:
+        """Sync wrapper of create_users."""
+        return self.run(self.create_users(params_list))
+
+    def delete_users_sync(self, params_list: List[Dict[str, Any]]) -> List[Any]:
+        """Sync wrapper of delete_users."""
+        return self.run(self.delete_users(params_list))
+
+    def put_user_policies_sync(self, params_list: List[Dict[str, Any]]) -> List[Any]:
+        """Sync wrapper of put_user_policies."""
+        return self.run(self.put_user_policies(params_list))
+
+    def close_sync(self) -> None:
+        """Sync wrapper of close, also closes event loop of sync calls."""
+        self.run(self.close())
+        self._loop.close()
+        self._loop = None
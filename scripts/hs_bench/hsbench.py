@@ -25,7 +25,6 @@
 import logging
 from datetime import datetime
 import json
-import pandas as pd
 
 from commons.utils.config_utils import read_yaml
 from commons.utils.system_utils import path_exists, run_local_cmd, make_dirs
@@ -167,22 +166,12 @@ def parse_hsbench_output(file_path):
     :file_path: Generated JSON file after hsbench tool
     :return: dictionary/list of the content
     """
-    json_data = []
     keys = ['Mode', 'Seconds', 'Ops', 'Mbps',
             'Iops', 'MinLat', 'AvgLat', 'MaxLat']
-    values = []
     with open(file_path, 'r', encoding="utf-8") as list_ops:
         json_data = json.load(list_ops)
-    for data in json_data:
-        value = []
-        if data['IntervalName'] == 'TOTAL':
-            for key in keys:
-                value.append(data[key])
-            values.append(value)
-    table_op = pd.DataFrame(values, columns=keys)
-    table_op.reset_index(inplace=False)
-    data_dict = table_op.to_dict("records")
-    return data_dict
+    return [{key: data[key] for key in keys} for data in json_data
+            if data['IntervalName'] == 'TOTAL']
 
 def parse_metrics_value(metric_name, mode_type, operation, parse_data):
     """
@@ -205,4 +194,4 @@ def parse_metrics_value(metric_name, mode_type, operation, parse_data):
                 if in_line_data[operation]:
                     vv1.append(int(in_line_data[operation]))
                     tt1.append(int(in_line_data['Seconds']))
-    return metric_name, str(vv1[0]+vv1[1]), tt1[0]+tt1[1]
+    return metric_name, str(sum(vv1)), sum(tt1)
@@ -0,0 +1,222 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2022 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+#
+
+"""Resource usage sampling agent run on cluster nodes.
+
+   Samples /proc of the node at a fixed rate and writes binary frames to stdout:
+   the node, every pod (processes grouped by kubepods cgroup, named by HOSTNAME of
+   their environment) and every process matching --procs. Only python3 standard
+   library is used so the agent can be piped to ``python3 -`` over SSH.
+   The agent exits when stdout is closed.
+
+   Frame: type (1 byte), payload length (uint32), payload.
+     H: agent epoch time (double).
+     K: key id (uint32) followed by utf-8 key name, sent before first use of key.
+     S: sample epoch time (double), record count (uint32), records of RECORD.
+"""
+
+import argparse
+import os
+import re
+import struct
+import sys
+import time
+
+FRAME = struct.Struct("<cI")
+HELLO = struct.Struct("<d")
+KEY = struct.Struct("<I")
+SAMPLE = struct.Struct("<dI")
+#: key id, cpu %, rss bytes, read B/s, write B/s, rx B/s, tx B/s
+RECORD = struct.Struct("<IfQffff")
+NODE_KEY = "node"
+
+CLK_TCK = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+def _read(path):
+    try:
+        with open(path, "rb") as proc_file:
+            return proc_file.read()
+    except OSError:
+        return b""
+
+
+def net_bytes(path="/proc/net/dev"):
+    """Received and transmitted bytes of all interfaces but loopback."""
+    rx_bytes = tx_bytes = 0
+    for line in _read(path).splitlines()[2:]:
+        name, _, values = line.partition(b":")
+        if name.strip() == b"lo":
+            continue
+        values = values.split()
+        rx_bytes += int(values[0])
+        tx_bytes += int(values[8])
+    return rx_bytes, tx_bytes
+
+
+def node_counters():
+    """Busy and total cpu ticks, used memory, disk and network byte counters of node."""
+    cpu = [int(val) for val in _read("/proc/stat").split(b"\n", 1)[0].split()[1:]]
+    idle = cpu[3] + (cpu[4] if len(cpu) > 4 else 0)
+    meminfo = dict(line.split(b":", 1) for line in _read("/proc/meminfo").splitlines())
+    mem = (int(meminfo[b"MemTotal"].split()[0]) -
+           int(meminfo[b"MemAvailable"].split()[0])) * 1024
+    read_bytes = write_bytes = 0
+    for line in _read("/proc/diskstats").splitlines():
+        fields = line.split()
+        # whole disks only, partitions are counted in their disk
+        if os.path.exists(b"/sys/block/" + fields[2]):
+            read_bytes += int(fields[5]) * 512
+            write_bytes += int(fields[9]) * 512
+    rx_bytes, tx_bytes = net_bytes()
+    return sum(cpu) - idle, sum(cpu), mem, read_bytes, write_bytes, rx_bytes, tx_bytes
+
+
+def proc_counters(pid):
+    """Name, cpu ticks, rss bytes, read and write bytes of a process, None if gone."""
+    stat = _read(f"/proc/{pid}/stat")
+    if not stat:
+        return None
+    comm = stat[stat.index(b"(") + 1:stat.rindex(b")")].decode(errors="replace")
+    fields = stat[stat.rindex(b")") + 2:].split()
+    ticks = int(fields[11]) + int(fields[12])
+    statm = _read(f"/proc/{pid}/statm").split()
+    rss = int(statm[1]) * PAGE_SIZE if len(statm) > 1 else 0
+    read_bytes = write_bytes = 0
+    for line in _read(f"/proc/{pid}/io").splitlines():
+        if line.startswith(b"read_bytes:"):
+            read_bytes = int(line.split()[1])
+        elif line.startswith(b"write_bytes:"):
+            write_bytes = int(line.split()[1])
+    return comm, ticks, rss, read_bytes, write_bytes
+
+
+class Agent:
+    """Sample counters, turn them into rates and write frames."""
+
+    def __init__(self, out, procs):
+        self.out = out
+        self.procs = re.compile(procs) if procs else None
+        self.keys = {}
+        self.pods = {}  # pid: pod name or None
+        self.prev = {}
+        self.prev_time = None
+
+    def _frame(self, kind, payload):
+        self.out.write(FRAME.pack(kind, len(payload)) + payload)
+
+    def _key(self, name):
+        key_id = self.keys.get(name)
+        if key_id is None:
+            key_id = self.keys[name] = len(self.keys)
+            self._frame(b"K", KEY.pack(key_id) + name.encode())
+        return key_id
+
+    def _pod(self, pid):
+        if pid not in self.pods:
+            pod = None
+            if b"kubepods" in _read(f"/proc/{pid}/cgroup"):
+                for var in _read(f"/proc/{pid}/environ").split(b"\0"):
+                    if var.startswith(b"HOSTNAME="):
+                        pod = var[len(b"HOSTNAME="):].decode(errors="replace")
+                        break
+            self.pods[pid] = pod
+        return self.pods[pid]
+
+    def counters(self):
+        """Current counters per key."""
+        node = node_counters()
+        counters = {NODE_KEY: (node[0], node[1]) + node[2:]}
+        pod_pid = {}
+        pids = [int(pid) for pid in os.listdir("/proc") if pid.isdigit()]
+        for pid in set(self.pods) - set(pids):
+            del self.pods[pid]
+        for pid in pids:
+            pod = self._pod(pid)
+            if pod is None:
+                continue
+            proc = proc_counters(pid)
+            if proc is None:
+                continue
+            comm, ticks, rss, read_bytes, write_bytes = proc
+            pod_key = "pod:" + pod
+            pod_pid.setdefault(pod_key, pid)
+            total = counters.get(pod_key, (0, 0, 0, 0, 0, 0, 0))
+            counters[pod_key] = (total[0] + ticks, 0, total[2] + rss, total[3] + read_bytes,
+                                 total[4] + write_bytes, 0, 0)
+            if self.procs is not None and self.procs.search(comm):
+                counters[f"proc:{pod}/{comm}:{pid}"] = (ticks, 0, rss, read_bytes,
+                                                        write_bytes, 0, 0)
+        for pod_key, pid in pod_pid.items():
+            # pod network namespace is seen through any of its processes
+            rx_bytes, tx_bytes = net_bytes(f"/proc/{pid}/net/dev")
+            counters[pod_key] = counters[pod_key][:5] + (rx_bytes, tx_bytes)
+        return counters
+
+    def sample(self):
+        """Write one sample frame of rates since previous call."""
+        now = time.time()
+        counters = self.counters()
+        records = []
+        if self.prev_time is not None:
+            elapsed = max(now - self.prev_time, 1e-3)
+            for name, cur in counters.items():
+                prev = self.prev.get(name)
+                if prev is None:
+                    continue
+                # pod counters drop when its processes exit
+                if name == NODE_KEY:
+                    cpu = 100.0 * max(cur[0] - prev[0], 0) / max(cur[1] - prev[1], 1)
+                else:
+                    cpu = 100.0 * max(cur[0] - prev[0], 0) / CLK_TCK / elapsed
+                records.append(RECORD.pack(
+                    self._key(name), cpu, cur[2],
+                    *[max(cur[i] - prev[i], 0) / elapsed for i in range(3, 7)]))
+        self.prev, self.prev_time = counters, now
+        self._frame(b"S", SAMPLE.pack(now, len(records)) + b"".join(records))
+        self.out.flush()
+
+    def run(self, interval, duration=None):
+        """Sample every interval seconds until stdout is closed or duration elapsed."""
+        self._frame(b"H", HELLO.pack(time.time()))
+        end = time.time() + duration if duration else None
+        next_time = time.time()
+        try:
+            while end is None or time.time() < end:
+                self.sample()
+                next_time += interval
+                time.sleep(max(next_time - time.time(), 0))
+        except BrokenPipeError:
+            pass
+
+
+def main():
+    """Agent entry point."""
+    parser = argparse.ArgumentParser(description="Resource usage sampling agent")
+    parser.add_argument("--interval", type=float, default=1.0, help="seconds between samples")
+    parser.add_argument("--procs", default="", help="regex of process names sampled per pid")
+    parser.add_argument("--duration", type=float, default=None, help="seconds to run")
+    opts = parser.parse_args()
+    Agent(sys.stdout.buffer, opts.procs).run(opts.interval, opts.duration)
+
+
+if __name__ == "__main__":
+    main()
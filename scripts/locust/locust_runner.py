@@ -71,8 +71,9 @@ def run_locust(
     time_str = str(time.strftime("%Y%m%d-%H%M%S"))
     log_file = f"{log_dir}{test_id}-{LOCUST_CFG['default']['LOGFILE']}-{time_str}.log"
     html_file = f"{log_dir}{test_id}-{LOCUST_CFG['default']['HTMLFILE']}-{time_str}.html"
-    locust_run_cmd = \
-        "locust --host={} -f {} --headless -u {} -r {} --run-time {} --html {} --logfile {}"
+    csv_prefix = f"{log_dir}{test_id}-locust-{time_str}"
+    locust_run_cmd = "locust --host={} -f {} --headless -u {} -r {} --run-time {} --html {} " \
+                     "--logfile {} --csv {}"
     LOGGER.info("Setting ulimit for locust\n")
     locust_run_cmd = locust_run_cmd.format(
         host,
@@ -81,11 +82,12 @@ def run_locust(
         hatch_rate,
         duration,
         html_file,
-        log_file)
+        log_file,
+        csv_prefix)
     cmd = "{}; {}\n".format(upper_limit_cmd, locust_run_cmd)
     res = run_local_cmd(cmd)
     LOGGER.info("Locust run completed.")
-    res1 = {"log-file": log_file, "html-file": html_file}
+    res1 = {"log-file": log_file, "html-file": html_file, "csv-file": f"{csv_prefix}_stats.csv"}
 
     return res, res1
 
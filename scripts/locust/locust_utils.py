@@ -34,12 +34,21 @@ from locust import events
 from commons.utils import system_utils
 from core.runner import InMemoryDB
 from scripts.locust import LOCUST_CFG
+from scripts.locust.object_registry import ObjectRegistry
 
 LOGGER = logging.getLogger(__name__)
 
 OBJ_NAME = LOCUST_CFG['default']['OBJ_NAME']
 GET_OBJ_PATH = LOCUST_CFG['default']['GET_OBJ_PATH']
-OBJECT_CACHE = InMemoryDB(1024*1024)
+MAX_OBJECTS = int(os.getenv('MAX_OBJECTS', LOCUST_CFG['default']['MAX_OBJECTS']))
+# Shared registry lets every locust worker on the client sample objects written by others.
+OBJECT_REGISTRY = os.getenv('OBJECT_REGISTRY', LOCUST_CFG['default']['OBJECT_REGISTRY'])
+if OBJECT_REGISTRY:
+    OBJECT_CACHE = ObjectRegistry(
+        OBJECT_REGISTRY, max_size=MAX_OBJECTS,
+        reservation_timeout=float(LOCUST_CFG['default']['RESERVATION_TIMEOUT']))
+else:
+    OBJECT_CACHE = InMemoryDB(MAX_OBJECTS)
 
 
 class LocustUtils:
@@ -100,6 +109,13 @@ class LocustUtils:
         # LOGGER.info("store_checksum %s/%s", bucket, object_key)
         OBJECT_CACHE.store(f"{bucket}/{object_key}", checksum)
 
+    @staticmethod
+    def purge_checksums(bucket):
+        """Delete checksums of all objects of bucket from shared registry"""
+        global OBJECT_CACHE
+        if isinstance(OBJECT_CACHE, ObjectRegistry):
+            OBJECT_CACHE.purge(f"{bucket}/")
+
     @staticmethod
     def pop_one_random():
         """Pop one random object entry from local DB"""
@@ -181,6 +197,7 @@ class LocustUtils:
             else:
                 if bucket in self.bucket_list:
                     self.bucket_list.pop(bucket)
+                self.purge_checksums(bucket.name)
                 LOGGER.info("Deleted bucket : %s", bucket)
                 events.request_success.fire(request_type="delete", name="delete_bucket",
                                             response_time=self.total_time(start_time),
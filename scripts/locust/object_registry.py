@@ -0,0 +1,237 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2022 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+#
+"""
+Shared object registry used by locust workers to track uploaded objects.
+
+All locust worker processes on a client host open the same SQLite database in WAL mode,
+so GET/HEAD/DELETE tasks can pick objects written by any worker. Objects which are
+available for sampling occupy a dense range of slots [0, available), which makes a random
+pick a single indexed lookup irrespective of the registry size.
+"""
+import logging
+import secrets
+import sqlite3
+import threading
+import time
+
+LOGGER = logging.getLogger(__name__)
+
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS objects ("
+    " key TEXT PRIMARY KEY,"
+    " value TEXT NOT NULL,"
+    " seq INTEGER NOT NULL,"
+    " slot INTEGER UNIQUE,"
+    " reserved_at REAL)",
+    "CREATE INDEX IF NOT EXISTS objects_seq ON objects(seq)",
+    "CREATE INDEX IF NOT EXISTS objects_reserved_at ON objects(reserved_at)",
+    "CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value INTEGER NOT NULL)",
+    "INSERT OR IGNORE INTO meta VALUES ('available', 0), ('total', 0), ('seq', 0)",
+)
+
+
+class ObjectRegistry:
+    """
+    Process shared object registry with the same interface as core.runner.InMemoryDB.
+
+    pop_one() reserves an entry instead of forgetting it, store() of a reserved key releases
+    it back for sampling and delete() drops it. Reservations of crashed workers are reclaimed
+    after reservation_timeout seconds. When max_size is exceeded the oldest unreserved entries
+    are evicted.
+    """
+
+    def __init__(self, db_path: str, max_size: int = 1024 * 1024,
+                 reservation_timeout: float = 300, busy_timeout: float = 30) -> None:
+        self.db_path = db_path
+        self.maxsize = max_size
+        self.reservation_timeout = reservation_timeout
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            db_path, timeout=busy_timeout, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        with self._transaction() as cur:
+            for stmt in _SCHEMA:
+                cur.execute(stmt)
+
+    def _transaction(self):
+        """Return a context manager running the block in a write transaction."""
+        return _Transaction(self._conn, self._lock)
+
+    @staticmethod
+    def _get_meta(cur, name: str) -> int:
+        return cur.execute("SELECT value FROM meta WHERE name = ?", (name,)).fetchone()[0]
+
+    @staticmethod
+    def _add_meta(cur, name: str, delta: int) -> int:
+        cur.execute("UPDATE meta SET value = value + ? WHERE name = ?", (delta, name))
+        return ObjectRegistry._get_meta(cur, name)
+
+    def _add_slot(self, cur, key: str) -> None:
+        """Make key available for sampling by appending it to the slot range."""
+        available = self._get_meta(cur, "available")
+        cur.execute("UPDATE objects SET slot = ?, reserved_at = NULL WHERE key = ?",
+                    (available, key))
+        self._add_meta(cur, "available", 1)
+
+    def _remove_slot(self, cur, slot: int) -> None:
+        """Fill the hole left by a freed slot with the last slot of the range."""
+        last = self._add_meta(cur, "available", -1)
+        if slot != last:
+            cur.execute("UPDATE objects SET slot = ? WHERE slot = ?", (slot, last))
+
+    def _drop(self, cur, key: str, slot) -> None:
+        cur.execute("DELETE FROM objects WHERE key = ?", (key,))
+        if slot is not None:
+            self._remove_slot(cur, slot)
+        self._add_meta(cur, "total", -1)
+
+    def _evict(self, cur) -> None:
+        """Evict oldest unreserved entries while registry is over capacity."""
+        total = self._get_meta(cur, "total")
+        while total > self.maxsize:
+            row = cur.execute("SELECT key, slot FROM objects WHERE slot IS NOT NULL "
+                              "ORDER BY seq LIMIT 1").fetchone()
+            if not row:
+                break
+            self._drop(cur, row[0], row[1])
+            total -= 1
+
+    def _reclaim(self, cur) -> None:
+        """Release reservations held longer than reservation timeout."""
+        expired = cur.execute(
+            "SELECT key FROM objects WHERE reserved_at < ?",
+            (time.time() - self.reservation_timeout,)).fetchall()
+        for (key,) in expired:
+            LOGGER.debug("Reclaiming stale reservation of %s", key)
+            self._add_slot(cur, key)
+
+    def store(self, key: str, value: str) -> None:
+        """
+        Stores the key and value, releases reservation if any and evicts old entries.
+        :param key: bucket/object key
+        :param value: checksum of the object
+        """
+        with self._transaction() as cur:
+            row = cur.execute("SELECT slot FROM objects WHERE key = ?", (key,)).fetchone()
+            if row:
+                cur.execute("UPDATE objects SET value = ? WHERE key = ?", (value, key))
+                if row[0] is None:
+                    self._add_slot(cur, key)
+            else:
+                seq = self._add_meta(cur, "seq", 1)
+                cur.execute("INSERT INTO objects (key, value, seq) VALUES (?, ?, ?)",
+                            (key, value, seq))
+                self._add_meta(cur, "total", 1)
+                self._add_slot(cur, key)
+            self._evict(cur)
+
+    def lookup(self, key: str) -> str:
+        """
+        Lookup registry for key.
+        :param key: bucket/object key
+        :return: val of entry
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM objects WHERE key = ?", (key,)).fetchone()
+        if not row:
+            raise KeyError(key)
+        return row[0]
+
+    def delete(self, key: str) -> None:
+        """Removes the entry whether or not it is reserved."""
+        with self._transaction() as cur:
+            row = cur.execute("SELECT slot FROM objects WHERE key = ?", (key,)).fetchone()
+            if row:
+                self._drop(cur, key, row[0])
+
+    def release(self, key: str) -> None:
+        """Makes a reserved entry available for sampling again."""
+        with self._transaction() as cur:
+            row = cur.execute("SELECT slot FROM objects WHERE key = ?", (key,)).fetchone()
+            if row and row[0] is None:
+                self._add_slot(cur, key)
+
+    def pop_one(self) -> tuple:
+        """
+        Reserve one random available entry.
+        :return: (key, value) or (False, False) if nothing is available
+        """
+        with self._transaction() as cur:
+            self._reclaim(cur)
+            available = self._get_meta(cur, "available")
+            if available == 0:
+                return False, False
+            slot = secrets.randbelow(available)
+            key, value = cur.execute(
+                "SELECT key, value FROM objects WHERE slot = ?", (slot,)).fetchone()
+            cur.execute("UPDATE objects SET slot = NULL, reserved_at = ? WHERE key = ?",
+                        (time.time(), key))
+            self._remove_slot(cur, slot)
+        return key, value
+
+    def purge(self, prefix: str) -> int:
+        """
+        Removes all entries whose key starts with prefix e.g. all objects of a bucket.
+        :param prefix: key prefix
+        :return: number of entries removed
+        """
+        with self._transaction() as cur:
+            upper = prefix[:-1] + chr(ord(prefix[-1]) + 1)
+            rows = cur.execute("SELECT key, slot FROM objects WHERE key >= ? AND key < ?",
+                               (prefix, upper)).fetchall()
+            for key, slot in rows:
+                self._drop(cur, key, slot)
+        return len(rows)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._get_meta(self._conn.cursor(), "total")
+
+    def close(self) -> None:
+        """Close database connection."""
+        self._conn.close()
+
+
+class _Transaction:
+    """Serialize writers across threads and processes with BEGIN IMMEDIATE."""
+
+    def __init__(self, conn, lock) -> None:
+        self.conn = conn
+        self.lock = lock
+        self.cur = None
+
+    def __enter__(self):
+        self.lock.acquire()
+        try:
+            self.cur = self.conn.cursor()
+            self.cur.execute("BEGIN IMMEDIATE")
+        except sqlite3.Error:
+            self.lock.release()
+            raise
+        return self.cur
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        try:
+            self.cur.execute("ROLLBACK" if exc_type else "COMMIT")
+        finally:
+            self.lock.release()
+        return False
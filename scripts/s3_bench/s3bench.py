@@ -168,6 +168,45 @@ def check_log_file_error(file_path, errors=None):
     return error_found
 
 
+# pylint: disable=too-many-arguments
+def s3bench_cmd(access_key, secret_key, bucket, end_point, num_clients, num_sample,
+                obj_name_pref, obj_size, skip_write=False, skip_cleanup=False, skip_read=False,
+                validate=True, verbose=False, region="us-east-1", validate_certs=True,
+                max_retries=None, response_header_timeout=None, httpclientimeout=None,
+                connect_timeout=None):
+    """
+    Form s3bench command line, see s3bench for description of the arguments.
+    :param connect_timeout: connection timeout of s3bench clients e.g. 10s.
+    :return: s3bench command without output redirection.
+    """
+    # GO command formatter
+    cmd = f"s3bench -accessKey={access_key} -accessSecret={secret_key} " \
+          f"-bucket={bucket} -endpoint={end_point} -numClients={num_clients} " \
+          f"-numSamples={num_sample} -objectNamePrefix={obj_name_pref} -objectSize={obj_size} " \
+          f"-skipSSLCertVerification={not validate_certs} "
+    if max_retries:
+        cmd = cmd + f"-s3MaxRetries={max_retries} "
+    if response_header_timeout:
+        cmd = cmd + f"-responseHeaderTimeout={response_header_timeout} "
+    if httpclientimeout:
+        cmd = cmd + f"-httpClientTimeout={httpclientimeout} "
+    if region:
+        cmd = cmd + f"-region {region} "
+    if skip_write:
+        cmd = cmd + "-skipWrite "
+    if skip_read:
+        cmd = cmd + "-skipRead "
+    if skip_cleanup:
+        cmd = cmd + "-skipCleanup "
+    if validate:
+        cmd = cmd + "-validate "
+    if connect_timeout:
+        cmd = cmd + f"-connectTimeout={connect_timeout} "
+    if verbose:
+        cmd = cmd + "-verbose "
+    return cmd
+
+
 # pylint: disable=too-many-arguments
 # pylint: disable-msg=too-many-locals
 def s3bench(
@@ -228,31 +267,13 @@ def s3bench(
     log_path = create_log(result, log_file_prefix, num_clients, num_sample, obj_size, host=host,
                           user=user, pwd=pwd)
     LOGGER.info("Running s3 bench tool")
-    # GO command formatter
-    cmd = f"s3bench -accessKey={access_key} -accessSecret={secret_key} " \
-          f"-bucket={bucket} -endpoint={end_point} -numClients={num_clients} " \
-          f"-numSamples={num_sample} -objectNamePrefix={obj_name_pref} -objectSize={obj_size} " \
-          f"-skipSSLCertVerification={not validate_certs} "
-    if max_retries:
-        cmd = cmd + f"-s3MaxRetries={max_retries} "
-    if response_header_timeout:
-        cmd = cmd + f"-responseHeaderTimeout={response_header_timeout} "
-    if httpclientimeout:
-        cmd = cmd + f"-httpClientTimeout={httpclientimeout} "
-    if region:
-        cmd = cmd + f"-region {region} "
-    if skip_write:
-        cmd = cmd + "-skipWrite "
-    if skip_read:
-        cmd = cmd + "-skipRead "
-    if skip_cleanup:
-        cmd = cmd + "-skipCleanup "
-    if validate:
-        cmd = cmd + "-validate "
-    if connect_timeout:
-        cmd = cmd + f"-connectTimeout={connect_timeout} "
-    if verbose:
-        cmd = cmd + "-verbose "
+    cmd = s3bench_cmd(access_key, secret_key, bucket=bucket, end_point=end_point,
+                      num_clients=num_clients, num_sample=num_sample,
+                      obj_name_pref=obj_name_pref, obj_size=obj_size, skip_write=skip_write,
+                      skip_cleanup=skip_cleanup, skip_read=skip_read, validate=validate,
+                      verbose=verbose, region=region, validate_certs=validate_certs,
+                      max_retries=max_retries, response_header_timeout=response_header_timeout,
+                      httpclientimeout=httpclientimeout, connect_timeout=connect_timeout)
     cmd = f"{cmd}>> {log_path} 2>&1"
     LOGGER.info("Workload execution started.")
     if duration:
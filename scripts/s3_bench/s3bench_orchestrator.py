@@ -0,0 +1,239 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2022 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+#
+
+"""Run parallel s3bench instances across multiple endpoints and client hosts."""
+
+import json
+import logging
+import os
+import subprocess
+import threading
+import time
+from datetime import datetime
+
+from paramiko import AutoAddPolicy, SSHClient, SSHException
+
+from commons.utils import benchmark_utils
+from commons.utils.system_utils import make_dirs, path_exists
+from libs.ha.ha_common_libs_k8s import HAK8s
+from scripts.s3_bench import s3bench
+
+LOGGER = logging.getLogger(__name__)
+
+
+class S3benchInstance:
+    """One s3bench process bound to an endpoint and a client host."""
+
+    # pylint: disable=too-many-arguments
+    def __init__(self, index: int, end_point: str, cmd: str, log_path: str, host: dict = None):
+        """
+        :param index: instance number.
+        :param end_point: endpoint used by instance.
+        :param cmd: s3bench command line.
+        :param log_path: local log file to which output is streamed.
+        :param host: client host dict with hostname, username and password, local if None.
+        """
+        self.index = index
+        self.end_point = end_point
+        self.cmd = cmd
+        self.log_path = log_path
+        self.host = host
+        self.runs = 0
+        self.exit_status = []
+
+    def _run_local(self, log_fd) -> int:
+        with subprocess.Popen(self.cmd, shell=True, stdout=subprocess.PIPE,  # nosec (B602)
+                              stderr=subprocess.STDOUT) as proc:
+            for chunk in iter(lambda: proc.stdout.read1(65536), b""):
+                log_fd.write(chunk)
+            return proc.wait()
+
+    def _run_remote(self, log_fd) -> int:
+        client = SSHClient()
+        client.set_missing_host_key_policy(AutoAddPolicy())
+        client.connect(self.host["hostname"], username=self.host["username"],
+                       password=self.host["password"], timeout=30)
+        try:
+            _, stdout, _ = client.exec_command(f"{self.cmd} 2>&1")
+            channel = stdout.channel
+            while True:
+                chunk = channel.recv(65536)
+                if not chunk:
+                    break
+                log_fd.write(chunk)
+            return channel.recv_exit_status()
+        finally:
+            client.close()
+
+    def run(self, deadline: float = None) -> None:
+        """Run s3bench once or back to back until deadline (epoch seconds)."""
+        with open(self.log_path, "ab") as log_fd:
+            while True:
+                LOGGER.info("Instance %s: starting run %s against %s on %s", self.index,
+                            self.runs, self.end_point,
+                            self.host["hostname"] if self.host else "localhost")
+                try:
+                    if self.host:
+                        status = self._run_remote(log_fd)
+                    else:
+                        status = self._run_local(log_fd)
+                except (OSError, SSHException) as error:
+                    LOGGER.error("Instance %s failed: %s", self.index, error)
+                    status = -1
+                log_fd.flush()
+                self.exit_status.append(status)
+                self.runs += 1
+                if not deadline or time.time() >= deadline:
+                    break
+
+
+class S3benchOrchestrator:
+    """
+    Launch N s3bench instances in parallel spread across endpoints and client hosts.
+
+    Output of every instance is streamed into its own local log, logs are parsed with
+    commons.utils.benchmark_utils and merged into per endpoint and aggregate reports.
+    """
+
+    # pylint: disable=too-many-arguments
+    def __init__(self, access_key: str, secret_key: str, end_points: list,
+                 client_hosts: list = None, instances_per_endpoint: int = 1,
+                 log_dir: str = s3bench.LOG_DIR):
+        """
+        :param access_key: S3 access key.
+        :param secret_key: S3 secret key.
+        :param end_points: endpoint URLs e.g. from endpoints_from_pods.
+        :param client_hosts: list of dicts with hostname, username and password of client
+            hosts, instances run on local client if not given.
+        :param instances_per_endpoint: number of s3bench instances per endpoint.
+        :param log_dir: local directory for instance logs and report.
+        """
+        self.access_key = access_key
+        self.secret_key = secret_key
+        self.end_points = list(end_points)
+        self.client_hosts = client_hosts or [None]
+        self.instances_per_endpoint = instances_per_endpoint
+        self.log_dir = log_dir
+        self.instances = []
+
+    @staticmethod
+    def endpoints_from_pods(pod_obj, pod_list: list, port_name: str = "rgw-https",
+                            scheme: str = "https") -> list:
+        """
+        Form endpoint URLs of RGW pods.
+        :param pod_obj: LogicalNode object of master node.
+        :param pod_list: server pod names.
+        :param port_name: name of the pod port.
+        :param scheme: URL scheme.
+        :return: list of endpoint URLs.
+        """
+        pod_ep = HAK8s.form_endpoint_port(pod_obj, pod_list, port_name=port_name)
+        return [f"{scheme}://{ip_port}" for ip_port in pod_ep.values()]
+
+    def setup(self) -> bool:
+        """Install s3bench on all client hosts."""
+        for host in self.client_hosts:
+            if host:
+                resp = s3bench.setup_s3bench(host["hostname"], host["username"],
+                                             host["password"], remote=True)
+            else:
+                resp = s3bench.setup_s3bench()
+            if not resp:
+                return False
+        return True
+
+    # pylint: disable=too-many-locals
+    def run(self, log_file_prefix: str, bucket_prefix: str, num_clients: int, num_sample: int,
+            obj_size: str = "4Kb", duration: int = None, **kwargs) -> dict:
+        """
+        Run s3bench instances in parallel and merge their results.
+        :param log_file_prefix: prefix of instance logs and report.
+        :param bucket_prefix: bucket prefix, every instance uses its own bucket.
+        :param num_clients: number of clients per instance.
+        :param num_sample: number of samples per instance.
+        :param obj_size: object size e.g. 1Kb, 2Mb, 4Gb.
+        :param duration: run instances back to back for duration seconds, single run if None.
+        :keyword: s3bench options of s3bench.s3bench_cmd e.g. skip_cleanup, unknown options
+            raise TypeError.
+        :return: report dict with per endpoint and aggregate records and log paths.
+        """
+        if not path_exists(self.log_dir):
+            make_dirs(self.log_dir)
+        now = datetime.now().strftime("%d-%m-%Y-%H-%M-%S-%f")
+        self.instances = []
+        obj_name_pref = kwargs.pop("obj_name_pref", "loadgen_test_")
+        index = 0
+        for end_point in self.end_points:
+            for _ in range(self.instances_per_endpoint):
+                host = self.client_hosts[index % len(self.client_hosts)]
+                cmd = s3bench.s3bench_cmd(
+                    self.access_key, self.secret_key, bucket=f"{bucket_prefix}-{index}",
+                    end_point=end_point, num_clients=num_clients, num_sample=num_sample,
+                    obj_name_pref=obj_name_pref,
+                    obj_size=obj_size, **kwargs)
+                log_path = os.path.join(
+                    self.log_dir, f"{log_file_prefix}_s3bench_{index}_{num_clients}_"
+                                  f"{num_sample}_{obj_size}_{now}.log")
+                self.instances.append(S3benchInstance(index, end_point, cmd, log_path, host))
+                index += 1
+        deadline = time.time() + duration if duration else None
+        LOGGER.info("Starting %s s3bench instances across %s endpoints and %s client hosts",
+                    len(self.instances), len(self.end_points), len(self.client_hosts))
+        threads = [threading.Thread(target=instance.run, args=(deadline,),
+                                    name=f"s3bench-{instance.index}", daemon=True)
+                   for instance in self.instances]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        report = self.report(num_clients)
+        report_path = os.path.join(self.log_dir, f"{log_file_prefix}_s3bench_report_{now}.json")
+        with open(report_path, "w", encoding="utf-8") as report_fd:
+            json.dump(report, report_fd, indent=2)
+        report["report_path"] = report_path
+        LOGGER.info("Aggregate s3bench report: %s", report["aggregate"])
+        return report
+
+    def report(self, num_clients: int = None) -> dict:
+        """Merge results of finished instances per endpoint and in total."""
+        per_endpoint = {}
+        logs = []
+        errors = []
+        for instance in self.instances:
+            logs.append(instance.log_path)
+            if any(instance.exit_status) or s3bench.check_log_file_error(instance.log_path):
+                errors.append(instance.log_path)
+            records = benchmark_utils.aggregate_records(
+                benchmark_utils.parse_s3bench_log(instance.log_path, clients=num_clients))
+            # Back to back runs of one instance are sequential, average instead of sum.
+            for record in records:
+                runs = max(instance.runs, 1)
+                record.ops_per_sec /= runs
+                record.mbps /= runs
+                record.clients //= runs
+            per_endpoint.setdefault(instance.end_point, []).extend(records)
+        all_records = [rec for records in per_endpoint.values() for rec in records]
+        return {
+            "endpoints": {end_point: [rec.to_dict() for rec in
+                                      benchmark_utils.aggregate_records(records)]
+                          for end_point, records in per_endpoint.items()},
+            "aggregate": [rec.to_dict() for rec in
+                          benchmark_utils.aggregate_records(all_records)],
+            "logs": logs, "failed_logs": errors}
@@ -33,9 +33,12 @@ from multiprocessing import Process
 from jira import JIRA
 from core import runner
 from core import kafka_consumer
+from core import scheduler
+from core.pytest_worker import WorkerPool
 from core.health_status_check_update import HealthCheck
 from core.client_config import ClientConfig
-from core.locking_server import LockingServer
+from core.lock_service import LeaseHeartbeat
+from core.lock_service import LeaseLockService
 from commons.utils.jira_utils import JiraTask
 from commons import configmanager
 from commons.utils import config_utils
@@ -45,6 +48,8 @@ from commons import cortxlogging
 from commons import constants as common_cnst
 
 LOGGER = logging.getLogger(__name__)
+# Warm pytest workers used for Kafka messages when --warm_workers is set.
+WORKER_POOL = None
 
 
 def parse_args():
@@ -103,6 +108,18 @@ def parse_args():
                         help="Use HTTPS/SSL connection for S3 endpoint.")
     parser.add_argument("-hc", "--health_check", type=str_to_bool, default=True,
                         help="Decide whether to do health check.")
+    parser.add_argument("-ww", "--warm_workers", type=str_to_bool, default=False,
+                        help="Run Kafka test batches on warm pytest workers.")
+    parser.add_argument("--worker_max_batches", type=int, default=20,
+                        help="Recycle warm worker after this many batches.")
+    parser.add_argument("--worker_max_rss_mb", type=int, default=4096,
+                        help="Recycle warm worker above this resident memory in MB.")
+    parser.add_argument("--profile", type=str, default="",
+                        help="Comma separated test IDs to run under sampling profiler, "
+                             "all to profile every test.")
+    parser.add_argument("-e", "--execution_id", type=str, default=None,
+                        help="Consume scheduled tests of this distributed execution "
+                             "and steal remaining work of other runners.")
     return parser.parse_args()
 
 
@@ -130,8 +147,11 @@ def str_to_bool(val):
         raise argparse.ArgumentTypeError('Boolean value expected.')
 
 
-def run_pytest_cmd(args, te_tag=None, parallel_exe=False, env=None, re_execution=False):
-    """Form a pytest command for execution."""
+def run_pytest_cmd(args, te_tag=None, parallel_exe=False, env=None, re_execution=False,
+                   tests=None):
+    """Form a pytest command for execution.
+    Command runs on a warm worker if worker pool is started and tests are given.
+    """
     env['TARGET'] = args.target
     build, build_type = args.build, args.build_type
 
@@ -211,6 +231,9 @@ def run_pytest_cmd(args, te_tag=None, parallel_exe=False, env=None, re_execution
     if args.stop_on_first_error:
         cmd_line = cmd_line + ["-x"]
 
+    if args.profile:
+        cmd_line = cmd_line + ["--profile=" + args.profile]
+
     cmd_line = cmd_line + ['--build=' + str(build), '--build_type=' + str(build_type),
                            '--tp_ticket=' + args.test_plan,
                            '--product_family=' + args.product_family,
@@ -219,12 +242,24 @@ def run_pytest_cmd(args, te_tag=None, parallel_exe=False, env=None, re_execution
                            '--csm_checks=' + str(args.csm_checks),
                            '--health_check=' + str(args.health_check)]
     LOGGER.debug('Running pytest command %s', cmd_line)
+    if WORKER_POOL is not None and tests is not None:
+        reply = WORKER_POOL.run_batch(args.target, cmd_line[1:], tests,
+                                      env={'pytest_run': env.get('pytest_run', '')})
+        LOGGER.info("Warm worker batch finished with exit code %s in %.1fs, results %s",
+                    reply["exit_code"], reply.get("duration", 0), reply["results"])
+        check_pytest_exit_code(reply["exit_code"])
+        return
     prc = subprocess.Popen(cmd_line, env=env)
     prc.communicate()
-    if prc.returncode == 3:
+    check_pytest_exit_code(prc.returncode)
+
+
+def check_pytest_exit_code(returncode):
+    """Exit test runner if pytest run stopped on deployment health check."""
+    if returncode == 3:
         print('Exiting test runner due to bad health of deployment')
         sys.exit(1)
-    if prc.returncode == 4:
+    if returncode == 4:
         print('Exiting test runner due to health check script error')
         sys.exit(2)
 
@@ -312,7 +347,7 @@ def trigger_unexecuted_tests(args, test_list):
             _env = os.environ.copy()
             _env['pytest_run'] = 'distributed'
             run_pytest_cmd(args, te_tag=tag, parallel_exe=args.parallel_exe,
-                           env=_env, re_execution=True)
+                           env=_env, re_execution=True, tests=unexecuted_test_list)
 
 
 def create_test_meta_data_file(args, test_list, jira_obj=None):
@@ -391,13 +426,13 @@ def trigger_runner_process(args, kafka_msg, client):
     """
         Runner process to trigger tests in kafka msg on available target
     """
-    lock_task = LockingServer()
+    lock_service = LeaseLockService()
     trigger_tests_from_kafka_msg(args, kafka_msg)
     # rerun unexecuted tests in case of parallel execution
     if kafka_msg.parallel and args.force_serial_run != "True":
         trigger_unexecuted_tests(args, kafka_msg.test_list)
     # Release lock on acquired target.
-    lock_released = lock_task.unlock_target(args.target, client)
+    lock_released = lock_service.release(args.target, client)
     if lock_released:
         LOGGER.debug("lock released on target {}".format(args.target))
     else:
@@ -420,7 +455,8 @@ def trigger_tests_from_kafka_msg(args, kafka_msg):
     _env['pytest_run'] = 'distributed'
 
     # First execute all tests with parallel tag which are mentioned in given tag.
-    run_pytest_cmd(args, te_tag=None, parallel_exe=kafka_msg.parallel, env=_env)
+    run_pytest_cmd(args, te_tag=None, parallel_exe=kafka_msg.parallel, env=_env,
+                   tests=kafka_msg.test_list)
     LOGGER.debug("Executed tests %s on target %s", kafka_msg.test_list, args.target)
 
 
@@ -496,50 +532,16 @@ def trigger_tests_from_te(args, jira_obj):
             runner.stop_parallel_io(thread_io, event)
 
 
-def acquire_target(target, client, lock_type, convert_to_shared=False):
-    """
-    Check for target which will be used for sequential execution.
-    """
-    lock_task = LockingServer()
-    found_target = ""
-    if target != "":
-        LOGGER.debug("target found {}".format(target))
-        lock_success = lock_task.lock_target(target, client, lock_type, convert_to_shared)
-        if lock_success:
-            LOGGER.debug("lock acquired {}".format(target))
-            confirm_lock_success = lock_task.is_target_locked(target, client, lock_type)
-            if confirm_lock_success:
-                found_target = target
-                LOGGER.debug("lock confirmed {}".format(target))
-    return found_target
-
-
 def get_available_target(kafka_msg, client):
     """
-    Check available target from target list
-    Get lock on target if available
+    Wait in queue for a lock on any target from target list
+    Shared lock for parallel tests, exclusive lock otherwise
     """
-    lock_task = LockingServer()
-    acquired_target = ""
+    lock_service = LeaseLockService()
     HealthCheck(runner.get_db_credential()).health_check(kafka_msg.target_list)
     LOGGER.info("Acquiring available target for test execution.")
-    while acquired_target == "":
-        if kafka_msg.parallel:
-            target = lock_task.find_free_target(kafka_msg.target_list, common_cnst.SHARED_LOCK)
-            if target == "":
-                seq_target = lock_task.find_free_target(kafka_msg.target_list,
-                                                        common_cnst.EXCLUSIVE_LOCK)
-                if seq_target != "":
-                    acquired_target = acquire_target(seq_target, client, common_cnst.SHARED_LOCK,
-                                                     True)
-            else:
-                acquired_target = acquire_target(target, client, common_cnst.SHARED_LOCK)
-        else:
-            seq_target = lock_task.find_free_target(kafka_msg.target_list,
-                                                    common_cnst.EXCLUSIVE_LOCK)
-            if seq_target != "":
-                acquired_target = acquire_target(seq_target, client,
-                                                 common_cnst.EXCLUSIVE_LOCK)
+    lock_type = common_cnst.SHARED_LOCK if kafka_msg.parallel else common_cnst.EXCLUSIVE_LOCK
+    acquired_target = lock_service.acquire(kafka_msg.target_list, client, lock_type)
     LOGGER.info("Acquired available target %s for test execution.", str(acquired_target))
     return acquired_target
 
@@ -551,6 +553,7 @@ def check_kafka_msg_trigger_test(args):
     """
     consumer = kafka_consumer.get_consumer()
     print(consumer)
+    start_worker_pool(args)
     received_stop_signal = False
     max_iteration = 0
     while not received_stop_signal:
@@ -572,27 +575,92 @@ def check_kafka_msg_trigger_test(args):
             elif not len(kafka_msg.test_list):
                 continue
             else:
-                current_time_ms = datetime.utcnow().strftime('%Y-%m-%d_%H:%M:%S.%f')
-                client = system_utils.get_host_name() + "_" + current_time_ms
-                acquired_target = get_available_target(kafka_msg, client)
-                ClientConfig(runner.get_db_credential()).client_configure_for_given_target(acquired_target)
-                args.te_ticket = kafka_msg.te_ticket
-                args.parallel_exe = kafka_msg.parallel
-                args.build = kafka_msg.build
-                args.build_type = kafka_msg.build_type
-                args.test_plan = kafka_msg.test_plan
-                args.target = acquired_target
-                # force serial run within testrunner till xdist issue is fixed
-                args.force_serial_run = "True"
-                p = Process(target=trigger_runner_process, args=(args, kafka_msg, client))
-                p.start()
-                p.join()
+                execute_kafka_msg(args, kafka_msg)
         except KeyboardInterrupt:
             break
         except BaseException as exce:
             print(exce)
             received_stop_signal = True
     consumer.close()
+    stop_worker_pool()
+
+
+def execute_kafka_msg(args, kafka_msg):
+    """Acquire a target and run tests of kafka message in a runner process."""
+    current_time_ms = datetime.utcnow().strftime('%Y-%m-%d_%H:%M:%S.%f')
+    client = system_utils.get_host_name() + "_" + current_time_ms
+    acquired_target = get_available_target(kafka_msg, client)
+    ClientConfig(runner.get_db_credential()).client_configure_for_given_target(acquired_target)
+    args.te_ticket = kafka_msg.te_ticket
+    args.parallel_exe = kafka_msg.parallel
+    args.build = kafka_msg.build
+    args.build_type = kafka_msg.build_type
+    args.test_plan = kafka_msg.test_plan
+    args.target = acquired_target
+    # force serial run within testrunner till xdist issue is fixed
+    args.force_serial_run = "True"
+    # keep lease alive while tests run, runner process releases the lock
+    heartbeat = LeaseHeartbeat(LeaseLockService(), acquired_target, client)
+    heartbeat.start()
+    try:
+        if WORKER_POOL is not None:
+            # warm workers already isolate pytest from runner, a health check exit ends
+            # this message like it ends a runner process
+            try:
+                trigger_runner_process(args, kafka_msg, client)
+            except SystemExit as exit_code:
+                LOGGER.error("Runner for %s exited with %s", kafka_msg.te_ticket,
+                             exit_code.code)
+        else:
+            p = Process(target=trigger_runner_process, args=(args, kafka_msg, client))
+            p.start()
+            p.join()
+    finally:
+        heartbeat.stop()
+        # no-op if runner released the lock, frees target when runner failed before that
+        heartbeat.service.release(acquired_target, client)
+
+
+def start_worker_pool(args):
+    """Start warm pytest worker pool if enabled."""
+    global WORKER_POOL  # pylint: disable=global-statement
+    if args.warm_workers and WORKER_POOL is None:
+        WORKER_POOL = WorkerPool(max_batches=args.worker_max_batches,
+                                 max_rss_mb=args.worker_max_rss_mb,
+                                 env={"USE_SSL": str(args.use_ssl),
+                                      "VALIDATE_CERTS": str(args.validate_certs)},
+                                 collect_args=["--local=True"])
+    return WORKER_POOL
+
+
+def stop_worker_pool():
+    """Stop warm pytest workers."""
+    global WORKER_POOL  # pylint: disable=global-statement
+    if WORKER_POOL is not None:
+        WORKER_POOL.close()
+        WORKER_POOL = None
+
+
+def check_scheduled_kafka_msg_trigger_test(args):
+    """
+    Consume work items of a scheduled distributed execution.
+    Own partition is consumed first, remaining items of other runners are stolen.
+    """
+    runner_id = f"{system_utils.get_host_name()}_{os.getpid()}"
+    consumer = scheduler.ScheduledConsumer(args.execution_id, runner_id)
+    start_worker_pool(args)
+    try:
+        for kafka_msg in consumer:
+            if not len(kafka_msg.test_list):
+                continue
+            execute_kafka_msg(args, kafka_msg)
+        if consumer.finished:
+            consumer.finish()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        consumer.close()
+        stop_worker_pool()
 
 
 def get_setup_details(args):
@@ -666,6 +734,8 @@ def main(args):
             trigger_tests_from_te(args, jira_obj)
     elif args.te_ticket:
         trigger_tests_from_te(args, jira_obj)
+    elif args.execution_id:
+        check_scheduled_kafka_msg_trigger_test(args)
     else:
         check_kafka_msg_trigger_test(args)
 
@@ -42,6 +42,7 @@ from config import CSM_REST_CFG
 from config.s3 import S3_CFG
 from libs.csm.csm_interface import csm_api_factory
 from libs.csm.csm_setup import CSMConfigsCheck
+from libs.csm.rest.csm_rest_capacity_tracker import CapacityTracker
 from libs.ha.ha_common_libs_k8s import HAK8s
 from libs.s3 import s3_misc
 from libs.s3.s3_multipart_test_lib import S3MultipartTestLib
@@ -121,6 +122,7 @@ class TestCapacityQuota():
         self.buckets_created.append([self.bucket, self.akey, self.skey])
         self.s3_mp_test_obj = S3MultipartTestLib(access_key=self.akey, secret_key=self.skey,
                                                  endpoint_url=S3_CFG["s3_url"])
+        self.tracker = CapacityTracker(quota_obj=self.csm_obj)
 
     def teardown_method(self):
         """
@@ -154,6 +156,19 @@ class TestCapacityQuota():
         self.log.info("[ENDED] ######### Teardown #########")
 
 
+    def wait_user_capacity(self, user_id, used, objects):
+        """
+        Poll capacity usage of user created in test till it reports used bytes and objects.
+        :param user_id: ID of user created in test, its capacity starts at zero
+        :param used: expected used bytes
+        :param objects: expected object count
+        """
+        key = ("user", user_id)
+        self.tracker.set_baseline(key, 0, 0)
+        self.tracker.expect(key, used=used, objects=objects)
+        result = self.tracker.wait()
+        assert result.converged, f"Capacity of {user_id} not updated: {result.pending}"
+
     def create_bucket_to_upload_parts(
             self,
             bucket_name,
@@ -790,6 +805,7 @@ class TestCapacityQuota():
         self.log.info("total objects and size %s and %s ", total_objects, total_size)
         self.log.info("Data size is %s ", data_size)
         self.log.info("Step 4: Perform & Verify GET API to get capacity usage stats")
+        self.wait_user_capacity(self.user_id, total_size, total_objects)
         res, resp = self.csm_obj.verify_user_capacity(self.user_id, total_size,
                                 total_size, total_objects)
         assert res, "Verify User capacity failed"
@@ -830,6 +846,7 @@ class TestCapacityQuota():
         self.log.info("total objects and size %s and %s ", total_objects, total_size)
         self.log.info("Data size is %s ", data_size)
         self.log.info("Step 4: Perform & Verify GET API to get capacity usage stats")
+        self.wait_user_capacity(self.user_id, total_size, total_objects)
         res, resp = self.csm_obj.verify_user_capacity(self.user_id, total_size,
                                 total_size, total_objects)
         assert res, "Verify User capacity failed"
@@ -868,6 +885,7 @@ class TestCapacityQuota():
         self.log.info("total objects and size %s and %s ", total_objects, total_size)
         self.log.info("Data size is %s ", data_size)
         self.log.info("Step 4: Perform & Verify GET API to get capacity usage stats")
+        self.wait_user_capacity(self.user_id, total_size, total_objects)
         res, resp = self.csm_obj.verify_user_capacity(self.user_id, total_size,
                                 total_size, total_objects)
         assert res, "Verify User capacity failed"
@@ -1025,6 +1043,7 @@ class TestCapacityQuota():
         self.log.info("total objects and size %s and %s ", total_objects, total_size)
         self.log.info("Data size is %s ", data_size)
         self.log.info("Step 4: Perform & Verify GET API to get capacity usage stats")
+        self.wait_user_capacity(self.user_id, total_size, total_objects)
         res, resp = self.csm_obj.verify_user_capacity(self.user_id, total_size,
                                 total_size, total_objects)
         assert res, "Verify User capacity failed"
@@ -1147,6 +1166,7 @@ class TestCapacityQuota():
         total_objects, total_size = s3_misc.get_objects_size_bucket(self.bucket,
                                                                     self.akey, self.skey)
         self.log.info("Step 8: Perform & Verify GET API to get capacity usage stats")
+        self.wait_user_capacity(self.user_id, total_size, total_objects)
         res, resp = self.csm_obj.verify_user_capacity(self.user_id, total_size,
                                 total_size, total_objects)
         assert res, "Verify User capacity failed"
@@ -1212,6 +1232,7 @@ class TestCapacityQuota():
             self.log.info("total objects and size %s and %s ", total_objects, total_size)
             self.log.info("Data size is %s ", data_size)
             self.log.info("Step 4: Perform & Verify GET API to get capacity usage stats")
+            self.wait_user_capacity(user_id, total_size, total_objects)
             res, resp = self.csm_obj.verify_user_capacity(user_id, total_size,
                                 total_size, total_objects)
             assert res, "Verify User capacity failed"
@@ -1276,6 +1297,7 @@ class TestCapacityQuota():
             total_num_objects = total_num_objects + num_objects
 
         self.log.info("Step 4: Perform & Verify GET API to get capacity usage stats")
+        self.wait_user_capacity(self.user_id, total_size, total_objects)
         res, resp = self.csm_obj.verify_user_capacity(self.user_id, total_size,
                                 total_size, total_objects)
         assert res, "Verify User capacity failed"
@@ -1347,6 +1369,7 @@ class TestCapacityQuota():
             self.log.info("total objects and size %s and %s ", total_objects, total_size)
             self.log.info("Data size is %s ", data_size)
             self.log.info("Step 4: Perform & Verify GET API to get capacity usage stats")
+            self.wait_user_capacity(user_id, total_size, total_objects)
             res, resp = self.csm_obj.verify_user_capacity(user_id, total_size,
                                 total_size, total_objects)
             assert res, "Verify User capacity failed"
@@ -1694,6 +1717,7 @@ class TestCapacityQuota():
         self.log.info("Data size is %s ", data_size)
 
         self.log.info("Step 3: Perform & Verify GET API to get capacity usage stats")
+        self.wait_user_capacity(self.user_id, total_size, total_objects)
         res, resp = self.csm_obj.verify_user_capacity(self.user_id, total_size,
                                 total_size, total_objects, aligned=True)
         assert res, "Verify User capacity failed"
@@ -1735,6 +1759,7 @@ class TestCapacityQuota():
         self.log.info("Data size is %s ", data_size)
 
         self.log.info("Step 3: Perform & Verify GET API to get capacity usage stats")
+        self.wait_user_capacity(self.user_id, total_size, total_objects)
         res, resp = self.csm_obj.verify_user_capacity(self.user_id, total_size,
                                 total_size, total_objects, aligned=False)
         assert res, "Verify User capacity failed"
@@ -1780,6 +1805,7 @@ class TestCapacityQuota():
         self.log.info("Data size is %s ", data_size)
 
         self.log.info("Step 3: Perform & Verify GET API to get capacity usage stats")
+        self.wait_user_capacity(self.user_id, total_size, total_objects)
         res, resp = self.csm_obj.verify_user_capacity(self.user_id, total_size,
                                 total_size, total_objects, aligned=True)
         assert res, "Verify User capacity failed"
@@ -1827,6 +1853,7 @@ class TestCapacityQuota():
         self.log.info("Data size is %s ", data_size)
 
         self.log.info("Step 4: Perform & Verify GET API to get capacity usage stats")
+        self.wait_user_capacity(self.user_id, total_size, total_objects)
         res, resp = self.csm_obj.verify_user_capacity(self.user_id, total_size,
                                 total_size, total_objects, aligned=True)
         assert res, "Verify User capacity failed"
@@ -1871,6 +1898,7 @@ class TestCapacityQuota():
         self.log.info("Data size is %s ", data_size)
 
         self.log.info("Step 4: Perform & Verify GET API to get capacity usage stats")
+        self.wait_user_capacity(self.user_id, total_size, total_objects)
         res, resp = self.csm_obj.verify_user_capacity(self.user_id, total_size,
                                 total_size, total_objects, aligned=False)
         assert res, "Verify User capacity failed"
@@ -1918,6 +1946,7 @@ class TestCapacityQuota():
         self.log.info("Data size is %s ", data_size)
 
         self.log.info("Step 4: Perform & Verify GET API to get capacity usage stats")
+        self.wait_user_capacity(self.user_id, total_size, total_objects)
         res, resp = self.csm_obj.verify_user_capacity(self.user_id, total_size,
                                 total_size, total_objects, aligned=True)
         assert res, "Verify User capacity failed"
@@ -1995,6 +2024,7 @@ class TestCapacityQuota():
         self.log.info("Data size is %s ", data_size)
 
         self.log.info("Step 5: Perform & Verify GET API to get capacity usage stats")
+        self.wait_user_capacity(self.user_id, total_size, total_objects)
         res, resp = self.csm_obj.verify_user_capacity(self.user_id, total_size,
                                 total_size, total_objects, aligned=None) # Revisit after CORTX-32486
         assert res, "Verify User capacity failed"
@@ -2090,6 +2120,7 @@ class TestCapacityQuota():
         self.log.info("Data size is %s ", data_size)
 
         self.log.info("Step 5: Perform & Verify GET API to get capacity usage stats")
+        self.wait_user_capacity(self.user_id, total_size, total_objects)
         res, resp = self.csm_obj.verify_user_capacity(self.user_id, total_size,
                                 total_size, total_objects, aligned=None) # Revisit after CORTX-32486
         assert res, "Verify User capacity failed"
@@ -2454,6 +2485,7 @@ class TestCapacityQuota():
         max_objects = test_cfg["max_objects"]
 
         self.log.info("Get capacity count")
+        self.wait_user_capacity(self.user_id, 0, 0)
         res, resp = self.csm_obj.verify_user_capacity(self.user_id, 0, 0, 0)
         assert res, "Verify User capacity failed"
 
@@ -2463,6 +2495,7 @@ class TestCapacityQuota():
                                           object_size=0, block_size="1K")
 
         self.log.info("Get capacity count")
+        self.wait_user_capacity(self.user_id, 0, 1)
         res, resp = self.csm_obj.verify_user_capacity(self.user_id, 0, 0, 1)
         used_rounded = resp["capacity"]["s3"]["users"][0]["used_rounded"]
         assert res, "Verify User capacity failed"
@@ -2473,6 +2506,7 @@ class TestCapacityQuota():
         assert resp, "Failed to delete object."
 
         self.log.info("Get capacity count")
+        self.wait_user_capacity(self.user_id, 0, 0)
         res, resp = self.csm_obj.verify_user_capacity(self.user_id, 0, 0, 0)
         assert res, "Verify User capacity failed"
 
@@ -2515,6 +2549,7 @@ class TestCapacityQuota():
         max_objects = test_cfg["max_objects"]
 
         self.log.info("Get capacity count")
+        self.wait_user_capacity(self.user_id, 0, 0)
         res, resp = self.csm_obj.verify_user_capacity(self.user_id, 0, 0, 0)
         assert res, "Verify User capacity failed"
 
@@ -2557,6 +2592,7 @@ class TestCapacityQuota():
         max_objects = -1
 
         self.log.info("Get capacity count")
+        self.wait_user_capacity(self.user_id, 0, 0)
         res, resp = self.csm_obj.verify_user_capacity(self.user_id, 0, 0, 0)
         assert res, "Verify User capacity failed"
 
@@ -2718,6 +2754,7 @@ class TestCapacityQuota():
         total_objects, total_size = s3_misc.get_objects_size_bucket(self.bucket,
                                                                     self.akey, self.skey)
         self.log.info("total objects and size %s and %s ", total_objects, total_size)
+        self.wait_user_capacity(self.user_id, total_size, total_objects)
         res, resp = self.csm_obj.verify_user_capacity(self.user_id, total_size,
                                 total_size, total_objects, aligned=None)
         assert res, "Verify User capacity failed"
@@ -2725,6 +2762,7 @@ class TestCapacityQuota():
         assert s3_misc.delete_objects(self.bucket, self.akey, self.skey), \
                                          "Delete object Failed"
         self.log.info("Step 3: Get user capacity stats")
+        self.wait_user_capacity(self.user_id, 0, 0)
         res, resp = self.csm_obj.verify_user_capacity(self.user_id, 0,
                                 0, 0, aligned=True)   #Need to Revisit
         self.log.info("Response is: %s", resp)
@@ -133,18 +133,13 @@ class TestSystemCapacity():
         assert resp, "Put object Failed"
         self.log.info("[End] Start some IOs")
 
-        self.log.info("[Start] Sleep %s", self.update_seconds)
-        time.sleep(self.update_seconds)
-        self.log.info("[End] Sleep %s", self.update_seconds)
-
-        resp = self.csm_obj.get_degraded_all(self.csm_obj.hlth_master)
-
         new_write = self.aligned_size * 1024 * 1024
         total_written += new_write
 
-        result = self.csm_obj.verify_degraded_capacity(
-            resp, healthy=total_written, degraded=0, critical=0, damaged=0,
-            err_margin=self.err_margin, total=total_written)
+        result = self.csm_obj.wait_degraded_capacity(
+            self.csm_obj.hlth_master, self.csm_obj.verify_degraded_capacity,
+            healthy=total_written, degraded=0, critical=0, damaged=0,
+            err_margin=self.err_margin, total=total_written, timeout=self.update_seconds)
         assert result[0], result[1]
         self.log.info("[END] Setup Method")
 
@@ -254,14 +249,9 @@ class TestSystemCapacity():
             assert_utils.assert_false(resp[0], resp)
             self.log.info("[End] Cluster is in degraded state")
 
-            self.log.info("[Start] Sleep %s", self.update_seconds)
-            time.sleep(self.update_seconds)
-            self.log.info("[End] Sleep %s", self.update_seconds)
-
-            resp = self.csm_obj.get_degraded_all(self.csm_obj.hlth_master)
-
-            result = self.csm_obj.verify_bytecount_all(resp, failure_cnt, self.kvalue,
-                                                       test_cfg["err_margin"], total_written)
+            result = self.csm_obj.wait_degraded_capacity(
+                self.csm_obj.hlth_master, self.csm_obj.verify_bytecount_all, failure_cnt,
+                self.kvalue, test_cfg["err_margin"], total_written, timeout=self.update_seconds)
             assert result[0], result[1]
         self.log.info("[END] Failure loop")
 
@@ -274,13 +264,9 @@ class TestSystemCapacity():
             assert resp, "Failed to restore pod"
             failure_cnt -= 1
 
-            self.log.info("[Start] Sleep %s", self.update_seconds)
-            time.sleep(self.update_seconds)
-            self.log.info("[End] Sleep %s", self.update_seconds)
-
-            resp = self.csm_obj.get_degraded_all(self.csm_obj.hlth_master)
-            result = self.csm_obj.verify_bytecount_all(resp, failure_cnt, self.kvalue,
-                                                       test_cfg["err_margin"], total_written)
+            result = self.csm_obj.wait_degraded_capacity(
+                self.csm_obj.hlth_master, self.csm_obj.verify_bytecount_all, failure_cnt,
+                self.kvalue, test_cfg["err_margin"], total_written, timeout=self.update_seconds)
             assert result[0], result[1] + f"for {failure_cnt} failures"
         self.deploy = True
 
@@ -333,15 +319,10 @@ class TestSystemCapacity():
             assert_utils.assert_false(resp[0], resp)
             self.log.info("[End] Cluster is in degraded state")
 
-            self.log.info("[Start] Sleep %s", self.update_seconds)
-            time.sleep(self.update_seconds)
-            self.log.info("[End] Sleep %s", self.update_seconds)
-
-            resp = self.csm_obj.get_degraded_all(self.csm_obj.hlth_master)
-            result = self.csm_obj.verify_degraded_capacity(
-                resp, healthy=0, degraded=None, critical=None, damaged=None,
-                err_margin=test_cfg["err_margin"],
-                total=total_written)
+            result = self.csm_obj.wait_degraded_capacity(
+                self.csm_obj.hlth_master, self.csm_obj.verify_degraded_capacity, healthy=0,
+                degraded=None, critical=None, damaged=None, err_margin=test_cfg["err_margin"],
+                total=total_written, timeout=self.update_seconds)
             assert result[0], result[1]
 
             new_write = self.aligned_size * failure_cnt
@@ -366,13 +347,9 @@ class TestSystemCapacity():
             assert resp, "Put object Failed"
             self.log.info("[End] Start some IOs")
 
-            self.log.info("[Start] Sleep %s", self.update_seconds)
-            time.sleep(self.update_seconds)
-            self.log.info("[End] Sleep %s", self.update_seconds)
-
-            resp = self.csm_obj.get_degraded_all(self.csm_obj.hlth_master)
-            result = self.csm_obj.verify_flexi_protection(resp, cap_df, self.failed_pod,
-                                                          self.kvalue, test_cfg["err_margin"])
+            result = self.csm_obj.wait_degraded_capacity(
+                self.csm_obj.hlth_master, self.csm_obj.verify_flexi_protection, cap_df,
+                self.failed_pod, self.kvalue, test_cfg["err_margin"], timeout=self.update_seconds)
             #Commented below line until CORTX-34274 is fixed
             assert result[0], result[1]
         self.log.info("[END] Failure loop")
@@ -392,12 +369,9 @@ class TestSystemCapacity():
             self.log.info("[End] Restore deleted pods : %s", deploy_name)
             failure_cnt -= 1
 
-            self.log.info("[Start] Sleep %s", self.update_seconds)
-            time.sleep(self.update_seconds)
-            self.log.info("[End] Sleep %s", self.update_seconds)
-            resp = self.csm_obj.get_degraded_all(self.csm_obj.hlth_master)
-            result = self.csm_obj.verify_flexi_protection(resp, cap_df, self.failed_pod,
-                                                          self.kvalue, test_cfg["err_margin"])
+            result = self.csm_obj.wait_degraded_capacity(
+                self.csm_obj.hlth_master, self.csm_obj.verify_flexi_protection, cap_df,
+                self.failed_pod, self.kvalue, test_cfg["err_margin"], timeout=self.update_seconds)
             #Commented below line until CORTX-34274 is fixed
             assert result[0], result[1] + f"for {failure_cnt} failures"
         assert self.csm_obj.verify_checksum(cap_df)
@@ -496,13 +470,9 @@ class TestSystemCapacity():
                 else:
                     raise error
 
-            self.log.info("[Start] Sleep %s", self.update_seconds)
-            time.sleep(self.update_seconds)
-            self.log.info("[End] Sleep %s", self.update_seconds)
-
-            resp = self.csm_obj.get_degraded_all(self.csm_obj.hlth_master)
-            result = self.csm_obj.verify_flexi_protection(resp, cap_df, self.failed_pod,
-                                                          self.kvalue, test_cfg["err_margin"])
+            result = self.csm_obj.wait_degraded_capacity(
+                self.csm_obj.hlth_master, self.csm_obj.verify_flexi_protection, cap_df,
+                self.failed_pod, self.kvalue, test_cfg["err_margin"], timeout=self.update_seconds)
             #Commented below line until CORTX-34274 is fixed
             assert result[0], result[1]
         self.log.info("[END] Failure loop")
@@ -522,12 +492,9 @@ class TestSystemCapacity():
             self.log.info("[End] Restore deleted pods : %s", deploy_name)
             failure_cnt -= 1
 
-            self.log.info("[Start] Sleep %s", self.update_seconds)
-            time.sleep(self.update_seconds)
-            self.log.info("[End] Sleep %s", self.update_seconds)
-            resp = self.csm_obj.get_degraded_all(self.csm_obj.hlth_master)
-            result = self.csm_obj.verify_flexi_protection(resp, cap_df, self.failed_pod,
-                                                          self.kvalue, test_cfg["err_margin"])
+            result = self.csm_obj.wait_degraded_capacity(
+                self.csm_obj.hlth_master, self.csm_obj.verify_flexi_protection, cap_df,
+                self.failed_pod, self.kvalue, test_cfg["err_margin"], timeout=self.update_seconds)
             #Commented below line until CORTX-34274 is fixed
             assert result[0], result[1] + f"for {failure_cnt} failures"
         assert self.csm_obj.verify_checksum(cap_df)
@@ -561,21 +528,18 @@ class TestSystemCapacity():
         csum = s3_misc.get_object_checksum(obj, self.bucket, self.akey, self.skey)
         self.log.info("[End] IOs")
 
-        self.log.info("[Start] Sleep %s", self.update_seconds)
-        time.sleep(self.update_seconds)
-        self.log.info("[End] Sleep %s", self.update_seconds)
+        total_written += obj_size * 1024 * 1024
+        result = self.csm_obj.wait_degraded_capacity(
+            self.csm_obj.hlth_master, self.csm_obj.verify_degraded_capacity,
+            healthy=total_written, degraded=0, critical=0, damaged=0,
+            err_margin=self.err_margin, total=total_written, timeout=self.update_seconds)
+        assert result[0], result[1]
 
         resp = self.csm_obj.get_degraded_all(self.csm_obj.hlth_master)
-        total_written += obj_size * 1024 * 1024
         new_row = pandas.Series(data=resp, name='BeforeClusterRestart')
         cap_df = cap_df.append(new_row, ignore_index=False)
         cap_df["csum"] = csum
 
-        result = self.csm_obj.verify_degraded_capacity(
-            resp, healthy=total_written, degraded=0, critical=0, damaged=0,
-            err_margin=self.err_margin, total=total_written)
-        assert result[0], result[1]
-
         self.log.info("[Start] Stop Cluster")
         resp = self.ha_obj.cortx_stop_cluster(self.master)
         assert resp[0], resp[1]
@@ -592,20 +556,16 @@ class TestSystemCapacity():
         assert resp[0], resp[1]
         self.log.info("[End] Cluster restart.")
 
-        self.log.info("[Start] Sleep %s", self.update_seconds)
-        time.sleep(self.update_seconds)
-        self.log.info("[End] Sleep %s", self.update_seconds)
+        result = self.csm_obj.wait_degraded_capacity(
+            self.csm_obj.hlth_master, self.csm_obj.verify_degraded_capacity, degraded=0,
+            critical=0, damaged=0, err_margin=self.err_margin, timeout=self.update_seconds)
+        assert result[0], result[1]
 
         resp = self.csm_obj.get_degraded_all(self.csm_obj.hlth_master)
         total_written = resp["healthy"]
         new_row = pandas.Series(data=resp, name='AfterClusterRestart')
         cap_df = cap_df.append(new_row, ignore_index=False)
 
-        result = self.csm_obj.verify_degraded_capacity(
-            resp, healthy=total_written, degraded=0, critical=0, damaged=0,
-            err_margin=self.err_margin, total=total_written)
-        assert result[0], result[1]
-
         csum = s3_misc.get_object_checksum(obj, self.bucket, self.akey, self.skey)
         cap_df["csum"]["AfterClusterRestart"] = csum
 
@@ -665,16 +625,10 @@ class TestSystemCapacity():
             assert_utils.assert_false(resp[0], resp)
             self.log.info("[End] Cluster is in degraded state")
 
-            self.log.info("[Start] Sleep %s", self.update_seconds)
-            time.sleep(self.update_seconds)
-            self.log.info("[End] Sleep %s", self.update_seconds)
-
-            resp = self.csm_obj.get_degraded_all(self.csm_obj.hlth_master)
-
-            result = self.csm_obj.verify_degraded_capacity(
-                resp, healthy=0, degraded=None, critical=None, damaged=None,
-                err_margin=test_cfg["err_margin"],
-                total=total_written)
+            result = self.csm_obj.wait_degraded_capacity(
+                self.csm_obj.hlth_master, self.csm_obj.verify_degraded_capacity, healthy=0,
+                degraded=None, critical=None, damaged=None, err_margin=test_cfg["err_margin"],
+                total=total_written, timeout=self.update_seconds)
             assert result[0], result[1]
 
             new_write = self.aligned_size * failure_cnt
@@ -698,13 +652,9 @@ class TestSystemCapacity():
             assert resp, "Put object Failed"
             self.log.info("[End] Start some IOs")
 
-            self.log.info("[Start] Sleep %s", self.update_seconds)
-            time.sleep(self.update_seconds)
-            self.log.info("[End] Sleep %s", self.update_seconds)
-
-            resp = self.csm_obj.get_degraded_all(self.csm_obj.hlth_master)
-            result = self.csm_obj.verify_flexi_protection(resp, cap_df, self.failed_pod,
-                                                          self.kvalue, test_cfg["err_margin"])
+            result = self.csm_obj.wait_degraded_capacity(
+                self.csm_obj.hlth_master, self.csm_obj.verify_flexi_protection, cap_df,
+                self.failed_pod, self.kvalue, test_cfg["err_margin"], timeout=self.update_seconds)
             #Commented below line until CORTX-34274 is fixed
             assert result[0], result[1]
         self.log.info("[END] Failure loop")
@@ -723,12 +673,9 @@ class TestSystemCapacity():
             self.failed_pod.remove(deploy_name)
             self.log.info("[End] Restore deleted pods : %s", deploy_name)
             failure_cnt -= 1
-            self.log.info("[Start] Sleep %s", self.update_seconds)
-            time.sleep(self.update_seconds)
-            self.log.info("[End] Sleep %s", self.update_seconds)
-            resp = self.csm_obj.get_degraded_all(self.csm_obj.hlth_master)
-            result = self.csm_obj.verify_flexi_protection(resp, cap_df, self.failed_pod,
-                                                          self.kvalue, test_cfg["err_margin"])
+            result = self.csm_obj.wait_degraded_capacity(
+                self.csm_obj.hlth_master, self.csm_obj.verify_flexi_protection, cap_df,
+                self.failed_pod, self.kvalue, test_cfg["err_margin"], timeout=self.update_seconds)
             #Commented below line until CORTX-34274 is fixed
             assert result[0], result[1] + f"for {failure_cnt} failures"
         self.deploy = True
@@ -802,13 +749,9 @@ class TestSystemCapacity():
             assert resp, "Put object Failed"
             self.log.info("[End] Start some IOs")
 
-            self.log.info("[Start] Sleep %s", self.update_seconds)
-            time.sleep(self.update_seconds)
-            self.log.info("[End] Sleep %s", self.update_seconds)
-
-            resp = self.csm_obj.get_degraded_all(self.csm_obj.hlth_master)
-            result = self.csm_obj.verify_flexi_protection(resp, cap_df, self.failed_pod,
-                                                          self.kvalue, test_cfg["err_margin"])
+            result = self.csm_obj.wait_degraded_capacity(
+                self.csm_obj.hlth_master, self.csm_obj.verify_flexi_protection, cap_df,
+                self.failed_pod, self.kvalue, test_cfg["err_margin"], timeout=self.update_seconds)
             assert result[0], result[1]
         self.log.info("[END] Failure loop")
 
@@ -823,12 +766,9 @@ class TestSystemCapacity():
             self.failed_pod.remove(deploy_name)
             self.log.info("[End] Restore deleted pods : %s", deploy_name)
             failure_cnt -= 1
-            self.log.info("[Start] Sleep %s", self.update_seconds)
-            time.sleep(self.update_seconds)
-            self.log.info("[End] Sleep %s", self.update_seconds)
-            resp = self.csm_obj.get_degraded_all(self.csm_obj.hlth_master)
-            result = self.csm_obj.verify_flexi_protection(resp, cap_df, self.failed_pod,
-                                                          self.kvalue, test_cfg["err_margin"])
+            result = self.csm_obj.wait_degraded_capacity(
+                self.csm_obj.hlth_master, self.csm_obj.verify_flexi_protection, cap_df,
+                self.failed_pod, self.kvalue, test_cfg["err_margin"], timeout=self.update_seconds)
             assert result[0], result[1] + f"for {failure_cnt} failures"
         assert self.csm_obj.verify_checksum(cap_df)
         self.deploy = True
@@ -1076,17 +1016,13 @@ class TestSystemCapacity():
             assert os.path.exists(resp[1]), "Log file not found."
             self.log.info("[End] Start some IOs")
 
-            self.log.info("[Start] Sleep %s", self.update_seconds)
-            time.sleep(self.update_seconds)
-            self.log.info("[End] Sleep %s", self.update_seconds)
-
             _, new_write = s3_misc.get_objects_size_bucket(bucket, self.akey, self.skey)
-            resp = self.csm_obj.get_degraded_all(self.csm_obj.hlth_master)
-            result = self.csm_obj.verify_degraded_capacity(
-                resp, healthy=new_write, degraded=total_written, critical=0, damaged=0,
-                err_margin=test_cfg["err_margin"],
-                total=total_written + new_write)
-            assert result, "Degraded byte check failed"
+            result = self.csm_obj.wait_degraded_capacity(
+                self.csm_obj.hlth_master, self.csm_obj.verify_degraded_capacity,
+                healthy=new_write, degraded=total_written, critical=0, damaged=0,
+                err_margin=test_cfg["err_margin"], total=total_written + new_write,
+                timeout=self.update_seconds)
+            assert result[0], result[1]
 
             total_written += new_write
             self.log.info("[START] Recovery loop")
@@ -1098,14 +1034,11 @@ class TestSystemCapacity():
             self.failed_pod.remove(deploy_name)
             self.log.info("[End] Restore deleted pods : %s", deploy_name)
 
-            self.log.info("[Start] Sleep %s", self.update_seconds)
-            time.sleep(self.update_seconds)
-            self.log.info("[End] Sleep %s", self.update_seconds)
-            resp = self.csm_obj.get_degraded_all(self.csm_obj.hlth_master)
-            result = self.csm_obj.verify_degraded_capacity(
-                resp, healthy=total_written, degraded=0, critical=0, damaged=0,
-                err_margin=test_cfg["err_margin"],
-                total=total_written)
+            result = self.csm_obj.wait_degraded_capacity(
+                self.csm_obj.hlth_master, self.csm_obj.verify_degraded_capacity,
+                healthy=total_written, degraded=0, critical=0, damaged=0,
+                err_margin=test_cfg["err_margin"], total=total_written,
+                timeout=self.update_seconds)
             assert result[0], result[1]
             # Uncomment next lines and remove break when CORTX-32322 is fixed.
             #resp = s3_misc.delete_all_buckets(self.akey,self.skey)
@@ -1222,18 +1155,13 @@ class TestSystemCapacityFixedPlacement():
         assert resp, "Put object Failed"
         self.log.info("[End] Start some IOs")
 
-        self.log.info("[Start] Sleep %s", self.update_seconds)
-        time.sleep(self.update_seconds)
-        self.log.info("[End] Sleep %s", self.update_seconds)
-
-        resp = self.csm_obj.get_degraded_all(self.csm_obj.hlth_master)
-
         new_write = self.aligned_size * 1024 * 1024
         total_written += new_write
 
-        result = self.csm_obj.verify_degraded_capacity(
-            resp, healthy=total_written, degraded=0, critical=0, damaged=0,
-            err_margin=self.err_margin, total=total_written)
+        result = self.csm_obj.wait_degraded_capacity(
+            self.csm_obj.hlth_master, self.csm_obj.verify_degraded_capacity,
+            healthy=total_written, degraded=0, critical=0, damaged=0,
+            err_margin=self.err_margin, total=total_written, timeout=self.update_seconds)
         assert result[0], result[1]
         self.log.info("[END] Setup Method")
 
@@ -1340,14 +1268,10 @@ class TestSystemCapacityFixedPlacement():
             assert not resp[0], resp
             self.log.info("[End] Cluster is in degraded state")
 
-            self.log.info("[Start] Sleep %s", self.update_seconds)
-            time.sleep(self.update_seconds)
-            self.log.info("[End] Sleep %s", self.update_seconds)
-
-            resp = self.csm_obj.get_degraded_all(self.csm_obj.hlth_master)
-
-            result = self.csm_obj.verify_bytecount_fixed_placement(
-                resp, failure_cnt, self.kvalue, test_cfg["err_margin"], total_written)
+            result = self.csm_obj.wait_degraded_capacity(
+                self.csm_obj.hlth_master, self.csm_obj.verify_bytecount_fixed_placement,
+                failure_cnt, self.kvalue, test_cfg["err_margin"], total_written,
+                timeout=self.update_seconds)
             assert result[0], result[1]
         self.log.info("[END] Failure loop")
 
@@ -1364,14 +1288,10 @@ class TestSystemCapacityFixedPlacement():
             self.log.info("[End] Restore deleted pods : %s", deploy_name)
             failure_cnt -= 1
 
-            self.log.info("[Start] Sleep %s", self.update_seconds)
-            time.sleep(self.update_seconds)
-            self.log.info("[End] Sleep %s", self.update_seconds)
-
-            resp = self.csm_obj.get_degraded_all(self.csm_obj.hlth_master)
-
-            result = self.csm_obj.verify_bytecount_fixed_placement(
-                resp, failure_cnt, self.kvalue, test_cfg["err_margin"], total_written)
+            result = self.csm_obj.wait_degraded_capacity(
+                self.csm_obj.hlth_master, self.csm_obj.verify_bytecount_fixed_placement,
+                failure_cnt, self.kvalue, test_cfg["err_margin"], total_written,
+                timeout=self.update_seconds)
             assert result[0], f"{result[1]} for {failure_cnt} failures"
         self.deploy = True
 
@@ -1414,14 +1334,10 @@ class TestSystemCapacityFixedPlacement():
             assert not resp[0], resp
             self.log.info("[End] Cluster is in degraded state")
 
-            self.log.info("[Start] Sleep %s", self.update_seconds)
-            time.sleep(self.update_seconds)
-            self.log.info("[End] Sleep %s", self.update_seconds)
-
-            resp = self.csm_obj.get_degraded_all(self.csm_obj.hlth_master)
-
-            result = self.csm_obj.verify_bytecount_fixed_placement(
-                resp, failure_cnt, self.kvalue, test_cfg["err_margin"], total_written)
+            result = self.csm_obj.wait_degraded_capacity(
+                self.csm_obj.hlth_master, self.csm_obj.verify_bytecount_fixed_placement,
+                failure_cnt, self.kvalue, test_cfg["err_margin"], total_written,
+                timeout=self.update_seconds)
             assert result[0], result[1]
             if failure_cnt <= self.kvalue:
                 obj = f"object{self.s3_user}{time.time_ns()}.txt"
@@ -1432,14 +1348,10 @@ class TestSystemCapacityFixedPlacement():
                 assert resp, "Put object Failed"
                 total_written = total_written + self.aligned_size
 
-                self.log.info("[Start] Sleep %s", self.update_seconds)
-                time.sleep(self.update_seconds)
-                self.log.info("[End] Sleep %s", self.update_seconds)
-
-                resp = self.csm_obj.get_degraded_all(self.csm_obj.hlth_master)
-
-                result = self.csm_obj.verify_bytecount_fixed_placement(
-                    resp, failure_cnt, self.kvalue, test_cfg["err_margin"], total_written)
+                result = self.csm_obj.wait_degraded_capacity(
+                    self.csm_obj.hlth_master, self.csm_obj.verify_bytecount_fixed_placement,
+                    failure_cnt, self.kvalue, test_cfg["err_margin"], total_written,
+                    timeout=self.update_seconds)
                 assert result[0], result[1]
         self.log.info("[END] Failure loop")
 
@@ -1456,14 +1368,9 @@ class TestSystemCapacityFixedPlacement():
             self.log.info("[End] Restore deleted pods : %s", deploy_name)
             failure_cnt -= 1
 
-            self.log.info("[Start] Sleep %s", self.update_seconds)
-            time.sleep(self.update_seconds)
-            self.log.info("[End] Sleep %s", self.update_seconds)
-
-            resp = self.csm_obj.get_degraded_all(self.csm_obj.hlth_master)
-
-            result = self.csm_obj.verify_bytecount_all(resp, failure_cnt, self.kvalue,
-                                                       test_cfg["err_margin"], total_written)
+            result = self.csm_obj.wait_degraded_capacity(
+                self.csm_obj.hlth_master, self.csm_obj.verify_bytecount_all, failure_cnt,
+                self.kvalue, test_cfg["err_margin"], total_written, timeout=self.update_seconds)
             assert result[0], f"{result[1]} for {failure_cnt} failures"
         self.deploy = True
 
@@ -1504,14 +1411,10 @@ class TestSystemCapacityFixedPlacement():
             assert not resp[0], resp
             self.log.info("[End] Cluster is in degraded state")
 
-            self.log.info("[Start] Sleep %s", self.update_seconds)
-            time.sleep(self.update_seconds)
-            self.log.info("[End] Sleep %s", self.update_seconds)
-
-            resp = self.csm_obj.get_degraded_all(self.csm_obj.hlth_master)
-
-            result = self.csm_obj.verify_bytecount_fixed_placement(resp, failure_cnt, self.kvalue,
-                                                                   self.err_margin, total_written)
+            result = self.csm_obj.wait_degraded_capacity(
+                self.csm_obj.hlth_master, self.csm_obj.verify_bytecount_fixed_placement,
+                failure_cnt, self.kvalue, self.err_margin, total_written,
+                timeout=self.update_seconds)
             assert result[0], result[1]
             if failure_cnt <= self.kvalue:
                 odd_multiplier = self.csm_obj.random_gen.randrange(3, 20, 2)
@@ -1525,14 +1428,10 @@ class TestSystemCapacityFixedPlacement():
                 assert resp, "Put object Failed"
                 total_written = total_written + self.aligned_size
 
-                self.log.info("[Start] Sleep %s", self.update_seconds)
-                time.sleep(self.update_seconds)
-                self.log.info("[End] Sleep %s", self.update_seconds)
-
-                resp = self.csm_obj.get_degraded_all(self.csm_obj.hlth_master)
-
-                result = self.csm_obj.verify_bytecount_fixed_placement(
-                    resp, failure_cnt, self.kvalue, self.err_margin, total_written)
+                result = self.csm_obj.wait_degraded_capacity(
+                    self.csm_obj.hlth_master, self.csm_obj.verify_bytecount_fixed_placement,
+                    failure_cnt, self.kvalue, self.err_margin, total_written,
+                    timeout=self.update_seconds)
                 assert result[0], result[1]
         self.log.info("[END] Failure loop")
 
@@ -1549,14 +1448,10 @@ class TestSystemCapacityFixedPlacement():
             self.log.info("[End] Restore deleted pods : %s", deploy_name)
             failure_cnt -= 1
 
-            self.log.info("[Start] Sleep %s", self.update_seconds)
-            time.sleep(self.update_seconds)
-            self.log.info("[End] Sleep %s", self.update_seconds)
-
-            resp = self.csm_obj.get_degraded_all(self.csm_obj.hlth_master)
-
-            result = self.csm_obj.verify_bytecount_fixed_placement(resp, failure_cnt, self.kvalue,
-                                                                   self.err_margin, total_written)
+            result = self.csm_obj.wait_degraded_capacity(
+                self.csm_obj.hlth_master, self.csm_obj.verify_bytecount_fixed_placement,
+                failure_cnt, self.kvalue, self.err_margin, total_written,
+                timeout=self.update_seconds)
             assert result[0], f"{result[1]} for {failure_cnt} failures"
 
         self.deploy = True
@@ -31,7 +31,7 @@ from commons.helpers.health_helper import Health
 from commons.helpers.pods_helper import LogicalNode
 from commons.params import LATEST_LOG_FOLDER
 from commons.utils import assert_utils, support_bundle_utils
-from commons.utils.top_stats_collection_utils import TopStatsCollection
+from commons.utils.stats_collection_utils import ClusterStatsCollector
 from config import CMN_CFG
 from conftest import LOG_DIR
 from libs.dtm.ProcPathStasCollection import EnableProcPathStatsCollection
@@ -94,7 +94,6 @@ class TestIOWorkloadDegradedPath:
         cls.log.info("Setup S3bench")
         resp = s3bench.setup_s3bench()
         assert_utils.assert_true(resp)
-        cls.remote_dir_path = cls.test_cfg['remote_path']
         cls.log.info("Get %s pod to be deleted", POD_NAME_PREFIX)
         sts_dict = cls.master_node_list[0].get_sts_pods(pod_prefix=POD_NAME_PREFIX)
         sts_list = list(sts_dict.keys())
@@ -114,15 +113,15 @@ class TestIOWorkloadDegradedPath:
         self.log.info("Start Procpath collection")
         self.proc_path = EnableProcPathStatsCollection(CMN_CFG)
         self.log_collect = ServerOSLogsCollectLib(CMN_CFG)
-        self.top_stats = TopStatsCollection(CMN_CFG)
+        self.stats = ClusterStatsCollector(CMN_CFG,
+                                           interval=self.test_cfg['stats_interval_sec'])
         resp = self.proc_path.setup_requirement()
         assert_utils.assert_true(resp[0], resp[1])
         self.proc_path.start_collection()
         time.sleep(30)
         resp = self.proc_path.validate_collection()
         assert_utils.assert_true(resp[0], resp[1])
-        resp = self.top_stats.collect_stats(dir_path=self.remote_dir_path)
-        assert_utils.assert_true(resp)
+        self.stats.start()
         self.test_completed = False
         self.log.info("Setup Method Ended")
 
@@ -146,10 +145,10 @@ class TestIOWorkloadDegradedPath:
         self.log.info("Copy files to client")
         resp = self.proc_path.get_stat_files_to_local()
         self.log.debug("Resp : %s", resp)
-        resp = self.top_stats.stop_collection(dir_path=self.remote_dir_path)
-        assert_utils.assert_true(resp)
-        resp = self.top_stats.copy_remove_files_from_remote(self.remote_dir_path, path)
-        assert_utils.assert_true(resp)
+        self.log.info("Stop node, pod and process stats collection")
+        self.stats.stop()
+        resp = self.stats.save(path)
+        self.log.info("Stats saved in %s", resp)
         self.log.info("Teardown method ended.")
 
     @pytest.mark.lc
@@ -185,6 +184,7 @@ class TestIOWorkloadDegradedPath:
                                                              )
         assert_utils.assert_true(resp[0], "Failed in shutdown or expected cluster check")
         self.log.info("Deleted pod : %s", list(resp[1].keys())[0])
+        self.stats.mark("degraded")
 
         self.log.info("Step 3: Perform IO's using S3bench")
         workload_distribution = self.test_cfg['workloads_distribution']
@@ -248,6 +248,7 @@ class TestIOWorkloadDegradedPath:
                                                              )
         assert_utils.assert_true(resp[0], "Failed in shutdown or expected cluster check")
         self.log.info("Deleted pod : %s", list(resp[1].keys())[0])
+        self.stats.mark("degraded")
 
         self.log.info("Step 4: Performing read operations.")
         end_time = datetime.now() + timedelta(days=self.duration_in_days)
@@ -335,6 +336,7 @@ class TestIOWorkloadDegradedPath:
                                                              )
         assert_utils.assert_true(resp[0], "Failed in shutdown or expected cluster check")
         self.log.info("Deleted pod : %s", list(resp[1].keys())[0])
+        self.stats.mark("degraded")
 
         self.log.info("Step 4: Perform Reads/Delete on data written in healthy mode"
                       " and Write/Reads/Delete on data written in degraded mode")
@@ -47,11 +47,13 @@ class TestObjectACL:
     """Object ACL Test suite."""
 
     @pytest.fixture(autouse=True)
-    def setup(self):
+    def setup(self, s3_account, s3_account_pool):
         """
         Function will be invoked prior to each test case.
 
         It will perform all prerequisite test steps if any.
+        Test accounts are leased from session account pool, s3_account fixture returns
+        the first one to the pool.
         """
         self.log = logging.getLogger(__name__)
         self.s3_obj = s3_test_lib.S3TestLib(endpoint_url=S3_CFG["s3_url"])
@@ -82,12 +84,15 @@ class TestObjectACL:
             time.perf_counter_ns())
         self.obj_name = S3_OBJ_TST["s3_object"]["object_name"].format(
             time.perf_counter_ns())
-        self.account_name = "objaclacc{}".format(time.perf_counter_ns())
-        self.email_id = "{}@seagate.com".format(self.account_name)
-        self.account_name_1 = "objaclacc_one{}".format(time.perf_counter_ns())
-        self.email_id_1 = "{}@seagate.com".format(self.account_name_1)
-        self.account_name_2 = "objaclacc_two{}".format(time.perf_counter_ns())
-        self.email_id_2 = "{}@seagate.com".format(self.account_name_2)
+        leased = [s3_account_pool.lease(), s3_account_pool.lease()]
+        self.pooled_accounts = {account.account_name: account
+                                for account in [s3_account] + leased}
+        self.account_name = s3_account.account_name
+        self.email_id = s3_account.email_id
+        self.account_name_1 = leased[0].account_name
+        self.email_id_1 = leased[0].email_id
+        self.account_name_2 = leased[1].account_name
+        self.email_id_2 = leased[1].email_id
         self.rest_obj = S3AccountOperations()
         self.account_list = []
         self.log.info("ENDED: SetUp Operations")
@@ -100,6 +105,8 @@ class TestObjectACL:
             resp = self.s3_obj.delete_bucket(self.bucket_name, force=True)
             assert_utils.assert_true(resp[0], resp[1])
         self.delete_accounts(self.account_list)
+        for account in leased:
+            s3_account_pool.release(account)
         self.log.info("ENDED: Teardown operation.")
 
     def delete_accounts(self, accounts):
@@ -135,11 +142,18 @@ class TestObjectACL:
         """
         Function to create s3 Account using cortxcli tool and return account details and objects.
 
+        Accounts leased in setup are returned as they are, other names are created.
         :param str account_name: Name for an account
         :param str email_id: Email id for an account
         :param str password: Password for the account
         :return: canonical_id, S3_OBJ, S3_ACL_OBJ, s3_tag_obj in tuple.
         """
+        account = self.pooled_accounts.get(account_name)
+        if account is not None:
+            self.log.info("Step : Using pooled account %s", account_name)
+            s3_tag_obj = s3_tagging_test_lib.S3TaggingTestLib(
+                access_key=account.access_key, secret_key=account.secret_key)
+            return account.canonical_id, account.s3_obj, account.acl_obj, s3_tag_obj
         self.log.info(
             "Step : Creating account with name %s and email_id %s",
             account_name, email_id)
@@ -16,17 +16,47 @@
 # For any questions about this software or licensing,
 # please email opensource@seagate.com or cortx-questions@seagate.com.
 #
-"""Data generator by honouring the data distribution."""
-import random
+"""Data generator by honouring the data distribution.
+
+File sizes, extensions and directory depths follow the distributions below and the
+size distribution of the dataset config. Content is sliced from a binary and a text
+slab of random data generated once per process, every file is written with a few
+large writev calls of slab slices at random offsets, so generation is limited by disk
+speed. Work is split in shards, each shard has its own seed and an equal part of each
+size class, output is deterministic for a given seed and shard count.
+
+With --s3_bucket files are not written locally, their paths become object keys and
+generated content is uploaded straight from memory by concurrent uploaders. A manifest
+of key, size, content seed and md5 is written per shard, content of an object can be
+regenerated with object_chunks from its size, extension and seed and the dataset seed.
+"""
+import argparse
+import base64
+import csv
+import hashlib
+import io
 import os
-import sys
+import random
 import string
-from multiprocessing import Process, Value, Lock
-from struct import pack
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import wait
+from itertools import islice
+from multiprocessing import Lock
+from multiprocessing import Process
 from platform import system
-from struct import unpack
 
-randmax = 2147483647 / 256
+import boto3
+import numpy as np
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config
+
+SLAB_SIZE = 64 * 1024 * 1024
+IOV_MAX = 1024
+LIST_BATCH = 1000
+MULTIPART_THRESHOLD = 16 * 1024 * 1024
 
 fileextbin1k = 646 * ['dat'] + 1074 * ['png'] + 105 * ['sol'] + 89 * ['jpg'] + 72 * ['lex'] + 7739 * ['gif'] + 947 * [
     'cookie'] + 642 * ['aae'] + 324 * ['sth'] + 285 * ['tbl'] + 262 * ['old'] + 248 * ['vcrd'] + 150 * [
@@ -100,225 +130,337 @@ files_depth_variation = [4, 6, 3, 3, 3, 3, 2, 5, 14, 6, 7, 3, 4]
 fileslevel = len(files_depth_dist)
 
 
-def randname(min=4, max=10):
-    a = ''
-    for i in range(random.randrange(min, max)):
-        a = a + random.choice(string.ascii_letters + string.digits)
-    return a
-
-
-def randfilename(size, min=5, max=40):
-    fname = ''
-    for i in range(random.randrange(min, max)):
-        fname += random.choice(string.ascii_letters + string.digits + '_-')
-
-    if size < 1024:
-        ext = random.choice(fileexttxt1k + fileextbin1k)
-    elif (size >= 1024) & (size < 10240):
-        ext = random.choice(fileexttxt10k + fileextbin10k)
-    elif (size >= 10240) & (size < 102400):
-        ext = random.choice(fileexttxt100k + fileextbin100k)
-    elif (size >= 102400) & (size < 1024 * 1024):
-        ext = random.choice(fileexttxt1m + fileextbin1m)
-    elif (size >= 1024 * 1024) & (size < 1024 * 10240):
-        ext = random.choice(fileexttxt10m + fileextbin10m)
-    elif (size >= 1024 * 10240) & (size < 10240 * 10240):
-        ext = random.choice(fileexttxt100m + fileextbin100m)
-    elif (size >= 10240 * 10240) & (size < 1024 * 1024 * 1024):
-        ext = random.choice(fileexttxt1g + fileextbin1g)
-    elif size >= 1024 * 1024 * 1024:
-        ext = random.choice(fileextbin10g)
-    return fname, ext
-
-
-def randtext(bytes):
-    a = ''
-    for it in range(bytes / 8):
-        a += ''.join(random.choice(string.printable) for _ in range(4)) + 4 * ' '
-    if (bytes % 8) == 0:
-        pass
-    else:
-        b = ''.join(random.choice(string.printable) for _ in range(4)) + 4 * ' '
-        a += b[0:bytes % 8]
-    return a
-
-
-def randbytes(bytes):
-    a = ''.join(pack('q', random.randrange(randmax))
-                for _ in range(bytes / 8))
-    if (bytes % 8) == 0:
-        pass
-    else:
-        a += (''.join(pack('q', random.randrange(randmax))))[0:bytes % 8]
-    return a
-
-
-def bufferbin(size):
-    buf = ''
-    for i in range(size / 8):
-        buf = buf + pack('q', random.randrange(randmax))
-    return buf
+BINARY = set(binary)
+# upper size bound and extensions of size classes, files of last class are binary only
+SIZE_CLASSES = [
+    (1024, fileexttxt1k + fileextbin1k),
+    (10240, fileexttxt10k + fileextbin10k),
+    (102400, fileexttxt100k + fileextbin100k),
+    (1024 * 1024, fileexttxt1m + fileextbin1m),
+    (1024 * 10240, fileexttxt10m + fileextbin10m),
+    (10240 * 10240, fileexttxt100m + fileextbin100m),
+    (1024 * 1024 * 1024, fileexttxt1g + fileextbin1g),
+    (None, fileextbin10g)]
+NAME_CHARS = np.frombuffer((string.ascii_letters + string.digits + '_-').encode(), np.uint8)
+TEXT_CHARS = np.frombuffer(string.printable.encode(), np.uint8)
 
 
-def buffertext(bytes):
-    a = ''
-    for it in range(bytes / 8):
-        a += ''.join(random.choice(string.printable) for _ in range(4)) + 4 * ' '
-    if (bytes % 8) == 0:
-        pass
-    else:
-        b = ''.join(random.choice(string.printable) for _ in range(4)) + 4 * ' '
-        a += b[0:bytes % 8]
-    return a
+def randname(min=4, max=10):
+    return ''.join(random.choice(string.ascii_letters + string.digits)
+                   for _ in range(random.randrange(min, max)))
 
 
 def make_dirs(name, number):
-    dirs = []
-    for i in range(0, number, 1):
-        dirname = randname()
-        path = name + '/' + dirname
-        dirs.append(path)
-    return dirs
+    return [name + '/' + randname() for _ in range(number)]
 
 
 def make_dirtree(topdir, depth, number):
+    """Directory list with each directory repeated by its share of files at its depth."""
     all_dirs = []
     top = [topdir]
     temp = []
-    if (depth <= fileslevel):
+    if depth <= fileslevel:
         filefact = int(round(1000.0 * files_depth_dist[-depth] / len(top)))
         all_dirs.extend(top * filefact)
     depth -= 1
-    while (depth):
+    while depth:
         variation = dir_depth_variation[-depth]
         nextdirs = int(round((dir_depth_dist[-depth - 1] * number / 100)))
-        if (len(top) > nextdirs):
-            samplesize = nextdirs
-        else:
-            samplesize = len(top)
-
+        samplesize = min(len(top), nextdirs)
         for x in random.sample(variation * top, samplesize):
             numberdirs = int(nextdirs / samplesize)
             temp.extend(make_dirs(x, numberdirs))
+        if not temp:
+            break
         top = temp
-        print(top)
-
         temp = []
         if depth <= fileslevel:
             filefact = int(round(1000.0 * files_depth_dist[-depth] / len(top)))
             filevariation = files_depth_variation[-depth]
             sampletop = top
-            for it in range(7 * filevariation):
+            for _ in range(7 * filevariation):
                 sampletop = random.sample(filevariation * sampletop, len(top))
             all_dirs.extend(filefact * (sampletop + top))
-
         depth -= 1
-    return all_dirs
-
-
-def create_fileset(fsize_percent, randseed, numfiles, alldirs, lock):
-    mycwd = os.getcwd()
-    isWindows = False
-    if system() == 'Windows':
-        isWindows = True
-    fs = 0
-    random.seed(randseed)
-    block = 1024 * 1024 * 40
-    buftxt = buffertext(block)
-    bufbin = bufferbin(block)
-    for fs_pc in fsize_percent:
-        isize = fs_pc[0] - fs
-        for fno in range(int(round(fs_pc[1] * numfiles / 100))):
-            randno = random.randrange(randmax)
-            if (isize > 1):
-                size = fs + isize * randno / randmax
-            else:
-                size = fs + isize
-            filename, ext = randfilename(size)
-            dira = random.choice(alldirs)
-            if ext:
-                filename = filename + '.' + ext
-            lock.acquire()
-            printstring = (str(dira + '/' + filename), size)
-            print(printstring)
-            lock.release()
-
-            if isWindows:
-                dira = '\\\\?\\' + mycwd + '\\' + dira.replace('/', '\\')
-                filename = dira + '\\' + filename
-            else:
-                filename = dira + '/' + filename
-
-            try:
-                os.makedirs(dira)
-            except:
-                pass
-            f = open(filename, 'wb', 512 * 1024)
-            if (size < 1024):
-                iosize = 128
-            elif (size >= 1024) & (size < 1024 * 1024):
-                iosize = 4096
-            elif (size >= 1024 * 1024):
-                iosize = 1024 * 64
-
-            sizew = size / iosize
-            randn = len(bufbin[:-iosize])
-            for z in range(0, sizew, 1):
-                noff = random.randrange(randn)
-                if ext in binary:
-                    f.write(bufbin[noff:noff + iosize])
-                else:
-                    f.write(buftxt[noff:noff + iosize])
-            x = size - f.tell()
-            if (x > 0):
-                if ext in binary:
-                    f.write(randbytes(x))
-                else:
-                    f.write(randtext(x))
-            f.close()
-        fs = fs_pc[0]
-    return 1
+    return all_dirs or [topdir]
+
+
+def make_slabs(seed):
+    """Binary slab of random bytes and text slab of 4 printable characters and 4 spaces."""
+    rng = np.random.default_rng(seed)
+    binary_slab = rng.bytes(SLAB_SIZE)
+    text = TEXT_CHARS[np.frombuffer(rng.bytes(SLAB_SIZE), np.uint8) % len(TEXT_CHARS)]
+    text.reshape(-1, 8)[:, 4:] = ord(' ')
+    return memoryview(binary_slab), memoryview(text.tobytes())
+
+
+def shard_counts(fsize_percent, numfiles, shard, shards):
+    """Files of each size class of shard, classes are split evenly over shards."""
+    counts = []
+    for _, percent in fsize_percent:
+        total = int(round(percent * numfiles / 100))
+        counts.append(total // shards + (1 if shard < total % shards else 0))
+    return counts
+
+
+def file_sizes(rng, fsize_percent, counts):
+    """Sizes uniformly distributed within each size class of dataset config."""
+    sizes = []
+    lower = 0
+    for (upper, _), count in zip(fsize_percent, counts):
+        if upper - lower > 1:
+            sizes.append(rng.integers(lower, upper, count, dtype=np.int64))
+        else:
+            sizes.append(np.full(count, upper, dtype=np.int64))
+        lower = upper
+    return np.concatenate(sizes) if sizes else np.zeros(0, dtype=np.int64)
+
+
+def file_names(rng, sizes, min=5, max=40):
+    """Random names with extension chosen by size class."""
+    lengths = rng.integers(min, max, len(sizes))
+    chars = NAME_CHARS[rng.integers(0, len(NAME_CHARS), int(lengths.sum()))].tobytes().decode()
+    ends = np.cumsum(lengths)
+    bounds = [upper for upper, _ in SIZE_CLASSES[:-1]]
+    classes = np.searchsorted(bounds, sizes, side='right')
+    picks = rng.random(len(sizes))
+    names = []
+    for end, length, size_class, pick in zip(ends.tolist(), lengths.tolist(), classes.tolist(),
+                                             picks.tolist()):
+        extensions = SIZE_CLASSES[size_class][1]
+        names.append((chars[end - length:end], extensions[int(pick * len(extensions))]))
+    return names
+
+
+def iosize_of(size):
+    if size < 1024:
+        return 128
+    if size < 1024 * 1024:
+        return 4096
+    return 1024 * 64
+
+
+def object_chunks(slab, size, seed):
+    """Slab slices at random offsets making up size bytes, same slab and seed give same content."""
+    iosize = iosize_of(size)
+    offsets = np.random.default_rng(seed).integers(0, len(slab) - iosize, -(-size // iosize))
+    for index, off in enumerate(offsets.tolist()):
+        yield slab[off:off + min(iosize, size - index * iosize)]
+
+
+def write_file(path, chunks):
+    """Write chunks with writev calls of up to IOV_MAX chunks."""
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0), 0o644)
+    try:
+        while True:
+            batch = list(islice(chunks, IOV_MAX))
+            if not batch:
+                break
+            if hasattr(os, 'writev'):
+                written = os.writev(fd, batch)
+                if written == sum(len(chunk) for chunk in batch):
+                    continue
+                # short write, write remainder chunk by chunk
+                batch = [memoryview(b''.join(batch))[written:]]
+            for chunk in batch:
+                while chunk:
+                    chunk = chunk[os.write(fd, chunk):]
+    finally:
+        os.close(fd)
+
+
+def fileset_plan(fsize_percent, randseed, numfiles, alldirs, shard=0, shards=1):
+    """Yield path, size, extension and content seed of every file of shard."""
+    rng = np.random.default_rng([randseed, shard])
+    sizes = file_sizes(rng, fsize_percent, shard_counts(fsize_percent, numfiles, shard, shards))
+    names = file_names(rng, sizes)
+    dirs = rng.integers(0, len(alldirs), len(sizes)).tolist()
+    seeds = rng.integers(0, 2 ** 62, len(sizes)).tolist()
+    for size, (fname, ext), dir_index, seed in zip(sizes.tolist(), names, dirs, seeds):
+        filename = fname + '.' + ext if ext else fname
+        yield alldirs[dir_index] + '/' + filename, size, ext, seed
+
+
+def create_fileset(fsize_percent, randseed, numfiles, alldirs, lock, shard=0, shards=1):
+    """Create files of one shard, created paths and sizes are printed as tuples."""
+    bufbin, buftxt = make_slabs(randseed)
+    prefix = '\\\\?\\' + os.getcwd() + '\\' if system() == 'Windows' else ''
+    created = set()
+    listing = []
+    for path, size, ext, seed in fileset_plan(fsize_percent, randseed, numfiles, alldirs,
+                                              shard, shards):
+        listing.append(str((path, size)))
+        dira, filename = path.rsplit('/', 1)
+        dirpath = prefix + dira.replace('/', os.sep) if prefix else dira
+        if dirpath not in created:
+            os.makedirs(dirpath, exist_ok=True)
+            created.add(dirpath)
+        write_file(os.path.join(dirpath, filename),
+                   object_chunks(bufbin if ext in BINARY else buftxt, size, seed))
+        if len(listing) >= LIST_BATCH:
+            flush_listing(listing, lock)
+    flush_listing(listing, lock)
+    return 0
+
+
+class ChunkReader(io.RawIOBase):
+    """Raw stream over content chunks, wrapped in BufferedReader for multipart uploads."""
+
+    def __init__(self, chunks):
+        self._chunks = chunks
+        self._current = memoryview(b'')
+
+    def readable(self):
+        return True
+
+    def readinto(self, buf):
+        while not self._current:
+            self._current = next(self._chunks, None)
+            if self._current is None:
+                self._current = memoryview(b'')
+                return 0
+        count = min(len(buf), len(self._current))
+        buf[:count] = self._current[:count]
+        self._current = self._current[count:]
+        return count
+
+
+def upload_object(client, bucket, key, size, slab, seed, transfer_config):
+    """Upload generated content of key, small objects with ContentMD5 checked by server."""
+    md5 = hashlib.md5()
+    if size < MULTIPART_THRESHOLD:
+        body = b''.join(object_chunks(slab, size, seed))
+        md5.update(body)
+        client.put_object(Bucket=bucket, Key=key, Body=body,
+                          ContentMD5=base64.b64encode(md5.digest()).decode())
+    else:
+        for chunk in object_chunks(slab, size, seed):
+            md5.update(chunk)
+        stream = io.BufferedReader(ChunkReader(object_chunks(slab, size, seed)),
+                                   buffer_size=1024 * 1024)
+        client.upload_fileobj(stream, bucket, key, Config=transfer_config)
+    return md5.hexdigest()
+
+
+def upload_fileset(fsize_percent, randseed, numfiles, alldirs, s3_args, shard=0, shards=1):
+    """
+    Upload objects of one shard straight from memory and write manifest of key, size,
+    content seed and md5 to <manifest>-<shard>.csv.
+    """
+    bufbin, buftxt = make_slabs(randseed)
+    client = boto3.client("s3", endpoint_url=s3_args.endpoint_url, verify=not s3_args.no_verify_ssl,
+                          aws_access_key_id=s3_args.access_key,
+                          aws_secret_access_key=s3_args.secret_key,
+                          config=Config(max_pool_connections=s3_args.concurrency,
+                                        retries={'max_attempts': 5, 'mode': 'standard'}))
+    transfer_config = TransferConfig(multipart_threshold=MULTIPART_THRESHOLD,
+                                     multipart_chunksize=MULTIPART_THRESHOLD, max_concurrency=4)
+    start = time.time()
+    uploaded = nbytes = errors = 0
+    with open(f"{s3_args.manifest}-{shard}.csv", "w", newline='') as fp, \
+            ThreadPoolExecutor(max_workers=s3_args.concurrency) as pool:
+        writer = csv.writer(fp)
+        pending = {}
+
+        def collect(done):
+            nonlocal uploaded, nbytes, errors
+            for future in done:
+                key, size, seed = pending.pop(future)
+                try:
+                    writer.writerow((key, size, seed, future.result()))
+                    uploaded += 1
+                    nbytes += size
+                except Exception as error:  # pylint: disable=broad-except
+                    errors += 1
+                    sys.stderr.write(f"Upload of {key} failed: {error}\n")
+
+        for path, size, ext, seed in fileset_plan(fsize_percent, randseed, numfiles, alldirs,
+                                                  shard, shards):
+            # bounded in flight uploads, plan of millions of keys is never held as futures
+            if len(pending) >= 2 * s3_args.concurrency:
+                collect(wait(pending, return_when=FIRST_COMPLETED).done)
+            key = s3_args.key_prefix + path
+            future = pool.submit(upload_object, client, s3_args.s3_bucket, key, size,
+                                 bufbin if ext in BINARY else buftxt, seed, transfer_config)
+            pending[future] = (key, size, seed)
+        collect(wait(pending).done)
+    elapsed = time.time() - start
+    sys.stderr.write(f"Shard {shard}: uploaded {uploaded} objects, {nbytes} bytes in "
+                     f"{elapsed:.1f}s ({nbytes / max(elapsed, 1e-9) / 2 ** 20:.1f} MiB/s), "
+                     f"{errors} failed\n")
+    return errors
+
+
+def flush_listing(listing, lock):
+    with lock:
+        sys.stdout.write('\n'.join(listing) + '\n' if listing else '')
+        sys.stdout.flush()
+    listing.clear()
+
+
+def run_shard(target, target_args, shard, shards):
+    """Run shard and exit with 1 if any object failed."""
+    sys.exit(1 if target(*target_args, shard, shards) else 0)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("config", help="dataset config e.g. dataset-S.cfg")
+    parser.add_argument("nfiles", type=int, help="number of files")
+    parser.add_argument("seed", type=int, help="random seed of file content and names")
+    parser.add_argument("ndirs", type=int, help="number of directories")
+    parser.add_argument("depth", type=int, help="directory tree depth")
+    parser.add_argument("-p", "--processes", type=int, default=os.cpu_count(),
+                        help="processes generating shards")
+    parser.add_argument("-n", "--shards", type=int, default=None,
+                        help="number of shards, processes if not set")
+    parser.add_argument("-s", "--shard", type=int, default=None,
+                        help="generate only this shard e.g. on one of several clients")
+    parser.add_argument("--s3_bucket", default=None,
+                        help="upload objects to this bucket instead of writing files")
+    parser.add_argument("--endpoint_url", default=None, help="S3 endpoint url")
+    parser.add_argument("--access_key", default=None, help="S3 access key")
+    parser.add_argument("--secret_key", default=None, help="S3 secret key")
+    parser.add_argument("--no_verify_ssl", action="store_true",
+                        help="do not verify SSL certificate of S3 endpoint")
+    parser.add_argument("--key_prefix", default="", help="prefix of object keys")
+    parser.add_argument("-c", "--concurrency", type=int, default=32,
+                        help="concurrent uploads per process")
+    parser.add_argument("-m", "--manifest", default="manifest",
+                        help="manifest path prefix, shard number and .csv are appended")
+    return parser.parse_args()
 
 
 if __name__ == "__main__":
-    if (len(sys.argv) < 4):
-        print("generate_dataset.py dataset-S.cfg N_files Rand_seed Ndirs Depth")
-        exit()
-
-    infile = sys.argv[1]
-    nfiles = int(sys.argv[2])
-    randnew = int(sys.argv[3])
-    ndirs = int(sys.argv[4])
-    depth = int(sys.argv[5])
-    randseed = 143
-
-    percent = []
-    fsize = []
-
-    f = open(infile)
-    fsize_percent = [[float(x) if '.' in x else int(x) for x in line.split()] for line in f]
-
-    print("")
-    print("")
-    print("")
-    print("")
-    random.seed(randseed)
-    # topdira=str(random.randrange(randmax))
+    args = parse_args()
+    shards = args.shards or args.processes
+    with open(args.config) as f:
+        fsize_percent = [[float(x) if '.' in x else int(x) for x in line.split()]
+                         for line in f if line.strip()]
+
+    # directory tree only depends on fixed seed, all shards and clients share it
+    random.seed(143)
     topdira = randname()
-    try:
-        os.mkdir(topdira)
-    except:
-        pass
-    alldirs = make_dirtree(topdira, depth, ndirs)
-    nthr = 2
-    nf = nfiles / nthr
-    randseed = randnew
-    randseed = randseed + 110
-    lock = Lock()
-    for i in range(nthr):
-        if (i == nthr - 1) & (nf < nfiles):
-            nf = nfiles - (nthr - 1) * nf
-        fileset = Process(target=create_fileset,
-                          args=(fsize_percent, randseed, nf, alldirs, lock))
-        fileset.start()
-        randseed = randseed + 10
+    alldirs = make_dirtree(topdira, args.depth, args.ndirs)
+    randseed = args.seed + 110
+    if args.s3_bucket:
+        target, target_args = upload_fileset, (fsize_percent, randseed, args.nfiles, alldirs,
+                                               args)
+    else:
+        os.makedirs(topdira, exist_ok=True)
+        target, target_args = create_fileset, (fsize_percent, randseed, args.nfiles, alldirs,
+                                               Lock())
+    if args.shard is not None:
+        run_shard(target, target_args, args.shard, shards)
+    failed = 0
+    pending = list(range(shards))
+    while pending:
+        batch, pending = pending[:args.processes], pending[args.processes:]
+        procs = [Process(target=run_shard, args=(target, target_args, shard, shards))
+                 for shard in batch]
+        for proc in procs:
+            proc.start()
+        for proc in procs:
+            proc.join()
+            failed += proc.exitcode != 0
+    sys.exit(1 if failed else 0)
@@ -20,6 +20,7 @@
 from http import HTTPStatus
 
 from pymongo import MongoClient
+from pymongo import ReturnDocument
 from pymongo.errors import PyMongoError
 from pymongo.errors import ServerSelectionTimeoutError, OperationFailure
 
@@ -188,6 +189,35 @@ def update_document(query: dict,
         return True, result
 
 
+@pymongo_exception
+def compare_and_set(query: dict,
+                    data: dict,
+                    uri: str,
+                    db_name: str,
+                    collection: str
+                    ) -> (bool, dict):
+    """
+    Atomically update one document matching query
+
+    Args:
+        query: Query which must match for update to happen
+        data: Update operations
+        uri: URI of MongoDB database
+        db_name: Database name
+        collection: Collection name in database
+
+    Returns:
+        On failure returns http status code and message
+        On success returns updated document or None if query did not match
+    """
+    with MongoClient(uri) as client:
+        database = client[db_name]
+        tests = database[collection]
+        result = tests.find_one_and_update(query, data, projection={"_id": False},
+                                           return_document=ReturnDocument.AFTER)
+        return True, result
+
+
 @pymongo_exception
 def distinct_fields(field: str,
                     query: dict,
@@ -182,3 +182,50 @@ class UpdateSystems(Resource):
 
     def __str__(self):
         return self.__class__.__name__
+
+
+@api.route("/cas", doc={"description": "Compare and set system entry in MongoDB"})
+@api.response(200, "Success")
+@api.response(400, "Bad Request: Missing parameters. Do not retry.")
+@api.response(401, "Unauthorized: Wrong db_username/db_password.")
+@api.response(403, "Forbidden: User does not have permission for operation.")
+@api.response(409, "Conflict: Filter did not match, entry changed meanwhile.")
+@api.response(503, "Service Unavailable: Unable to connect to mongoDB.")
+class CompareAndSetSystems(Resource):
+    """
+         Rest API: cas
+         Endpoint: /systemdb/cas
+         For performing atomic update of one entry of r2_systems collection.
+      """
+
+    @staticmethod
+    def patch():
+        """Patch for systems if filter matches"""
+        json_data = flask.request.get_json()
+        if not json_data:
+            return flask.Response(status=HTTPStatus.BAD_REQUEST,
+                                  response="Body is empty")
+        if not validations.check_user_pass(json_data):
+            return flask.Response(status=HTTPStatus.BAD_REQUEST,
+                                  response="db_username/db_password missing in request body")
+
+        # Build MongoDB URI using username and password
+        uri = read_config.MONGODB_URI.format(quote_plus(json_data["db_username"]),
+                                             quote_plus(json_data["db_password"]),
+                                             read_config.db_hostname)
+
+        # Delete username and password as not needed to add those fields in DB
+        del json_data["db_username"]
+        del json_data["db_password"]
+        cas_result = mongodbapi.compare_and_set(json_data["filter"], json_data["update"],
+                                                uri, read_config.db_name,
+                                                read_config.system_collection)
+        if not cas_result[0]:
+            return flask.Response(status=cas_result[1][0], response=cas_result[1][1])
+        if cas_result[1] is None:
+            return flask.Response(status=HTTPStatus.CONFLICT,
+                                  response="No entry matched filter.")
+        return flask.jsonify({'result': cas_result[1]})
+
+    def __str__(self):
+        return self.__class__.__name__
@@ -0,0 +1,65 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2022 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+
+"""Test reconnect of host on SSH connect timeout."""
+
+import socket
+
+import pytest
+
+from commons.helpers import host
+from commons.utils import retry_utils
+
+
+class TimingOutClient:
+    """SSH client whose connect always times out."""
+
+    attempts = 0
+
+    def set_missing_host_key_policy(self, policy):
+        """Accept any policy."""
+
+    def connect(self, **kwargs):
+        """Count attempt and time out."""
+        TimingOutClient.attempts += 1
+        raise socket.timeout("timed out")
+
+    def close(self):
+        """Nothing to close."""
+
+
+@pytest.fixture(name="timing_out")
+def fixture_timing_out(monkeypatch):
+    """Patch SSH client and backoff sleeps."""
+    TimingOutClient.attempts = 0
+    monkeypatch.setattr(host.paramiko, "SSHClient", TimingOutClient)
+    monkeypatch.setattr(retry_utils.time, "sleep", lambda seconds: None)
+    return TimingOutClient
+
+
+class TestConnect:
+    """Connect attempts on timeout."""
+
+    @pytest.mark.parametrize("retry, attempts", [(0, 1), (1, 2), (3, 4)])
+    def test_timeout_attempts(self, timing_out, retry, attempts):
+        """First attempt and one per reconnect, then TimeoutError."""
+        node = host.AbsHost(f"timeout-{retry}.example", "root", "secret")
+        with pytest.raises(TimeoutError):
+            node.connect(retry=retry, timeout=1)
+        assert timing_out.attempts == attempts
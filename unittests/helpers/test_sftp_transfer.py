@@ -0,0 +1,239 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2022 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+
+"""Test resumable SFTP transfer against a local directory stand in for remote host."""
+
+import os
+from types import SimpleNamespace
+
+import pytest
+
+from commons.helpers import sftp_transfer
+from commons.helpers.sftp_transfer import PART_SUFFIX
+from commons.helpers.sftp_transfer import SftpTransfer
+
+CHUNK = 1024
+
+
+class FakeRemoteFile:
+    """Remote file handle backed by a local file."""
+
+    def __init__(self, sftp, path, mode):
+        self.sftp = sftp
+        self.path = path
+        self.file = open(path, mode)  # pylint: disable=consider-using-with
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.file.close()
+
+    def close(self):
+        """Close file."""
+        self.file.close()
+
+    def set_pipelined(self, pipelined):
+        """No acks to wait for locally."""
+
+    def seek(self, offset):
+        """Seek in file."""
+        self.file.seek(offset)
+
+    def read(self, size):
+        """Read from file."""
+        return self.file.read(size)
+
+    def write(self, data):
+        """Write at current offset, fails once at the configured offset."""
+        if self.file.tell() == self.sftp.fail_at:
+            self.sftp.fail_at = None
+            raise IOError("Connection lost")
+        self.sftp.written += len(data)
+        self.file.write(data)
+
+    def readv(self, blocks):
+        """Read blocks, fails once at the configured offset."""
+        for offset, length in blocks:
+            if offset == self.sftp.fail_at:
+                self.sftp.fail_at = None
+                raise IOError("Connection lost")
+            self.file.seek(offset)
+            self.sftp.written += length
+            yield self.file.read(length)
+
+
+class FakeSftp:
+    """SFTP client working on local paths."""
+
+    def __init__(self):
+        self.fail_at = None
+        self.written = 0
+        self.channel = SimpleNamespace(closed=False)
+
+    def get_channel(self):
+        return self.channel
+
+    def open(self, path, mode):
+        return FakeRemoteFile(self, path, mode)
+
+    @staticmethod
+    def stat(path):
+        return os.stat(path)
+
+    @staticmethod
+    def posix_rename(old, new):
+        os.replace(old, new)
+
+    @staticmethod
+    def utime(path, times):
+        os.utime(path, times)
+
+    @staticmethod
+    def listdir_attr(path):
+        return [SimpleNamespace(filename=name, **{key: getattr(os.stat(os.path.join(path, name)),
+                                                               key)
+                                                  for key in ("st_mode", "st_size", "st_mtime")})
+                for name in sorted(os.listdir(path))]
+
+    def close(self):
+        self.channel.closed = True
+
+
+class FakeClient:
+    """Connected SSH client whose channels share one fake SFTP server."""
+
+    def __init__(self):
+        self.sftp = FakeSftp()
+        self.channels = 0
+
+    def open_sftp(self):
+        self.channels += 1
+        return self.sftp
+
+
+class FakeClientConnection:
+    """New SSH connection to the fake server."""
+
+    def __init__(self, client):
+        self.client = client
+
+    def set_missing_host_key_policy(self, policy):
+        """Accept any host key."""
+
+    def connect(self, **kwargs):
+        """Connect to fake server."""
+
+    def open_sftp(self):
+        return self.client.open_sftp()
+
+    def close(self):
+        """Close connection."""
+
+
+@pytest.fixture(name="client")
+def fixture_client(tmp_path, monkeypatch):
+    """Fake client, transfer journals kept in test directory."""
+    monkeypatch.setattr(sftp_transfer, "JOURNAL_DIR", str(tmp_path / "journal"))
+    return FakeClient()
+
+
+def transfer(client, **kwargs):
+    """Transfer on shared fake client with small chunks."""
+    return SftpTransfer("host", "user", "pass", channels=2, chunk_size=CHUNK, client=client,
+                        **kwargs)
+
+
+class TestSftpTransfer:
+    """Test chunk journal, resume and part file rename."""
+
+    def test_get_resumes_from_journal(self, tmp_path, client):
+        """Interrupted download resumes with chunks missing in journal."""
+        data = os.urandom(4 * CHUNK + 100)
+        src, dst = tmp_path / "remote.bin", tmp_path / "local.bin"
+        src.write_bytes(data)
+        client.sftp.fail_at = 3 * CHUNK
+        with pytest.raises(IOError):
+            with transfer(client) as sftp:
+                sftp.get(str(src), str(dst))
+        assert not dst.exists()
+        assert os.path.getsize(str(dst) + PART_SUFFIX) == len(data)
+        assert len(os.listdir(tmp_path / "journal")) == 1
+        copied = client.sftp.written
+        client.sftp.written = 0
+        with transfer(client) as sftp:
+            assert sftp.get(str(src), str(dst)) == len(data)
+        assert dst.read_bytes() == data
+        assert client.sftp.written == len(data) - copied
+        assert not os.path.exists(str(dst) + PART_SUFFIX)
+        assert not os.listdir(tmp_path / "journal")
+        assert int(os.stat(dst).st_mtime) == int(os.stat(src).st_mtime)
+
+    def test_put_resumes_and_renames(self, tmp_path, client):
+        """Interrupted upload resumes and part file is renamed when complete."""
+        data = os.urandom(3 * CHUNK)
+        src, dst = tmp_path / "local.bin", tmp_path / "remote.bin"
+        src.write_bytes(data)
+        client.sftp.fail_at = CHUNK
+        with pytest.raises(IOError):
+            with transfer(client) as sftp:
+                sftp.put(str(src), str(dst))
+        assert not dst.exists()
+        client.sftp.written = 0
+        with transfer(client) as sftp:
+            sftp.put(str(src), str(dst))
+        assert dst.read_bytes() == data
+        assert client.sftp.written < len(data)
+        assert not os.path.exists(str(dst) + PART_SUFFIX)
+
+    def test_changed_source_restarts(self, tmp_path, client):
+        """Journal of another source version is ignored."""
+        src, dst = tmp_path / "remote.bin", tmp_path / "local.bin"
+        src.write_bytes(os.urandom(2 * CHUNK))
+        client.sftp.fail_at = CHUNK
+        with pytest.raises(IOError):
+            with transfer(client) as sftp:
+                sftp.get(str(src), str(dst))
+        data = os.urandom(2 * CHUNK)
+        src.write_bytes(data)
+        os.utime(src, (1, 1))
+        client.sftp.written = 0
+        with transfer(client) as sftp:
+            sftp.get(str(src), str(dst))
+        assert dst.read_bytes() == data
+        assert client.sftp.written == len(data)
+
+    def test_fanout_above_threshold(self, tmp_path, client, monkeypatch):
+        """Small copies use channels of the given connection, large ones connect."""
+        src = tmp_path / "remote.bin"
+        src.write_bytes(os.urandom(2 * CHUNK))
+        connections = []
+        monkeypatch.setattr(sftp_transfer.paramiko, "SSHClient",
+                            lambda: connections.append(1) or FakeClientConnection(client),
+                            raising=False)
+        monkeypatch.setattr(sftp_transfer.paramiko, "AutoAddPolicy", lambda: None,
+                            raising=False)
+        with transfer(client) as sftp:
+            sftp.get(str(src), str(tmp_path / "small.bin"))
+        assert not connections
+        with transfer(client, fanout_size=CHUNK) as sftp:
+            sftp.get(str(src), str(tmp_path / "large.bin"))
+        assert connections
+        assert (tmp_path / "large.bin").read_bytes() == src.read_bytes()
+
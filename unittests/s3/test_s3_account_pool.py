@@ -0,0 +1,174 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2022 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+
+"""Test S3 account pool lease, scrub and release with stubbed account operations."""
+
+import pytest
+
+from libs.s3 import s3_account_pool
+from libs.s3.s3_account_pool import S3AccountPool
+
+
+class FakeCluster:
+    """Accounts with their buckets and IAM users."""
+
+    def __init__(self):
+        self.accounts = {}
+        self.created = []
+        self.deleted = []
+        self.fail_delete_bucket = set()
+
+    def account_of(self, access_key):
+        """Account state of access key."""
+        return self.accounts[access_key.replace("AK-", "", 1)]
+
+
+CLUSTER = FakeCluster()
+
+
+class FakeAccountOperations:
+    """S3AccountOperations creating and deleting accounts of CLUSTER."""
+
+    @staticmethod
+    def create_s3_account(acc_name, email_id, passwd):  # pylint: disable=unused-argument
+        """Create account."""
+        CLUSTER.accounts[acc_name] = {"buckets": [], "iam_users": []}
+        CLUSTER.created.append(acc_name)
+        return True, {"access_key": f"AK-{acc_name}", "secret_key": "secret",
+                      "canonical_id": f"id-{acc_name}"}
+
+    @staticmethod
+    def delete_s3_account(acc_name):
+        """Delete account."""
+        CLUSTER.accounts.pop(acc_name)
+        CLUSTER.deleted.append(acc_name)
+        return True, "deleted"
+
+
+class FakeS3Client:
+    """boto3 client calls of scrub."""
+
+    def delete_bucket_policy(self, Bucket):  # pylint: disable=invalid-name
+        """No bucket has a policy."""
+        raise RuntimeError(f"NoSuchBucketPolicy {Bucket}")
+
+    def put_bucket_acl(self, Bucket, ACL):  # pylint: disable=invalid-name
+        """Reset ACL."""
+
+
+class FakeS3TestLib:
+    """S3TestLib of an account."""
+
+    def __init__(self, access_key, secret_key):  # pylint: disable=unused-argument
+        self.account = CLUSTER.account_of(access_key)
+        self.s3_client = FakeS3Client()
+
+    def bucket_list(self):
+        """Buckets of account."""
+        return True, list(self.account["buckets"])
+
+    def delete_bucket(self, bucket, force=False):  # pylint: disable=unused-argument
+        """Delete bucket with its objects."""
+        if bucket in CLUSTER.fail_delete_bucket:
+            return False, "BucketNotEmpty"
+        self.account["buckets"].remove(bucket)
+        return True, bucket
+
+
+class FakeIamTestLib:
+    """IamTestLib of an account."""
+
+    def __init__(self, access_key, secret_key):  # pylint: disable=unused-argument
+        self.account = CLUSTER.account_of(access_key)
+
+    def list_users(self):
+        """IAM users of account."""
+        return True, [{"UserName": user} for user in self.account["iam_users"]]
+
+    def delete_users_with_access_key(self, users):
+        """Delete IAM users."""
+        for user in users:
+            self.account["iam_users"].remove(user)
+
+
+@pytest.fixture(name="pool")
+def fixture_pool(monkeypatch):
+    """Pool of two accounts on a fresh fake cluster."""
+    CLUSTER.__init__()
+    monkeypatch.setattr(s3_account_pool, "S3AccountOperations", FakeAccountOperations)
+    monkeypatch.setattr(s3_account_pool.s3_test_lib, "S3TestLib", FakeS3TestLib)
+    monkeypatch.setattr(s3_account_pool, "IamTestLib", FakeIamTestLib)
+    pool = S3AccountPool(size=2, max_workers=2)
+    pool.provision()
+    return pool
+
+
+class TestS3AccountPool:
+    """Test S3AccountPool."""
+
+    def test_release_scrubs_and_recycles(self, pool):
+        """Released account is emptied and leased again without a new account."""
+        account = pool.lease()
+        CLUSTER.accounts[account.account_name]["buckets"].extend(["bkt1", "bkt2"])
+        CLUSTER.accounts[account.account_name]["iam_users"].append("user1")
+        pool.release(account)
+        assert CLUSTER.accounts[account.account_name] == {"buckets": [], "iam_users": []}
+        leased = [pool.lease(), pool.lease()]
+        assert account in leased
+        assert len(CLUSTER.created) == 2
+        assert not CLUSTER.deleted
+
+    def test_empty_pool_creates(self, pool):
+        """Lease from an empty pool creates an account which joins the pool."""
+        leased = [pool.lease() for _ in range(3)]
+        assert len({account.account_name for account in leased}) == 3
+        assert len(CLUSTER.created) == 3
+        assert leased[2] in pool.accounts
+        for account in leased:
+            pool.release(account)
+        assert not CLUSTER.deleted
+
+    def test_scrub_failure_deletes(self, pool):
+        """Account which cannot be scrubbed is deleted instead of returned to pool."""
+        account = pool.lease()
+        CLUSTER.accounts[account.account_name]["buckets"].append("stuck")
+        CLUSTER.fail_delete_bucket.add("stuck")
+        pool.release(account)
+        assert CLUSTER.deleted == [account.account_name]
+        assert account not in pool.accounts
+        assert account not in [pool.lease(), pool.lease()]
+        assert len(CLUSTER.created) == 3
+
+    def test_fresh(self, pool):
+        """Fresh account is created for the test and deleted on release."""
+        account = pool.lease(fresh=True)
+        assert account.fresh
+        assert account not in pool.accounts
+        pool.release(account)
+        assert CLUSTER.deleted == [account.account_name]
+        assert len(CLUSTER.created) == 3
+
+    def test_close(self, pool):
+        """Close deletes every account of pool."""
+        account = pool.lease()
+        CLUSTER.accounts[account.account_name]["buckets"].append("bkt")
+        pool.close()
+        assert not CLUSTER.accounts
+        assert sorted(CLUSTER.deleted) == sorted(CLUSTER.created)
+        assert not pool.accounts
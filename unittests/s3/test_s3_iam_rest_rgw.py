@@ -0,0 +1,153 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2022 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+
+"""Test pooled sessions and bulk concurrency of RGW REST client."""
+
+import asyncio
+
+import pytest
+
+from libs.s3 import s3_iam_rest_rgw
+from libs.s3.s3_iam_rest_rgw import HttpClient
+from libs.s3.s3_iam_rest_rgw import RestApiRgw
+
+
+class FakeResponse:
+    """Response context of fake session."""
+
+    status = 200
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        return False
+
+    async def text(self):
+        """Empty JSON body."""
+        await asyncio.sleep(0)
+        return "{}"
+
+
+class FakeSession:
+    """aiohttp.ClientSession stand in recording created and closed sessions."""
+
+    created = []
+
+    def __init__(self, connector=None):
+        self.connector = connector
+        self.closed = False
+        self.detached = False
+        FakeSession.created.append(self)
+
+    def request(self, **kwargs):
+        """Response of request."""
+        return FakeResponse()
+
+    async def close(self):
+        """Close session."""
+        self.closed = True
+
+    def detach(self):
+        """Detach connector."""
+        self.detached = True
+
+
+class FakeConnector:
+    """aiohttp.TCPConnector stand in."""
+
+    def __init__(self, **kwargs):
+        self.closed = False
+
+    def close(self):
+        """Close pooled sockets."""
+        self.closed = True
+
+
+@pytest.fixture(name="sessions")
+def fixture_sessions(monkeypatch):
+    """Patch aiohttp session and connector."""
+    FakeSession.created = []
+    monkeypatch.setattr(s3_iam_rest_rgw, "ClientSession", FakeSession)
+    monkeypatch.setattr(s3_iam_rest_rgw, "TCPConnector", FakeConnector)
+    return FakeSession.created
+
+
+class TestHttpClient:
+    """Session of client is pooled per event loop."""
+
+    def test_session_reused(self, sessions):
+        """Requests on one loop share one session, close closes it."""
+        client = HttpClient()
+
+        async def requests():
+            for _ in range(3):
+                await client.request("GET", "/admin/user")
+            await client.close()
+        asyncio.run(requests())
+        assert len(sessions) == 1
+        assert sessions[0].closed
+
+    def test_stale_loop_session_closed(self, sessions):
+        """Session of a previous loop is closed when another loop uses the client."""
+        client = HttpClient()
+        first, second = asyncio.new_event_loop(), asyncio.new_event_loop()
+        try:
+            first.run_until_complete(client.request("GET", "/admin/user"))
+            second.run_until_complete(client.request("GET", "/admin/user"))
+            assert len(sessions) == 2
+            assert sessions[0].connector.closed and sessions[0].detached
+            assert not sessions[1].connector.closed
+            # close from another loop than the one of the session
+            first.run_until_complete(client.close())
+        finally:
+            first.close()
+            second.close()
+        assert sessions[1].connector.closed and sessions[1].detached
+
+
+class TestRestApiRgw:
+    """Bulk operations and sync wrappers."""
+
+    def test_bulk_concurrency_bounded(self, sessions):
+        """At most max_concurrency operations are in flight."""
+        rgw = RestApiRgw(max_concurrency=3)
+        in_flight, peak = [0], [0]
+
+        async def operation(user_params):
+            in_flight[0] += 1
+            peak[0] = max(peak[0], in_flight[0])
+            await asyncio.sleep(0.001)
+            in_flight[0] -= 1
+            if user_params["uid"] == 4:
+                raise ValueError("failed")
+            return user_params["uid"]
+        results = rgw.run(rgw._bulk(operation,  # pylint: disable=protected-access
+                                    [{"uid": uid} for uid in range(10)]))
+        assert peak[0] == 3
+        assert results[:4] == [0, 1, 2, 3] and isinstance(results[4], ValueError)
+
+    def test_sync_calls_share_session(self, sessions):
+        """Sync wrappers reuse loop and session till close_sync."""
+        rgw = RestApiRgw(max_concurrency=2)
+        rgw.create_users_sync([{"uid": "u1"}, {"uid": "u2"}])
+        rgw.delete_users_sync([{"uid": "u1"}, {"uid": "u2"}])
+        assert len(sessions) == 1
+        rgw.close_sync()
+        assert sessions[0].closed
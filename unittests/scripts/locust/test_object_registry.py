@@ -0,0 +1,95 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2022 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+#
+"""Locust shared object registry unit tests."""
+import os
+import tempfile
+
+import pytest
+
+from scripts.locust.object_registry import ObjectRegistry
+
+
+class TestObjectRegistry:
+    """Locust shared object registry test suite."""
+
+    def setup_method(self):
+        """Create registry in a scratch directory."""
+        self.tmp_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.tmp_dir, "objects.db")
+        self.registry = ObjectRegistry(self.db_path, max_size=4, reservation_timeout=60)
+
+    def teardown_method(self):
+        """Remove scratch directory."""
+        self.registry.close()
+        for name in os.listdir(self.tmp_dir):
+            os.remove(os.path.join(self.tmp_dir, name))
+        os.rmdir(self.tmp_dir)
+
+    def test_reserve_release_delete(self):
+        """Reserved entries are not sampled until stored back."""
+        self.registry.store("bkt/obj1", "crc1")
+        assert self.registry.pop_one() == ("bkt/obj1", "crc1")
+        assert self.registry.pop_one() == (False, False)
+        self.registry.store("bkt/obj1", "crc1")
+        key, _ = self.registry.pop_one()
+        self.registry.delete(key)
+        assert len(self.registry) == 0
+        with pytest.raises(KeyError):
+            self.registry.lookup("bkt/obj1")
+
+    def test_shared_between_connections(self):
+        """Entries stored by one worker are visible to another."""
+        other = ObjectRegistry(self.db_path, max_size=4)
+        try:
+            other.store("bkt/obj1", "crc1")
+            assert self.registry.lookup("bkt/obj1") == "crc1"
+            assert self.registry.pop_one() == ("bkt/obj1", "crc1")
+            assert other.pop_one() == (False, False)
+        finally:
+            other.close()
+
+    def test_eviction_skips_reserved(self):
+        """Oldest unreserved entries are evicted over capacity."""
+        for i in range(4):
+            self.registry.store(f"bkt/obj{i}", f"crc{i}")
+        reserved = set()
+        while len(reserved) < 2:
+            reserved.add(self.registry.pop_one()[0])
+        for i in range(4, 6):
+            self.registry.store(f"bkt/obj{i}", f"crc{i}")
+        assert len(self.registry) == 4
+        for key in reserved:
+            assert self.registry.lookup(key)
+        sampled = set()
+        while True:
+            key, _ = self.registry.pop_one()
+            if not key:
+                break
+            sampled.add(key)
+        assert {"bkt/obj4", "bkt/obj5"} <= sampled
+        assert len(sampled) == 2
+
+    def test_purge_bucket(self):
+        """Purge removes only entries of the given bucket."""
+        self.registry.store("bkt1/obj", "crc")
+        self.registry.store("bkt10/obj", "crc")
+        self.registry.store("bkt2/obj", "crc")
+        assert self.registry.purge("bkt1/") == 1
+        assert len(self.registry) == 2
@@ -0,0 +1,94 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2022 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+
+"""Test s3bench command builder and orchestrator without running s3bench."""
+
+import pytest
+
+from scripts.s3_bench import s3bench
+from scripts.s3_bench.s3bench_orchestrator import S3benchInstance
+from scripts.s3_bench.s3bench_orchestrator import S3benchOrchestrator
+
+S3BENCH_RESP = (
+    "Test parameters\nobjectSize:       1.0000 MB\nnumClients:       40\n\n\n"
+    "Results Summary for Write Operation(s)\nTotal Transferred: 200.000 MB\n"
+    "Total Throughput:  20.00 MB/s\nTotal Duration:    10.000 s\nNumber of Errors:  0\n"
+    "------------------------------------\nWrite times 99th %ile: 2.000 s\n"
+    "Errors Count:  0\n")
+HOSTS = [{"hostname": f"client{index}", "username": "root", "password": "secret"}
+         for index in range(3)]
+
+
+class TestS3benchCmd:
+    """Command line of s3bench."""
+
+    def test_options(self):
+        """Options are rendered as s3bench flags."""
+        cmd = s3bench.s3bench_cmd("ak", "sk", "bkt", "https://ep:443", 8, 100, "pre_", "1Mb",
+                                  skip_cleanup=True, validate=False, validate_certs=False,
+                                  max_retries=3, connect_timeout="10s")
+        assert cmd.split() == [
+            "s3bench", "-accessKey=ak", "-accessSecret=sk", "-bucket=bkt",
+            "-endpoint=https://ep:443", "-numClients=8", "-numSamples=100",
+            "-objectNamePrefix=pre_", "-objectSize=1Mb", "-skipSSLCertVerification=True",
+            "-s3MaxRetries=3", "-region", "us-east-1", "-skipCleanup", "-connectTimeout=10s"]
+
+    def test_unknown_option(self):
+        """Misspelled option is rejected instead of running with defaults."""
+        with pytest.raises(TypeError):
+            s3bench.s3bench_cmd("ak", "sk", "bkt", "ep", 8, 100, "pre_", "1Mb",
+                                skip_clenaup=True)
+
+
+class TestS3benchOrchestrator:
+    """Distribution of instances and merged report."""
+
+    def test_round_robin(self, tmp_path, monkeypatch):
+        """Instances are spread over endpoints and client hosts in turn."""
+        monkeypatch.setattr(S3benchInstance, "run", lambda instance, deadline: None)
+        monkeypatch.setattr(S3benchOrchestrator, "report",
+                            lambda orchestrator, num_clients: {"aggregate": []})
+        orchestrator = S3benchOrchestrator("ak", "sk", ["https://ep1", "https://ep2"], HOSTS,
+                                           instances_per_endpoint=2, log_dir=str(tmp_path))
+        orchestrator.run("TEST-1", "bkt", 8, 100, skip_cleanup=True)
+        assert [(instance.end_point, instance.host["hostname"])
+                for instance in orchestrator.instances] == [
+                    ("https://ep1", "client0"), ("https://ep1", "client1"),
+                    ("https://ep2", "client2"), ("https://ep2", "client0")]
+        assert [instance.cmd.split()[3] for instance in orchestrator.instances] == \
+            [f"-bucket=bkt-{index}" for index in range(4)]
+        assert all("-skipCleanup" in instance.cmd for instance in orchestrator.instances)
+
+    def test_report_averages_runs(self, tmp_path):
+        """Back to back runs of an instance are averaged, instances are summed."""
+        orchestrator = S3benchOrchestrator("ak", "sk", ["https://ep1", "https://ep2"],
+                                           log_dir=str(tmp_path))
+        for index, (end_point, runs) in enumerate((("https://ep1", 2), ("https://ep2", 1))):
+            log_path = tmp_path / f"instance{index}.log"
+            log_path.write_text(S3BENCH_RESP * runs)
+            instance = S3benchInstance(index, end_point, "s3bench", str(log_path))
+            instance.runs, instance.exit_status = runs, [0] * runs
+            orchestrator.instances.append(instance)
+        report = orchestrator.report()
+        ep1, = report["endpoints"]["https://ep1"]
+        assert (ep1["mbps"], ep1["clients"]) == (20.0, 40)
+        aggregate, = report["aggregate"]
+        assert (aggregate["operation"], aggregate["mbps"], aggregate["clients"]) == \
+            ("PUT", 40.0, 80)
+        assert not report["failed_logs"]
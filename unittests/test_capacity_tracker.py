@@ -0,0 +1,180 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2022 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+
+"""Test capacity tracker expectations and adaptive polling with fake counters."""
+
+from http import HTTPStatus
+from types import SimpleNamespace
+
+import pytest
+
+from libs.csm.rest import csm_rest_capacity_tracker
+from libs.csm.rest.csm_rest_capacity_tracker import CLUSTER
+from libs.csm.rest.csm_rest_capacity_tracker import DECREASE
+from libs.csm.rest.csm_rest_capacity_tracker import INCREASE
+from libs.csm.rest.csm_rest_capacity_tracker import CapacityTracker
+from libs.csm.rest.csm_rest_capacity_tracker import Expectation
+
+
+class FakeClock:
+    """Clock advanced by sleep only."""
+
+    def __init__(self):
+        self.now = 1000.0
+        self.sleeps = []
+
+    def time(self):
+        """Current fake time."""
+        return self.now
+
+    def sleep(self, seconds):
+        """Advance fake time."""
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class ScriptedReader:
+    """Cluster reader returning scripted used bytes, last value repeats."""
+
+    def __init__(self, values):
+        self.values = list(values)
+        self.reads = 0
+
+    def __call__(self):
+        value = self.values[min(self.reads, len(self.values) - 1)]
+        self.reads += 1
+        return value
+
+
+class FakeQuota:
+    """Capacity usage REST responses of users."""
+
+    def __init__(self, usage):
+        self.usage = usage
+
+    def get_user_capacity_usage(self, resource, uid):
+        """Response of GET capacity usage."""
+        if uid not in self.usage:
+            return SimpleNamespace(status_code=HTTPStatus.NOT_FOUND, json=dict)
+        used, objects = self.usage[uid]
+        body = {"capacity": {"s3": {"users": [{"id": uid, "used": used, "objects": objects,
+                                               "resource": resource}]}}}
+        return SimpleNamespace(status_code=HTTPStatus.OK, json=lambda: body)
+
+
+@pytest.fixture(name="clock")
+def fixture_clock(monkeypatch):
+    """Fake time of tracker module."""
+    clock = FakeClock()
+    monkeypatch.setattr(csm_rest_capacity_tracker, "time", clock)
+    return clock
+
+
+class TestExpectation:
+    """Test Expectation.met."""
+
+    def test_exact(self):
+        """Used bytes within tolerance and exact object count."""
+        expectation = Expectation(used=100, objects=2, tolerance=5)
+        assert expectation.met(100, 2)
+        assert expectation.met(95, 2)
+        assert expectation.met(105, 2)
+        assert not expectation.met(106, 2)
+        assert not expectation.met(100, 1)
+
+    def test_direction(self):
+        """Increase allows no change, decrease needs a drop beyond tolerance."""
+        assert Expectation(direction=INCREASE).met(0, 0)
+        assert Expectation(direction=INCREASE).met(10, 0)
+        assert not Expectation(direction=INCREASE).met(-1, 0)
+        assert Expectation(direction=INCREASE, tolerance=4).met(-4, 0)
+        assert Expectation(direction=DECREASE).met(-1, 0)
+        assert not Expectation(direction=DECREASE).met(0, 0)
+        assert not Expectation(direction=DECREASE, tolerance=4).met(-4, 0)
+
+    def test_unset(self):
+        """Expectation without fields is always met."""
+        assert Expectation().met(-50, 3)
+
+
+class TestCapacityTracker:
+    """Test CapacityTracker baseline, expect and wait."""
+
+    def test_expect_cumulative(self, clock):  # pylint: disable=unused-argument
+        """Repeated expectations of a key add up."""
+        tracker = CapacityTracker(cluster_reader=ScriptedReader([0]))
+        with pytest.raises(KeyError):
+            tracker.expect(CLUSTER, used=1)
+        tracker.baseline(cluster=True)
+        tracker.expect(CLUSTER, used=10, objects=1, tolerance=2)
+        tracker.expect(CLUSTER, used=20, direction=INCREASE)
+        tracker.expect(CLUSTER, objects=1, tolerance=1)
+        assert tracker.expected[CLUSTER] == Expectation(30, 2, INCREASE, 2)
+        tracker.set_baseline(CLUSTER, 5)
+        assert CLUSTER not in tracker.expected
+
+    def test_wait_backoff(self, clock):
+        """Interval grows while counters stand still and resets once they move."""
+        reader = ScriptedReader([100, 100, 100, 100, 150, 200])
+        tracker = CapacityTracker(cluster_reader=reader, min_interval=5, max_interval=15)
+        tracker.baseline(cluster=True)
+        tracker.expect(CLUSTER, used=100)
+        result = tracker.wait(timeout=300)
+        assert result.converged
+        assert result.polls == 5
+        assert clock.sleeps == [5, 10, 15, 5]
+        assert result.latency == sum(clock.sleeps)
+        assert result.observed == {CLUSTER: (200, 0)}
+        assert not result.pending
+
+    def test_wait_timeout(self, clock):
+        """Unmet expectations are reported with observed deltas at timeout."""
+        tracker = CapacityTracker(cluster_reader=ScriptedReader([100, 120]), min_interval=5,
+                                  max_interval=20)
+        tracker.baseline(cluster=True)
+        tracker.expect(CLUSTER, used=50)
+        result = tracker.wait(timeout=60)
+        assert not result.converged
+        assert result.pending == {CLUSTER: (20, 0)}
+        # no poll is scheduled past timeout
+        assert clock.sleeps == [5, 10, 20, 20]
+        assert result.latency == 55
+
+    def test_wait_users(self, clock):  # pylint: disable=unused-argument
+        """Users are read in one round and only met once all of them are."""
+        quota = FakeQuota({"u1": (0, 0), "u2": (10, 1)})
+        tracker = CapacityTracker(quota_obj=quota, min_interval=1)
+        tracker.baseline([("user", "u1"), ("user", "u2")])
+        quota.usage = {"u1": (40, 2), "u2": (10, 1)}
+        tracker.expect(("user", "u1"), used=40, objects=2)
+        tracker.expect(("user", "u2"), used=-10, objects=-1)
+        assert tracker.wait(timeout=3).pending == {("user", "u2"): (0, 0)}
+        quota.usage["u2"] = (0, 0)
+        assert tracker.wait(timeout=3).converged
+        quota.usage = {}
+        with pytest.raises(RuntimeError):
+            tracker.read([("user", "u1")])
+
+    def test_poll_check(self, clock):  # pylint: disable=unused-argument
+        """Poll calls a custom check till it passes."""
+        reader = ScriptedReader([0, 0, 1, 2])
+        tracker = CapacityTracker(min_interval=1)
+        result = tracker.poll(lambda: (reader() == 2, reader.reads), timeout=10)
+        assert result.converged
+        assert result.polls == 4
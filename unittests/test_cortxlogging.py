@@ -0,0 +1,74 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2022 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+
+"""Test cortx logging pipeline."""
+
+import gzip
+import json
+import logging
+import multiprocessing
+
+from commons import cortxlogging
+
+
+class TestCortxLogging:
+    """Test queued logging, rate limiting and background compression."""
+
+    def test_queued_json_lines_rotation(self, tmp_path):
+        """Records written by listener, rotated files are compressed in background."""
+        log = logging.getLogger("test_queued_json_lines_rotation")
+        log.setLevel(logging.INFO)
+        log.propagate = False
+        path = str(tmp_path / "di.jsonl")
+        cortxlogging.start_queue_logging(
+            log, [cortxlogging.json_lines_handler(path, max_bytes=4096, backup_count=2)])
+        for i in range(200):
+            log.info("item %s", i)
+        cortxlogging.stop_queue_logging(log)
+        rotated = sorted(tmp_path.glob("di.jsonl-*.gz"))
+        assert len(rotated) == 2
+        assert all(gzip.open(str(name)).read() for name in rotated)
+        last = json.loads(open(path, encoding="utf-8").read().splitlines()[-1])
+        assert last["m"] == "item 199"
+        assert not list(tmp_path.glob("*.pending"))
+
+    def test_queued_forked_process(self, tmp_path):
+        """Records of forked child process are written by listener of parent."""
+        log = logging.getLogger("test_queued_forked_process")
+        log.setLevel(logging.INFO)
+        log.propagate = False
+        path = tmp_path / "di.log"
+        cortxlogging.set_log_handlers(log, str(path), queued=True, multiprocess=True)
+        child = multiprocessing.get_context("fork").Process(target=log.info,
+                                                            args=("from child",))
+        child.start()
+        child.join()
+        log.info("from parent")
+        cortxlogging.stop_queue_logging(log)
+        lines = path.read_text().splitlines()
+        assert child.exitcode == 0
+        assert [line.rsplit(" - ", 1)[1] for line in lines] == ["from child", "from parent"]
+
+    def test_rate_limit(self):
+        """Call site is limited to burst records, warnings always pass."""
+        log_filter = cortxlogging.RateLimitFilter(rate=0.001, burst=3)
+        info = logging.LogRecord("x", logging.INFO, "mod.py", 10, "item", None, None)
+        warning = logging.LogRecord("x", logging.WARNING, "mod.py", 11, "warn", None, None)
+        assert [log_filter.filter(info) for _ in range(5)] == [True] * 3 + [False] * 2
+        assert log_filter.filter(warning)
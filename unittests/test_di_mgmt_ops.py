@@ -0,0 +1,130 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2022 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+
+"""Test parallel provisioning of DI users and buckets with per operation retries."""
+
+import threading
+
+import pytest
+
+from libs.di import di_mgmt_ops
+from libs.di.di_mgmt_ops import ManagementOPs
+
+
+class FakeIam:
+    """
+    IAM user and access key calls. Access key creation fails always for users named with
+    fail_key prefix and once for users named with flaky_key prefix.
+    """
+
+    def __init__(self):
+        self.users = set()
+        self.keys = {}
+        self.fail_key = None
+        self.flaky_key = None
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def create_user(self, user):
+        """Create user, a second create of a user fails like IAM."""
+        with self._lock:
+            self.calls.append(("create_user", user))
+            if user in self.users:
+                raise RuntimeError(f"EntityAlreadyExists {user}")
+            self.users.add(user)
+        return True, user
+
+    def create_access_key(self, user):
+        """Create key, fails for fail_key users and once for flaky_key users."""
+        with self._lock:
+            self.calls.append(("create_access_key", user))
+            if self.fail_key and user.startswith(self.fail_key):
+                raise RuntimeError(f"ServiceUnavailable {user}")
+            if self.flaky_key and user.startswith(self.flaky_key):
+                self.flaky_key = None
+                raise RuntimeError(f"Timeout {user}")
+            self.keys[user] = f"AK-{user}"
+        return True, {"AccessKey": {"AccessKeyId": f"AK-{user}", "SecretAccessKey": "secret"}}
+
+    def delete_access_key(self, user, key):
+        """Delete key."""
+        with self._lock:
+            assert self.keys.pop(user) == key
+
+    def delete_user(self, user):
+        """Delete user."""
+        with self._lock:
+            self.users.remove(user)
+
+
+class FakeAccountOps:
+    """S3 account REST calls."""
+
+    def create_s3_account(self, user_name, email_id, passwd):  # pylint: disable=unused-argument
+        """Create account."""
+        return True, {"access_key": f"AK-{user_name}", "secret_key": "secret"}
+
+
+@pytest.fixture(name="iam")
+def fixture_iam(monkeypatch):
+    """Fake IAM of create_iam_users, retries without sleeping."""
+    iam = FakeIam()
+    monkeypatch.setattr(ManagementOPs, "retry_delay", 0)
+    monkeypatch.setattr(di_mgmt_ops, "DI_CFG", {"DiUserConfig": {
+        "s3_account": {"password": "pw"}, "iam_user": {"password": "pw"}}})
+    monkeypatch.setattr(di_mgmt_ops, "S3AccountOperationsRestAPI", FakeAccountOps)
+    monkeypatch.setattr(di_mgmt_ops, "IamTestLib", lambda access_key, secret_key: iam)
+    return iam
+
+
+class TestProvision:
+    """Test ManagementOPs.provision."""
+
+    def test_retry_failed_step_only(self, iam):
+        """A failing step is retried alone, earlier steps of the key are not repeated."""
+        user = f"iam_{ManagementOPs.user_prefix}2_"
+        iam.flaky_key = user
+        resp = ManagementOPs.create_iam_users(nusers=3)
+        users = resp["iam_users"]
+        assert len(users) == 3
+        flaky = [name for name in users if name.startswith(user)][0]
+        assert users[flaky]["accesskey"] == f"AK-{flaky}"
+        assert iam.calls.count(("create_user", flaky)) == 1
+        assert iam.calls.count(("create_access_key", flaky)) == 2
+        assert len(iam.keys) == 3
+
+    def test_partial_failure_rollback(self, iam):
+        """Created and half created items are deleted before AssertionError is raised."""
+        iam.fail_key = f"iam_{ManagementOPs.user_prefix}2_"
+        with pytest.raises(AssertionError, match="ServiceUnavailable"):
+            ManagementOPs.create_iam_users(nusers=3)
+        failed = [call[1] for call in iam.calls if call[0] == "create_access_key"
+                  and call[1].startswith(iam.fail_key)]
+        assert len(failed) == ManagementOPs.retries
+        assert not iam.users
+        assert not iam.keys
+
+    def test_on_done(self):
+        """on_done is called once per created key."""
+        done = []
+        result = ManagementOPs.provision(
+            range(5), lambda key, record: record.setdefault("key", key),
+            on_done=lambda key, result: done.append((key, result)))
+        assert result == {key: key for key in range(5)}
+        assert sorted(done) == [(key, key) for key in range(5)]
@@ -0,0 +1,79 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2022 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+
+"""Test lease based target locking against local stand in DB."""
+
+import threading
+import time
+
+from commons.constants import EXCLUSIVE_LOCK, SHARED_LOCK
+from core.lock_service import LeaseLockService, LocalLockStore
+
+
+def new_service(lease_ttl=300):
+    """Lock service with two free healthy targets."""
+    store = LocalLockStore([
+        {"setupname": name, "is_setup_free": True, "is_setup_healthy": True,
+         "setup_in_useby": "", "in_use_for_parallel": False, "parallel_client_cnt": 0}
+        for name in ("t1", "t2")])
+    return LeaseLockService(store, lease_ttl=lease_ttl)
+
+
+class TestLeaseLockService:
+    """Test lease lock service class."""
+
+    def test_exclusive_and_shared(self):
+        """Exclusive lock excludes others, shared holders are counted."""
+        service = new_service()
+        assert service.acquire(["t1"], "c1", EXCLUSIVE_LOCK, timeout=0) == "t1"
+        assert service.acquire(["t1"], "c2", SHARED_LOCK, timeout=0) == ""
+        assert service.acquire(["t1", "t2"], "c2", SHARED_LOCK, timeout=0) == "t2"
+        assert service.acquire(["t2"], "c3", SHARED_LOCK, timeout=0) == "t2"
+        setup = service.store.find_one("t2")
+        assert setup["parallel_client_cnt"] == 2
+        assert setup["setup_in_useby"] == "c2 c3"
+        assert not setup["lock_waiters"]
+        assert service.release("t2", "c2") and service.release("t2", "c3")
+        setup = service.store.find_one("t2")
+        assert setup["is_setup_free"] and not setup["in_use_for_parallel"]
+        assert not service.release("t2", "c3")
+
+    def test_fifo_waiters_are_notified(self):
+        """Queued exclusive waiter is served before a later shared client."""
+        service = new_service()
+        assert service.acquire(["t1"], "c1", SHARED_LOCK) == "t1"
+        result = {}
+        waiter = threading.Thread(
+            target=lambda: result.update(target=service.acquire(["t1"], "c2", EXCLUSIVE_LOCK)))
+        waiter.start()
+        while not service.store.find_one("t1").get("lock_waiters"):
+            time.sleep(0.01)
+        assert service.acquire(["t1"], "c3", SHARED_LOCK, timeout=0) == ""
+        service.release("t1", "c1")
+        waiter.join(5)
+        assert result["target"] == "t1"
+        assert service.store.find_one("t1")["setup_in_useby"] == "c2"
+
+    def test_expired_lease(self):
+        """Lease not renewed in time is taken over, renewed lease is kept."""
+        service = new_service(lease_ttl=0.2)
+        assert service.acquire(["t1"], "c1", EXCLUSIVE_LOCK) == "t1"
+        assert service.renew("t1", "c1")
+        assert service.acquire(["t1"], "c2", EXCLUSIVE_LOCK, timeout=1) == "t1"
+        assert not service.renew("t1", "c1")
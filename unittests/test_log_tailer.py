@@ -0,0 +1,212 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2022 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+
+"""Test incremental log tailer against an in memory node."""
+
+import io
+import re
+from types import SimpleNamespace
+
+import pytest
+
+from commons import commands
+from commons.helpers import log_tailer
+from commons.helpers.log_tailer import JOURNAL
+from commons.helpers.log_tailer import LogTailer
+
+LOG = "/var/log/cortx/rgw.log"
+
+
+class FakeRemoteFile:
+    """SFTP file handle of fake node."""
+
+    def __init__(self, data: bytes):
+        self.data = data
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def readv(self, chunks):
+        """Yield requested ranges."""
+        for offset, length in chunks:
+            yield self.data[offset:offset + length]
+
+
+class FakeNode:
+    """Node with remote files by path and journal entries with cursors."""
+
+    def __init__(self):
+        self.hostname = "node1"
+        self.files = {}
+        self.inodes = {}
+        self.journal = []
+        self.sftp_reads = 0
+
+    def write(self, path: str, data: bytes, rotate: bool = False):
+        """Append to remote file, rotate replaces it with a new inode."""
+        if rotate or path not in self.files:
+            self.inodes[path] = self.inodes.get(path, 0) + 100
+            self.files[path] = b""
+        self.files[path] += data
+
+    def execute_cmd(self, cmd: str):
+        """Stat of remote files and last journal entry."""
+        for path, data in self.files.items():
+            if cmd == commands.CMD_STAT_INODE_SIZE.format(path):
+                return f"{self.inodes[path]} {len(data)}".encode()
+        if "-n 1" in cmd:
+            return self._journal(self.journal[-1:])
+        raise IOError(f"stat: cannot stat: {cmd}")
+
+    def _journal(self, entries) -> bytes:
+        out = [f"2022-04-01T10:00:0{num}+0000 node1 {msg}\n".encode() for num, msg in entries]
+        if entries:
+            out.append(f"-- cursor: c{entries[-1][0]}\n".encode())
+        return b"".join(out)
+
+    def exec_command(self, cmd: str):
+        """Stream journal entries after cursor of command."""
+        after = re.search(r"--after-cursor='c(\d+)'", cmd)
+        if after:
+            entries = [entry for entry in self.journal if entry[0] > int(after.group(1))]
+        elif "-n 0" in cmd:
+            entries = []
+        else:
+            entries = self.journal
+        stdout = io.BytesIO(self._journal(entries))
+        stdout.channel = SimpleNamespace(recv_exit_status=lambda: 0)
+        return None, stdout, io.BytesIO()
+
+    def open_sftp(self):
+        """SFTP client of node."""
+        node = self
+
+        class Sftp:
+            """Fake SFTP client."""
+            @staticmethod
+            def open(path, mode):  # pylint: disable=unused-argument
+                node.sftp_reads += 1
+                return FakeRemoteFile(node.files[path])
+
+            @staticmethod
+            def close():
+                """Close client."""
+        return Sftp()
+
+    def connected_client(self):
+        """Connected SSH client of node."""
+        return self
+
+
+def new_tailer(node, local_dir, **kwargs):
+    """Tailer of LOG and journal with error pattern."""
+    return LogTailer(node, str(local_dir), files=[LOG], patterns=["ERROR", "panic"],
+                     **kwargs)
+
+
+class TestLogTailer:
+    """Test offsets, rotation, cursors and test windows."""
+
+    def test_file_offsets_and_partial_lines(self, tmp_path):
+        """Only complete lines added since previous poll are fetched."""
+        node = FakeNode()
+        node.write(LOG, b"old line\n")
+        tailer = new_tailer(node, tmp_path, journal=False)
+        assert tailer.poll() == {LOG: 0}
+        node.write(LOG, b"first\nERROR second\npart")
+        assert tailer.poll() == {LOG: len(b"first\nERROR second\n")}
+        node.write(LOG, b"ial\n")
+        assert tailer.poll() == {LOG: len(b"partial\n")}
+        with open(tailer.local_path(LOG), "rb") as local:
+            assert local.read() == b"first\nERROR second\npartial\n"
+        hit, = tailer.hits()
+        assert (hit["offset"], hit["patterns"]) == (len(b"first\n"), ["ERROR"])
+
+    def test_large_backlog_in_bounded_fetches(self, tmp_path, monkeypatch):
+        """Backlog larger than one fetch is read in several SFTP ranges."""
+        monkeypatch.setattr(log_tailer, "MAX_FETCH", 64)
+        monkeypatch.setattr(log_tailer, "READ_BLOCK", 16)
+        node = FakeNode()
+        data = b"".join(b"line %03d\n" % num for num in range(100))
+        node.write(LOG, data)
+        tailer = new_tailer(node, tmp_path, journal=False, from_start=True)
+        assert tailer.poll() == {LOG: len(data)}
+        with open(tailer.local_path(LOG), "rb") as local:
+            assert local.read() == data
+
+    def test_rotation(self, tmp_path):
+        """Rotated or truncated file is read again from start."""
+        node = FakeNode()
+        tailer = new_tailer(node, tmp_path, journal=False, from_start=True)
+        node.write(LOG, b"a" * 50 + b"\n")
+        assert tailer.poll() == {LOG: 51}
+        node.write(LOG, b"rotated\n", rotate=True)
+        assert tailer.poll() == {LOG: 8}
+        node.write(LOG, b"x\n", rotate=True)
+        node.write(LOG, b"y" * 100 + b"\n")
+        assert tailer.poll() == {LOG: 103}
+
+    def test_journal_cursor_persisted(self, tmp_path):
+        """Journal is read after saved cursor, a new tailer continues from state."""
+        node = FakeNode()
+        node.journal = [(1, "boot"), (2, "kernel: panic")]
+        tailer = LogTailer(node, str(tmp_path), files=[], patterns=["panic"], from_start=True)
+        entries = b"2022-04-01T10:00:01+0000 node1 boot\n" \
+                  b"2022-04-01T10:00:02+0000 node1 kernel: panic\n"
+        assert tailer.poll()[JOURNAL] == len(entries)
+        assert tailer.state["cursors"][JOURNAL] == "c2"
+        node.journal.append((3, "service started"))
+        tailer = LogTailer(node, str(tmp_path), files=[], patterns=["panic"])
+        assert tailer.poll()[JOURNAL] == len(b"2022-04-01T10:00:03+0000 node1 service started\n")
+        with open(tailer.local_path(JOURNAL), "rb") as local:
+            assert b"-- cursor" not in local.read()
+        assert [hit["source"] for hit in tailer.hits()] == [JOURNAL, log_tailer.KERNEL]
+
+    def test_journal_without_entries(self, tmp_path):
+        """Tailer starting at current end takes cursor of last journal entry."""
+        node = FakeNode()
+        node.journal = [(1, "boot")]
+        tailer = LogTailer(node, str(tmp_path), files=[], patterns=[])
+        assert tailer.poll()[JOURNAL] == 0
+        assert tailer.state["cursors"][JOURNAL] == "c1"
+
+    def test_window_extract(self, tmp_path):
+        """Logs and error lines of a window are cut from local copies."""
+        node = FakeNode()
+        node.write(LOG, b"before\n")
+        tailer = new_tailer(node, tmp_path / "copies", journal=False, from_start=True)
+        start = tailer.mark()
+        node.write(LOG, b"ERROR in test\n")
+        end = tailer.mark()
+        node.write(LOG, b"ERROR after\n")
+        tailer.poll()
+        assert [hit["line"] for hit in tailer.hits(start, end)] == ["ERROR in test"]
+        path, = tailer.extract(start, end, str(tmp_path / "test"), "TEST-1")
+        with open(path, "rb") as window:
+            assert window.read() == b"ERROR in test\n"
+
+
+@pytest.fixture(autouse=True)
+def fixture_no_yaml(monkeypatch):
+    """Tailers of tests never read serverlogs config."""
+    monkeypatch.setattr(log_tailer.config_utils, "read_yaml",
+                        lambda path: (True, {"tail_files": [], "error_patterns": []}))
@@ -0,0 +1,63 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2022 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+
+"""Test time window extraction of logs."""
+
+from datetime import datetime
+from datetime import timedelta
+
+from commons.helpers import log_window
+
+
+class TestLogWindow:
+    """Test binary search of log window offsets."""
+
+    def test_window_across_year_boundary(self, tmp_path, monkeypatch):
+        """Syslog timestamps from December and January are ordered by inferred year."""
+        monkeypatch.setattr(log_window, "PROBE_SIZE", 16)
+        stamp = datetime(2021, 12, 31, 23, 50)
+        lines = []
+        for i in range(2000):
+            stamp += timedelta(seconds=i % 2)
+            lines.append(stamp.strftime("%b %d %H:%M:%S") + f" node msg {i}\n")
+            if i % 5 == 0:
+                lines.append("    traceback line without timestamp\n")
+        log_path = tmp_path / "messages"
+        log_path.write_text("".join(lines))
+        ref = datetime(2022, 1, 3)
+        start = log_window.parse_log_time("Dec 31 23:55:00", ref)
+        end = log_window.parse_log_time("Jan 01 00:05:00", ref)
+        expected = []
+        current = None
+        for line in lines:
+            current = log_window.parse_log_time(line, ref) or current
+            if start <= current <= end:
+                expected.append(line)
+        dest = tmp_path / "window.log"
+        log_window.extract_log_window(str(log_path), "Dec 31 23:55:00", "Jan 01 00:05:00",
+                                      str(dest), ref=ref)
+        assert dest.read_text() == "".join(expected)
+        assert expected[0].startswith("Dec 31 23:55:00")
+        assert expected[-1].startswith("Jan 01 00:05:00") or "traceback" in expected[-1]
+
+    def test_iso_timestamp(self):
+        """ISO timestamps with fraction are parsed."""
+        assert log_window.parse_log_time("2022-12-12 16:06:01,25 [INFO] started") == \
+            datetime(2022, 12, 12, 16, 6, 1, 250000)
+        assert log_window.parse_log_time("no timestamp here") is None
@@ -0,0 +1,90 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2022 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+
+"""Test warm pytest workers against a small local test tree."""
+
+import os
+
+import pytest
+
+from core.pytest_worker import WorkerPool
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CONFTEST = '''
+def pytest_addoption(parser):
+    parser.addoption("--target", action="store", default=None)
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "tags(test_id): test id")
+'''
+
+TESTS = '''
+import pytest
+
+
+@pytest.mark.tags("TEST-1")
+def test_pass():
+    pass
+
+
+@pytest.mark.tags("TEST-2")
+def test_fail():
+    assert False
+
+
+@pytest.mark.tags("TEST-3")
+def test_bad_health():
+    pytest.exit("Health check failed for cluster", 3)
+'''
+
+
+@pytest.fixture(name="pool")
+def fixture_pool(tmp_path, monkeypatch):
+    """Worker pool running tests of a temporary test tree."""
+    (tmp_path / "conftest.py").write_text(CONFTEST)
+    (tmp_path / "test_batch.py").write_text(TESTS)
+    monkeypatch.chdir(tmp_path)
+    python_path = os.pathsep.join(filter(None, [REPO_DIR, os.environ.get("PYTHONPATH")]))
+    pool = WorkerPool(max_batches=3, env={"PYTHONPATH": python_path},
+                      collect_args=["-p", "no:cacheprovider"])
+    yield pool
+    pool.close()
+
+
+class TestWorkerPool:
+    """Test exit code and result passthrough of warm workers."""
+
+    def test_exit_codes(self, pool):
+        """Pytest exit codes and per test outcomes are passed back to runner."""
+        args = ["-q", "-p", "no:cacheprovider", "--target=t1"]
+        reply = pool.run_batch("t1", args, ["TEST-1"])
+        assert reply["exit_code"] == 0
+        assert reply["results"] == {"test_batch.py::test_pass": "passed"}
+        reply = pool.run_batch("t1", args, ["TEST-1", "TEST-2"])
+        assert reply["exit_code"] == 1
+        assert reply["results"]["test_batch.py::test_fail"] == "failed"
+        assert not reply["recycle"]
+        # health check exit code is what test runner maps to its own exit
+        reply = pool.run_batch("t1", args, ["TEST-3"])
+        assert reply["exit_code"] == 3
+        assert reply["recycle"]
+        reply = pool.run_batch("t1", args, ["TEST-9"])
+        assert (reply["exit_code"], reply["missing"]) == (5, ["TEST-9"])
@@ -0,0 +1,73 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2022 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+
+"""Test retry policy and circuit breaker."""
+
+import pytest
+
+from commons.utils import retry_utils
+from commons.utils.retry_utils import Backoff
+from commons.utils.retry_utils import CircuitBreaker
+from commons.utils.retry_utils import CircuitOpenError
+from commons.utils.retry_utils import RetryPolicy
+
+
+class TestRetryUtils:
+    """Test retries, give up and breaker states."""
+
+    def test_retry_and_giveup(self, monkeypatch):
+        """Retryable errors are retried with recorded backoff, giveup errors are raised."""
+        monkeypatch.setattr(retry_utils.time, "sleep", lambda _: None)
+        calls = []
+
+        @retry_utils.retry(attempts=4, backoff=Backoff(base=0.5, jitter=False),
+                           retry_on=(ConnectionError,), name="test_retry",
+                           giveup=lambda error: "fatal" in str(error))
+        def flaky(fail):
+            calls.append(fail)
+            if len(calls) <= fail:
+                raise ConnectionError("fatal" if fail > 10 else "reset")
+            return len(calls)
+
+        assert flaky(2) == 3
+        calls.clear()
+        with pytest.raises(ConnectionError):
+            flaky(20)
+        assert len(calls) == 1
+        metrics = retry_utils.retry_metrics(reset=True)["test_retry"]
+        assert (metrics["calls"], metrics["retries"], metrics["failures"]) == (2, 2, 1)
+        assert metrics["backoff_ms"]["count"] == 2
+
+    def test_circuit_breaker(self, monkeypatch):
+        """Breaker opens at threshold, rejects calls and closes after successful trial."""
+        now = [100.0]
+        monkeypatch.setattr(retry_utils.time, "monotonic", lambda: now[0])
+        breaker = CircuitBreaker("test_breaker", failure_threshold=2, reset_timeout=10)
+        policy = RetryPolicy(attempts=1, breaker=breaker, name="test_breaker")
+        for _ in range(2):
+            with pytest.raises(ValueError):
+                policy.call(int, "x")
+        assert breaker.state == "open"
+        with pytest.raises(CircuitOpenError):
+            policy.call(int, "1")
+        now[0] += 10
+        assert breaker.state == "half_open"
+        assert policy.call(int, "1") == 1
+        assert breaker.state == "closed"
+        assert retry_utils.retry_metrics(reset=True)["test_breaker"]["rejected"] == 1
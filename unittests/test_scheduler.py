@@ -0,0 +1,196 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2022 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+
+"""Test duration aware scheduler against in memory Kafka stand ins."""
+
+from types import SimpleNamespace
+
+import pytest
+
+from core import scheduler
+from core.scheduler import WorkItem
+
+
+class FakeMsg:
+    """Consumed message."""
+
+    def __init__(self, partition, offset, key, value):
+        self._partition, self._offset, self._key, self._value = partition, offset, key, value
+
+    def partition(self):
+        return self._partition
+
+    def offset(self):
+        return self._offset
+
+    def key(self):
+        return self._key
+
+    def value(self):
+        return self._value
+
+    @staticmethod
+    def error():
+        return None
+
+
+class FakeBroker:
+    """Topics as lists of partition logs."""
+
+    def __init__(self):
+        self.topics = {}
+        self.deleted = []
+
+    def log(self, topic, partition=0):
+        """Message list of topic partition."""
+        partitions = self.topics.setdefault(topic, {})
+        return partitions.setdefault(partition, [])
+
+
+class FakeConsumer:
+    """Consumer reading assigned partitions of broker in order."""
+
+    def __init__(self, broker, partitions=()):
+        self.broker = broker
+        self.positions = {}
+        for topic, partition in partitions:
+            self.positions[(topic, partition)] = 0
+
+    def assign(self, topic_partitions):
+        self.positions = {(t_p.topic, t_p.partition): max(t_p.offset, 0)
+                          for t_p in topic_partitions}
+
+    def poll(self, timeout=None):  # pylint: disable=unused-argument
+        for (topic, partition), offset in self.positions.items():
+            log = self.broker.log(topic, partition)
+            if offset < len(log):
+                self.positions[(topic, partition)] = offset + 1
+                key, value = log[offset]
+                return FakeMsg(partition, offset, key, value)
+        return None
+
+    def list_topics(self, topic):
+        partitions = dict.fromkeys(self.broker.topics.get(topic, {}))
+        return SimpleNamespace(topics={topic: SimpleNamespace(partitions=partitions)})
+
+    def get_watermark_offsets(self, topic_partition):
+        return 0, len(self.broker.log(topic_partition.topic, topic_partition.partition))
+
+    def close(self):
+        pass
+
+
+class FakeProducer:
+    """Producer appending to single partition claims topic."""
+
+    def __init__(self, broker):
+        self.broker = broker
+
+    def produce(self, topic, key, value):
+        self.broker.log(topic).append((key.encode(), value.encode()))
+
+    def flush(self):
+        pass
+
+
+class FakeAdmin:
+    """Admin client recording deleted topics."""
+
+    def __init__(self, broker):
+        self.broker = broker
+
+    def delete_topics(self, topics, operation_timeout=None):  # pylint: disable=unused-argument
+        self.broker.deleted.extend(topics)
+        return {topic: SimpleNamespace(result=lambda: None) for topic in topics}
+
+
+def ticket(name, duration):
+    """Work topic value as deserialized by kafka_consumer."""
+    return SimpleNamespace(te_ticket=name, test_list=[name], duration=duration)
+
+
+@pytest.fixture(name="broker")
+def fixture_broker(monkeypatch):
+    """Broker with an execution of two partitions, long items in 0 and short in 1."""
+    broker = FakeBroker()
+    topic = scheduler.execution_topic("e1")
+    for partition, items in ((0, [("a1", 40), ("a2", 30), ("a3", 20), ("a4", 10)]),
+                             (1, [("b1", 5)])):
+        for name, duration in items:
+            broker.log(topic, partition).append((name, ticket(name, duration)))
+        broker.log(topic, partition).append((f"stop{partition}",
+                                             ticket(scheduler.STOP_TICKET, 0)))
+    partitions = iter([0, 1])
+
+    def get_consumer(topic=None, group_id=None, subscribe=True):  # pylint: disable=W0613
+        return FakeConsumer(broker, [(topic, next(partitions))] if subscribe else ())
+    monkeypatch.setattr(scheduler.kafka_consumer, "get_consumer", get_consumer)
+    monkeypatch.setattr(scheduler, "Consumer", lambda conf: FakeConsumer(broker))
+    monkeypatch.setattr(scheduler, "Producer", lambda conf: FakeProducer(broker))
+    return broker
+
+
+class TestScheduler:
+    """Test scheduling plan and work stealing consumers."""
+
+    def test_plan_longest_processing_time(self):
+        """Items go longest first to the least loaded bin."""
+        items = [WorkItem(f"t{duration}", False, [f"t{duration}"], "TE-1", duration)
+                 for duration in (3, 7, 4, 6, 5)]
+        bins = scheduler.plan(items, 2)
+        assert [[item.duration for item in b_in.items] for b_in in bins] == [[7, 4, 3], [6, 5]]
+        assert [b_in.load for b_in in bins] == [14, 11]
+        assert scheduler.plan(items, 0)[0].load == 25
+
+    def test_estimate_durations(self):
+        """Parallel group takes sum of its tests, unknown tests the median."""
+        items = [WorkItem("g", True, ["t1", "t2", "t9"], "TE-1"),
+                 WorkItem("s", False, ["t3"], "TE-1")]
+        scheduler.estimate_durations(items, {"t1": 10, "t2": 20, "t3": 30})
+        assert [item.duration for item in items] == [50, 30]
+
+    def test_durations_timeout(self, monkeypatch):
+        """Hanging report server times out and default durations are used."""
+        timeouts = []
+
+        def request(method, url, timeout=None, **kwargs):  # pylint: disable=W0613
+            timeouts.append(timeout)
+            raise scheduler.requests.exceptions.Timeout("read timed out")
+        monkeypatch.setattr(scheduler.requests, "request", request)
+        assert scheduler.get_test_durations(["t1"], "user", "pwd") == {}
+        assert timeouts == [scheduler.DURATIONS_TIMEOUT]
+
+    def test_work_stealing_exactly_once(self, broker):
+        """Idle runner steals shortest items of loaded partition, every item runs once."""
+        runner_a = scheduler.ScheduledConsumer("e1", "a", idle_polls=3)
+        runner_b = scheduler.ScheduledConsumer("e1", "b", idle_polls=3)
+        iter_a = iter(runner_a)
+        assert next(iter_a).te_ticket == "a1"
+        done_b = [value.te_ticket for value in runner_b]
+        assert done_b == ["b1", "a4", "a3", "a2"]
+        assert runner_b.finished
+        assert not runner_b.finish(FakeAdmin(broker))
+        assert not broker.deleted
+        assert not list(iter_a)
+        assert runner_a.finished
+        assert runner_a.finish(FakeAdmin(broker))
+        assert broker.deleted == [scheduler.execution_topic("e1"),
+                                  scheduler.claims_topic("e1")]
+        assert runner_a.claims.owners == {"a1": "a", "b1": "b", "a2": "b", "a3": "b",
+                                          "a4": "b"}
@@ -0,0 +1,58 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2022 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+
+"""Test drunner test index and execution plan."""
+
+import json
+
+from core.test_index import TestIndex, iter_json_array
+
+META = [
+    {"test_id": "TEST-1", "nodeid": "t.py::test_1", "marks": ["parallel", "s3_ops", "s3_bucket"]},
+    {"test_id": "TEST-2", "nodeid": "t.py::test_2", "marks": ["s3_bucket"]},
+    {"test_id": "TEST-3", "nodeid": "t.py::test_3", "marks": ["parallel", "s3_bucket"]},
+    {"test_id": "TEST-4", "nodeid": "t.py::test_4", "marks": ["ha", "sanity"]},
+    {"test_id": "TEST-5", "nodeid": "t.py::test_5", "marks": ["skip", "s3_bucket"]},
+    {"test_id": "TEST-6", "nodeid": "t.py::test_6", "marks": ["parametrize"]},
+]
+
+
+class TestTestIndex:
+    """Test TestIndex class."""
+
+    def test_streamed_meta_file(self, tmp_path):
+        """Meta file is read in small chunks."""
+        meta_file = tmp_path / "te_meta.json"
+        meta_file.write_text(json.dumps(META, indent=2))
+        assert list(iter_json_array(str(meta_file), chunk_size=7)) == META
+        index = TestIndex.from_meta_file(str(meta_file))
+        assert len(index) == 6 and "TEST-6" in index
+        assert index.marks == ["s3_bucket", "ha"]
+
+    def test_plan(self):
+        """Parallel group of a mark precedes its sequential tests."""
+        index = TestIndex()
+        for meta in META:
+            index.add(meta["test_id"], meta["nodeid"], meta["marks"])
+        items = index.plan({"TE-1": ["TEST-4", "TEST-3", "TEST-5", "TEST-6", "TEST-9"],
+                            "TE-2": ["TEST-2", "TEST-1"]})
+        assert [(item.tag, item.parallel, item.tests, item.ticket) for item in items] == [
+            ("ha", False, ["TEST-4"], "TE-1"),
+            ("s3_bucket", True, ["TEST-1", "TEST-3"], "TE-2"),
+            ("s3_bucket", False, ["TEST-2"], "TE-2")]
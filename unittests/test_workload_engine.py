@@ -0,0 +1,127 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2022 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+
+"""Test in-process IO stability workload engine."""
+
+import threading
+from types import SimpleNamespace
+
+from libs.iostability import workload_engine
+from libs.iostability.workload_engine import RateLimiter
+from libs.iostability.workload_engine import WorkloadEngine
+
+
+class FakeBody:
+    """Streaming body of get_object."""
+
+    def __init__(self, size):
+        self.size = size
+
+    def iter_chunks(self, chunk_size):
+        """Yield body in chunks."""
+        for start in range(0, self.size, chunk_size):
+            yield b"x" * min(chunk_size, self.size - start)
+
+
+class FakeS3Client:
+    """In memory S3 client recording PUT, GET and DELETE calls."""
+
+    def __init__(self, undeletable=()):
+        self.objects = {}
+        self.gets = 0
+        self.deleted = []
+        self.undeletable = set(undeletable)
+        self._lock = threading.Lock()
+
+    def upload_fileobj(self, fileobj, bucket, key, Config=None):  # pylint: disable=invalid-name
+        """Read whole stream like s3transfer."""
+        data = fileobj.read()
+        with self._lock:
+            self.objects[key] = len(data)
+
+    def get_object(self, Bucket, Key):  # pylint: disable=invalid-name
+        """Return body of stored object."""
+        with self._lock:
+            self.gets += 1
+            return {"Body": FakeBody(self.objects[Key])}
+
+    def delete_objects(self, Bucket, Delete):  # pylint: disable=invalid-name
+        """Record deleted keys, undeletable keys are reported in Errors."""
+        keys = [obj["Key"] for obj in Delete["Objects"]]
+        with self._lock:
+            self.deleted.extend(key for key in keys if key not in self.undeletable)
+        return {"Errors": [{"Key": key, "Code": "AccessDenied", "Message": "Access Denied"}
+                           for key in keys if key in self.undeletable]}
+
+
+class TestWorkloadEngine:
+    """Test rate limiter and workload scheduling."""
+
+    def test_rate_limiter(self, monkeypatch):
+        """Burst is served at once, further tokens are paced at rate."""
+        clock = [0.0]
+
+        def sleep(secs):
+            clock[0] += secs
+        monkeypatch.setattr(workload_engine, "time",
+                            SimpleNamespace(monotonic=lambda: clock[0], sleep=sleep))
+        limiter = RateLimiter(rate=4, burst=4)
+        for _ in range(4):
+            limiter.acquire()
+        assert clock[0] == 0
+        for _ in range(8):
+            limiter.acquire()
+        assert clock[0] == 2.0
+        # request bigger than bucket goes through once the bucket is full
+        limiter.acquire(16)
+        assert clock[0] == 3.0
+        # set stop event releases waiting clients
+        stop = threading.Event()
+        stop.set()
+        limiter.acquire(1, stop)
+        assert clock[0] == 3.0
+
+    def test_workload_mix_and_cleanup(self, tmp_path):
+        """Throttled clients write sizes of distribution, read back and delete every object."""
+        client = FakeS3Client()
+        engine = WorkloadEngine({"1Kb": 50, "4Kb": 50, "1Mb": 0}, clients=3, bucket="bkt",
+                                s3_client=client, target_ops=40, interval=0.1,
+                                stats_file=str(tmp_path / "stats.jsonl"))
+        summary = engine.run(duration=0.5)
+        puts = summary["operations"]["PUT"]["ops"]
+        # burst of one second plus rate over duration
+        assert 0 < puts <= 40 + 20 + 3
+        assert set(client.objects.values()) <= {1024, 4096}
+        assert len(client.objects) == puts == client.gets
+        assert sorted(client.deleted) == sorted(client.objects)
+        assert summary["operations"]["DELETE"]["errors"] == 0
+        assert len(engine.reports) >= 2
+        with open(tmp_path / "stats.jsonl") as stats:
+            assert len(stats.readlines()) == len(engine.reports)
+
+    def test_partial_delete_failure(self):
+        """Keys failed in delete_objects are counted as DELETE errors and reported."""
+        client = FakeS3Client(undeletable={"object-1024-1"})
+        engine = WorkloadEngine({"1Kb": 100}, clients=1, bucket="bkt", s3_client=client,
+                                target_ops=10, interval=0.1, read_back=False)
+        summary = engine.run(duration=0.3)
+        assert summary["operations"]["DELETE"]["errors"] == 1
+        assert summary["undeleted"] == 1
+        assert engine.undeleted == ["object-1024-1"]
+        assert sorted(client.deleted) == sorted(set(client.objects) - {"object-1024-1"})
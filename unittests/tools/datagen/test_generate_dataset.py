@@ -0,0 +1,115 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2022 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+
+"""Test plan and uploads of data generator."""
+
+import base64
+import hashlib
+
+import numpy as np
+
+from tools.datagen import generate_dataset as gd
+
+# size classes of dataset-S.cfg
+FSIZE_PERCENT = [[1024, 26.79], [10240, 18.84], [102400, 27.87], [1048576, 18.2],
+                 [10485760, 7.7], [104857600, 0.56], [1073741824, 0.03], [10737418240, 0.01]]
+ALLDIRS = ["top/a", "top/a/b", "top/c"]
+SLAB = memoryview(np.random.default_rng(5).bytes(4 * 1024 * 1024))
+
+
+class StubClient:
+    """S3 client keeping uploaded bodies."""
+
+    def __init__(self):
+        self.bodies = {}
+        self.content_md5 = {}
+
+    def put_object(self, Bucket, Key, Body, ContentMD5):  # pylint: disable=invalid-name
+        """Keep body and its ContentMD5 header."""
+        self.bodies[(Bucket, Key)] = bytes(Body)
+        self.content_md5[(Bucket, Key)] = ContentMD5
+
+    def upload_fileobj(self, stream, bucket, key, Config):  # pylint: disable=invalid-name
+        """Read stream in parts as multipart upload does."""
+        parts = []
+        part = stream.read(5 * 1024 * 1024)
+        while part:
+            parts.append(part)
+            part = stream.read(5 * 1024 * 1024)
+        self.bodies[(bucket, key)] = b"".join(parts)
+
+
+def plan(numfiles, shard=0, shards=1):
+    """Plan of shard as list."""
+    return list(gd.fileset_plan(FSIZE_PERCENT, 7, numfiles, ALLDIRS, shard, shards))
+
+
+class TestFilesetPlan:
+    """Test deterministic sharded plan and extensions of size classes."""
+
+    def test_plan_is_deterministic(self):
+        """Same seed and shard give same paths, sizes and content seeds."""
+        assert plan(500, 1, 3) == plan(500, 1, 3)
+        assert plan(500, 1, 3) != plan(500, 2, 3)
+
+    def test_shards_partition_unsharded_count(self):
+        """Shards are disjoint and together hold as many files per class as one shard."""
+        numfiles, shards = 1000, 4
+        per_class = [gd.shard_counts(FSIZE_PERCENT, numfiles, shard, shards)
+                     for shard in range(shards)]
+        assert [sum(counts) for counts in zip(*per_class)] == \
+            gd.shard_counts(FSIZE_PERCENT, numfiles, 0, 1)
+        sharded = [plan(numfiles, shard, shards) for shard in range(shards)]
+        entries = [entry for shard_plan in sharded for entry in shard_plan]
+        assert len(set(entries)) == len(entries)
+        assert len(entries) == len(plan(numfiles))
+
+    def test_extension_of_size_class(self):
+        """Extension is taken from class of size, upper bound belongs to next class."""
+        sizes = [0, 1023, 1024, 10239, 10240, 2 ** 30 - 1, 2 ** 30, 5 * 2 ** 30]
+        classes = [0, 0, 1, 1, 2, 6, 7, 7]
+        names = gd.file_names(np.random.default_rng(3), np.repeat(sizes, 50))
+        for index, (_, ext) in enumerate(names):
+            assert ext in gd.SIZE_CLASSES[classes[index // 50]][1]
+        assert all(ext in gd.BINARY for _, ext in names[-100:])
+
+
+class TestUploadObject:
+    """Test md5 of manifest against uploaded content."""
+
+    def test_put_object_md5(self):
+        """Small object is put with ContentMD5 of generated content."""
+        client = StubClient()
+        size = 100 * 1024 + 17
+        digest = gd.upload_object(client, "bkt", "small", size, SLAB, 11, None)
+        expected = b"".join(gd.object_chunks(SLAB, size, 11))
+        assert client.bodies[("bkt", "small")] == expected
+        assert digest == hashlib.md5(expected).hexdigest()
+        assert base64.b64decode(client.content_md5[("bkt", "small")]) == \
+            hashlib.md5(expected).digest()
+
+    def test_multipart_stream_md5(self):
+        """Large object streamed through ChunkReader matches md5 of generated content."""
+        client = StubClient()
+        size = gd.MULTIPART_THRESHOLD + 12345
+        digest = gd.upload_object(client, "bkt", "large", size, SLAB, 13, None)
+        expected = b"".join(gd.object_chunks(SLAB, size, 13))
+        assert len(expected) == size
+        assert client.bodies[("bkt", "large")] == expected
+        assert digest == hashlib.md5(expected).hexdigest()
@@ -0,0 +1,112 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2022 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+
+"""Test benchmark results utility module."""
+
+import os
+import tempfile
+
+from commons.utils import benchmark_utils
+from commons.utils.histogram_utils import LatencyHistogram
+
+S3BENCH_RESP = [
+    'Test parameters\nendpoint(s):      [https://s3.seagate.com]\nbucket:           '
+    'dd-bucket\nobjectNamePrefix: loadgen_test_\nobjectSize:       1.0000 MB\nnumClients: '
+    '      40\nnumSamples:       200\n\n\nResults Summary for Write Operation(s)\nTotal '
+    'Transferred: 200.000 MB\nTotal Throughput:  20.00 MB/s\nTotal Duration:    10.000 s\n'
+    'Number of Errors:  0\n------------------------------------\nWrite times Max:       '
+    '2.500 s\nWrite times 99th %ile: 2.000 s\nWrite times 50th %ile: 1.000 s\nWrite times '
+    'Min:       0.100 s\n\n\nResults Summary for Read Operation(s)\nTotal Transferred: '
+    '200.000 MB\nTotal Throughput:  40.00 MB/s\nTotal Duration:    5.000 s\nNumber of '
+    'Errors:  1\n------------------------------------\nRead times 99th %ile: 1.000 s\n']
+
+
+class TestBenchmarkUtils:
+    """Test benchmark results utility class."""
+
+    def test_parse_s3bench(self):
+        """Parse plain s3bench output."""
+        put, get = benchmark_utils.parse_s3bench_log(S3BENCH_RESP)
+        assert (put.operation, put.object_size, put.clients) == ("PUT", 1024 * 1024, 40)
+        assert put.mbps == 20.0
+        assert put.ops_per_sec == 20.0
+        assert put.latency["p99"] == 2000.0
+        assert (get.operation, get.errors, get.latency["p99"]) == ("GET", 1, 1000.0)
+
+    def test_parse_cosbench(self):
+        """Parse cosbench stage summary CSV."""
+        csv_fd, csv_path = tempfile.mkstemp(suffix=".csv")
+        with os.fdopen(csv_fd, "w") as csv_file:
+            csv_file.write("Op-Name,Op-Type,Op-Count,Byte-Count,Avg-ResTime,Avg-ProcTime,"
+                           "Throughput,Bandwidth,Succ-Ratio,99%-ResTime\n"
+                           "write,write,1000,1048576000,12.5,10.1,100,104857600,99%,40\n")
+        try:
+            record, = benchmark_utils.parse_results("cosbench", csv_path, object_size=1048576)
+        finally:
+            os.remove(csv_path)
+        assert (record.operation, record.mbps, record.errors) == ("PUT", 100.0, 10)
+        assert record.latency == {"avg": 12.5, "p99": 40.0}
+
+    def test_regression_against_baseline(self):
+        """PUT throughput drop beyond threshold is flagged."""
+        baseline = list(benchmark_utils.parse_s3bench_log(S3BENCH_RESP))
+        current = list(benchmark_utils.parse_s3bench_log(S3BENCH_RESP))
+        current[0].mbps = 17.0
+        json_fd, json_path = tempfile.mkstemp(suffix=".json")
+        os.close(json_fd)
+        try:
+            benchmark_utils.save_baseline(baseline, json_path)
+            status, regressed = benchmark_utils.check_regression(
+                current, json_path, thresholds={"mbps": 10})
+        finally:
+            os.remove(json_path)
+        assert not status
+        assert regressed[0]["key"][1] == "PUT"
+        assert regressed[0]["change"]["mbps"] == -15.0
+
+    def test_aggregate_percentiles_approximate(self):
+        """Merged instance percentiles are averaged and labelled approximate."""
+        first, second = (list(benchmark_utils.parse_s3bench_log(S3BENCH_RESP))[0]
+                         for _ in range(2))
+        second.count, second.latency["p99"], second.latency["max"] = 600, 4000.0, 5000.0
+        record, = benchmark_utils.aggregate_records([first, second])
+        assert (record.count, record.mbps, record.clients) == (800, 40.0, 80)
+        assert record.latency["p99"] == (2000.0 * 200 + 4000.0 * 600) / 800
+        assert (record.latency["min"], record.latency["max"]) == (100.0, 5000.0)
+        assert record.approximate == ["p50", "p99"]
+        single, = benchmark_utils.aggregate_records([first])
+        assert not single.approximate
+
+    def test_aggregate_histograms(self):
+        """Records with latency histograms are merged into exact percentiles."""
+        records = []
+        for latencies in (range(1000, 2000), range(1000, 101000, 100)):
+            hist = LatencyHistogram()
+            for latency in latencies:
+                hist.record(latency)
+            records.append(benchmark_utils.BenchmarkRecord(
+                tool="s3bench", operation="PUT", count=1000, histogram=hist.to_dict(),
+                latency={"p50": 0.0, "p99": 0.0}))
+        record, = benchmark_utils.aggregate_records(records)
+        assert not record.approximate
+        assert LatencyHistogram.from_dict(record.histogram).count == 2000
+        # 1000 values in 1-2ms and 1000 spread up to 101ms, p50 is close to 2ms
+        assert abs(record.latency["p50"] - 2.0) < 0.05
+        assert abs(record.latency["p99"] - 99.0) < 1.0
+        assert (record.latency["min"], record.latency["max"]) == (1.0, 100.9)
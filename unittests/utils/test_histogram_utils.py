@@ -0,0 +1,62 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2022 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+
+"""Test latency histogram utility module."""
+
+import random
+
+import pytest
+
+from commons.utils.histogram_utils import LatencyHistogram
+
+
+class TestLatencyHistogram:
+    """Test latency histogram class."""
+
+    def test_exact_small_values(self):
+        """Values below sub bucket count are recorded exactly."""
+        hist = LatencyHistogram()
+        for value in range(1, 101):
+            hist.record(value)
+        assert hist.percentile(50) == 50
+        assert hist.percentile(99) == 99
+        assert hist.summary()["max"] == 100
+
+    def test_relative_error(self):
+        """Percentiles of large values stay within precision."""
+        hist = LatencyHistogram(precision_bits=7)
+        values = sorted(random.randint(1, 10 ** 8) for _ in range(10000))
+        for value in values:
+            hist.record(value)
+        for percent in (50, 95, 99):
+            expected = values[int(len(values) * percent / 100) - 1]
+            assert hist.percentile(percent) == pytest.approx(expected, rel=0.02)
+
+    def test_merge_and_serialize(self):
+        """Merged and restored histograms keep counts."""
+        hist1, hist2 = LatencyHistogram(), LatencyHistogram()
+        hist1.record(10, count=3)
+        hist2.record(1000000)
+        hist1.merge(hist2)
+        restored = LatencyHistogram.from_dict(hist1.to_dict())
+        assert restored.count == 4
+        assert restored.min == 10
+        assert restored.percentile(100) == 1000000
+        with pytest.raises(ValueError):
+            hist1.merge(LatencyHistogram(precision_bits=5))
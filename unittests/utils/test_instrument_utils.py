@@ -0,0 +1,59 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2022 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+
+"""Test latency instrumentation."""
+
+import pytest
+
+from commons.utils import instrument_utils
+
+
+class TestInstrumentUtils:
+    """Test operation recording and summaries."""
+
+    def test_nested_operations(self, monkeypatch):
+        """Nested operations are recorded by name, only outer ones add to instrumented time."""
+        clock = iter(range(0, 10 ** 10, 10 ** 6))
+        monkeypatch.setattr(instrument_utils.time, "perf_counter_ns", lambda: next(clock))
+        instrument_utils.begin_test()
+
+        @instrument_utils.instrumented("test.outer")
+        def outer():
+            with instrument_utils.measure("test.inner") as span:
+                span.nbytes = 100
+            with pytest.raises(ValueError), instrument_utils.measure("test.inner"):
+                raise ValueError("failed")
+
+        outer()
+        summary = instrument_utils.testcase_summary(duration=0.01)
+        assert summary["instrumented_s"] == 0.005
+        inner = summary["ops"]["test.inner"]
+        assert (inner["count"], inner["errors"], inner["bytes"], inner["p50_ms"]) == \
+            (2, 1, 100, 1.0)
+        assert summary["ops"]["test.outer"]["share"] == 0.5
+        assert not instrument_utils.testcase_summary()["ops"]
+        assert "test.inner" in instrument_utils.format_summary(summary)
+
+    def test_disabled(self, monkeypatch):
+        """Nothing is recorded while instrumentation is disabled."""
+        monkeypatch.setattr(instrument_utils, "ENABLED", False)
+        instrument_utils.begin_test()
+        with instrument_utils.measure("test.disabled") as span:
+            span.nbytes += 1
+        assert not instrument_utils.testcase_summary()["ops"]
@@ -0,0 +1,53 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2022 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+
+"""Test sampling profiler."""
+
+import hashlib
+import time
+
+from commons.utils.profile_utils import SamplingProfiler
+
+
+def _busy(seconds):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        hashlib.md5(b"x" * 4096).digest()
+
+
+class TestSamplingProfiler:
+    """Test stacks and module breakdown of profiler."""
+
+    def test_profile_busy_loop(self, tmp_path):
+        """Busy loop of main thread shows up in collapsed stacks and module breakdown."""
+        profiler = SamplingProfiler(interval=0.005)
+        profiler.start()
+        _busy(0.2)
+        profiler.stop()
+        assert profiler.samples > 10
+        stacks_file, modules_file = profiler.write(str(tmp_path / "TEST-1_profile"))
+        with open(stacks_file) as fp:
+            lines = fp.read().splitlines()
+        assert any(line.startswith("MainThread;") and f"{__name__}:_busy" in line
+                   for line in lines)
+        assert all(line.rsplit(" ", 1)[1].isdigit() for line in lines)
+        modules = [module for module, _, _, _ in profiler.breakdown()]
+        assert __name__ in modules
+        with open(modules_file) as fp:
+            assert "client work" in fp.read()
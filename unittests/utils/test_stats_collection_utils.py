@@ -0,0 +1,82 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2022 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+
+"""Test decoding of stats agent frames into node columns."""
+
+import io
+import time
+
+from commons.utils.stats_collection_utils import ClusterStatsCollector, NodeSeries
+from scripts.io_stability import stats_agent
+
+
+def agent_output(duration: float = 0.3) -> bytes:
+    """Frames written by agent sampling local /proc."""
+    buf = io.BytesIO()
+    stats_agent.Agent(buf, "python").run(interval=0.05, duration=duration)
+    return buf.getvalue()
+
+
+class TestNodeSeries:
+    """Test NodeSeries decoding of agent output."""
+
+    def test_read_agent_output(self):
+        """Node records are decoded with one value per column and sample."""
+        series = NodeSeries("node1")
+        series.read(io.BytesIO(agent_output()))
+        assert series.keys[0] == stats_agent.NODE_KEY
+        node_samples = [key for key in series.key if key == 0]
+        # first sample has no previous counters and carries no records
+        assert len(node_samples) >= 2
+        for values in series.columns.values():
+            assert len(values) == len(series.time)
+        assert all(0 <= cpu <= 100 for cpu, key in zip(series.columns["cpu"], series.key)
+                   if key == 0)
+        assert all(mem > 0 for mem in series.columns["mem"])
+        assert abs(series.time[-1] - time.time()) < 5
+
+    def test_truncated_stream(self):
+        """Partial trailing frame of a closed connection is dropped."""
+        data = agent_output(0.15)
+        series = NodeSeries("node1")
+        series.read(io.BytesIO(data[:-3]))
+        full = NodeSeries("node1")
+        full.read(io.BytesIO(data))
+        assert len(series.time) < len(full.time)
+        assert len(series.columns["cpu"]) == len(series.time)
+
+
+class TestClusterStatsCollector:
+    """Test phase mapping of collected samples."""
+
+    def test_phase_summary(self):
+        """Samples are attributed to the latest marker before them."""
+        collector = ClusterStatsCollector({"nodes": []})
+        series = collector.series["node1"] = NodeSeries("node1")
+        collector.markers.append((time.time(), "start"))
+        series.read(io.BytesIO(agent_output(0.2)))
+        # sample times are shifted by the agent clock offset, place marker after them
+        collector.markers.append((series.time[-1] + 1e-3, "degraded"))
+        series.read(io.BytesIO(agent_output(0.2)))
+        arrays = collector.to_arrays("node1")
+        assert set(arrays["phase"]) == {0, 1}
+        summary = collector.phase_summary("node1", stats_agent.NODE_KEY)
+        assert set(summary) == {"start", "degraded"}
+        assert summary["degraded"]["max"] >= summary["degraded"]["mean"] >= 0
+        assert collector.phase_summary("node1", "pod:missing") == {}